@@ -0,0 +1,580 @@
+"""
+Prueba de carga para la API de proyectos y tareas del TP4.
+
+Ejecutar desde la raíz del repositorio:
+
+    # En el mismo proceso, llamando a la app ASGI de una carpeta TP4
+    python Herramientas/carga.py --app "TPs/62344 - Fabricio villagra/Unidad 3/TP4"
+
+    # Contra un servidor que ya está corriendo
+    python Herramientas/carga.py --url http://127.0.0.1:8000
+
+Opciones principales: --clientes 50 --segundos 10 --calentamiento 1
+--mezcla leer=35,listar=25,resumen=10,crear=15,actualizar=10,eliminar=5
+--json resultado.json (o --json - para imprimirlo en lugar de la tabla).
+
+Antes de medir se crean --proyectos proyectos y --tareas tareas por la
+misma API (con 0 y 0 se usan los que ya existen; tareas sin proyectos es un
+error). Cada cliente es un
+usuario virtual que manda un request detrás de otro, sin pausa, eligiendo
+la operación al azar según la mezcla:
+
+- leer: GET /proyectos/{id}
+- listar: GET /tareas?estado=...&prioridad=... o GET /proyectos/{id}/tareas?estado=...
+- resumen: GET /proyectos/{id}/resumen o GET /resumen
+- crear: POST /proyectos/{id}/tareas
+- actualizar: PUT /tareas/{id} sobre las tareas sembradas
+- eliminar: DELETE /tareas/{id} sobre una tarea que creó el mismo cliente
+
+Cualquier status >= 400 cuenta como error de su operación.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+ESTADOS = ["pendiente", "en_progreso", "completada"]
+PRIORIDADES = ["baja", "media", "alta"]
+
+MEZCLA_POR_DEFECTO = {"leer": 35, "listar": 25, "resumen": 10, "crear": 15, "actualizar": 10, "eliminar": 5}
+
+# Tareas que se buscan con GET cuando no se siembra (--tareas 0)
+MAX_TAREAS_DESCUBIERTAS = 1000
+
+
+class CargaError(Exception):
+    """La preparación de la carga falló (la API no respondió como se esperaba)"""
+
+
+# ---------- clientes ----------
+
+class ClienteASGI:
+    """Llama a la app ASGI directamente, sin sockets"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def pedir(self, metodo: str, ruta: str, cuerpo: Optional[dict] = None) -> Tuple[int, bytes]:
+        datos = json.dumps(cuerpo).encode() if cuerpo is not None else b""
+        camino, _, query = ruta.partition("?")
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+            "method": metodo, "scheme": "http", "path": camino, "raw_path": camino.encode(),
+            "root_path": "", "query_string": query.encode(),
+            "headers": [(b"host", b"carga"), (b"content-type", b"application/json"),
+                        (b"content-length", str(len(datos)).encode())],
+            "client": ("carga", 1), "server": ("carga", 80),
+        }
+        status = 500
+        partes = []
+        enviado = False
+
+        async def receive():
+            nonlocal enviado
+            if enviado:
+                # El request ya se leyó entero: lo que sigue es esperar la desconexión
+                await asyncio.Event().wait()
+            enviado = True
+            return {"type": "http.request", "body": datos, "more_body": False}
+
+        async def send(mensaje):
+            nonlocal status
+            if mensaje["type"] == "http.response.start":
+                status = mensaje["status"]
+            elif mensaje["type"] == "http.response.body":
+                partes.append(mensaje.get("body", b""))
+
+        try:
+            await self.app(scope, receive, send)
+        except Exception:
+            # Starlette ya respondió 500 y vuelve a lanzar la excepción para el
+            # servidor; como uvicorn, se la trata como un 500
+            status = 500
+        return status, b"".join(partes)
+
+    async def cerrar(self) -> None:
+        pass
+
+
+class ClienteHTTP:
+    """
+    Cliente HTTP/1.1 mínimo con una conexión keep-alive.
+
+    Con httpx, en una máquina con pocos núcleos el propio cliente consume
+    más CPU que el servidor y la medición termina siendo la del cliente.
+    """
+
+    def __init__(self, host: str, puerto: int):
+        self.host = host
+        self.puerto = puerto
+        self._lector = None
+        self._escritor = None
+
+    async def _conectar(self) -> None:
+        self._lector, self._escritor = await asyncio.open_connection(self.host, self.puerto)
+
+    async def pedir(self, metodo: str, ruta: str, cuerpo: Optional[dict] = None) -> Tuple[int, bytes]:
+        datos = json.dumps(cuerpo).encode() if cuerpo is not None else b""
+        if self._escritor is None:
+            await self._conectar()
+        try:
+            self._escritor.write(
+                f"{metodo} {ruta} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(datos)}\r\n\r\n".encode() + datos
+            )
+            await self._escritor.drain()
+            status, cabeceras, cuerpo_respuesta = await self._leer_respuesta()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            # El servidor cerró la conexión: el próximo request abre otra
+            await self.cerrar()
+            raise
+        if cabeceras.get("connection", "").lower() == "close":
+            await self.cerrar()
+        return status, cuerpo_respuesta
+
+    async def _leer_respuesta(self) -> Tuple[int, Dict[str, str], bytes]:
+        cabecera = await self._lector.readuntil(b"\r\n\r\n")
+        lineas = cabecera.decode("latin-1").split("\r\n")
+        status = int(lineas[0].split()[1])
+        cabeceras = {}
+        for linea in lineas[1:]:
+            if ":" in linea:
+                nombre, valor = linea.split(":", 1)
+                cabeceras[nombre.strip().lower()] = valor.strip()
+
+        if "content-length" in cabeceras:
+            return status, cabeceras, await self._lector.readexactly(int(cabeceras["content-length"]))
+        if cabeceras.get("transfer-encoding", "").lower() == "chunked":
+            partes = []
+            while True:
+                largo = int((await self._lector.readuntil(b"\r\n")).split(b";")[0], 16)
+                if largo == 0:
+                    await self._lector.readuntil(b"\r\n")
+                    break
+                partes.append(await self._lector.readexactly(largo))
+                await self._lector.readexactly(2)
+            return status, cabeceras, b"".join(partes)
+        # 204 / 304: sin cuerpo
+        return status, cabeceras, b""
+
+    async def cerrar(self) -> None:
+        if self._escritor is not None:
+            self._escritor.close()
+            self._escritor = self._lector = None
+
+
+# ---------- preparación ----------
+
+def _json(cuerpo: bytes) -> Any:
+    try:
+        return json.loads(cuerpo)
+    except ValueError:
+        return None
+
+
+def _buscar_id(datos: Any) -> Optional[int]:
+    """id del objeto creado, esté en la raíz o envuelto ({"tarea": {...}})"""
+    if isinstance(datos, dict):
+        if isinstance(datos.get("id"), int):
+            return datos["id"]
+        for valor in datos.values():
+            encontrado = _buscar_id(valor) if isinstance(valor, dict) else None
+            if encontrado is not None:
+                return encontrado
+    return None
+
+
+def _buscar_lista(datos: Any) -> List[dict]:
+    """La lista de una respuesta de listado, sea la raíz o un campo ({"items": [...]})"""
+    if isinstance(datos, list):
+        return datos
+    if isinstance(datos, dict):
+        for valor in datos.values():
+            if isinstance(valor, list):
+                return valor
+    return []
+
+
+async def sembrar(cliente, proyectos: int, tareas: int, semilla: int) -> Dict[str, List[int]]:
+    """Crea proyectos y tareas por la API y devuelve sus ids"""
+    rng = random.Random(semilla)
+    marca = f"{semilla:x}-{int(time.time() * 1000):x}"
+    datos = {"proyectos": [], "tareas": []}
+
+    for i in range(proyectos):
+        status, cuerpo = await cliente.pedir("POST", "/proyectos", {
+            "nombre": f"Carga {marca} {i}", "descripcion": f"Proyecto {i} de la prueba de carga",
+        })
+        proyecto_id = _buscar_id(_json(cuerpo))
+        if status >= 400 or proyecto_id is None:
+            raise CargaError(f"POST /proyectos devolvió {status}: {cuerpo[:200]!r}")
+        datos["proyectos"].append(proyecto_id)
+
+    for i in range(tareas):
+        proyecto_id = rng.choice(datos["proyectos"])
+        status, cuerpo = await cliente.pedir("POST", f"/proyectos/{proyecto_id}/tareas", {
+            "descripcion": f"Tarea {i} de la prueba de carga",
+            "estado": rng.choice(ESTADOS), "prioridad": rng.choice(PRIORIDADES),
+        })
+        tarea_id = _buscar_id(_json(cuerpo))
+        if status >= 400 or tarea_id is None:
+            raise CargaError(f"POST /proyectos/{proyecto_id}/tareas devolvió {status}: {cuerpo[:200]!r}")
+        datos["tareas"].append(tarea_id)
+
+    return datos
+
+
+async def descubrir(cliente) -> Dict[str, List[int]]:
+    """Ids de los proyectos y de algunas tareas que ya existen"""
+    status, cuerpo = await cliente.pedir("GET", "/proyectos")
+    proyectos = [p["id"] for p in _buscar_lista(_json(cuerpo)) if isinstance(p, dict) and "id" in p]
+    if status >= 400 or not proyectos:
+        raise CargaError("No hay proyectos: sembrá datos con --proyectos / --tareas")
+
+    tareas: List[int] = []
+    for proyecto_id in proyectos:
+        _, cuerpo = await cliente.pedir("GET", f"/proyectos/{proyecto_id}/tareas")
+        tareas.extend(t["id"] for t in _buscar_lista(_json(cuerpo)) if isinstance(t, dict) and "id" in t)
+        if len(tareas) >= MAX_TAREAS_DESCUBIERTAS:
+            break
+    if not tareas:
+        raise CargaError("No hay tareas: sembrá datos con --tareas")
+    return {"proyectos": proyectos, "tareas": tareas[:MAX_TAREAS_DESCUBIERTAS]}
+
+
+# ---------- operaciones ----------
+
+def _leer(rng, datos, propias):
+    return "GET", f"/proyectos/{rng.choice(datos['proyectos'])}", None
+
+
+def _listar(rng, datos, propias):
+    if rng.random() < 0.5:
+        return "GET", f"/tareas?estado={rng.choice(ESTADOS)}&prioridad={rng.choice(PRIORIDADES)}", None
+    return "GET", f"/proyectos/{rng.choice(datos['proyectos'])}/tareas?estado={rng.choice(ESTADOS)}", None
+
+
+def _resumen(rng, datos, propias):
+    if rng.random() < 0.5:
+        return "GET", "/resumen", None
+    return "GET", f"/proyectos/{rng.choice(datos['proyectos'])}/resumen", None
+
+
+def _crear(rng, datos, propias):
+    return "POST", f"/proyectos/{rng.choice(datos['proyectos'])}/tareas", {
+        "descripcion": f"Tarea de carga {rng.getrandbits(32):08x}",
+        "estado": rng.choice(ESTADOS), "prioridad": rng.choice(PRIORIDADES),
+    }
+
+
+def _actualizar(rng, datos, propias):
+    return "PUT", f"/tareas/{rng.choice(datos['tareas'])}", {
+        "estado": rng.choice(ESTADOS), "prioridad": rng.choice(PRIORIDADES),
+    }
+
+
+def _eliminar(rng, datos, propias):
+    return "DELETE", f"/tareas/{propias.pop()}", None
+
+
+OPERACIONES: Dict[str, Callable] = {
+    "leer": _leer, "listar": _listar, "resumen": _resumen,
+    "crear": _crear, "actualizar": _actualizar, "eliminar": _eliminar,
+}
+
+
+def parsear_mezcla(texto: str) -> Dict[str, float]:
+    """'leer=40,crear=10' -> {'leer': 40.0, 'crear': 10.0}"""
+    mezcla = {}
+    for parte in texto.split(","):
+        nombre, _, peso = parte.partition("=")
+        nombre = nombre.strip()
+        if nombre not in OPERACIONES:
+            raise ValueError(f"Operación desconocida: {nombre!r} (válidas: {', '.join(OPERACIONES)})")
+        mezcla[nombre] = float(peso)
+    if not any(peso > 0 for peso in mezcla.values()):
+        raise ValueError("La mezcla no tiene ninguna operación con peso positivo")
+    return mezcla
+
+
+def revisar_siembra(proyectos: int, tareas: int, mezcla: Dict[str, float]) -> None:
+    """
+    Con 0 y 0 se descubren los datos existentes; si no, se siembra. Falla
+    con ValueError si la siembra no alcanza para la mezcla.
+    """
+    if proyectos < 0 or tareas < 0:
+        raise ValueError("--proyectos y --tareas no pueden ser negativos")
+    if tareas > 0 and proyectos == 0:
+        raise ValueError("--tareas necesita --proyectos > 0: cada tarea se crea en un proyecto")
+    if proyectos > 0 and tareas == 0 and mezcla.get("actualizar", 0) > 0:
+        raise ValueError("'actualizar' usa las tareas sembradas: pasá --tareas > 0 "
+                         "o sacá actualizar de la mezcla (--proyectos 0 --tareas 0 usa las existentes)")
+
+
+# ---------- ejecución ----------
+
+async def _usuario(numero: int, cliente, datos: dict, mezcla: Dict[str, float], semilla: int,
+                   inicio_medicion: float, fin: float, registros: dict) -> None:
+    rng = random.Random(semilla * 1_000_003 + numero)
+    nombres = list(mezcla)
+    pesos = [mezcla[n] for n in nombres]
+    propias: List[int] = []
+
+    while time.perf_counter() < fin:
+        operacion = rng.choices(nombres, pesos)[0]
+        if operacion == "eliminar" and not propias:
+            # Todavía no creó ninguna tarea para borrar
+            operacion = "crear"
+        metodo, ruta, cuerpo = OPERACIONES[operacion](rng, datos, propias)
+
+        inicio = time.perf_counter()
+        try:
+            status, respuesta = await cliente.pedir(metodo, ruta, cuerpo)
+            error = str(status) if status >= 400 else None
+        except Exception as e:
+            status, respuesta, error = None, b"", type(e).__name__
+        fin_request = time.perf_counter()
+
+        if operacion == "crear" and error is None:
+            tarea_id = _buscar_id(_json(respuesta))
+            if tarea_id is not None:
+                propias.append(tarea_id)
+
+        if inicio >= inicio_medicion:
+            latencias, errores = registros.setdefault(operacion, ([], {}))
+            latencias.append(fin_request - inicio)
+            if error is not None:
+                errores[error] = errores.get(error, 0) + 1
+
+
+def percentil(ordenadas: List[float], p: float) -> float:
+    """Percentil por rango más cercano sobre una lista ya ordenada"""
+    if not ordenadas:
+        return 0.0
+    indice = max(0, min(len(ordenadas) - 1, int(len(ordenadas) * p + 0.999999) - 1))
+    return ordenadas[indice]
+
+
+def _estadisticas(latencias: List[float], errores: Dict[str, int], segundos: float) -> dict:
+    ordenadas = sorted(latencias)
+    cantidad_errores = sum(errores.values())
+    return {
+        "requests": len(ordenadas),
+        "por_seg": round(len(ordenadas) / segundos, 2) if segundos > 0 else 0.0,
+        "errores": cantidad_errores,
+        "tasa_error": round(cantidad_errores / len(ordenadas), 4) if ordenadas else 0.0,
+        "errores_por_tipo": dict(sorted(errores.items())),
+        "p50_ms": round(percentil(ordenadas, 0.50) * 1000, 3),
+        "p95_ms": round(percentil(ordenadas, 0.95) * 1000, 3),
+        "p99_ms": round(percentil(ordenadas, 0.99) * 1000, 3),
+        "max_ms": round(ordenadas[-1] * 1000, 3) if ordenadas else 0.0,
+    }
+
+
+async def correr(crear_cliente: Callable[[], Any], clientes: int = 50, segundos: float = 10,
+                 calentamiento: float = 1, mezcla: Optional[Dict[str, float]] = None,
+                 proyectos: int = 20, tareas: int = 500, semilla: int = 1) -> dict:
+    """
+    Siembra (o descubre) los datos y corre `clientes` usuarios virtuales
+    durante `calentamiento` + `segundos`; solo se miden los requests que
+    empiezan después del calentamiento.
+    """
+    mezcla = mezcla or MEZCLA_POR_DEFECTO
+    revisar_siembra(proyectos, tareas, mezcla)
+    preparador = crear_cliente()
+    try:
+        if proyectos > 0 or tareas > 0:
+            datos = await sembrar(preparador, proyectos, tareas, semilla)
+        else:
+            datos = await descubrir(preparador)
+    finally:
+        await preparador.cerrar()
+
+    usuarios = [crear_cliente() for _ in range(clientes)]
+    registros: Dict[str, Tuple[List[float], Dict[str, int]]] = {}
+    inicio = time.perf_counter()
+    inicio_medicion = inicio + calentamiento
+    fin = inicio_medicion + segundos
+    try:
+        await asyncio.gather(*(
+            _usuario(n, cliente, datos, mezcla, semilla, inicio_medicion, fin, registros)
+            for n, cliente in enumerate(usuarios)
+        ))
+    finally:
+        for cliente in usuarios:
+            await cliente.cerrar()
+    # Los últimos requests pueden terminar un poco después de `fin`
+    medidos = max(time.perf_counter(), fin) - inicio_medicion
+
+    todas = [x for latencias, _ in registros.values() for x in latencias]
+    errores_totales: Dict[str, int] = {}
+    for _, errores in registros.values():
+        for tipo, cantidad in errores.items():
+            errores_totales[tipo] = errores_totales.get(tipo, 0) + cantidad
+
+    return {
+        "clientes": clientes,
+        "segundos": round(medidos, 3),
+        "mezcla": mezcla,
+        "datos": {"proyectos": len(datos["proyectos"]), "tareas": len(datos["tareas"])},
+        "total": _estadisticas(todas, errores_totales, medidos),
+        "operaciones": {
+            nombre: _estadisticas(*registros[nombre], medidos)
+            for nombre in mezcla if nombre in registros
+        },
+    }
+
+
+def tabla(resultado: dict) -> str:
+    """Resultado de correr() como tabla de texto"""
+    filas = [("operación", "requests", "req/s", "errores", "p50 ms", "p95 ms", "p99 ms", "max ms")]
+    for nombre, e in list(resultado["operaciones"].items()) + [("total", resultado["total"])]:
+        filas.append((
+            nombre, str(e["requests"]), f"{e['por_seg']:.1f}",
+            f"{e['errores']} ({e['tasa_error']:.1%})",
+            f"{e['p50_ms']:.2f}", f"{e['p95_ms']:.2f}", f"{e['p99_ms']:.2f}", f"{e['max_ms']:.2f}",
+        ))
+    anchos = [max(len(fila[i]) for fila in filas) for i in range(len(filas[0]))]
+    lineas = [
+        f"{resultado.get('objetivo', '')}  {resultado['clientes']} clientes, "
+        f"{resultado['segundos']:.1f} s medidos, {resultado['datos']['proyectos']} proyectos / "
+        f"{resultado['datos']['tareas']} tareas",
+    ]
+    for i, fila in enumerate(filas):
+        lineas.append("  ".join(
+            celda.ljust(anchos[j]) if j == 0 else celda.rjust(anchos[j]) for j, celda in enumerate(fila)
+        ))
+        if i == 0 or i == len(filas) - 2:
+            lineas.append("  ".join("-" * ancho for ancho in anchos))
+    errores = resultado["total"]["errores_por_tipo"]
+    if errores:
+        lineas.append("errores: " + ", ".join(f"{tipo} x{cantidad}" for tipo, cantidad in errores.items()))
+    return "\n".join(lineas)
+
+
+# ---------- app en el mismo proceso ----------
+
+def copiar_implementacion(carpeta: str, destino: str) -> str:
+    """
+    Copia los fuentes de `carpeta` a `destino` (sin tareas.db ni cachés) y
+    devuelve la ruta de la copia. Algunas implementaciones ubican la base
+    junto a su main.py: así nunca escriben en el repositorio.
+    """
+    carpeta = os.path.abspath(carpeta)
+    if not os.path.isfile(os.path.join(carpeta, "main.py")):
+        raise CargaError(f"{carpeta} no tiene main.py")
+    copia = os.path.join(destino, "app")
+    shutil.copytree(carpeta, copia, ignore=shutil.ignore_patterns(
+        "*.db", "*.db-journal", "*.db-wal", "*.db-shm", "__pycache__", ".pytest_cache"))
+    return copia
+
+
+def cargar_app(carpeta: str, directorio_trabajo: str):
+    """
+    Importa `main:app` de una copia de `carpeta` con la copia como cwd: las
+    implementaciones usan DB_NAME = "tareas.db" relativo al directorio actual.
+    """
+    copia = copiar_implementacion(carpeta, directorio_trabajo)
+    os.chdir(copia)
+    sys.path.insert(0, copia)
+    try:
+        import main  # noqa: E402
+    except Exception as e:
+        raise CargaError(f"No se pudo importar main.py: {type(e).__name__}: {e}") from e
+    return main.app
+
+
+class Lifespan:
+    """Corre los eventos startup / shutdown de la app (init_db, etc.)"""
+
+    def __init__(self, app):
+        self.app = app
+        self._entrada: "asyncio.Queue" = asyncio.Queue()
+        self._salida: "asyncio.Queue" = asyncio.Queue()
+        self._tarea = None
+
+    async def __aenter__(self):
+        scope = {"type": "lifespan", "asgi": {"version": "3.0"}, "state": {}}
+        self._tarea = asyncio.create_task(self.app(scope, self._entrada.get, self._salida.put))
+        await self._entrada.put({"type": "lifespan.startup"})
+        mensaje = await self._salida.get()
+        if mensaje["type"] == "lifespan.startup.failed":
+            raise CargaError(f"El startup de la app falló: {mensaje.get('message', '')}")
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._entrada.put({"type": "lifespan.shutdown"})
+        await self._salida.get()
+        await self._tarea
+
+
+async def correr_asgi(app, **opciones) -> dict:
+    async with Lifespan(app):
+        return await correr(lambda: ClienteASGI(app), **opciones)
+
+
+async def correr_http(url: str, **opciones) -> dict:
+    partes = urlsplit(url)
+    if partes.scheme != "http" or not partes.hostname:
+        raise CargaError(f"URL no soportada: {url} (solo http://host:puerto)")
+    host, puerto = partes.hostname, partes.port or 80
+    return await correr(lambda: ClienteHTTP(host, puerto), **opciones)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    objetivo = parser.add_mutually_exclusive_group(required=True)
+    objetivo.add_argument("--app", help="carpeta con main.py (se corre en este proceso)")
+    objetivo.add_argument("--url", help="servidor ya levantado, por ejemplo http://127.0.0.1:8000")
+    parser.add_argument("--clientes", type=int, default=50)
+    parser.add_argument("--segundos", type=float, default=10)
+    parser.add_argument("--calentamiento", type=float, default=1)
+    parser.add_argument("--mezcla", type=parsear_mezcla, default=dict(MEZCLA_POR_DEFECTO))
+    parser.add_argument("--proyectos", type=int, default=20)
+    parser.add_argument("--tareas", type=int, default=500)
+    parser.add_argument("--semilla", type=int, default=1)
+    parser.add_argument("--json", help="archivo donde guardar el resultado en JSON ('-' = stdout)")
+    args = parser.parse_args()
+    try:
+        revisar_siembra(args.proyectos, args.tareas, args.mezcla)
+    except ValueError as e:
+        parser.error(str(e))
+
+    opciones = dict(clientes=args.clientes, segundos=args.segundos, calentamiento=args.calentamiento,
+                    mezcla=args.mezcla, proyectos=args.proyectos, tareas=args.tareas, semilla=args.semilla)
+    try:
+        if args.app:
+            carpeta, anterior = os.path.abspath(args.app), os.getcwd()
+            with tempfile.TemporaryDirectory() as directorio:
+                try:
+                    app = cargar_app(carpeta, directorio)
+                    resultado = asyncio.run(correr_asgi(app, **opciones))
+                finally:
+                    os.chdir(anterior)
+            resultado = {"objetivo": carpeta, "modo": "asgi", **resultado}
+        else:
+            resultado = asyncio.run(correr_http(args.url, **opciones))
+            resultado = {"objetivo": args.url, "modo": "http", **resultado}
+    except CargaError as e:
+        sys.exit(f"error: {e}")
+
+    if args.json == "-":
+        print(json.dumps(resultado, indent=2, ensure_ascii=False))
+        return
+    print(tabla(resultado))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as archivo:
+            json.dump(resultado, archivo, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
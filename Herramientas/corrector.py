@@ -0,0 +1,269 @@
+"""
+Corrector automático: corre Tests/Unidad 3/test_TPn.py sobre cada carpeta de TPs/.
+
+Ejecutar desde la raíz del repositorio:
+
+    python Herramientas/corrector.py                      # TP1 a TP4, todas las carpetas
+    python Herramientas/corrector.py --tp TP3 --tp TP4 --filtro 62344
+    python Herramientas/corrector.py --json notas.json --procesos 4
+
+Para cada TPs/*/Unidad 3/TPn que tiene main.py, copia los fuentes a un
+directorio temporal (sin tareas.db ni cachés), pone al lado la suite de
+Tests/Unidad 3 y corre pytest en un subproceso con esa copia como cwd. Así
+las suites, que borran DB_NAME del directorio actual, nunca se pisan entre
+sí ni tocan el repositorio. Los subprocesos corren de a --procesos a la vez.
+
+Los resultados por test (estado, duración y mensaje) se leen del reporte
+JUnit de pytest y se guardan en un caché con clave = hash de los fuentes de
+la carpeta + la suite + las versiones de Python y pytest. Una carpeta sin
+cambios no se vuelve a correr (--sin-cache fuerza la corrida y renueva el caché).
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from glob import glob
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import pytest
+
+import carga
+
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SUITES = os.path.join(RAIZ, "Tests", "Unidad 3")
+TPS = ["TP1", "TP2", "TP3", "TP4"]
+CACHE = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "tup-corrector")
+
+# Cambiar si cambia el formato de lo que se guarda en el caché
+VERSION_CACHE = 1
+
+IGNORADOS = {"__pycache__", ".pytest_cache"}
+EXTENSIONES_IGNORADAS = (".db", ".db-journal", ".db-wal", ".db-shm", ".pyc")
+
+
+def suite(tp: str) -> str:
+    return os.path.join(SUITES, f"test_{tp}.py")
+
+
+def descubrir(raiz: str = RAIZ, tps: Sequence[str] = TPS,
+              filtros: Sequence[str] = ()) -> List[Tuple[str, str]]:
+    """(carpeta, tp) de cada TPs/*/Unidad 3/TPn con main.py, por alumno y TP"""
+    trabajos = []
+    for tp in tps:
+        for main in glob(os.path.join(raiz, "TPs", "*", "Unidad 3", tp, "main.py")):
+            carpeta = os.path.dirname(main)
+            relativa = os.path.relpath(carpeta, raiz).lower()
+            if not filtros or any(f.lower() in relativa for f in filtros):
+                trabajos.append((carpeta, tp))
+    return sorted(trabajos)
+
+
+def alumno(carpeta: str) -> str:
+    """'62344 - Fabricio villagra' para TPs/62344 - Fabricio villagra/Unidad 3/TP4"""
+    return os.path.basename(os.path.dirname(os.path.dirname(carpeta)))
+
+
+def _archivos(carpeta: str, tp: str) -> Iterator[str]:
+    """Fuentes de la carpeta que se copian y entran en el hash, en orden estable"""
+    propia = f"test_{tp}.py"
+    for directorio, subdirectorios, archivos in os.walk(carpeta):
+        subdirectorios[:] = sorted(d for d in subdirectorios if d not in IGNORADOS)
+        for archivo in sorted(archivos):
+            if archivo.endswith(EXTENSIONES_IGNORADAS):
+                continue
+            # La copia de la suite que algunos alumnos dejan en su carpeta se
+            # reemplaza por la de Tests/
+            if directorio == carpeta and archivo == propia:
+                continue
+            yield os.path.join(directorio, archivo)
+
+
+def huella(carpeta: str, tp: str) -> str:
+    """Clave del caché: cambia si cambia un fuente, la suite o el entorno de pytest"""
+    h = hashlib.sha256()
+    h.update(f"{VERSION_CACHE}\0{sys.version}\0{pytest.__version__}\0".encode())
+    with open(suite(tp), "rb") as archivo:
+        h.update(archivo.read())
+    for ruta in _archivos(carpeta, tp):
+        h.update(b"\0" + os.path.relpath(ruta, carpeta).encode() + b"\0")
+        with open(ruta, "rb") as archivo:
+            h.update(archivo.read())
+    return h.hexdigest()
+
+
+def _mensaje(elemento) -> str:
+    """
+    Última línea "E   ..." del traceback (la que dice qué falló); si no hay,
+    el atributo message. Con un error de colección, message es solo
+    "collection failure" y la causa está en el texto.
+    """
+    lineas = [linea[1:].strip() for linea in (elemento.text or "").splitlines() if linea.startswith("E ")]
+    mensaje = lineas[-1] if lineas else (elemento.get("message") or "").strip()
+    return mensaje.splitlines()[0][:200] if mensaje else ""
+
+
+def leer_junit(ruta: str) -> List[dict]:
+    """Un dict por test con nombre, estado (passed/failed/error/skipped), duración y mensaje"""
+    tests = []
+    for caso in ET.parse(ruta).getroot().iter("testcase"):
+        estado, mensaje = "passed", ""
+        for etiqueta in ("failure", "error", "skipped"):
+            hijo = caso.find(etiqueta)
+            if hijo is not None:
+                estado = {"failure": "failed"}.get(etiqueta, etiqueta)
+                mensaje = _mensaje(hijo)
+                break
+        clase = caso.get("classname", "").rpartition(".")[2]
+        nombre = f"{clase}::{caso.get('name')}" if clase and not clase.startswith("test_") else caso.get("name")
+        tests.append({"nombre": nombre, "estado": estado,
+                      "segundos": round(float(caso.get("time") or 0), 3), "mensaje": mensaje})
+    return tests
+
+
+def correr_suite(carpeta: str, tp: str, timeout: float = 300) -> dict:
+    """Corre la suite de `tp` sobre una copia de `carpeta` y devuelve el resultado"""
+    entorno = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    with tempfile.TemporaryDirectory() as directorio:
+        copia = carga.copiar_implementacion(carpeta, directorio)
+        shutil.copy(suite(tp), os.path.join(copia, f"test_{tp}.py"))
+        reporte = os.path.join(directorio, "junit.xml")
+        inicio = time.perf_counter()
+        try:
+            salida = subprocess.run(
+                [sys.executable, "-m", "pytest", f"test_{tp}.py", "-q", "-p", "no:cacheprovider",
+                 "--junitxml", reporte, "-o", "junit_family=xunit1"],
+                cwd=copia, env=entorno, stdin=subprocess.DEVNULL,
+                capture_output=True, text=True, errors="replace", timeout=timeout,
+            )
+        except subprocess.TimeoutExpired:
+            return {"estado": "timeout", "motivo": f"no terminó en {timeout:g} s",
+                    "segundos": round(time.perf_counter() - inicio, 2), "tests": []}
+        segundos = round(time.perf_counter() - inicio, 2)
+        tests = leer_junit(reporte) if os.path.exists(reporte) else []
+
+    resultado = {"estado": "ok", "segundos": segundos, "tests": tests}
+    if not tests:
+        lineas = (salida.stdout + salida.stderr).strip().splitlines()
+        resultado.update(estado="error", motivo=lineas[-1] if lineas else f"pytest salió con código {salida.returncode}")
+    return resultado
+
+
+def corregir(carpeta: str, tp: str, cache: Optional[str] = CACHE, timeout: float = 300,
+             forzar: bool = False) -> dict:
+    """
+    Resultado de la suite para la carpeta, desde el caché si los fuentes no
+    cambiaron. Con `forzar` se corre igual y se actualiza el caché.
+    """
+    clave = huella(carpeta, tp)
+    ruta_cache = os.path.join(cache, f"{clave}.json") if cache else None
+    if ruta_cache and not forzar and os.path.exists(ruta_cache):
+        with open(ruta_cache, encoding="utf-8") as archivo:
+            resultado = json.load(archivo)
+        desde_cache = True
+    else:
+        resultado = correr_suite(carpeta, tp, timeout)
+        desde_cache = False
+        # Un timeout puede deberse a la máquina: no se guarda
+        if ruta_cache and resultado["estado"] != "timeout":
+            os.makedirs(cache, exist_ok=True)
+            temporal = f"{ruta_cache}.{os.getpid()}.tmp"
+            with open(temporal, "w", encoding="utf-8") as archivo:
+                json.dump(resultado, archivo, ensure_ascii=False)
+            os.replace(temporal, ruta_cache)
+
+    conteo = {estado: 0 for estado in ("passed", "failed", "error", "skipped")}
+    for test in resultado["tests"]:
+        conteo[test["estado"]] += 1
+    return {"alumno": alumno(carpeta), "tp": tp, "carpeta": carpeta, "huella": clave,
+            "cache": desde_cache, **conteo, "total": len(resultado["tests"]), **resultado}
+
+
+def corregir_todo(trabajos: List[Tuple[str, str]], procesos: int, cache: Optional[str] = CACHE,
+                  timeout: float = 300, forzar: bool = False, progreso=None) -> List[dict]:
+    """
+    Corrige los trabajos de a `procesos` a la vez. Cada suite ya corre en su
+    propio subproceso, así que alcanza con hilos para esperarlos.
+    """
+    with ThreadPoolExecutor(max_workers=procesos) as grupo:
+        futuros = [grupo.submit(corregir, carpeta, tp, cache, timeout, forzar) for carpeta, tp in trabajos]
+        resultados = []
+        for futuro in futuros:
+            resultados.append(futuro.result())
+            if progreso:
+                progreso(resultados[-1])
+    return resultados
+
+
+def tabla(resultados: List[dict]) -> str:
+    """Una fila por carpeta y TP"""
+    filas = [("alumno", "TP", "aprobados", "fallidos", "errores", "segundos", "caché")]
+    for r in resultados:
+        if r["estado"] != "ok":
+            aprobados = f"{r['estado']}: {r['motivo']}"[:60]
+        else:
+            aprobados = f"{r['passed']}/{r['total']}"
+        filas.append((r["alumno"], r["tp"], aprobados, str(r["failed"]), str(r["error"]),
+                      f"{r['segundos']:.1f}", "sí" if r["cache"] else ""))
+    anchos = [max(len(fila[i]) for fila in filas) for i in range(len(filas[0]))]
+    lineas = []
+    for n, fila in enumerate(filas):
+        lineas.append("  ".join(
+            celda.ljust(anchos[j]) if j < 3 else celda.rjust(anchos[j]) for j, celda in enumerate(fila)
+        ).rstrip())
+        if n == 0:
+            lineas.append("  ".join("-" * ancho for ancho in anchos))
+    return "\n".join(lineas)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tp", action="append", choices=TPS, help="TP a corregir (se puede repetir; por defecto todos)")
+    parser.add_argument("--filtro", action="append", default=[],
+                        help="solo carpetas cuya ruta contiene este texto (se puede repetir)")
+    parser.add_argument("--procesos", type=int, default=os.cpu_count() or 1, help="suites en paralelo")
+    parser.add_argument("--timeout", type=float, default=300, help="segundos máximos por suite")
+    parser.add_argument("--cache", default=CACHE, help=f"directorio del caché (por defecto {CACHE})")
+    parser.add_argument("--sin-cache", action="store_true",
+                        help="correr todo aunque esté en el caché (y actualizarlo)")
+    parser.add_argument("--json", help="archivo donde guardar los resultados por test ('-' = stdout)")
+    args = parser.parse_args()
+
+    trabajos = descubrir(tps=args.tp or TPS, filtros=args.filtro)
+    if not trabajos:
+        sys.exit("error: no se encontró ninguna carpeta con main.py")
+
+    hechos = 0
+
+    def progreso(r):
+        nonlocal hechos
+        hechos += 1
+        estado = f"{r['passed']}/{r['total']}" if r["estado"] == "ok" else r["estado"]
+        print(f"[{hechos}/{len(trabajos)}] {r['alumno']} {r['tp']}: {estado}{' (caché)' if r['cache'] else ''}",
+              file=sys.stderr, flush=True)
+
+    inicio = time.perf_counter()
+    resultados = corregir_todo(trabajos, max(1, args.procesos), args.cache, args.timeout,
+                               forzar=args.sin_cache, progreso=progreso)
+    print(f"{len(resultados)} suites en {time.perf_counter() - inicio:.1f} s "
+          f"({sum(r['cache'] for r in resultados)} desde el caché)", file=sys.stderr)
+
+    if args.json == "-":
+        print(json.dumps(resultados, indent=2, ensure_ascii=False))
+        return
+    print(tabla(resultados))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as archivo:
+            json.dump(resultados, archivo, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
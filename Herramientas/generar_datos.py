@@ -0,0 +1,265 @@
+"""
+Genera un tareas.db grande y reproducible con el esquema del TP3 o del TP4.
+
+Ejecutar desde la raíz del repositorio:
+
+    python Herramientas/generar_datos.py --esquema tp4 --proyectos 10000 --tareas 1000000 \\
+        --semilla 42 --salida /tmp/tareas.db
+
+La misma semilla y los mismos tamaños dan siempre la misma base, fila por
+fila. Distribuciones (sesgadas, como en una base real):
+
+- estado: 50 % pendiente, 15 % en_progreso, 35 % completada
+- prioridad: 25 % baja, 55 % media, 20 % alta
+- tareas por proyecto (TP4): Zipf con exponente --sesgo (1.0 por defecto):
+  unos pocos proyectos concentran la mayoría de las tareas y muchos quedan
+  casi vacíos
+- fecha_creacion: estrictamente creciente con el id, repartida en --dias
+  días hasta el 1/1/2025, siempre con microsegundos ("2024-06-30T12:00:00.000000") para
+  que el orden por texto sea el cronológico
+
+Para cargar rápido: PRAGMA journal_mode=OFF y synchronous=OFF, una sola
+transacción, executemany por bloques e índices creados después de la carga.
+La base se arma en un archivo temporal y se mueve a --salida al terminar.
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+from itertools import accumulate
+from typing import Dict, Iterator, List
+
+
+ESTADOS = ["pendiente", "en_progreso", "completada"]
+PESOS_ESTADO = [50, 15, 35]
+PRIORIDADES = ["baja", "media", "alta"]
+PESOS_PRIORIDAD = [25, 55, 20]
+
+FIN = datetime(2025, 1, 1)
+BLOQUE = 50_000
+
+VERBOS = ["Revisar", "Implementar", "Documentar", "Probar", "Diseñar", "Corregir",
+          "Optimizar", "Migrar", "Configurar", "Actualizar", "Refactorizar", "Desplegar"]
+OBJETOS = ["el login", "la API de pagos", "el reporte mensual", "la base de datos",
+           "el formulario de contacto", "los tests de integración", "el pipeline de CI",
+           "la pantalla de inicio", "el módulo de usuarios", "las notificaciones",
+           "el buscador", "la exportación a CSV", "el panel de administración", "los permisos"]
+AREAS = ["Tienda", "Intranet", "App", "Portal", "Sistema", "Plataforma", "Backoffice", "Sitio"]
+
+ESQUEMAS = {
+    "tp3": [
+        """CREATE TABLE tareas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            descripcion TEXT NOT NULL,
+            estado TEXT NOT NULL,
+            fecha_creacion TEXT,
+            prioridad TEXT NOT NULL DEFAULT 'media'
+        )""",
+    ],
+    "tp4": [
+        """CREATE TABLE proyectos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nombre TEXT NOT NULL UNIQUE,
+            descripcion TEXT,
+            fecha_creacion TEXT NOT NULL
+        )""",
+        """CREATE TABLE tareas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            descripcion TEXT NOT NULL,
+            estado TEXT NOT NULL,
+            prioridad TEXT NOT NULL,
+            proyecto_id INTEGER NOT NULL,
+            fecha_creacion TEXT NOT NULL,
+            FOREIGN KEY (proyecto_id) REFERENCES proyectos(id) ON DELETE CASCADE
+        )""",
+    ],
+}
+
+# Índices para los filtros de los enunciados; se crean después de cargar
+INDICES = {
+    "tp3": [
+        "CREATE INDEX idx_tareas_estado ON tareas(estado)",
+        "CREATE INDEX idx_tareas_prioridad ON tareas(prioridad)",
+    ],
+    "tp4": [
+        "CREATE INDEX idx_tareas_proyecto_id ON tareas(proyecto_id)",
+        "CREATE INDEX idx_tareas_estado ON tareas(estado)",
+        "CREATE INDEX idx_tareas_prioridad ON tareas(prioridad)",
+        "CREATE INDEX idx_tareas_fecha ON tareas(fecha_creacion)",
+    ],
+}
+
+
+# "HH:MM:SS" de cada segundo del día
+_HORAS = [f"{s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d}" for s in range(86_400)]
+
+
+def _fechas(cantidad: int, desde: datetime, hasta: datetime, rng: random.Random) -> Iterator[str]:
+    """
+    `cantidad` fechas estrictamente crecientes entre `desde` y `hasta`: la
+    i-ésima cae al azar dentro del i-ésimo tramo. Se arman con aritmética
+    entera (strftime por fila cuesta más que todo el resto de la fila).
+    """
+    medianoche = desde.replace(hour=0, minute=0, second=0, microsecond=0)
+    desplazamiento = (desde - medianoche) // timedelta(microseconds=1)
+    paso = (hasta - desde) // timedelta(microseconds=1) // max(cantidad, 1)
+    azar = rng.random
+    dias: Dict[int, str] = {}
+    for i in range(cantidad):
+        micros = desplazamiento + i * paso + int(azar() * paso)
+        dia, micros = divmod(micros, 86_400_000_000)
+        prefijo = dias.get(dia)
+        if prefijo is None:
+            prefijo = dias[dia] = (medianoche + timedelta(days=dia)).strftime("%Y-%m-%dT")
+        segundos, micros = divmod(micros, 1_000_000)
+        yield "%s%s.%06d" % (prefijo, _HORAS[segundos], micros)
+
+
+def _proyectos(cantidad: int, inicio: datetime, fin: datetime, rng: random.Random) -> Iterator[tuple]:
+    for i, fecha in enumerate(_fechas(cantidad, inicio, fin, rng), start=1):
+        yield (i, f"{rng.choice(AREAS)} {i:06d}", f"Proyecto generado número {i}", fecha)
+
+
+def _pesos_zipf(cantidad: int, sesgo: float, rng: random.Random) -> List[float]:
+    """Pesos acumulados de una Zipf; el orden de los proyectos se mezcla"""
+    pesos = [1 / (rango ** sesgo) for rango in range(1, cantidad + 1)]
+    rng.shuffle(pesos)
+    return list(accumulate(pesos))
+
+
+def _tareas(cantidad: int, proyectos: int, sesgo: float, inicio: datetime, fin: datetime,
+            rng: random.Random) -> Iterator[tuple]:
+    acumulados = _pesos_zipf(proyectos, sesgo, rng) if proyectos else None
+    fechas = _fechas(cantidad, inicio, fin, rng)
+    # Se generan por bloques: rng.choices(k=...) es mucho más rápido que uno por fila
+    for base in range(0, cantidad, BLOQUE):
+        n = min(BLOQUE, cantidad - base)
+        estados = rng.choices(ESTADOS, PESOS_ESTADO, k=n)
+        prioridades = rng.choices(PRIORIDADES, PESOS_PRIORIDAD, k=n)
+        verbos = rng.choices(VERBOS, k=n)
+        objetos = rng.choices(OBJETOS, k=n)
+        duenos = rng.choices(range(1, proyectos + 1), cum_weights=acumulados, k=n) if proyectos else None
+        for j in range(n):
+            i = base + j + 1
+            descripcion = "%s %s (#%d)" % (verbos[j], objetos[j], i)
+            if proyectos:
+                yield (i, descripcion, estados[j], prioridades[j], duenos[j], next(fechas))
+            else:
+                yield (i, descripcion, estados[j], next(fechas), prioridades[j])
+
+
+def _insertar(conn: sqlite3.Connection, sql: str, filas: Iterator[tuple]) -> int:
+    total = 0
+    while True:
+        bloque = [fila for _, fila in zip(range(BLOQUE), filas)]
+        if not bloque:
+            return total
+        conn.executemany(sql, bloque)
+        total += len(bloque)
+
+
+def generar(salida: str, esquema: str = "tp4", proyectos: int = 100, tareas: int = 10_000,
+            semilla: int = 1, sesgo: float = 1.0, dias: int = 365, indices: bool = True) -> Dict:
+    """Arma la base y devuelve los tiempos de cada fase (segundos)"""
+    if esquema not in ESQUEMAS:
+        raise ValueError(f"Esquema desconocido: {esquema} (válidos: {', '.join(ESQUEMAS)})")
+    if esquema == "tp4" and tareas and not proyectos:
+        raise ValueError("El esquema tp4 necesita al menos un proyecto para las tareas")
+
+    rng = random.Random(semilla)
+    inicio = FIN - timedelta(days=dias)
+    # Los proyectos se crean en el primer 10 % del período; las tareas, en todo el resto
+    corte = inicio + (FIN - inicio) / 10
+    temporal = salida + ".tmp"
+    if os.path.exists(temporal):
+        os.remove(temporal)
+
+    tiempos: Dict[str, float] = {}
+    comienzo = time.perf_counter()
+    conn = sqlite3.connect(temporal, isolation_level=None)
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("PRAGMA locking_mode = EXCLUSIVE")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA cache_size = -262144")
+        conn.execute("BEGIN")
+        for sentencia in ESQUEMAS[esquema]:
+            conn.execute(sentencia)
+
+        marca = time.perf_counter()
+        if esquema == "tp4":
+            _insertar(conn, "INSERT INTO proyectos (id, nombre, descripcion, fecha_creacion) VALUES (?, ?, ?, ?)",
+                      _proyectos(proyectos, inicio, corte, rng))
+            tiempos["proyectos"] = time.perf_counter() - marca
+            marca = time.perf_counter()
+            _insertar(conn, "INSERT INTO tareas (id, descripcion, estado, prioridad, proyecto_id, fecha_creacion) "
+                            "VALUES (?, ?, ?, ?, ?, ?)",
+                      _tareas(tareas, proyectos, sesgo, corte, FIN, rng))
+        else:
+            _insertar(conn, "INSERT INTO tareas (id, descripcion, estado, fecha_creacion, prioridad) "
+                            "VALUES (?, ?, ?, ?, ?)",
+                      _tareas(tareas, 0, sesgo, inicio, FIN, rng))
+        tiempos["tareas"] = time.perf_counter() - marca
+
+        marca = time.perf_counter()
+        if indices:
+            for indice in INDICES[esquema]:
+                conn.execute(indice)
+        conn.execute("COMMIT")
+        tiempos["indices"] = time.perf_counter() - marca
+
+        marca = time.perf_counter()
+        conn.execute("ANALYZE")
+        tiempos["analyze"] = time.perf_counter() - marca
+    finally:
+        conn.close()
+
+    os.replace(temporal, salida)
+    tiempos["total"] = time.perf_counter() - comienzo
+    return {
+        "salida": os.path.abspath(salida),
+        "esquema": esquema,
+        "proyectos": proyectos if esquema == "tp4" else 0,
+        "tareas": tareas,
+        "semilla": semilla,
+        "bytes": os.path.getsize(salida),
+        "segundos": {fase: round(valor, 3) for fase, valor in tiempos.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--esquema", choices=sorted(ESQUEMAS), default="tp4")
+    parser.add_argument("--proyectos", type=int, default=100)
+    parser.add_argument("--tareas", type=int, default=10_000)
+    parser.add_argument("--semilla", type=int, default=1)
+    parser.add_argument("--sesgo", type=float, default=1.0, help="exponente de la Zipf de tareas por proyecto")
+    parser.add_argument("--dias", type=int, default=365)
+    parser.add_argument("--sin-indices", action="store_true", help="dejar los índices a cargo de la app")
+    parser.add_argument("--salida", required=True)
+    parser.add_argument("--forzar", action="store_true", help="reemplazar --salida si ya existe")
+    args = parser.parse_args()
+
+    if os.path.exists(args.salida) and not args.forzar:
+        sys.exit(f"error: {args.salida} ya existe (usá --forzar para reemplazarlo)")
+    try:
+        r = generar(args.salida, args.esquema, args.proyectos, args.tareas, args.semilla,
+                    args.sesgo, args.dias, indices=not args.sin_indices)
+    except ValueError as e:
+        sys.exit(f"error: {e}")
+
+    filas = r["proyectos"] + r["tareas"]
+    print(f"{r['salida']}: esquema {r['esquema']}, {r['proyectos']} proyectos, {r['tareas']} tareas, "
+          f"{r['bytes'] / 1e6:.1f} MB")
+    for fase, segundos in r["segundos"].items():
+        print(f"    {fase:<10} {segundos:8.2f} s")
+    print(f"    {filas / r['segundos']['total']:,.0f} filas/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Ranking de rendimiento de todas las implementaciones del TP4 de TPs/.
+
+Ejecutar desde la raíz del repositorio:
+
+    python Herramientas/ranking.py
+    python Herramientas/ranking.py --clientes 20 --segundos 5 --json ranking.json
+    python Herramientas/ranking.py --filtro villagra --filtro 62447
+
+Busca las carpetas TPs/*/Unidad 3/TP4 que tienen main.py. Cada una corre en
+su propio subproceso con Herramientas/carga.py --app, desde un directorio
+temporal propio y con la misma carga: misma mezcla, misma semilla y mismos
+datos sembrados. Así ningún TP comparte módulos (main, database, models...)
+ni base con otro. De cada subproceso se guardan el resultado de carga.py y
+el pico de memoria (ru_maxrss del proceso, servidor y cliente juntos).
+
+El ranking ordena por req/s las implementaciones que terminaron con una
+tasa de error de hasta --max-errores. Las demás se listan aparte con el
+motivo: no se pudo importar, falló la siembra, timeout o demasiados errores.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from glob import glob
+from typing import Dict, List, Sequence, Tuple
+
+import carga
+
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CARGA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "carga.py")
+PATRON = os.path.join("TPs", "*", "Unidad 3", "TP4")
+
+
+def descubrir_implementaciones(raiz: str = RAIZ, patron: str = PATRON,
+                               filtros: Sequence[str] = ()) -> List[str]:
+    """Carpetas que coinciden con `patron` y tienen main.py, en orden alfabético"""
+    carpetas = sorted(
+        os.path.dirname(ruta) for ruta in glob(os.path.join(raiz, patron, "main.py"))
+    )
+    if filtros:
+        filtros = [f.lower() for f in filtros]
+        carpetas = [c for c in carpetas if any(f in os.path.relpath(c, raiz).lower() for f in filtros)]
+    return carpetas
+
+
+def nombre(carpeta: str) -> str:
+    """'62344 - Fabricio villagra' para TPs/62344 - Fabricio villagra/Unidad 3/TP4"""
+    relativa = os.path.relpath(carpeta, os.path.join(RAIZ, "TPs"))
+    return relativa.split(os.sep)[0] if not relativa.startswith("..") else carpeta
+
+
+def _esperar(proceso: subprocess.Popen, timeout: float) -> Tuple[int, int, bool]:
+    """
+    Espera al subproceso con os.wait4 para leer su propio pico de memoria.
+    Devuelve (código de salida, ru_maxrss en KB, si se cortó por timeout).
+    """
+    vencido = threading.Event()
+
+    def matar():
+        vencido.set()
+        proceso.kill()
+
+    temporizador = threading.Timer(timeout, matar)
+    temporizador.start()
+    try:
+        _, estado, uso = os.wait4(proceso.pid, 0)
+    finally:
+        temporizador.cancel()
+    proceso.returncode = os.waitstatus_to_exitcode(estado)
+    return proceso.returncode, uso.ru_maxrss, vencido.is_set()
+
+
+def medir(carpeta: str, opciones: Dict[str, object], timeout: float = 120) -> dict:
+    """Corre carga.py --app `carpeta` en un subproceso y devuelve su resultado"""
+    entorno = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    with tempfile.TemporaryDirectory() as directorio:
+        # El JSON va a un archivo aparte: algunos TPs imprimen en stdout
+        json_ruta = os.path.join(directorio, "resultado.json")
+        argumentos = [sys.executable, CARGA, "--app", carpeta, "--json", json_ruta]
+        for clave, valor in opciones.items():
+            argumentos += [f"--{clave}", str(valor)]
+        salida_ruta = os.path.join(directorio, "salida.txt")
+        errores_ruta = os.path.join(directorio, "errores.txt")
+        trabajo = os.path.join(directorio, "cwd")
+        os.mkdir(trabajo)
+        inicio = time.perf_counter()
+        # stdout y stderr van a archivos: con pipes, un TP que escribe mucho
+        # podría bloquearse antes de que termine la espera
+        with open(salida_ruta, "wb") as salida, open(errores_ruta, "wb") as errores:
+            proceso = subprocess.Popen(argumentos, cwd=trabajo, env=entorno,
+                                       stdin=subprocess.DEVNULL, stdout=salida, stderr=errores)
+            codigo, rss_kb, vencido = _esperar(proceso, timeout)
+        duracion = time.perf_counter() - inicio
+        try:
+            with open(json_ruta, encoding="utf-8") as archivo:
+                resultado = json.load(archivo)
+        except (OSError, ValueError):
+            resultado = None
+        with open(errores_ruta, encoding="utf-8", errors="replace") as archivo:
+            lineas_error = archivo.read().strip().splitlines()
+
+    medicion = {"implementacion": nombre(carpeta), "carpeta": carpeta,
+                "rss_max_mb": round(rss_kb / 1024, 1), "duracion_s": round(duracion, 2)}
+    if vencido:
+        return {**medicion, "estado": "timeout", "motivo": f"no terminó en {timeout:g} s"}
+    if codigo != 0:
+        motivo = lineas_error[-1] if lineas_error else f"salió con código {codigo}"
+        if motivo.startswith("error: "):
+            motivo = motivo[len("error: "):]
+        return {**medicion, "estado": "falló", "motivo": motivo}
+    if resultado is None:
+        return {**medicion, "estado": "falló", "motivo": "carga.py no guardó el resultado"}
+    return {**medicion, "estado": "ok", "resultado": resultado}
+
+
+def clasificar(mediciones: List[dict], max_errores: float = 0.01) -> Tuple[List[dict], List[dict]]:
+    """
+    Separa las mediciones en (ranking, descartadas). El ranking va de mayor a
+    menor req/s; a igual throughput gana la de menor p95.
+    """
+    ranking, descartadas = [], []
+    for medicion in mediciones:
+        if medicion["estado"] == "ok":
+            total = medicion["resultado"]["total"]
+            if total["tasa_error"] <= max_errores:
+                ranking.append(medicion)
+                continue
+            medicion = {**medicion, "estado": "errores",
+                        "motivo": f"{total['tasa_error']:.1%} de errores "
+                                  f"({', '.join(total['errores_por_tipo']) or '-'})"}
+        descartadas.append(medicion)
+    ranking.sort(key=lambda m: (-m["resultado"]["total"]["por_seg"], m["resultado"]["total"]["p95_ms"]))
+    return ranking, descartadas
+
+
+def _alinear(filas: List[Tuple[str, ...]], izquierda: int) -> List[str]:
+    anchos = [max(len(fila[i]) for fila in filas) for i in range(len(filas[0]))]
+    lineas = []
+    for n, fila in enumerate(filas):
+        lineas.append("  ".join(
+            celda.ljust(anchos[j]) if j < izquierda else celda.rjust(anchos[j]) for j, celda in enumerate(fila)
+        ).rstrip())
+        if n == 0:
+            lineas.append("  ".join("-" * ancho for ancho in anchos))
+    return lineas
+
+
+def tabla(ranking: List[dict], descartadas: List[dict]) -> str:
+    """Ranking y descartadas como texto"""
+    filas = [("#", "implementación", "req/s", "p50 ms", "p95 ms", "p99 ms", "errores", "RSS MB")]
+    for puesto, m in enumerate(ranking, 1):
+        t = m["resultado"]["total"]
+        filas.append((
+            str(puesto), m["implementacion"], f"{t['por_seg']:.1f}", f"{t['p50_ms']:.2f}",
+            f"{t['p95_ms']:.2f}", f"{t['p99_ms']:.2f}", f"{t['tasa_error']:.1%}", f"{m['rss_max_mb']:.1f}",
+        ))
+    lineas = _alinear(filas, izquierda=2) if ranking else ["(ninguna implementación completó la carga)"]
+    if descartadas:
+        lineas += ["", "Descartadas:"]
+        lineas += _alinear([("implementación", "estado", "motivo")] + [
+            (m["implementacion"], m["estado"], m["motivo"]) for m in descartadas
+        ], izquierda=3)
+    return "\n".join(lineas)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--filtro", action="append", default=[],
+                        help="solo carpetas cuyo nombre contiene este texto (se puede repetir)")
+    parser.add_argument("--clientes", type=int, default=20)
+    parser.add_argument("--segundos", type=float, default=5)
+    parser.add_argument("--calentamiento", type=float, default=1)
+    parser.add_argument("--mezcla", default=",".join(f"{k}={v}" for k, v in carga.MEZCLA_POR_DEFECTO.items()))
+    parser.add_argument("--proyectos", type=int, default=20)
+    parser.add_argument("--tareas", type=int, default=500)
+    parser.add_argument("--semilla", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=120, help="segundos máximos por implementación")
+    parser.add_argument("--max-errores", type=float, default=0.01,
+                        help="tasa de error máxima para entrar al ranking (0.01 = 1 %%)")
+    parser.add_argument("--json", help="archivo donde guardar todas las mediciones ('-' = stdout)")
+    args = parser.parse_args()
+
+    try:
+        carga.revisar_siembra(args.proyectos, args.tareas, carga.parsear_mezcla(args.mezcla))
+    except ValueError as e:
+        sys.exit(f"error: {e}")
+    carpetas = descubrir_implementaciones(filtros=args.filtro)
+    if not carpetas:
+        sys.exit("error: no se encontró ninguna implementación con main.py")
+
+    opciones = dict(clientes=args.clientes, segundos=args.segundos, calentamiento=args.calentamiento,
+                    mezcla=args.mezcla, proyectos=args.proyectos, tareas=args.tareas, semilla=args.semilla)
+    mediciones = []
+    for i, carpeta in enumerate(carpetas, 1):
+        print(f"[{i}/{len(carpetas)}] {nombre(carpeta)} ...", end=" ", file=sys.stderr, flush=True)
+        medicion = medir(carpeta, opciones, timeout=args.timeout)
+        if medicion["estado"] == "ok":
+            print(f"{medicion['resultado']['total']['por_seg']:.1f} req/s", file=sys.stderr)
+        else:
+            print(medicion["estado"], file=sys.stderr)
+        mediciones.append(medicion)
+
+    ranking, descartadas = clasificar(mediciones, args.max_errores)
+    reporte = {"carga": opciones, "max_errores": args.max_errores,
+               "ranking": ranking, "descartadas": descartadas}
+    if args.json == "-":
+        print(json.dumps(reporte, indent=2, ensure_ascii=False))
+        return
+    print(tabla(ranking, descartadas))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as archivo:
+            json.dump(reporte, archivo, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
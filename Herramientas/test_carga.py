@@ -0,0 +1,102 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import carga
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TP4 = os.path.join(RAIZ, "TPs", "62344 - Fabricio villagra", "Unidad 3", "TP4")
+
+
+def test_parsear_mezcla():
+    assert carga.parsear_mezcla("leer=40, crear=10") == {"leer": 40.0, "crear": 10.0}
+    with pytest.raises(ValueError, match="desconocida"):
+        carga.parsear_mezcla("leer=1,borrar_todo=1")
+    with pytest.raises(ValueError, match="peso positivo"):
+        carga.parsear_mezcla("leer=0")
+
+
+@pytest.mark.parametrize("proyectos, tareas", [(0, 0), (10, 500), (10, 0)])
+def test_siembra_valida(proyectos, tareas):
+    carga.revisar_siembra(proyectos, tareas, {"leer": 1, "crear": 1})
+
+
+@pytest.mark.parametrize("proyectos, tareas, mezcla", [
+    (0, 10, {"leer": 1}),
+    (-1, 10, {"leer": 1}),
+    (10, 0, carga.MEZCLA_POR_DEFECTO),
+])
+def test_siembra_inconsistente(proyectos, tareas, mezcla):
+    with pytest.raises(ValueError):
+        carga.revisar_siembra(proyectos, tareas, mezcla)
+
+
+def test_siembra_inconsistente_es_un_error_de_argparse():
+    salida = subprocess.run(
+        [sys.executable, os.path.join(RAIZ, "Herramientas", "carga.py"), "--url", "http://127.0.0.1:9",
+         "--proyectos", "10", "--tareas", "0"],
+        capture_output=True, text=True, timeout=60, cwd=RAIZ,
+    )
+    assert salida.returncode == 2
+    assert "actualizar" in salida.stderr
+
+
+def test_percentil_por_rango_mas_cercano():
+    valores = [i / 1000 for i in range(1, 101)]
+    assert carga.percentil(valores, 0.50) == 0.050
+    assert carga.percentil(valores, 0.95) == 0.095
+    assert carga.percentil(valores, 0.99) == 0.099
+    assert carga.percentil([], 0.5) == 0.0
+
+
+def test_buscar_id_y_lista_en_respuestas_envueltas():
+    assert carga._buscar_id({"id": 3}) == 3
+    assert carga._buscar_id({"mensaje": "ok", "tarea": {"id": 7}}) == 7
+    assert carga._buscar_lista({"total": 1, "items": [{"id": 1}]}) == [{"id": 1}]
+
+
+def test_cliente_http_lee_chunked_y_keep_alive():
+    async def responder(lector, escritor):
+        for _ in range(2):
+            await lector.readuntil(b"\r\n\r\n")
+            escritor.write(b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+                           b"3\r\n[1,\r\n2\r\n2]\r\n0\r\n\r\n")
+            await escritor.drain()
+        escritor.close()
+
+    async def probar():
+        servidor = await asyncio.start_server(responder, "127.0.0.1", 0)
+        puerto = servidor.sockets[0].getsockname()[1]
+        cliente = carga.ClienteHTTP("127.0.0.1", puerto)
+        try:
+            return [await cliente.pedir("GET", "/tareas") for _ in range(2)]
+        finally:
+            await cliente.cerrar()
+            servidor.close()
+            await servidor.wait_closed()
+
+    assert asyncio.run(probar()) == [(200, b"[1,2]"), (200, b"[1,2]")]
+
+
+def test_carga_en_proceso_sobre_un_tp4():
+    # En un subproceso: importar main de un TP agrega módulos (main, database) al proceso
+    salida = subprocess.run(
+        [sys.executable, os.path.join(RAIZ, "Herramientas", "carga.py"), "--app", TP4,
+         "--clientes", "4", "--segundos", "0.5", "--calentamiento", "0",
+         "--proyectos", "3", "--tareas", "20", "--json", "-"],
+        capture_output=True, text=True, timeout=120, cwd=RAIZ,
+    )
+    assert salida.returncode == 0, salida.stderr
+    resultado = json.loads(salida.stdout)
+
+    assert resultado["modo"] == "asgi"
+    assert resultado["datos"] == {"proyectos": 3, "tareas": 20}
+    assert resultado["total"]["requests"] > 0
+    assert resultado["total"]["errores"] == 0
+    assert set(resultado["operaciones"]) <= set(carga.OPERACIONES)
+    for estadistica in resultado["operaciones"].values():
+        assert estadistica["p50_ms"] <= estadistica["p95_ms"] <= estadistica["p99_ms"] <= estadistica["max_ms"]
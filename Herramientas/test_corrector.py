@@ -0,0 +1,69 @@
+import os
+import shutil
+
+import corrector
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TP2 = os.path.join(RAIZ, "TPs", "62344 - Fabricio villagra", "Unidad 3", "TP2")
+
+JUNIT = """<?xml version="1.0" encoding="utf-8"?>
+<testsuites><testsuite name="pytest" tests="4">
+<testcase classname="test_TP1.TestAgendaAPI" name="test_01" time="0.25"/>
+<testcase classname="test_TP3" name="test_02" time="0.010">
+  <failure message="AssertionError: assert 404 == 200">def test_02():
+E       assert 404 == 200</failure></testcase>
+<testcase classname="" name="test_TP4" time="0.000">
+  <error message="collection failure">test_TP4.py:3: in &lt;module&gt;
+E   ImportError: cannot import name 'DB_NAME' from 'main'</error></testcase>
+<testcase classname="test_TP3" name="test_04" time="0"><skipped message="sin servidor"/></testcase>
+</testsuite></testsuites>
+"""
+
+
+def test_leer_junit(tmp_path):
+    ruta = tmp_path / "junit.xml"
+    ruta.write_text(JUNIT)
+    tests = corrector.leer_junit(str(ruta))
+    assert [(t["nombre"], t["estado"]) for t in tests] == [
+        ("TestAgendaAPI::test_01", "passed"), ("test_02", "failed"),
+        ("test_TP4", "error"), ("test_04", "skipped"),
+    ]
+    assert tests[0]["segundos"] == 0.25
+    assert tests[1]["mensaje"] == "assert 404 == 200"
+    assert tests[2]["mensaje"] == "ImportError: cannot import name 'DB_NAME' from 'main'"
+    assert tests[3]["mensaje"] == "sin servidor"
+
+
+def test_huella_ignora_bases_caches_y_la_copia_de_la_suite(tmp_path):
+    carpeta = tmp_path / "TP3"
+    carpeta.mkdir()
+    (carpeta / "main.py").write_text("app = None\n")
+    original = corrector.huella(str(carpeta), "TP3")
+
+    (carpeta / "tareas.db").write_bytes(b"datos")
+    (carpeta / "test_TP3.py").write_text("# copia vieja de la suite\n")
+    (carpeta / "__pycache__").mkdir()
+    (carpeta / "__pycache__" / "main.cpython-311.pyc").write_bytes(b"x")
+    assert corrector.huella(str(carpeta), "TP3") == original
+
+    (carpeta / "models.py").write_text("")
+    assert corrector.huella(str(carpeta), "TP3") != original
+    assert corrector.huella(str(carpeta), "TP4") != corrector.huella(str(carpeta), "TP3")
+
+
+def test_corregir_usa_el_cache_y_no_toca_la_carpeta(tmp_path):
+    carpeta = str(tmp_path / "TPs" / "1 - Alumno" / "Unidad 3" / "TP2")
+    shutil.copytree(TP2, carpeta, ignore=shutil.ignore_patterns("__pycache__"))
+    antes = sorted(os.listdir(carpeta))
+    cache = str(tmp_path / "cache")
+
+    primero = corrector.corregir(carpeta, "TP2", cache)
+    assert primero["alumno"] == "1 - Alumno"
+    assert not primero["cache"]
+    assert primero["estado"] == "ok" and primero["total"] == 20
+    assert primero["passed"] + primero["failed"] + primero["error"] + primero["skipped"] == 20
+    assert sorted(os.listdir(carpeta)) == antes
+
+    segundo = corrector.corregir(carpeta, "TP2", cache)
+    assert segundo["cache"] and segundo["tests"] == primero["tests"]
+    assert not corrector.corregir(carpeta, "TP2", cache, forzar=True)["cache"]
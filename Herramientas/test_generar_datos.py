@@ -0,0 +1,83 @@
+import sqlite3
+
+import pytest
+
+import generar_datos
+
+
+def filas(ruta, sql):
+    conn = sqlite3.connect(ruta)
+    try:
+        return conn.execute(sql).fetchall()
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def tp4(tmp_path):
+    ruta = str(tmp_path / "tareas.db")
+    resultado = generar_datos.generar(ruta, "tp4", proyectos=50, tareas=20_000, semilla=7)
+    return ruta, resultado
+
+
+def test_misma_semilla_misma_base(tmp_path, tp4):
+    ruta, _ = tp4
+    otra = str(tmp_path / "otra.db")
+    distinta = str(tmp_path / "distinta.db")
+    generar_datos.generar(otra, "tp4", proyectos=50, tareas=20_000, semilla=7)
+    generar_datos.generar(distinta, "tp4", proyectos=50, tareas=20_000, semilla=8)
+
+    consulta = "SELECT * FROM tareas ORDER BY id"
+    assert filas(ruta, consulta) == filas(otra, consulta)
+    assert filas(ruta, consulta) != filas(distinta, consulta)
+    assert filas(ruta, "SELECT * FROM proyectos") == filas(otra, "SELECT * FROM proyectos")
+
+
+def test_esquema_tp4_con_claves_e_indices(tp4):
+    ruta, resultado = tp4
+    assert resultado["proyectos"] == 50 and resultado["tareas"] == 20_000
+    assert set(resultado["segundos"]) == {"proyectos", "tareas", "indices", "analyze", "total"}
+
+    assert filas(ruta, "SELECT COUNT(*) FROM tareas") == [(20_000,)]
+    assert filas(ruta, "PRAGMA foreign_key_check") == []
+    indices = {nombre for (nombre,) in filas(ruta, "SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {"idx_tareas_proyecto_id", "idx_tareas_estado", "idx_tareas_prioridad"} <= indices
+    # AUTOINCREMENT sigue desde el último id cargado
+    assert dict(filas(ruta, "SELECT name, seq FROM sqlite_sequence")) == {"proyectos": 50, "tareas": 20_000}
+
+
+def test_distribuciones_sesgadas(tp4):
+    ruta, _ = tp4
+    estados = dict(filas(ruta, "SELECT estado, COUNT(*) FROM tareas GROUP BY estado"))
+    assert estados["pendiente"] / 20_000 == pytest.approx(0.50, abs=0.02)
+    assert estados["en_progreso"] / 20_000 == pytest.approx(0.15, abs=0.02)
+    prioridades = dict(filas(ruta, "SELECT prioridad, COUNT(*) FROM tareas GROUP BY prioridad"))
+    assert prioridades["media"] / 20_000 == pytest.approx(0.55, abs=0.02)
+
+    # Zipf: el proyecto más grande tiene mucho más que el promedio (400)
+    mayor = filas(ruta, "SELECT COUNT(*) c FROM tareas GROUP BY proyecto_id ORDER BY c DESC LIMIT 1")[0][0]
+    assert mayor > 2000
+
+
+def test_fechas_crecientes_con_microsegundos(tp4):
+    ruta, _ = tp4
+    fechas = [f for (f,) in filas(ruta, "SELECT fecha_creacion FROM tareas ORDER BY id")]
+    assert fechas == sorted(fechas) and len(set(fechas)) == len(fechas)
+    assert all(len(f) == 26 for f in fechas)
+    assert fechas[-1] < "2025-01-01T00:00:00.000000"
+
+
+def test_esquema_tp3(tmp_path):
+    ruta = str(tmp_path / "tareas.db")
+    generar_datos.generar(ruta, "tp3", tareas=1000, semilla=1)
+
+    columnas = {c[1]: c for c in filas(ruta, "PRAGMA table_info(tareas)")}
+    assert set(columnas) == {"id", "descripcion", "estado", "fecha_creacion", "prioridad"}
+    assert columnas["descripcion"][3] == 1 and columnas["estado"][3] == 1
+    assert filas(ruta, "SELECT name FROM sqlite_master WHERE name = 'proyectos'") == []
+    assert filas(ruta, "SELECT COUNT(*) FROM tareas") == [(1000,)]
+
+
+def test_tp4_sin_proyectos_es_un_error(tmp_path):
+    with pytest.raises(ValueError, match="al menos un proyecto"):
+        generar_datos.generar(str(tmp_path / "x.db"), "tp4", proyectos=0, tareas=10)
@@ -0,0 +1,52 @@
+import os
+
+import ranking
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TP4 = os.path.join(RAIZ, "TPs", "62344 - Fabricio villagra", "Unidad 3", "TP4")
+CARGA_CORTA = dict(clientes=2, segundos=0.3, calentamiento=0, proyectos=2, tareas=10, semilla=1)
+
+
+def medicion(nombre, por_seg, p95=1.0, tasa_error=0.0, estado="ok"):
+    total = {"por_seg": por_seg, "p50_ms": p95 / 2, "p95_ms": p95, "p99_ms": p95 * 2, "tasa_error": tasa_error,
+             "errores_por_tipo": {"404": 1} if tasa_error else {}}
+    return {"implementacion": nombre, "estado": estado, "motivo": "no se pudo importar",
+            "rss_max_mb": 40.0, "resultado": {"total": total}}
+
+
+def test_descubrir_solo_carpetas_con_main(tmp_path):
+    for legajo, archivos in [("1 - A", ["main.py"]), ("2 - B", [".gitkeep"]), ("3 - C", ["main.py"])]:
+        carpeta = tmp_path / "TPs" / legajo / "Unidad 3" / "TP4"
+        carpeta.mkdir(parents=True)
+        for archivo in archivos:
+            (carpeta / archivo).write_text("")
+
+    encontradas = ranking.descubrir_implementaciones(str(tmp_path))
+    assert [os.path.basename(os.path.dirname(os.path.dirname(c))) for c in encontradas] == ["1 - A", "3 - C"]
+    assert len(ranking.descubrir_implementaciones(str(tmp_path), filtros=["c"])) == 1
+
+
+def test_clasificar_ordena_por_throughput_y_descarta_errores():
+    mediciones = [
+        medicion("lenta", 100), medicion("rapida", 900), medicion("empate", 900, p95=0.5),
+        medicion("con_errores", 2000, tasa_error=0.3), medicion("rota", 0, estado="falló"),
+    ]
+    orden, descartadas = ranking.clasificar(mediciones, max_errores=0.01)
+    assert [m["implementacion"] for m in orden] == ["empate", "rapida", "lenta"]
+    assert {m["implementacion"]: m["estado"] for m in descartadas} == {"con_errores": "errores", "rota": "falló"}
+    assert "30.0% de errores (404)" in descartadas[0]["motivo"]
+    assert "lenta" in ranking.tabla(orden, descartadas)
+
+
+def test_medir_un_tp4_y_uno_que_no_importa(tmp_path):
+    bien = ranking.medir(TP4, CARGA_CORTA, timeout=120)
+    assert bien["estado"] == "ok"
+    assert bien["resultado"]["total"]["requests"] > 0
+    assert bien["rss_max_mb"] > 10
+
+    rota = tmp_path / "rota"
+    rota.mkdir()
+    (rota / "main.py").write_text("import modulo_que_no_existe\n")
+    mal = ranking.medir(str(rota), CARGA_CORTA, timeout=120)
+    assert mal["estado"] == "falló"
+    assert "modulo_que_no_existe" in mal["motivo"]
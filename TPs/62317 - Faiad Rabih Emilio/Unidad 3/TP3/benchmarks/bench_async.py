@@ -0,0 +1,192 @@
+"""
+Benchmark: latencia con clientes concurrentes, SQLite en el event loop vs en el executor.
+
+Ejecutar desde la carpeta TP3:
+
+    python benchmarks/bench_async.py [--clientes 100] [--pedidos 20] [--tareas 20000] [--hilos 1 2 4]
+
+Levanta la app con uvicorn en un proceso aparte y lanza --clientes clientes
+a la vez, cada uno con su conexión keep-alive y --pedidos requests
+(GET /tareas filtrado, GET /tareas/resumen, POST /tareas y GET /). El modo "en_loop" reemplaza el
+repositorio por uno que ejecuta las consultas directo en el event loop,
+como hacían los endpoints antes; "executor" es el repositorio actual, una
+vez por cada tamaño de --hilos (por defecto el de TAREAS_HILOS_DB).
+
+Con clientes que mandan el siguiente pedido apenas reciben la respuesta, la
+latencia media de todos los pedidos es clientes / throughput en los dos
+modos: lo que GET / deja de esperar lo pasan a esperar los pedidos a la base.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+CARPETA_TP3 = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, CARPETA_TP3)
+
+from repositorio import MAX_HILOS_DB  # noqa: E402
+
+
+PEDIDOS = [
+    ("GET", "/tareas?estado=pendiente&texto=99"),
+    ("GET", "/tareas/resumen"),
+    ("POST", "/tareas"),
+    ("GET", "/"),
+]
+
+
+def preparar(ruta: str, cantidad: int) -> None:
+    import main as api
+
+    api.DB_NAME = ruta
+    api.init_db()
+    estados = ["pendiente", "en_progreso", "completada"]
+    prioridades = ["baja", "media", "alta"]
+    conn = api.get_db_connection()
+    conn.executemany(
+        "INSERT INTO tareas (descripcion, estado, prioridad, fecha_creacion) VALUES (?, ?, ?, ?)",
+        [(f"Tarea número {i}", estados[i % 3], prioridades[i % 3], f"2024-01-01T00:00:00.{i:06d}")
+         for i in range(cantidad)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def puerto_libre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def servir(ruta: str, modo: str, puerto: int, hilos: int) -> None:
+    """Se ejecuta en el proceso hijo"""
+    import uvicorn
+
+    import main as api
+    from repositorio import RepositorioTareas
+
+    class RepositorioEnLoop(RepositorioTareas):
+        """Mismas consultas, pero bloqueando el event loop"""
+
+        async def _ejecutar(self, operacion, *args):
+            return self._con_conexion(operacion, *args)
+
+    api.DB_NAME = ruta
+    if modo == "en_loop":
+        api.repo = RepositorioEnLoop(api.get_db_connection)
+    else:
+        api.repo = RepositorioTareas(api.get_db_connection, max_hilos=hilos)
+    uvicorn.run(api.app, host="127.0.0.1", port=puerto, log_level="warning", timeout_keep_alive=60)
+
+
+def esperar_servidor(puerto: int) -> None:
+    for _ in range(500):
+        try:
+            socket.create_connection(("127.0.0.1", puerto)).close()
+            return
+        except OSError:
+            time.sleep(0.02)
+    raise RuntimeError("el servidor no arrancó")
+
+
+async def pedir(lector, escritor, metodo: str, ruta: str, cuerpo: bytes = b"") -> int:
+    """Un request HTTP/1.1 por una conexión keep-alive ya abierta"""
+    escritor.write(
+        f"{metodo} {ruta} HTTP/1.1\r\nHost: bench\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(cuerpo)}\r\n\r\n".encode() + cuerpo
+    )
+    await escritor.drain()
+    cabecera = await lector.readuntil(b"\r\n\r\n")
+    lineas = cabecera.decode("latin-1").split("\r\n")
+    largo = next(int(l.split(":", 1)[1]) for l in lineas if l.lower().startswith("content-length:"))
+    await lector.readexactly(largo)
+    return int(lineas[0].split()[1])
+
+
+async def cliente(puerto: int, numero: int, pedidos: int, latencias: dict) -> None:
+    # Cliente HTTP mínimo: con httpx el propio cliente consume más CPU que
+    # el servidor y la medición termina siendo la del cliente
+    lector, escritor = await asyncio.open_connection("127.0.0.1", puerto)
+    try:
+        for i in range(pedidos):
+            metodo, ruta = PEDIDOS[(numero + i) % len(PEDIDOS)]
+            cuerpo = json.dumps({"descripcion": f"Cliente {numero} pedido {i}"}).encode() \
+                if metodo == "POST" else b""
+            inicio = time.perf_counter()
+            status = await pedir(lector, escritor, metodo, ruta, cuerpo)
+            if status >= 400:
+                raise RuntimeError(f"{metodo} {ruta} devolvió {status}")
+            latencias.setdefault(f"{metodo} {ruta.split('?')[0]}", []).append(time.perf_counter() - inicio)
+    finally:
+        escritor.close()
+
+
+async def medir(puerto: int, clientes: int, pedidos: int) -> dict:
+    latencias = {}
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente(puerto, n, pedidos, latencias) for n in range(clientes)))
+    segundos = time.perf_counter() - inicio
+    latencias["todos"] = [x for valores in latencias.values() for x in valores]
+    latencias["segundos"] = segundos
+    return latencias
+
+
+def percentil(valores: list, p: float) -> float:
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, int(len(valores) * p))] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clientes", type=int, default=100)
+    parser.add_argument("--pedidos", type=int, default=20)
+    parser.add_argument("--tareas", type=int, default=20_000)
+    parser.add_argument("--hilos", type=int, nargs="+", default=[MAX_HILOS_DB])
+    parser.add_argument("--servir", choices=["en_loop", "executor"], help=argparse.SUPPRESS)
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    parser.add_argument("--puerto", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.servir:
+        servir(args.db, args.servir, args.puerto, args.hilos[0])
+        return
+
+    with tempfile.TemporaryDirectory() as directorio:
+        # Importar main crea tareas.db en el directorio actual
+        os.chdir(directorio)
+        for modo, hilos in [("en_loop", 1)] + [("executor", h) for h in args.hilos]:
+            nombre = modo if modo == "en_loop" else f"executor ({hilos} hilos)"
+            ruta = os.path.join(directorio, f"bench_{modo}_{hilos}.db")
+            preparar(ruta, args.tareas)
+            puerto = puerto_libre()
+            servidor = subprocess.Popen(
+                [sys.executable, __file__, "--servir", modo, "--db", ruta, "--puerto", str(puerto),
+                 "--hilos", str(hilos)],
+                cwd=directorio,
+            )
+            try:
+                esperar_servidor(puerto)
+                r = asyncio.run(medir(puerto, args.clientes, args.pedidos))
+            finally:
+                servidor.terminate()
+                servidor.wait()
+
+            total = len(r["todos"])
+            print(f"{nombre:<20} {total / r['segundos']:8.1f} req/s  "
+                  f"media={statistics.mean(r['todos']) * 1000:7.1f}ms  "
+                  f"p50={statistics.median(r['todos']) * 1000:7.1f}ms  "
+                  f"p95={percentil(r['todos'], 0.95):7.1f}ms")
+            for pedido in sorted(k for k in r if k not in ("todos", "segundos")):
+                print(f"    {pedido:<20} p50={statistics.median(r[pedido]) * 1000:7.1f}ms  "
+                      f"p95={percentil(r[pedido], 0.95):7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,11 @@
 from fastapi import FastAPI, HTTPException, Query
 from pydantic import BaseModel, Field, field_validator
-from typing import List, Optional
+from typing import Optional
 import datetime
 import sqlite3
 
+from repositorio import RepositorioTareas
+
 # Database setup
 DB_NAME = "tareas.db"
 
@@ -59,6 +61,13 @@ app = FastAPI()
 # Inicializar DB al arrancar
 init_db()
 
+# Las consultas corren en hilos propios, fuera del event loop
+repo = RepositorioTareas(get_db_connection)
+
+@app.on_event("shutdown")
+def cerrar_repositorio():
+    repo.cerrar()
+
 @app.get("/")
 async def Bienvenida():
     return {
@@ -81,49 +90,13 @@ async def VomitarTareas(
     prioridad: Optional[str] = Query(None),
     orden: Optional[str] = Query(None)
 ):
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    query = "SELECT * FROM tareas WHERE 1=1"
-    params = []
-    
-    if estado:
-        if estado not in estadosValidos:
-            conn.close()
-            raise HTTPException(status_code=400, detail="Estado inválido")
-        query += " AND estado = ?"
-        params.append(estado)
-    
-    if texto:
-        query += " AND descripcion LIKE ?"
-        params.append(f"%{texto}%")
+    if estado and estado not in estadosValidos:
+        raise HTTPException(status_code=400, detail="Estado inválido")
     
-    if prioridad:
-        if prioridad not in prioridadesValidas:
-            conn.close()
-            raise HTTPException(status_code=400, detail="Prioridad inválida")
-        query += " AND prioridad = ?"
-        params.append(prioridad)
+    if prioridad and prioridad not in prioridadesValidas:
+        raise HTTPException(status_code=400, detail="Prioridad inválida")
     
-    if orden == "desc":
-        query += " ORDER BY fecha_creacion DESC"
-    elif orden == "asc":
-        query += " ORDER BY fecha_creacion ASC"
-    
-    cursor.execute(query, params)
-    tareas = cursor.fetchall()
-    conn.close()
-    
-    return [
-        {
-            "id": t["id"],
-            "descripcion": t["descripcion"],
-            "estado": t["estado"],
-            "prioridad": t["prioridad"],
-            "fecha_creacion": t["fecha_creacion"]
-        }
-        for t in tareas
-    ]
+    return await repo.listar(estado, texto, prioridad, orden)
 
 @app.post("/tareas", status_code=201)
 async def CrearTarea(tarea_in: TareaIn):
@@ -139,136 +112,66 @@ async def CrearTarea(tarea_in: TareaIn):
     if prioridad not in prioridadesValidas:
         raise HTTPException(status_code=422, detail="Prioridad inválida")
     
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
     fecha_creacion = datetime.datetime.now().isoformat()
-    cursor.execute(
-        "INSERT INTO tareas (descripcion, estado, prioridad, fecha_creacion) VALUES (?, ?, ?, ?)",
-        (descripcion, estado, prioridad, fecha_creacion)
-    )
-    conn.commit()
-    
-    tarea_id = cursor.lastrowid
-    
-    cursor.execute("SELECT * FROM tareas WHERE id = ?", (tarea_id,))
-    tarea = cursor.fetchone()
-    conn.close()
-    
-    return {
-        "id": tarea["id"],
-        "descripcion": tarea["descripcion"],
-        "estado": tarea["estado"],
-        "prioridad": tarea["prioridad"],
-        "fecha_creacion": tarea["fecha_creacion"]
-    }
+    return await repo.crear(descripcion, estado, prioridad, fecha_creacion)
 
 @app.put("/tareas/completar_todas", status_code=200)
 async def CompletarTodas():
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT COUNT(*) as count FROM tareas")
-    count = cursor.fetchone()["count"]
-    
-    if count == 0:
-        conn.close()
+    if await repo.completar_todas() == 0:
         return {"mensaje": "No hay tareas"}
     
-    cursor.execute("UPDATE tareas SET estado = 'completada'")
-    conn.commit()
-    conn.close()
-    
     return {"mensaje": "Todas las tareas marcadas como completadas"}
 
 @app.put("/tareas/{id}")
 async def ModificarTarea(id: int, tarea_in: dict):
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT * FROM tareas WHERE id = ?", (id,))
-    tarea = cursor.fetchone()
-    
-    if not tarea:
-        conn.close()
+    def combinar(tarea):
+        descripcion = tarea_in.get("descripcion", tarea["descripcion"])
+        estado = tarea_in.get("estado", tarea["estado"])
+        prioridad = tarea_in.get("prioridad", tarea["prioridad"])
+        
+        if descripcion is not None and not descripcion.strip():
+            descripcion = tarea["descripcion"]
+        
+        if estado is not None and estado not in estadosValidos:
+            raise HTTPException(status_code=422, detail="Estado inválido")
+        
+        if prioridad is not None and prioridad not in prioridadesValidas:
+            raise HTTPException(status_code=422, detail="Prioridad inválida")
+        
+        return descripcion, estado, prioridad
+    
+    # Lectura, validación y UPDATE en una sola llamada al repositorio
+    tarea = await repo.modificar(id, combinar)
+    
+    if tarea is None:
         raise HTTPException(status_code=404, detail="error: Tarea no encontrada")
     
-    descripcion = tarea_in.get("descripcion", tarea["descripcion"])
-    estado = tarea_in.get("estado", tarea["estado"])
-    prioridad = tarea_in.get("prioridad", tarea["prioridad"])
-    
-    if descripcion is not None and not descripcion.strip():
-        descripcion = tarea["descripcion"]
-    
-    if estado is not None and estado not in estadosValidos:
-        conn.close()
-        raise HTTPException(status_code=422, detail="Estado inválido")
-    
-    if prioridad is not None and prioridad not in prioridadesValidas:
-        conn.close()
-        raise HTTPException(status_code=422, detail="Prioridad inválida")
-    
-    cursor.execute(
-        "UPDATE tareas SET descripcion = ?, estado = ?, prioridad = ? WHERE id = ?",
-        (descripcion, estado, prioridad, id)
-    )
-    conn.commit()
-    
-    cursor.execute("SELECT * FROM tareas WHERE id = ?", (id,))
-    tarea_actualizada = cursor.fetchone()
-    conn.close()
-    
-    return {
-        "id": tarea_actualizada["id"],
-        "descripcion": tarea_actualizada["descripcion"],
-        "estado": tarea_actualizada["estado"],
-        "prioridad": tarea_actualizada["prioridad"],
-        "fecha_creacion": tarea_actualizada["fecha_creacion"]
-    }
+    return tarea
 
 @app.delete("/tareas/{id}")
 async def BorrarTarea(id: int):
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT * FROM tareas WHERE id = ?", (id,))
-    tarea = cursor.fetchone()
-    
-    if not tarea:
-        conn.close()
+    if not await repo.eliminar(id):
         raise HTTPException(status_code=404, detail="error: Tarea no encontrada")
     
-    cursor.execute("DELETE FROM tareas WHERE id = ?", (id,))
-    conn.commit()
-    conn.close()
-    
     return {"mensaje": "Tarea eliminada"}
 
 @app.get("/tareas/resumen")
 async def ResumenTareas():
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT COUNT(*) as count FROM tareas")
-    total = cursor.fetchone()["count"]
+    conteos = await repo.resumen()
     
     resumen_estado = {estado: 0 for estado in estadosValidos}
     resumen_prioridad = {prioridad: 0 for prioridad in prioridadesValidas}
     
-    cursor.execute("SELECT estado, COUNT(*) as count FROM tareas GROUP BY estado")
-    for row in cursor.fetchall():
-        if row["estado"] in resumen_estado:
-            resumen_estado[row["estado"]] = row["count"]
+    for estado, count in conteos["por_estado"].items():
+        if estado in resumen_estado:
+            resumen_estado[estado] = count
     
-    cursor.execute("SELECT prioridad, COUNT(*) as count FROM tareas GROUP BY prioridad")
-    for row in cursor.fetchall():
-        if row["prioridad"] in resumen_prioridad:
-            resumen_prioridad[row["prioridad"]] = row["count"]
-    
-    conn.close()
+    for prioridad, count in conteos["por_prioridad"].items():
+        if prioridad in resumen_prioridad:
+            resumen_prioridad[prioridad] = count
     
     return {
-        "total_tareas": total,
+        "total_tareas": conteos["total"],
         "por_estado": resumen_estado,
         "por_prioridad": resumen_prioridad
-    }
\ No newline at end of file
+    }
@@ -0,0 +1,162 @@
+import asyncio
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Hilos dedicados a SQLite; los requests que lleguen con todos ocupados
+# esperan su turno sin frenar el event loop. Las consultas usan CPU, así que
+# más hilos que núcleos solo agrega cambios de contexto (bench_async.py
+# --hilos 1 2 4 8 en un núcleo: 178, 146, 134 y 125 req/s)
+MAX_HILOS_DB = int(os.environ.get("TAREAS_HILOS_DB", min(4, os.cpu_count() or 1)))
+
+COLUMNAS = ("id", "descripcion", "estado", "prioridad", "fecha_creacion")
+
+
+def a_dict(fila: sqlite3.Row) -> Dict:
+    return {columna: fila[columna] for columna in COLUMNAS}
+
+
+class RepositorioTareas:
+    """
+    Acceso a la tabla tareas con métodos awaitables.
+
+    Cada operación abre su conexión y corre entera en un ThreadPoolExecutor
+    propio de tamaño fijo, así las consultas no bloquean el event loop.
+    """
+
+    def __init__(self, conectar: Callable[[], sqlite3.Connection], max_hilos: int = MAX_HILOS_DB):
+        self._conectar = conectar
+        self._max_hilos = max_hilos
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        # Se crea al primer uso (y de nuevo si se cerró al apagar la app)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._max_hilos,
+                                                thread_name_prefix="tareas-db")
+        return self._executor
+
+    def cerrar(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _con_conexion(self, operacion: Callable, *args):
+        conn = self._conectar()
+        try:
+            return operacion(conn, *args)
+        finally:
+            conn.close()
+
+    async def _ejecutar(self, operacion: Callable, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._con_conexion, operacion, *args)
+
+    # ---- operaciones (corren en el hilo de la base) ----
+
+    @staticmethod
+    def _listar(conn, estado, texto, prioridad, orden) -> List[Dict]:
+        query = "SELECT * FROM tareas WHERE 1=1"
+        params = []
+        if estado:
+            query += " AND estado = ?"
+            params.append(estado)
+        if texto:
+            query += " AND descripcion LIKE ?"
+            params.append(f"%{texto}%")
+        if prioridad:
+            query += " AND prioridad = ?"
+            params.append(prioridad)
+        if orden == "desc":
+            query += " ORDER BY fecha_creacion DESC"
+        elif orden == "asc":
+            query += " ORDER BY fecha_creacion ASC"
+        return [a_dict(t) for t in conn.execute(query, params).fetchall()]
+
+    @staticmethod
+    def _obtener(conn, tarea_id) -> Optional[Dict]:
+        tarea = conn.execute("SELECT * FROM tareas WHERE id = ?", (tarea_id,)).fetchone()
+        return a_dict(tarea) if tarea else None
+
+    @staticmethod
+    def _crear(conn, descripcion, estado, prioridad, fecha_creacion) -> Dict:
+        cursor = conn.execute(
+            "INSERT INTO tareas (descripcion, estado, prioridad, fecha_creacion) VALUES (?, ?, ?, ?)",
+            (descripcion, estado, prioridad, fecha_creacion)
+        )
+        conn.commit()
+        return RepositorioTareas._obtener(conn, cursor.lastrowid)
+
+    @staticmethod
+    def _modificar(conn, tarea_id, combinar) -> Optional[Dict]:
+        # BEGIN IMMEDIATE toma el lock de escritura antes de leer: ningún
+        # DELETE puede colarse entre la lectura y el UPDATE
+        conn.execute("BEGIN IMMEDIATE")
+        tarea = RepositorioTareas._obtener(conn, tarea_id)
+        if tarea is None:
+            conn.rollback()
+            return None
+        descripcion, estado, prioridad = combinar(tarea)
+        conn.execute(
+            "UPDATE tareas SET descripcion = ?, estado = ?, prioridad = ? WHERE id = ?",
+            (descripcion, estado, prioridad, tarea_id)
+        )
+        conn.commit()
+        return RepositorioTareas._obtener(conn, tarea_id)
+
+    @staticmethod
+    def _eliminar(conn, tarea_id) -> bool:
+        cursor = conn.execute("DELETE FROM tareas WHERE id = ?", (tarea_id,))
+        conn.commit()
+        return cursor.rowcount > 0
+
+    @staticmethod
+    def _completar_todas(conn) -> int:
+        cursor = conn.execute("UPDATE tareas SET estado = 'completada'")
+        conn.commit()
+        return cursor.rowcount
+
+    @staticmethod
+    def _resumen(conn) -> Dict:
+        total = conn.execute("SELECT COUNT(*) FROM tareas").fetchone()[0]
+        por_estado = dict(conn.execute(
+            "SELECT estado, COUNT(*) FROM tareas GROUP BY estado").fetchall())
+        por_prioridad = dict(conn.execute(
+            "SELECT prioridad, COUNT(*) FROM tareas GROUP BY prioridad").fetchall())
+        return {"total": total, "por_estado": por_estado, "por_prioridad": por_prioridad}
+
+    # ---- API awaitable ----
+
+    async def listar(self, estado: Optional[str] = None, texto: Optional[str] = None,
+                     prioridad: Optional[str] = None, orden: Optional[str] = None) -> List[Dict]:
+        return await self._ejecutar(self._listar, estado, texto, prioridad, orden)
+
+    async def obtener(self, tarea_id: int) -> Optional[Dict]:
+        return await self._ejecutar(self._obtener, tarea_id)
+
+    async def crear(self, descripcion: str, estado: str, prioridad: str, fecha_creacion: str) -> Dict:
+        return await self._ejecutar(self._crear, descripcion, estado, prioridad, fecha_creacion)
+
+    async def modificar(self, tarea_id: int,
+                        combinar: Callable[[Dict], Tuple[str, str, str]]) -> Optional[Dict]:
+        """
+        Lee la tarea, le pasa la fila a `combinar` (que devuelve descripcion,
+        estado y prioridad nuevos o lanza una excepción para no guardar nada)
+        y hace el UPDATE, todo en una sola transacción del mismo hilo.
+        Devuelve None si la tarea no existe.
+        """
+        return await self._ejecutar(self._modificar, tarea_id, combinar)
+
+    async def eliminar(self, tarea_id: int) -> bool:
+        """Devuelve False si la tarea no existía"""
+        return await self._ejecutar(self._eliminar, tarea_id)
+
+    async def completar_todas(self) -> int:
+        """Marca todas como completadas y devuelve cuántas había"""
+        return await self._ejecutar(self._completar_todas)
+
+    async def resumen(self) -> Dict:
+        """Total y conteos por estado y prioridad (solo los valores presentes)"""
+        return await self._ejecutar(self._resumen)
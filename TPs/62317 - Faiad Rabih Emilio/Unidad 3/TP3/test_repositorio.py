@@ -0,0 +1,155 @@
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from main import app, init_db, DB_NAME
+from repositorio import RepositorioTareas
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def base_limpia():
+    if os.path.exists(DB_NAME):
+        os.remove(DB_NAME)
+    init_db()
+    yield
+    if os.path.exists(DB_NAME):
+        os.remove(DB_NAME)
+
+
+def test_consultas_corren_en_hilos_del_repositorio():
+    hilos = []
+
+    def conectar():
+        hilos.append(threading.current_thread().name)
+        return main.get_db_connection()
+
+    repo = RepositorioTareas(conectar, max_hilos=2)
+
+    async def usar():
+        await repo.crear("Tarea", "pendiente", "media", "2024-01-01T00:00:00")
+        return await repo.listar()
+
+    try:
+        tareas = asyncio.run(usar())
+    finally:
+        repo.cerrar()
+
+    assert [t["descripcion"] for t in tareas] == ["Tarea"]
+    assert hilos and all(nombre.startswith("tareas-db") for nombre in hilos)
+
+
+def test_el_loop_sigue_libre_mientras_la_base_trabaja():
+    liberar = threading.Event()
+
+    def conectar_lento():
+        liberar.wait(5)
+        return main.get_db_connection()
+
+    repo = RepositorioTareas(conectar_lento, max_hilos=1)
+
+    async def usar():
+        consulta = asyncio.create_task(repo.resumen())
+        # El loop atiende otra cosa mientras la consulta espera en su hilo
+        await asyncio.sleep(0.01)
+        assert not consulta.done()
+        liberar.set()
+        return await consulta
+
+    try:
+        resumen = asyncio.run(usar())
+    finally:
+        repo.cerrar()
+
+    assert resumen["total"] == 0
+
+
+def test_cerrar_y_volver_a_usar():
+    repo = RepositorioTareas(main.get_db_connection, max_hilos=1)
+    asyncio.run(repo.resumen())
+    repo.cerrar()
+    assert asyncio.run(repo.resumen())["total"] == 0
+    repo.cerrar()
+
+
+def test_endpoints_usan_el_repositorio():
+    client.post("/tareas", json={"descripcion": "Una", "prioridad": "alta"})
+    client.post("/tareas", json={"descripcion": "Otra"})
+
+    assert len(client.get("/tareas").json()) == 2
+    assert client.get("/tareas/resumen").json()["por_prioridad"]["alta"] == 1
+    assert client.delete("/tareas/99").status_code == 404
+    assert client.put("/tareas/completar_todas").json()["mensaje"] == \
+        "Todas las tareas marcadas como completadas"
+
+
+def test_modificar_lee_valida_y_escribe_en_una_sola_llamada():
+    conexiones = []
+
+    def conectar():
+        conexiones.append(threading.current_thread().name)
+        return main.get_db_connection()
+
+    repo = RepositorioTareas(conectar, max_hilos=2)
+
+    def rechazar(tarea):
+        raise ValueError("inválida")
+
+    async def usar():
+        creada = await repo.crear("Tarea", "pendiente", "media", "2024-01-01T00:00:00")
+        conexiones.clear()
+        modificada = await repo.modificar(creada["id"], lambda t: (t["descripcion"], "completada", "alta"))
+        una_llamada = len(conexiones)
+        with pytest.raises(ValueError):
+            await repo.modificar(creada["id"], rechazar)
+        inexistente = await repo.modificar(99, rechazar)
+        return modificada, una_llamada, await repo.obtener(creada["id"]), inexistente
+
+    try:
+        modificada, una_llamada, guardada, inexistente = asyncio.run(usar())
+    finally:
+        repo.cerrar()
+
+    assert una_llamada == 1
+    assert (modificada["estado"], modificada["prioridad"]) == ("completada", "alta")
+    # Si combinar lanza, no se guarda nada
+    assert guardada == modificada
+    assert inexistente is None
+
+
+def test_delete_concurrente_no_se_cuela_entre_lectura_y_update():
+    leyo = threading.Event()
+    repo = RepositorioTareas(main.get_db_connection, max_hilos=2)
+
+    def combinar_lento(tarea):
+        leyo.set()
+        time.sleep(0.2)
+        return tarea["descripcion"], "completada", tarea["prioridad"]
+
+    async def usar():
+        creada = await repo.crear("Tarea", "pendiente", "media", "2024-01-01T00:00:00")
+        modificar = asyncio.create_task(repo.modificar(creada["id"], combinar_lento))
+        await asyncio.get_running_loop().run_in_executor(None, leyo.wait, 5)
+        # El DELETE espera al lock de escritura de modificar
+        eliminada = await repo.eliminar(creada["id"])
+        return await modificar, eliminada
+
+    try:
+        modificada, eliminada = asyncio.run(usar())
+    finally:
+        repo.cerrar()
+
+    assert modificada["estado"] == "completada"
+    assert eliminada
+
+
+def test_put_sobre_tarea_inexistente_devuelve_404():
+    respuesta = client.put("/tareas/99", json={"estado": "completada"})
+    assert respuesta.status_code == 404
+    assert client.put("/tareas/99", json={"estado": "otro"}).status_code == 404
@@ -0,0 +1,92 @@
+"""
+Benchmark: sincronizar con GET /cambios vs volver a leer todas las tareas.
+
+Ejecutar desde la carpeta TP4:
+
+    python benchmarks/bench_cambios.py [--tareas 10000 100000 1000000] [--cambios 10]
+
+Para cada tamaño de tabla modifica y borra --cambios tareas y compara leer
+solo el delta (obtener_cambios desde la versión anterior) con leer la
+tabla completa, que es lo que tenía que hacer un cliente para enterarse.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cambios  # noqa: E402
+import database  # noqa: E402
+import fechas  # noqa: E402
+import pool  # noqa: E402
+
+ESTADOS = ["pendiente", "en_progreso", "completada"]
+PRIORIDADES = ["baja", "media", "alta"]
+INICIO_US = fechas.iso_a_us("2024-01-01T00:00:00")
+
+
+def insertar(cantidad: int, proyectos: int) -> float:
+    """Inserta las tareas en una transacción y devuelve los segundos"""
+    filas = [(f"Tarea {i}", ESTADOS[i % 3], PRIORIDADES[i % 7 % 3], i % proyectos + 1, INICIO_US + i)
+             for i in range(cantidad)]
+    inicio = time.perf_counter()
+    with database.get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO tareas (descripcion, estado, prioridad, proyecto_id, fecha_creacion) "
+            "VALUES (?, ?, ?, ?, ?)", filas)
+        conn.commit()
+    return time.perf_counter() - inicio
+
+
+def leer_todo() -> None:
+    """Lo que hacía un cliente sin /cambios: pedir todas las filas otra vez"""
+    with database.get_connection() as conn:
+        conn.execute("SELECT * FROM proyectos").fetchall()
+        conn.execute("SELECT * FROM tareas").fetchall()
+
+
+def por_llamada_ms(funcion, repeticiones: int) -> float:
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) / repeticiones * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tareas", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--proyectos", type=int, default=100)
+    parser.add_argument("--cambios", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        for cantidad in args.tareas:
+            database.DB_NAME = os.path.join(directorio, f"bench_{cantidad}.db")
+            database.init_db()
+            for i in range(args.proyectos):
+                database.crear_proyecto(f"Proyecto {i}")
+            segundos = insertar(cantidad, args.proyectos)
+
+            with database.get_connection() as conn:
+                version = cambios.version_actual(conn.cursor())
+            paso = cantidad // args.cambios
+            for i in range(1, cantidad, paso):
+                database.actualizar_tarea(i, estado="completada")
+                database.eliminar_tarea(i + 1)
+
+            delta = database.obtener_cambios(version, 1000)
+            assert len(delta["tareas"]) + len(delta["borrados"]["tareas"]) == 2 * args.cambios
+
+            completo = por_llamada_ms(leer_todo, max(3, 200_000 // cantidad))
+            incremental = por_llamada_ms(lambda: database.obtener_cambios(version, 1000), 1000)
+            print(f"{cantidad:>9} tareas  leer todo {completo:9.3f} ms  "
+                  f"delta de {2 * args.cambios} cambios {incremental:6.3f} ms  "
+                  f"(inserción con triggers {segundos:5.2f} s)")
+            pool.reiniciar_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Benchmark: tareas creadas por segundo con 50 clientes concurrentes, con y sin escritor agrupado.
+
+Ejecutar desde la carpeta TP4:
+
+    python benchmarks/bench_escritor.py [--clientes 50] [--tareas-por-cliente 40]
+
+Dos escenarios, cada uno con el perfil "estricto" (synchronous=FULL, un
+fsync por commit) y con "produccion" (synchronous=NORMAL):
+
+- endpoint: cada cliente hace POST /proyectos/1/tareas en serie contra la
+  app ASGI (sin cliente HTTP de por medio), todos en el mismo event loop,
+  con un commit por request y con TAREAS_ESCRITOR activo.
+- hilos: cada cliente es un hilo que llama a crear_tarea o a
+  crear_tarea_agrupada(...).result(), como haría un servidor con
+  endpoints sincrónicos en un threadpool.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database  # noqa: E402
+import escritor  # noqa: E402
+import pool  # noqa: E402
+from main import app  # noqa: E402
+
+
+def preparar(ruta: str, perfil: str) -> None:
+    os.environ["TAREAS_DB_PERFIL"] = perfil
+    database.DB_NAME = ruta
+    database.init_db()
+    database.crear_proyecto("Benchmark")
+
+
+async def crear(numero: int) -> int:
+    """POST directo a la app ASGI; devuelve el status"""
+    cuerpo = json.dumps({"descripcion": f"Tarea {numero}"}).encode()
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "POST", "scheme": "http", "path": "/proyectos/1/tareas",
+        "raw_path": b"/proyectos/1/tareas", "root_path": "", "query_string": b"",
+        "headers": [(b"content-type", b"application/json"),
+                    (b"content-length", str(len(cuerpo)).encode())],
+        "client": ("bench", 1), "server": ("bench", 80),
+    }
+    status = None
+
+    async def receive():
+        return {"type": "http.request", "body": cuerpo, "more_body": False}
+
+    async def send(mensaje):
+        nonlocal status
+        if mensaje["type"] == "http.response.start":
+            status = mensaje["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def cliente(numero: int, cantidad: int, latencias: list) -> None:
+    for i in range(cantidad):
+        inicio = time.perf_counter()
+        status = await crear(numero * cantidad + i)
+        if status != 201:
+            raise RuntimeError(f"POST devolvió {status}")
+        latencias.append(time.perf_counter() - inicio)
+
+
+async def medir(clientes: int, cantidad: int) -> dict:
+    latencias = []
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente(n, cantidad, latencias) for n in range(clientes)))
+    segundos = time.perf_counter() - inicio
+    latencias.sort()
+    return {
+        "por_seg": len(latencias) / segundos,
+        "p50_ms": statistics.median(latencias) * 1000,
+        "p95_ms": latencias[int(len(latencias) * 0.95)] * 1000,
+    }
+
+
+def medir_hilos(clientes: int, cantidad: int, agrupado: bool) -> dict:
+    latencias = []
+
+    def trabajar(numero: int) -> None:
+        for i in range(cantidad):
+            inicio = time.perf_counter()
+            if agrupado:
+                database.crear_tarea_agrupada(f"Tarea {numero}-{i}", "pendiente", "media", 1).result()
+            else:
+                database.crear_tarea(f"Tarea {numero}-{i}", "pendiente", "media", 1)
+            latencias.append(time.perf_counter() - inicio)
+
+    hilos = [threading.Thread(target=trabajar, args=(n,)) for n in range(clientes)]
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    segundos = time.perf_counter() - inicio
+    latencias.sort()
+    return {
+        "por_seg": len(latencias) / segundos,
+        "p50_ms": statistics.median(latencias) * 1000,
+        "p95_ms": latencias[int(len(latencias) * 0.95)] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clientes", type=int, default=50)
+    parser.add_argument("--tareas-por-cliente", type=int, default=40)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        casos = [(escenario, perfil, agrupado)
+                 for escenario in ("endpoint", "hilos")
+                 for perfil in ("estricto", "produccion")
+                 for agrupado in (False, True)]
+        for escenario, perfil, agrupado in casos:
+            modo = "agrupado" if agrupado else "un commit"
+            preparar(os.path.join(directorio, f"bench_{escenario}_{perfil}_{int(agrupado)}.db"), perfil)
+            escritor.ACTIVO = agrupado
+
+            if escenario == "endpoint":
+                r = asyncio.run(medir(args.clientes, args.tareas_por_cliente))
+            else:
+                r = medir_hilos(args.clientes, args.tareas_por_cliente, agrupado)
+
+            lotes = ""
+            if agrupado:
+                stats = database.escritor_db().estadisticas()
+                lotes = f"  {stats['operaciones'] / max(stats['lotes'], 1):5.1f} tareas/commit"
+                escritor.detener_escritor()
+            print(f"{escenario:<9} {perfil:<11} {modo:<10} {r['por_seg']:8.0f} tareas/s  "
+                  f"p50={r['p50_ms']:7.2f}ms  p95={r['p95_ms']:7.2f}ms{lotes}")
+            pool.reiniciar_pool()
+
+
+if __name__ == "__main__":
+    main()
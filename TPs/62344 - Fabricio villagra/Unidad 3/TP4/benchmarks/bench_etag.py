@@ -0,0 +1,107 @@
+"""
+Benchmark: costo de un poll a los GET de datos con y sin If-None-Match.
+
+Ejecutar desde la carpeta TP4:
+
+    python benchmarks/bench_etag.py [--tareas 1000] [--repeticiones 2000]
+
+Para cada ruta mide el request completo contra la app ASGI (sin cliente
+HTTP de por medio): primero sin If-None-Match, que es lo que hacía cada
+poll antes (consulta + serialización), y después con el ETag de la
+respuesta anterior, que devuelve 304 sin pedir conexión al pool.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database  # noqa: E402
+import pool  # noqa: E402
+from main import app  # noqa: E402
+
+RUTAS = ["/tareas", "/tareas?estado=pendiente&limit=50", "/proyectos", "/proyectos/1/resumen", "/resumen"]
+
+
+def preparar(directorio: str, cantidad: int) -> None:
+    database.DB_NAME = os.path.join(directorio, "bench_etag.db")
+    database.init_db()
+    for nombre in ("Alpha", "Beta", "Gamma"):
+        database.crear_proyecto(nombre)
+    estados = ["pendiente", "en_progreso", "completada"]
+    database.crear_tareas_lote(1, [(f"Tarea {i}", estados[i % 3], "media") for i in range(cantidad)])
+
+
+async def pedir(ruta: str, etag: str = None) -> tuple:
+    """GET directo a la app ASGI; devuelve (status, headers, bytes del cuerpo)"""
+    camino, _, query = ruta.partition("?")
+    headers = [(b"if-none-match", etag.encode())] if etag else []
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": camino, "raw_path": camino.encode(),
+        "root_path": "", "query_string": query.encode(), "headers": headers,
+        "client": ("bench", 1), "server": ("bench", 80),
+    }
+    respuesta = {"status": None, "headers": {}, "bytes": 0}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(mensaje):
+        if mensaje["type"] == "http.response.start":
+            respuesta["status"] = mensaje["status"]
+            respuesta["headers"] = {k.decode(): v.decode() for k, v in mensaje["headers"]}
+        elif mensaje["type"] == "http.response.body":
+            respuesta["bytes"] += len(mensaje.get("body", b""))
+
+    await app(scope, receive, send)
+    return respuesta["status"], respuesta["headers"], respuesta["bytes"]
+
+
+async def medir(ruta: str, repeticiones: int, etag: str = None) -> dict:
+    latencias = []
+    checkouts = database.estadisticas_pool()["checkouts"]
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        status, _, cuerpo = await pedir(ruta, etag)
+        latencias.append(time.perf_counter() - inicio)
+    latencias.sort()
+    return {
+        "status": status,
+        "bytes": cuerpo,
+        "p50_us": statistics.median(latencias) * 1e6,
+        "p95_us": latencias[int(len(latencias) * 0.95)] * 1e6,
+        "conexiones": (database.estadisticas_pool()["checkouts"] - checkouts) / repeticiones,
+    }
+
+
+async def correr(repeticiones: int) -> None:
+    for ruta in RUTAS:
+        _, headers, _ = await pedir(ruta)
+        print(ruta)
+        for nombre, etag in (("sin ETag", None), ("If-None-Match", headers["etag"])):
+            r = await medir(ruta, repeticiones, etag)
+            print(f"    {nombre:<14} status={r['status']}  {r['bytes']:>7} B  "
+                  f"p50={r['p50_us']:8.1f}us  p95={r['p95_us']:8.1f}us  "
+                  f"conexiones/poll={r['conexiones']:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tareas", type=int, default=1000)
+    parser.add_argument("--repeticiones", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        preparar(directorio, args.tareas)
+        asyncio.run(correr(args.repeticiones))
+        pool.reiniciar_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Benchmark: GET /eventos con 1000 suscriptores sobre un solo worker.
+
+Ejecutar desde la carpeta TP4:
+
+    python benchmarks/bench_eventos.py [--suscriptores 1000] [--eventos 200]
+
+Levanta uvicorn (un worker) en un subproceso con una base temporal, abre
+--suscriptores conexiones SSE (la mitad sin filtro y la otra mitad filtrada
+por uno de 10 proyectos) y hace --eventos POST de tareas de a uno. Mide:
+
+- la latencia de cada POST sin suscriptores y con todos conectados
+- el tiempo desde que se manda el POST hasta que cada suscriptor recibe el
+  evento (p50 / p95 / p99)
+- eventos entregados vs esperados y la memoria residente del servidor
+
+Cliente y servidor comparten la máquina: en pocos núcleos las latencias de
+entrega incluyen el tiempo que el cliente tarda en leer 1000 sockets.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+CARPETA_TP4 = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROYECTOS = 10
+
+
+def puerto_libre() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as archivo:
+        for linea in archivo:
+            if linea.startswith("VmRSS:"):
+                return int(linea.split()[1]) / 1024
+    return 0.0
+
+
+def percentil(valores: List[float], p: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))] if ordenados else 0.0
+
+
+async def pedir(puerto: int, metodo: str, ruta: str, cuerpo: dict = None) -> dict:
+    """Un request HTTP/1.1 con Connection: close; devuelve el JSON de la respuesta"""
+    lector, escritor = await asyncio.open_connection("127.0.0.1", puerto)
+    datos = json.dumps(cuerpo).encode() if cuerpo is not None else b""
+    escritor.write(f"{metodo} {ruta} HTTP/1.1\r\nHost: x\r\nConnection: close\r\n"
+                   f"Content-Type: application/json\r\nContent-Length: {len(datos)}\r\n\r\n".encode() + datos)
+    respuesta = await lector.read()
+    escritor.close()
+    return json.loads(respuesta.split(b"\r\n\r\n", 1)[1])
+
+
+async def suscribir(puerto: int, proyecto_id) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    lector, escritor = await asyncio.open_connection("127.0.0.1", puerto)
+    filtro = f"?proyecto_id={proyecto_id}" if proyecto_id else ""
+    escritor.write(f"GET /eventos{filtro} HTTP/1.1\r\nHost: x\r\n\r\n".encode())
+    # Headers y el comentario inicial: recién ahí la suscripción existe
+    while (await lector.readline()).strip() != b": conectado":
+        pass
+    # El writer también se devuelve: si se libera, cierra la conexión
+    return lector, escritor
+
+
+async def escuchar(lector: asyncio.StreamReader, recibidos: Dict[int, List[float]]) -> None:
+    # Transfer-Encoding chunked: las líneas de tamaño no empiezan con "data: "
+    while True:
+        linea = await lector.readline()
+        if not linea:
+            return
+        if linea.startswith(b"data: "):
+            recibidos.setdefault(json.loads(linea[6:])["id"], []).append(time.perf_counter())
+
+
+async def escribir(puerto: int, eventos: int, enviados: Dict[int, float] = None) -> List[float]:
+    """Crea `eventos` tareas de a una, repartidas entre los proyectos; devuelve ms por POST"""
+    duraciones = []
+    for i in range(eventos):
+        inicio = time.perf_counter()
+        tarea = await pedir(puerto, "POST", f"/proyectos/{i % PROYECTOS + 1}/tareas", {"descripcion": f"T{i}"})
+        duraciones.append((time.perf_counter() - inicio) * 1000)
+        if enviados is not None:
+            enviados[tarea["id"]] = inicio
+    return duraciones
+
+
+async def medir(puerto: int, pid: int, suscriptores: int, eventos: int) -> None:
+    for i in range(PROYECTOS):
+        await pedir(puerto, "POST", "/proyectos", {"nombre": f"P{i}"})
+    sin_suscriptores = await escribir(puerto, eventos)
+    rss_antes = rss_mb(pid)
+
+    inicio = time.perf_counter()
+    filtros = [None if i % 2 == 0 else i // 2 % PROYECTOS + 1 for i in range(suscriptores)]
+    conexiones = []
+    for i in range(0, suscriptores, 100):
+        conexiones += await asyncio.gather(*(suscribir(puerto, f) for f in filtros[i:i + 100]))
+    conexion_s = time.perf_counter() - inicio
+
+    recibidos: Dict[int, List[float]] = {}
+    enviados: Dict[int, float] = {}
+    oyentes = [asyncio.ensure_future(escuchar(lector, recibidos)) for lector, _ in conexiones]
+    con_suscriptores = await escribir(puerto, eventos, enviados)
+
+    # Cada tarea le llega a los sin filtro y a los de su proyecto
+    esperados = sum(1 for f in filtros if f is None) * eventos + sum(
+        1 for f in filtros if f is not None for i in range(eventos) if i % PROYECTOS + 1 == f)
+    limite = time.perf_counter() + 30
+    while sum(map(len, recibidos.values())) < esperados and time.perf_counter() < limite:
+        await asyncio.sleep(0.05)
+    rss_despues = rss_mb(pid)
+    for oyente in oyentes:
+        oyente.cancel()
+    for _, escritor in conexiones:
+        escritor.close()
+
+    entregas = [(llegada - enviados[tarea_id]) * 1000
+                for tarea_id, llegadas in recibidos.items() for llegada in llegadas]
+    print(f"suscriptores conectados  {len(conexiones)} en {conexion_s:.2f} s")
+    print(f"POST /tareas             p50 {percentil(sin_suscriptores, .5):6.2f} ms sin suscriptores, "
+          f"{percentil(con_suscriptores, .5):6.2f} ms con {suscriptores}")
+    print(f"entregas                 {len(entregas)} de {esperados} esperadas")
+    print(f"POST -> evento recibido  p50 {percentil(entregas, .5):6.2f} ms  p95 {percentil(entregas, .95):6.2f} ms  "
+          f"p99 {percentil(entregas, .99):6.2f} ms")
+    print(f"RSS del servidor         {rss_antes:.1f} MB -> {rss_despues:.1f} MB "
+          f"({(rss_despues - rss_antes) * 1024 / suscriptores:.1f} KB por suscriptor)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--suscriptores", type=int, default=1000)
+    parser.add_argument("--eventos", type=int, default=200)
+    args = parser.parse_args()
+
+    puerto = puerto_libre()
+    with tempfile.TemporaryDirectory() as directorio:
+        servidor = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--app-dir", CARPETA_TP4, "--port", str(puerto),
+             "--log-level", "warning", "--timeout-graceful-shutdown", "1"],
+            cwd=directorio, env=dict(os.environ, PYTHONDONTWRITEBYTECODE="1"),
+        )
+        try:
+            limite = time.time() + 20
+            while True:
+                try:
+                    socket.create_connection(("127.0.0.1", puerto), timeout=1).close()
+                    break
+                except OSError:
+                    if time.time() > limite or servidor.poll() is not None:
+                        sys.exit("error: uvicorn no levantó")
+                    time.sleep(0.1)
+            asyncio.run(medir(puerto, servidor.pid, args.suscriptores, args.eventos))
+        finally:
+            servidor.terminate()
+            servidor.wait(10)
+
+
+if __name__ == "__main__":
+    main()
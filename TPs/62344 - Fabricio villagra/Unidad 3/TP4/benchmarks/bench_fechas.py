@@ -0,0 +1,148 @@
+"""
+Benchmark: filtros por rango de fecha_creacion, texto ISO vs microsegundos.
+
+Ejecutar desde la carpeta TP4:
+
+    python benchmarks/bench_fechas.py [--tareas 1000000] [--repeticiones 50]
+
+Arma una base con el esquema anterior (fecha_creacion TEXT, mismos índices)
+y --tareas tareas repartidas a lo largo de 2024. Mide sobre ella:
+
+- una página de 100 tareas de un día y el COUNT de un mes comparando el
+  texto contra el índice (lo que se podía hacer antes)
+- el mismo filtro con julianday(), que es lo que hace falta para comparar
+  fechas de texto en formatos distintos ("2024-02-01", con "Z", ...) y
+  recorre la tabla completa
+
+Después migra la base con init_db (tiempo y tamaño del archivo) y repite
+las consultas sobre la columna entera: la misma página y el mismo COUNT, y
+obtener_tareas(desde, hasta) como lo llama GET /tareas.
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database  # noqa: E402
+import fechas  # noqa: E402
+import pool  # noqa: E402
+
+ESTADOS = ["pendiente", "en_progreso", "completada"]
+PRIORIDADES = ["baja", "media", "alta"]
+INICIO_US = fechas.iso_a_us("2024-01-01T00:00:00")
+ANIO_US = timedelta(days=366) // timedelta(microseconds=1)
+
+# Esquema anterior, con los mismos índices que crea init_db
+ESQUEMA_TEXTO = """
+    CREATE TABLE proyectos (id INTEGER PRIMARY KEY AUTOINCREMENT, nombre TEXT NOT NULL UNIQUE,
+                            descripcion TEXT, fecha_creacion TEXT NOT NULL);
+    CREATE TABLE tareas (id INTEGER PRIMARY KEY AUTOINCREMENT, descripcion TEXT NOT NULL,
+                         estado TEXT NOT NULL, prioridad TEXT NOT NULL, proyecto_id INTEGER NOT NULL,
+                         fecha_creacion TEXT NOT NULL,
+                         FOREIGN KEY (proyecto_id) REFERENCES proyectos(id) ON DELETE CASCADE);
+""" + ";\n".join(database.INDICES) + ";"
+
+PAGINA = ("SELECT * FROM tareas WHERE fecha_creacion >= ? AND fecha_creacion < ? "
+          "ORDER BY fecha_creacion, id LIMIT 100")
+CONTAR = "SELECT COUNT(*) FROM tareas WHERE fecha_creacion >= ? AND fecha_creacion < ?"
+CONTAR_JULIANDAY = ("SELECT COUNT(*) FROM tareas "
+                    "WHERE julianday(fecha_creacion) >= julianday(?) AND julianday(fecha_creacion) < julianday(?)")
+
+DIA = ("2024-06-10T00:00:00", "2024-06-11T00:00:00")
+MES = ("2024-06-01T00:00:00", "2024-07-01T00:00:00")
+
+
+def crear_base_texto(ruta: str, cantidad: int) -> None:
+    conn = sqlite3.connect(ruta)
+    conn.executescript(ESQUEMA_TEXTO)
+    conn.executemany("INSERT INTO proyectos (nombre, fecha_creacion) VALUES (?, '2024-01-01T00:00:00')",
+                     [(f"P{i}",) for i in range(100)])
+    for inicio in range(0, cantidad, 100_000):
+        conn.executemany(
+            "INSERT INTO tareas (descripcion, estado, prioridad, proyecto_id, fecha_creacion) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [(f"Tarea {i}", ESTADOS[i % 3], PRIORIDADES[i % 7 % 3], i % 100 + 1,
+              fechas.us_a_iso(INICIO_US + i * ANIO_US // cantidad))
+             for i in range(inicio, min(inicio + 100_000, cantidad))],
+        )
+    conn.commit()
+    conn.execute("VACUUM")
+    conn.close()
+
+
+def por_llamada_ms(funcion, repeticiones: int) -> float:
+    funcion()
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) / repeticiones * 1000
+
+
+def medir_texto(ruta: str, repeticiones: int) -> None:
+    conn = sqlite3.connect(ruta)
+    pagina = por_llamada_ms(lambda: conn.execute(PAGINA, DIA).fetchall(), repeticiones)
+    mes = por_llamada_ms(lambda: conn.execute(CONTAR, MES).fetchone(), repeticiones)
+    juliano = por_llamada_ms(lambda: conn.execute(CONTAR_JULIANDAY, MES).fetchone(), max(1, repeticiones // 25))
+    conn.close()
+    print(f"texto       página de un día {pagina:8.3f} ms  COUNT de un mes {mes:8.3f} ms  "
+          f"con julianday() {juliano:9.3f} ms")
+
+
+def medir_enteros(ruta: str, repeticiones: int) -> None:
+    dia = tuple(map(fechas.iso_a_us, DIA))
+    mes_us = tuple(map(fechas.iso_a_us, MES))
+    desde, hasta = (fechas.EPOCA + us * timedelta(microseconds=1) for us in dia)
+    # Conexión sin el conversor FECHA, igual que la de medir_texto
+    conn = sqlite3.connect(ruta)
+    pagina = por_llamada_ms(lambda: conn.execute(PAGINA, dia).fetchall(), repeticiones)
+    mes = por_llamada_ms(lambda: conn.execute(CONTAR, mes_us).fetchone(), repeticiones)
+    conn.close()
+    api = por_llamada_ms(lambda: database.obtener_tareas(desde=desde, hasta=hasta, limite=100), repeticiones)
+    print(f"enteros     página de un día {pagina:8.3f} ms  COUNT de un mes {mes:8.3f} ms  "
+          f"obtener_tareas(desde, hasta) {api:7.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tareas", type=int, default=1_000_000)
+    parser.add_argument("--repeticiones", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "bench_fechas.db")
+        inicio = time.perf_counter()
+        crear_base_texto(ruta, args.tareas)
+        print(f"base con {args.tareas} tareas (fecha en texto) creada en {time.perf_counter() - inicio:.1f} s, "
+              f"{os.path.getsize(ruta) / 2**20:.1f} MB")
+        medir_texto(ruta, args.repeticiones)
+
+        database.DB_NAME = ruta
+        migrar = database._migrar_fecha_tareas
+        tiempos = {}
+
+        def migrar_medido(conn):
+            inicio = time.perf_counter()
+            migrar(conn)
+            tiempos["migracion"] = time.perf_counter() - inicio
+
+        database._migrar_fecha_tareas = migrar_medido
+        inicio = time.perf_counter()
+        database.init_db()
+        total = time.perf_counter() - inicio
+        database._migrar_fecha_tareas = migrar
+        with database.get_connection() as conn:
+            conn.execute("VACUUM")
+        print(f"migración   {tiempos['migracion']:.1f} s copiando la tabla, {total:.1f} s init_db completo; "
+              f"{os.path.getsize(ruta) / 2**20:.1f} MB después de VACUUM")
+        medir_enteros(ruta, args.repeticiones)
+        pool.reiniciar_pool()
+
+
+if __name__ == "__main__":
+    main()
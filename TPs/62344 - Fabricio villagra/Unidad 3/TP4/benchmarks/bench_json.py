@@ -0,0 +1,116 @@
+"""
+Benchmark: serialización de listas de tareas con response_model y con el modo rápido.
+
+Ejecutar desde la carpeta TP4:
+
+    python benchmarks/bench_json.py [--tamanos 10 1000 100000]
+
+Mide solo la codificación de filas como las que devuelve obtener_tareas:
+
+- response_model: lo que hace FastAPI con el valor que devuelve el endpoint
+  (serialize_response con el response_field de GET /tareas, que valida cada
+  fila y pasa por jsonable_encoder, y después JSONResponse).
+- rapido json / rapido orjson: respuestas.a_json, que codifica los dicts
+  directo a bytes (TAREAS_JSON_RAPIDO=1), sin y con orjson.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+
+import respuestas  # noqa: E402
+from main import app  # noqa: E402
+
+
+def filas(cantidad: int) -> list:
+    estados = ["pendiente", "en_progreso", "completada"]
+    prioridades = ["baja", "media", "alta"]
+    return [
+        {
+            "id": i + 1,
+            "descripcion": f"Tarea número {i} del benchmark",
+            "estado": estados[i % 3],
+            "prioridad": prioridades[i % 3],
+            "proyecto_id": 1 + i % 10,
+            "fecha_creacion": f"2024-01-01T00:00:00.{i:06d}",
+            "proyecto_nombre": f"Proyecto {1 + i % 10}",
+        }
+        for i in range(cantidad)
+    ]
+
+
+def campo_de_respuesta(ruta: str):
+    return next(r.response_field for r in app.routes if getattr(r, "path", None) == ruta)
+
+
+async def con_response_model(campo, datos) -> bytes:
+    contenido = await serialize_response(field=campo, response_content=datos)
+    return JSONResponse(contenido).body
+
+
+async def con_modo_rapido(datos, usar_orjson: bool) -> bytes:
+    guardado = respuestas.orjson
+    if not usar_orjson:
+        respuestas.orjson = None
+    try:
+        return respuestas.a_json(datos)
+    finally:
+        respuestas.orjson = guardado
+
+
+async def medir(funcion, datos, repeticiones: int) -> float:
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        await funcion(datos)
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos)
+
+
+def formato(segundos: float) -> str:
+    if segundos >= 0.1:
+        return f"{segundos:8.2f} s "
+    if segundos >= 1e-3:
+        return f"{segundos * 1e3:8.2f} ms"
+    return f"{segundos * 1e6:8.1f} us"
+
+
+async def correr(tamanos: list) -> None:
+    campo = campo_de_respuesta("/tareas")
+    casos = {
+        "response_model": lambda datos: con_response_model(campo, datos),
+        "rapido json": lambda datos: con_modo_rapido(datos, usar_orjson=False),
+    }
+    if respuestas.orjson is not None:
+        casos["rapido orjson"] = lambda datos: con_modo_rapido(datos, usar_orjson=True)
+    else:
+        print("orjson no está instalado: se omite ese caso")
+
+    for cantidad in tamanos:
+        datos = filas(cantidad)
+        repeticiones = max(5, min(2000, 200_000 // cantidad))
+        base = None
+        print(f"{cantidad} tareas ({repeticiones} repeticiones)")
+        for nombre, funcion in casos.items():
+            segundos = await medir(funcion, datos, repeticiones)
+            base = base or segundos
+            print(f"    {nombre:<15} {formato(segundos)}   x{base / segundos:5.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[10, 1000, 100_000])
+    args = parser.parse_args()
+    asyncio.run(correr(args.tamanos))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark: crear N tareas con un POST por tarea vs POST /proyectos/{id}/tareas/lote.
+
+Ejecutar desde la carpeta TP4:
+
+    python benchmarks/bench_lote.py [--tareas 5000]
+
+Se mide con los perfiles "produccion" (WAL, synchronous=NORMAL) y "estricto"
+(synchronous=FULL, un fsync por commit), que es donde más pesa hacer un
+commit por tarea.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import database  # noqa: E402
+import pool  # noqa: E402
+from main import app, MAX_LOTE  # noqa: E402
+
+
+def preparar(directorio: str, perfil: str, modo: str) -> TestClient:
+    os.environ["TAREAS_DB_PERFIL"] = perfil
+    database.DB_NAME = os.path.join(directorio, f"bench_{perfil}_{modo}.db")
+    database.init_db()
+    client = TestClient(app)
+    client.post("/proyectos", json={"nombre": "Benchmark"})
+    return client
+
+
+def una_por_una(client: TestClient, tareas: list) -> None:
+    for tarea in tareas:
+        client.post("/proyectos/1/tareas", json=tarea)
+
+
+def en_lotes(client: TestClient, tareas: list) -> None:
+    for inicio in range(0, len(tareas), MAX_LOTE):
+        respuesta = client.post("/proyectos/1/tareas/lote", json=tareas[inicio:inicio + MAX_LOTE])
+        assert respuesta.status_code == 201, respuesta.text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tareas", type=int, default=5000)
+    args = parser.parse_args()
+
+    tareas = [{"descripcion": f"Tarea {i}", "prioridad": ["baja", "media", "alta"][i % 3]}
+              for i in range(args.tareas)]
+
+    with tempfile.TemporaryDirectory() as directorio:
+        for perfil in ("produccion", "estricto"):
+            tiempos = {}
+            for modo, funcion in (("una por una", una_por_una), ("lote", en_lotes)):
+                client = preparar(directorio, perfil, modo)
+                inicio = time.perf_counter()
+                funcion(client, tareas)
+                tiempos[modo] = time.perf_counter() - inicio
+                assert database.obtener_resumen_general()["total_tareas"] == args.tareas
+                pool.reiniciar_pool()
+
+            print(f"{perfil:<11} una por una {tiempos['una por una']:7.2f}s  "
+                  f"lote {tiempos['lote']:6.2f}s  "
+                  f"(x{tiempos['una por una'] / tiempos['lote']:.0f})")
+
+
+if __name__ == "__main__":
+    main()
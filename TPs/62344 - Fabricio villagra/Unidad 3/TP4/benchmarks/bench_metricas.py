@@ -0,0 +1,121 @@
+"""
+Benchmark: costo por request de las métricas de /metrics (TAREAS_METRICAS).
+
+Ejecutar desde la carpeta TP4:
+
+    python benchmarks/bench_metricas.py [--requests 5000] [--tareas 10]
+
+- requests: GET directos a la app ASGI (sin cliente HTTP de por medio) con
+  las métricas activas y desactivadas, alternando rondas cortas para que el
+  ruido afecte a los dos modos por igual y tomando la ronda más rápida de
+  cada modo. La diferencia es lo que cuestan el middleware, el decorador
+  del data layer y la anotación de la ruta.
+- observar: una llamada a Histograma.observar aislada, con 1 y 8 hilos.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database  # noqa: E402
+import metricas  # noqa: E402
+import pool  # noqa: E402
+from main import app  # noqa: E402
+
+RUTAS = ["/tareas", "/proyectos/1", "/resumen"]
+RONDAS = 20
+
+
+async def get(ruta: str) -> int:
+    """GET directo a la app ASGI; devuelve el status"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": ruta, "raw_path": ruta.encode(),
+        "root_path": "", "query_string": b"", "headers": [],
+        "client": ("bench", 1), "server": ("bench", 80),
+    }
+    status = None
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(mensaje):
+        nonlocal status
+        if mensaje["type"] == "http.response.start":
+            status = mensaje["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def ronda(ruta: str, cantidad: int) -> float:
+    """Microsegundos por request (promedio de la ronda)"""
+    inicio = time.perf_counter()
+    for _ in range(cantidad):
+        if await get(ruta) != 200:
+            raise RuntimeError(f"GET {ruta} no devolvió 200")
+    return (time.perf_counter() - inicio) / cantidad * 1e6
+
+
+async def medir_requests(cantidad: int) -> None:
+    for ruta in RUTAS:
+        tiempos = {True: [], False: []}
+        await ronda(ruta, cantidad // 10)  # calentamiento
+        for _ in range(RONDAS):
+            for activas in (False, True):
+                metricas.ACTIVAS = activas
+                tiempos[activas].append(await ronda(ruta, cantidad // RONDAS))
+        sin = min(tiempos[False])
+        con = min(tiempos[True])
+        print(f"GET {ruta:<14} sin métricas {sin:7.1f} us   con métricas {con:7.1f} us   "
+              f"costo {con - sin:+6.1f} us ({(con - sin) / sin:+.1%})")
+    metricas.ACTIVAS = True
+
+
+def medir_observar(hilos: int, cantidad: int) -> float:
+    """Nanosegundos por observación con `hilos` hilos observando a la vez"""
+    histograma = metricas.Histograma("bench_seconds", "Benchmark", ("metodo", "ruta", "status"))
+    valores = ("GET", "/tareas", "200")
+
+    def observar():
+        for i in range(cantidad):
+            histograma.observar(valores, (i % 100) / 1e4)
+
+    trabajadores = [threading.Thread(target=observar) for _ in range(hilos)]
+    inicio = time.perf_counter()
+    for hilo in trabajadores:
+        hilo.start()
+    for hilo in trabajadores:
+        hilo.join()
+    segundos = time.perf_counter() - inicio
+    assert sum(histograma.sumar()[valores][:-1]) == hilos * cantidad
+    return segundos / (hilos * cantidad) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000, help="requests por ruta y modo")
+    parser.add_argument("--tareas", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        database.DB_NAME = os.path.join(directorio, "bench.db")
+        database.init_db()
+        database.crear_proyecto("Benchmark")
+        database.crear_tareas_lote(1, [(f"Tarea {i}", "pendiente", "media") for i in range(args.tareas)])
+
+        print(f"{args.requests} requests por ruta y modo, {args.tareas} tareas")
+        asyncio.run(medir_requests(args.requests))
+        for hilos in (1, 8):
+            print(f"Histograma.observar con {hilos} hilo(s): {medir_observar(hilos, 200_000):6.0f} ns")
+        pool.reiniciar_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark: requests/seg de los endpoints del TP4 con y sin pool de conexiones.
+
+Ejecutar desde la carpeta TP4:
+
+    python benchmarks/bench_pool.py [--requests 3000] [--clientes 16]
+
+Levanta uvicorn (un worker) en un subproceso y le manda --requests requests
+desde --clientes hilos a la vez, cada uno con su conexión keep-alive. Cada
+configuración arranca con una copia de la misma base sembrada.
+
+"Sin pool" (TAREAS_POOL_SIZE=0) reproduce el comportamiento anterior: una
+conexión nueva + PRAGMA foreign_keys por cada función del data layer.
+"""
+
+import argparse
+import http.client
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database  # noqa: E402
+import pool  # noqa: E402
+from servidor import pedir, uvicorn_tp4  # noqa: E402
+
+
+def sembrar(ruta: str) -> None:
+    database.DB_NAME = ruta
+    database.init_db()
+    for i in range(20):
+        database.crear_proyecto(f"Proyecto {i}")
+        for j in range(10):
+            database.crear_tarea(f"Tarea {j}", "pendiente", "media", i + 1)
+    pool.reiniciar_pool()
+
+
+def carga(conexion: http.client.HTTPConnection, i: int) -> int:
+    """Mezcla de operaciones de un cliente típico; devuelve el status"""
+    proyecto = i % 20 + 1
+    tipo = i % 6
+    if tipo == 0:
+        return pedir(conexion, "POST", f"/proyectos/{proyecto}/tareas", {"descripcion": f"Nueva {i}"})[0]
+    if tipo == 1:
+        return pedir(conexion, "GET", "/tareas?estado=pendiente&limit=100")[0]
+    if tipo == 2:
+        return pedir(conexion, "GET", f"/proyectos/{proyecto}")[0]
+    if tipo == 3:
+        return pedir(conexion, "GET", f"/proyectos/{proyecto}/tareas")[0]
+    if tipo == 4:
+        return pedir(conexion, "PUT", f"/tareas/{proyecto * 10}", {"estado": "en_progreso"})[0]
+    return pedir(conexion, "GET", "/resumen")[0]
+
+
+def medir(puerto: int, total: int, clientes: int):
+    siguiente = iter(range(total))
+    lock = threading.Lock()
+    latencias, errores = [], []
+
+    def trabajar(_) -> None:
+        conexion = http.client.HTTPConnection("127.0.0.1", puerto, timeout=60)
+        while True:
+            with lock:
+                i = next(siguiente, None)
+            if i is None:
+                break
+            inicio = time.perf_counter()
+            status = carga(conexion, i)
+            latencias.append((time.perf_counter() - inicio) * 1000)
+            if status >= 400:
+                errores.append(status)
+        conexion.close()
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clientes) as executor:
+        list(executor.map(trabajar, range(clientes)))
+    segundos = time.perf_counter() - inicio
+    latencias.sort()
+    return total / segundos, latencias[len(latencias) // 2], latencias[int(len(latencias) * .99)], len(errores)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--clientes", type=int, default=16)
+    parser.add_argument("--tamano", type=int, default=pool.TAMANO_POR_DEFECTO)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        semilla = os.path.join(directorio, "semilla.db")
+        sembrar(semilla)
+        resultados = {}
+        for nombre, tamano in (("sin pool", 0), (f"pool ({args.tamano})", args.tamano)):
+            carpeta = os.path.join(directorio, str(tamano))
+            os.mkdir(carpeta)
+            shutil.copy(semilla, os.path.join(carpeta, "tareas.db"))
+            with uvicorn_tp4(carpeta, {"TAREAS_POOL_SIZE": str(tamano)}) as puerto:
+                medir(puerto, 200, args.clientes)  # calentar
+                req_s, p50, p99, errores = medir(puerto, args.requests, args.clientes)
+            resultados[nombre] = req_s
+            print(f"{nombre:<12} {req_s:8.1f} req/s   p50 {p50:7.2f} ms   p99 {p99:7.2f} ms   errores {errores}")
+
+    base, con_pool = resultados.values()
+    print(f"mejora: x{con_pool / base:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark: GET /resumen con agregados sobre tareas vs tabla de contadores.
+
+Ejecutar desde la carpeta TP4:
+
+    python benchmarks/bench_resumen.py [--tareas 10000 100000 1000000]
+
+Para cada tamaño compara obtener_resumen_general (contadores) con las
+consultas anteriores (COUNT + GROUP BY + LEFT JOIN por proyecto), y mide
+cuánto cuesta insertar con los triggers activos.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database  # noqa: E402
+import fechas  # noqa: E402
+import pool  # noqa: E402
+
+ESTADOS = ["pendiente", "en_progreso", "completada"]
+PRIORIDADES = ["baja", "media", "alta"]
+INICIO_US = fechas.iso_a_us("2024-01-01T00:00:00")
+
+
+def resumen_anterior() -> None:
+    """Las cuatro consultas que hacía obtener_resumen_general antes"""
+    with database.get_connection() as conn:
+        conn.execute("SELECT COUNT(*) FROM proyectos").fetchone()
+        conn.execute("SELECT COUNT(*) FROM tareas").fetchone()
+        conn.execute("SELECT estado, COUNT(*) FROM tareas GROUP BY estado").fetchall()
+        conn.execute("""
+            SELECT p.id, p.nombre, COUNT(t.id) as cantidad_tareas
+            FROM proyectos p LEFT JOIN tareas t ON p.id = t.proyecto_id
+            GROUP BY p.id ORDER BY cantidad_tareas DESC LIMIT 1
+        """).fetchone()
+
+
+def insertar(cantidad: int, proyectos: int) -> float:
+    """Inserta las tareas en una transacción y devuelve los segundos"""
+    filas = [(f"Tarea {i}", ESTADOS[i % 3], PRIORIDADES[i % 7 % 3], i % proyectos + 1, INICIO_US + i)
+             for i in range(cantidad)]
+    inicio = time.perf_counter()
+    with database.get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO tareas (descripcion, estado, prioridad, proyecto_id, fecha_creacion) "
+            "VALUES (?, ?, ?, ?, ?)", filas)
+        conn.commit()
+    return time.perf_counter() - inicio
+
+
+def por_llamada_ms(funcion, repeticiones: int) -> float:
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) / repeticiones * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tareas", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--proyectos", type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        for cantidad in args.tareas:
+            resultados = {}
+            for triggers in (False, True):
+                database.DB_NAME = os.path.join(directorio, f"bench_{cantidad}_{triggers}.db")
+                database.init_db()
+                if not triggers:
+                    with database.get_connection() as conn:
+                        for nombre in ("insert", "delete", "update"):
+                            conn.execute(f"DROP TRIGGER contadores_tareas_{nombre}")
+                for i in range(args.proyectos):
+                    database.crear_proyecto(f"Proyecto {i}")
+                resultados[triggers] = insertar(cantidad, args.proyectos)
+
+            repeticiones = max(3, 200_000 // cantidad)
+            anterior = por_llamada_ms(resumen_anterior, repeticiones)
+            actual = por_llamada_ms(database.obtener_resumen_general, 1000)
+            print(f"{cantidad:>9} tareas  resumen anterior {anterior:9.3f} ms  "
+                  f"contadores {actual:7.3f} ms  "
+                  f"inserción {resultados[False]:6.2f}s -> {resultados[True]:6.2f}s con triggers")
+            pool.reiniciar_pool()
+
+
+if __name__ == "__main__":
+    main()
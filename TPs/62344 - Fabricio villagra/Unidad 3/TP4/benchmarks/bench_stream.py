@@ -0,0 +1,143 @@
+"""
+Benchmark: memoria pico de GET /tareas como lista JSON y en streaming NDJSON.
+
+Ejecutar desde la carpeta TP4:
+
+    python benchmarks/bench_stream.py [--tareas 1000000]
+
+Cada modo corre en un proceso aparte, llama a la app ASGI directamente
+descartando el cuerpo a medida que llega, y reporta el máximo de memoria
+residente (ru_maxrss) por encima de la que tenía antes del request.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+CARPETA_TP4 = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, CARPETA_TP4)
+
+
+def rss_pico_mb() -> float:
+    # Linux informa ru_maxrss en KiB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def preparar(ruta: str, cantidad: int) -> None:
+    import database
+    import fechas
+    import pool
+
+    database.DB_NAME = ruta
+    database.init_db()
+    database.crear_proyecto("Benchmark")
+    estados = ["pendiente", "en_progreso", "completada"]
+    inicio_us = fechas.iso_a_us("2024-01-01T00:00:00")
+    prioridades = ["baja", "media", "alta"]
+    with database.get_connection() as conn:
+        for inicio in range(0, cantidad, 50_000):
+            conn.executemany(
+                "INSERT INTO tareas (descripcion, estado, prioridad, proyecto_id, fecha_creacion) "
+                "VALUES (?, ?, ?, 1, ?)",
+                [(f"Tarea número {i} del benchmark", estados[i % 3], prioridades[i % 3],
+                  inicio_us + i)
+                 for i in range(inicio, min(inicio + 50_000, cantidad))],
+            )
+        conn.commit()
+    # Los procesos hijos abren la base por su cuenta
+    pool.reiniciar_pool()
+
+
+async def llamar(app, query_string: bytes) -> dict:
+    """
+    Hace un GET /tareas directo contra la app ASGI y descarta el cuerpo a
+    medida que llega (TestClient lo juntaría entero en memoria).
+    """
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": "/tareas", "raw_path": b"/tareas",
+        "root_path": "", "query_string": query_string, "headers": [],
+        "client": ("bench", 1), "server": ("bench", 80),
+    }
+    recibido = {"bytes": 0, "status": None}
+    pedido_enviado = False
+    terminado = asyncio.Event()
+
+    async def receive():
+        # Como un servidor real: el request una vez y después nada hasta que
+        # el cliente se desconecta (StreamingResponse escucha la desconexión)
+        nonlocal pedido_enviado
+        if not pedido_enviado:
+            pedido_enviado = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await terminado.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(mensaje):
+        if mensaje["type"] == "http.response.start":
+            recibido["status"] = mensaje["status"]
+        elif mensaje["type"] == "http.response.body":
+            recibido["bytes"] += len(mensaje.get("body", b""))
+            if not mensaje.get("more_body", False):
+                terminado.set()
+
+    await app(scope, receive, send)
+    return recibido
+
+
+def medir(ruta: str, modo: str) -> dict:
+    """Se ejecuta en el proceso hijo"""
+    import database
+    from main import app
+
+    database.DB_NAME = ruta
+    asyncio.run(llamar(app, b"limit=1"))  # calentar imports y pool
+    base = rss_pico_mb()
+
+    inicio = time.perf_counter()
+    r = asyncio.run(llamar(app, b"" if modo == "lista" else b"formato=stream"))
+    segundos = time.perf_counter() - inicio
+
+    return {"status": r["status"], "bytes": r["bytes"], "segundos": segundos,
+            "rss_extra_mb": rss_pico_mb() - base}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tareas", type=int, default=1_000_000)
+    parser.add_argument("--modo", choices=["lista", "stream"], help=argparse.SUPPRESS)
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.modo:
+        print(json.dumps(medir(args.db, args.modo)))
+        return
+
+    # Perfil "test" en todos los procesos: sin mmap, así las páginas del
+    # archivo no suman RSS, y sin cambiar journal_mode entre procesos
+    os.environ["TAREAS_DB_PERFIL"] = "test"
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "bench_stream.db")
+        inicio = time.perf_counter()
+        preparar(ruta, args.tareas)
+        print(f"base con {args.tareas} tareas creada en {time.perf_counter() - inicio:.1f}s")
+
+        for modo in ("lista", "stream"):
+            salida = subprocess.run(
+                [sys.executable, __file__, "--modo", modo, "--db", ruta],
+                cwd=CARPETA_TP4, capture_output=True, text=True, check=True,
+            )
+            r = json.loads(salida.stdout.splitlines()[-1])
+            print(f"{modo:<7} status={r['status']}  {r['bytes'] / 2**20:8.1f} MB enviados  "
+                  f"{r['segundos']:7.2f}s  memoria extra: {r['rss_extra_mb']:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark: latencia de PUT /tareas/{id} y costo de actualizar_tarea.
+
+Ejecutar desde la carpeta TP4:
+
+    python benchmarks/bench_update.py [--repeticiones 3000]
+
+Compara actualizar_tarea (un UPDATE ... RETURNING) con la versión anterior
+(SELECT de existencia + un UPDATE por campo + SELECT final), y mide la
+parte de data layer del endpoint PUT, que antes además hacía
+obtener_tarea_por_id y proyecto_existe. La última línea es el PUT completo
+con TestClient (incluye validación, serialización y el cliente HTTP).
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import database  # noqa: E402
+import pool  # noqa: E402
+from main import app  # noqa: E402
+
+
+def actualizar_tarea_anterior(tarea_id, descripcion=None, estado=None, prioridad=None, proyecto_id=None):
+    """Copia de la implementación anterior, solo para comparar"""
+    with database.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM tareas WHERE id = ?", (tarea_id,))
+        if not cursor.fetchone():
+            return None
+        if descripcion is not None:
+            cursor.execute("UPDATE tareas SET descripcion = ? WHERE id = ?", (descripcion, tarea_id))
+        if estado is not None:
+            cursor.execute("UPDATE tareas SET estado = ? WHERE id = ?", (estado, tarea_id))
+        if prioridad is not None:
+            cursor.execute("UPDATE tareas SET prioridad = ? WHERE id = ?", (prioridad, tarea_id))
+        if proyecto_id is not None:
+            cursor.execute("UPDATE tareas SET proyecto_id = ? WHERE id = ?", (proyecto_id, tarea_id))
+        conn.commit()
+        cursor.execute("SELECT * FROM tareas WHERE id = ?", (tarea_id,))
+        return dict(cursor.fetchone())
+
+
+def flujo_put_anterior(tarea_id, descripcion, estado, prioridad, proyecto_id):
+    """Lo que hacía el endpoint PUT antes: dos verificaciones y la actualización"""
+    if database.obtener_tarea_por_id(tarea_id) and database.proyecto_existe(proyecto_id):
+        actualizar_tarea_anterior(tarea_id, descripcion, estado, prioridad, proyecto_id)
+
+
+def preparar(directorio: str) -> None:
+    database.DB_NAME = os.path.join(directorio, "bench_update.db")
+    database.init_db()
+    database.crear_proyecto("Alpha")
+    database.crear_proyecto("Beta")
+    for i in range(1000):
+        database.crear_tarea(f"Tarea {i}", "pendiente", "media", 1)
+
+
+def medir(funcion, repeticiones: int) -> dict:
+    estados = ["pendiente", "en_progreso", "completada"]
+    prioridades = ["baja", "media", "alta"]
+    latencias = []
+    for i in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion(i % 1000 + 1, f"Tarea editada {i}", estados[i % 3], prioridades[i % 3], 1 + i % 2)
+        latencias.append(time.perf_counter() - inicio)
+    latencias.sort()
+    return {
+        "p50_us": statistics.median(latencias) * 1e6,
+        "p95_us": latencias[int(len(latencias) * 0.95)] * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeticiones", type=int, default=3000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        preparar(directorio)
+        client = TestClient(app)
+
+        def put(tarea_id, descripcion, estado, prioridad, proyecto_id):
+            client.put(f"/tareas/{tarea_id}", json={
+                "descripcion": descripcion, "estado": estado,
+                "prioridad": prioridad, "proyecto_id": proyecto_id,
+            })
+
+        casos = [
+            ("actualizar_tarea anterior", actualizar_tarea_anterior),
+            ("actualizar_tarea RETURNING", database.actualizar_tarea),
+            ("flujo PUT anterior", flujo_put_anterior),
+            ("PUT /tareas/{id}", put),
+        ]
+        for nombre, funcion in casos:
+            r = medir(funcion, args.repeticiones)
+            print(f"{nombre:<28} p50={r['p50_us']:8.1f}us  p95={r['p95_us']:8.1f}us")
+        pool.reiniciar_pool()
+
+
+if __name__ == "__main__":
+    main()
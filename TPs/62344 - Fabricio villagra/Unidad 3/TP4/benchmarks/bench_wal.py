@@ -0,0 +1,132 @@
+"""
+Benchmark: lectores concurrentes de GET /tareas mientras un escritor tiene
+tomada la base, con journal_mode=DELETE (perfil "test") y WAL ("produccion").
+
+Ejecutar desde la carpeta TP4:
+
+    python benchmarks/bench_wal.py [--lectores 8] [--segundos 3]
+
+Levanta uvicorn (un worker) con el perfil a medir y le manda GET /tareas
+desde --lectores hilos a la vez, cada uno con su conexión keep-alive. En
+paralelo otro proceso (este script, con su propia conexión) repite: BEGIN
+EXCLUSIVE, inserta un lote, espera --retencion ms y hace COMMIT. Con DELETE
+los requests quedan bloqueados durante la retención; con WAL siguen leyendo
+la última versión confirmada.
+"""
+
+import argparse
+import http.client
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database  # noqa: E402
+import fechas  # noqa: E402
+import perfiles  # noqa: E402
+import pool  # noqa: E402
+from servidor import pedir, uvicorn_tp4  # noqa: E402
+
+
+def preparar(carpeta: str, perfil: str) -> str:
+    """Crea carpeta/tareas.db con el perfil (journal_mode queda guardado en el archivo)"""
+    os.environ["TAREAS_DB_PERFIL"] = perfil
+    os.mkdir(carpeta)
+    database.DB_NAME = os.path.join(carpeta, "tareas.db")
+    database.init_db()
+    proyecto = database.crear_proyecto("Benchmark")
+    with database.get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO tareas (descripcion, estado, prioridad, proyecto_id, fecha_creacion) "
+            "VALUES (?, 'pendiente', 'media', ?, ?)",
+            [(f"Tarea {i}", proyecto["id"], fechas.ahora()[0]) for i in range(200)],
+        )
+        conn.commit()
+    pool.reiniciar_pool()
+    return database.DB_NAME
+
+
+def escritor(ruta: str, perfil: str, parar: threading.Event, retencion: float) -> None:
+    conn = sqlite3.connect(ruta, isolation_level=None)
+    perfiles.aplicar_perfil(conn, perfil)
+    try:
+        while not parar.is_set():
+            conn.execute("BEGIN EXCLUSIVE")
+            conn.executemany(
+                "INSERT INTO tareas (descripcion, estado, prioridad, proyecto_id, fecha_creacion) "
+                "VALUES (?, 'pendiente', 'media', 1, ?)",
+                [(f"Escrita {i}", fechas.ahora()[0]) for i in range(50)],
+            )
+            time.sleep(retencion)
+            conn.execute("COMMIT")
+            time.sleep(0.001)
+    finally:
+        conn.close()
+
+
+def lector(puerto: int, parar: threading.Event, latencias: list, errores: list) -> None:
+    conexion = http.client.HTTPConnection("127.0.0.1", puerto, timeout=60)
+    while not parar.is_set():
+        inicio = time.perf_counter()
+        try:
+            ok = pedir(conexion, "GET", "/tareas?estado=pendiente&limit=100")[0] == 200
+        except (OSError, http.client.HTTPException):
+            conexion.close()
+            ok = False
+        latencias.append(time.perf_counter() - inicio)
+        if not ok:
+            errores.append(1)
+
+
+def medir(puerto: int, ruta: str, perfil: str, lectores: int, segundos: float, retencion: float) -> dict:
+    parar = threading.Event()
+    latencias, errores = [], []
+    hilos = [threading.Thread(target=escritor, args=(ruta, perfil, parar, retencion))]
+    hilos += [threading.Thread(target=lector, args=(puerto, parar, latencias, errores)) for _ in range(lectores)]
+    for hilo in hilos:
+        hilo.start()
+    time.sleep(segundos)
+    parar.set()
+    for hilo in hilos:
+        hilo.join()
+
+    latencias.sort()
+    return {
+        "lecturas": len(latencias),
+        "lecturas_por_seg": len(latencias) / segundos,
+        "p50_ms": statistics.median(latencias) * 1000,
+        "p95_ms": latencias[int(len(latencias) * 0.95)] * 1000,
+        "max_ms": latencias[-1] * 1000,
+        "errores": len(errores),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lectores", type=int, default=8)
+    parser.add_argument("--segundos", type=float, default=3.0)
+    parser.add_argument("--retencion", type=float, default=50, help="ms con el lock tomado")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        for perfil in ("test", "produccion"):
+            ruta = preparar(os.path.join(directorio, perfil), perfil)
+            # Un lugar en el pool por lector
+            entorno = {"TAREAS_DB_PERFIL": perfil, "TAREAS_POOL_SIZE": str(args.lectores)}
+            with uvicorn_tp4(os.path.dirname(ruta), entorno) as puerto:
+                r = medir(puerto, ruta, perfil, args.lectores, args.segundos, args.retencion / 1000)
+            modo = "DELETE" if perfil == "test" else "WAL"
+            print(
+                f"{perfil:<11} ({modo:<6}) {r['lecturas_por_seg']:8.1f} lecturas/s  "
+                f"p50={r['p50_ms']:7.2f}ms  p95={r['p95_ms']:7.2f}ms  "
+                f"max={r['max_ms']:7.2f}ms  errores={r['errores']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
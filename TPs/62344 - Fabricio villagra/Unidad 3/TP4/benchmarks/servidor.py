@@ -0,0 +1,61 @@
+"""
+Levanta la API del TP4 con uvicorn en un subproceso, para los benchmarks que
+miden requests concurrentes contra un servidor real (un event loop, un
+proceso) en vez de un TestClient por hilo.
+"""
+
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+CARPETA_TP4 = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def puerto_libre() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def uvicorn_tp4(directorio: str, entorno: Optional[Dict[str, str]] = None, workers: int = 1):
+    """
+    Corre main:app con cwd=`directorio` (la base es `directorio`/tareas.db) y
+    las variables de `entorno`; devuelve el puerto y lo detiene al salir.
+    """
+    puerto = puerto_libre()
+    servidor = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--app-dir", CARPETA_TP4, "--port", str(puerto),
+         "--workers", str(workers), "--log-level", "warning", "--timeout-graceful-shutdown", "1"],
+        cwd=directorio, env=dict(os.environ, PYTHONDONTWRITEBYTECODE="1", **(entorno or {})),
+    )
+    try:
+        limite = time.time() + 20
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", puerto), timeout=1).close()
+                break
+            except OSError:
+                if time.time() > limite or servidor.poll() is not None:
+                    sys.exit("error: uvicorn no levantó")
+                time.sleep(0.1)
+        yield puerto
+    finally:
+        servidor.terminate()
+        servidor.wait(10)
+
+
+def pedir(conexion: http.client.HTTPConnection, metodo: str, ruta: str,
+          cuerpo: Optional[dict] = None) -> Tuple[int, bytes]:
+    """Un request sobre una conexión keep-alive; devuelve (status, cuerpo)"""
+    datos = json.dumps(cuerpo).encode() if cuerpo is not None else None
+    headers = {"Content-Type": "application/json"} if datos is not None else {}
+    conexion.request(metodo, ruta, body=datos, headers=headers)
+    respuesta = conexion.getresponse()
+    return respuesta.status, respuesta.read()
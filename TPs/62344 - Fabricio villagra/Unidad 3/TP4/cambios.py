@@ -0,0 +1,200 @@
+"""
+Registro de cambios para la sincronización incremental (GET /cambios).
+
+La tabla `cambios` guarda una fila por cada proyecto o tarea que existió
+alguna vez, con la versión de su último cambio:
+
+- tabla       -> 'proyectos' o 'tareas'
+- registro_id -> id de la fila
+- version     -> número global que crece con cada INSERT, UPDATE o DELETE
+- borrado     -> 1 si la fila se eliminó (tombstone); el id no se reutiliza
+                 porque las dos tablas usan AUTOINCREMENT
+
+Los triggers la actualizan dentro de la misma transacción que la escritura
+(también los DELETE en CASCADE de las tareas de un proyecto). La versión
+nueva es MAX(version) + 1, que sale del final de idx_cambios_version; como
+SQLite ejecuta de a una transacción de escritura, las versiones nunca se
+repiten y quien lee una versión ya ve confirmadas todas las anteriores.
+
+Una fila que cambia muchas veces ocupa un solo lugar: lo que devuelve
+"cambios desde la versión N" es proporcional a las filas distintas que
+cambiaron, y se lee por rango de idx_cambios_version.
+
+`cambios_instancia` guarda un valor al azar elegido al crear el registro:
+si el archivo se borra y se vuelve a crear, las versiones empiezan de nuevo
+pero la instancia es otra. Instancia + versión es la versión de los datos
+que usan los ETag (ver LectorVersion).
+"""
+
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional
+
+
+TABLAS = ("proyectos", "tareas")
+
+TABLA = '''
+    CREATE TABLE IF NOT EXISTS cambios (
+        tabla TEXT NOT NULL,
+        registro_id INTEGER NOT NULL,
+        version INTEGER NOT NULL,
+        borrado INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (tabla, registro_id)
+    ) WITHOUT ROWID
+'''
+
+INDICE_VERSION = "CREATE UNIQUE INDEX IF NOT EXISTS idx_cambios_version ON cambios(version)"
+
+INSTANCIA = '''
+    CREATE TABLE IF NOT EXISTS cambios_instancia (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        valor TEXT NOT NULL
+    )
+'''
+
+_REGISTRAR = '''
+        INSERT INTO cambios (tabla, registro_id, version, borrado)
+        VALUES ('{tabla}', {fila}.id, (SELECT IFNULL(MAX(version), 0) + 1 FROM cambios), {borrado})
+        ON CONFLICT (tabla, registro_id) DO UPDATE
+        SET version = excluded.version, borrado = excluded.borrado;
+'''
+
+TRIGGERS = [
+    f"CREATE TRIGGER IF NOT EXISTS cambios_{tabla}_{evento.lower()} AFTER {evento} ON {tabla} BEGIN"
+    + _REGISTRAR.format(tabla=tabla, fila=fila, borrado=borrado) + "END"
+    for tabla in TABLAS
+    for evento, fila, borrado in (("INSERT", "NEW", 0), ("UPDATE", "NEW", 0), ("DELETE", "OLD", 1))
+]
+
+
+class VersionDesconocidaError(ValueError):
+    """Se pidieron cambios desde una versión que esta base todavía no tuvo"""
+
+
+def crear_cambios(cursor: sqlite3.Cursor) -> None:
+    """Crea la tabla, el índice y los triggers; si la tabla es nueva la llena"""
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'cambios'")
+    existia = cursor.fetchone() is not None
+
+    cursor.execute(TABLA)
+    cursor.execute(INDICE_VERSION)
+    cursor.execute(INSTANCIA)
+    cursor.execute("INSERT OR IGNORE INTO cambios_instancia (id, valor) VALUES (1, lower(hex(randomblob(4))))")
+    for trigger in TRIGGERS:
+        cursor.execute(trigger)
+
+    # Bases creadas antes de existir el registro: todas las filas actuales
+    # cuentan como cambios, así desde=0 devuelve el estado completo
+    if not existia:
+        for tabla in TABLAS:
+            cursor.execute(f'''
+                INSERT INTO cambios (tabla, registro_id, version, borrado)
+                SELECT '{tabla}', id,
+                       (SELECT IFNULL(MAX(version), 0) FROM cambios) + ROW_NUMBER() OVER (ORDER BY id), 0
+                FROM {tabla}
+            ''')
+
+
+def version_actual(cursor: sqlite3.Cursor) -> int:
+    """Versión del último cambio (0 si no hubo ninguno)"""
+    cursor.execute("SELECT IFNULL(MAX(version), 0) FROM cambios")
+    return cursor.fetchone()[0]
+
+
+def leer_cambios(cursor: sqlite3.Cursor, desde: int, limite: int) -> Dict[str, Any]:
+    """
+    Filas insertadas o modificadas y ids borrados con versión mayor a `desde`,
+    de a lo sumo `limite` cambios en orden de versión.
+
+    Usar dentro de una transacción para que el registro y las filas salgan
+    de la misma foto de la base. `version` es hasta dónde llega la
+    respuesta: el próximo `desde`. Un `desde` mayor que la versión actual
+    (la base se recreó) lanza VersionDesconocidaError.
+    """
+    if desde > version_actual(cursor):
+        raise VersionDesconocidaError(f"La versión {desde} no existe en esta base")
+
+    cursor.execute(
+        "SELECT tabla, registro_id, version, borrado FROM cambios "
+        "WHERE version > ? ORDER BY version LIMIT ?",
+        (desde, limite + 1)
+    )
+    registro = cursor.fetchall()
+    hay_mas = len(registro) > limite
+    registro = registro[:limite]
+
+    resultado: Dict[str, Any] = {
+        "desde": desde,
+        "version": registro[-1]["version"] if registro else desde,
+        "hay_mas": hay_mas,
+        "proyectos": [],
+        "tareas": [],
+        "borrados": {tabla: [] for tabla in TABLAS},
+    }
+    vigentes: Dict[str, List[int]] = {tabla: [] for tabla in TABLAS}
+    for tabla, registro_id, _, borrado in registro:
+        (resultado["borrados"][tabla] if borrado else vigentes[tabla]).append(registro_id)
+
+    # Búsquedas por clave primaria, a lo sumo `limite` ids (tope de la página)
+    for tabla, ids in vigentes.items():
+        if ids:
+            marcas = ", ".join("?" * len(ids))
+            cursor.execute(f"SELECT * FROM {tabla} WHERE id IN ({marcas}) ORDER BY id", ids)
+            resultado[tabla] = [dict(fila) for fila in cursor.fetchall()]
+    return resultado
+
+
+class LectorVersion:
+    """
+    Lee "<instancia>-<versión>" de una base con una conexión propia, fuera
+    del pool. Vale para cualquier proceso que escriba el archivo (otros
+    workers de uvicorn, Herramientas/carga.py, el CLI de sqlite3): todos
+    pasan por los triggers de `cambios`.
+
+    PRAGMA data_version cambia cuando otra conexión confirma algo, así que la
+    consulta a `cambios` solo se repite después de una escritura. Si cambia
+    la ruta o el archivo se reemplaza (otro inodo), se reabre. La conexión no
+    espera locks: con la base bloqueada devuelve None, igual que si la base
+    no tiene el registro de cambios.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._ruta: Optional[str] = None
+        self._inodo: Optional[int] = None
+        self._data_version: Optional[int] = None
+        self._version: Optional[str] = None
+
+    def leer(self, ruta: str) -> Optional[str]:
+        with self._lock:
+            try:
+                # stat antes de conectar: connect() crearía un archivo vacío
+                inodo = os.stat(ruta).st_ino
+                if self._conn is None or ruta != self._ruta or inodo != self._inodo:
+                    self._cerrar()
+                    self._conn = sqlite3.connect(ruta, timeout=0, check_same_thread=False)
+                    self._ruta, self._inodo = ruta, inodo
+
+                data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+                if data_version != self._data_version or self._version is None:
+                    instancia, version = self._conn.execute(
+                        "SELECT (SELECT valor FROM cambios_instancia), IFNULL(MAX(version), 0) FROM cambios"
+                    ).fetchone()
+                    self._data_version = data_version
+                    self._version = f"{instancia}-{version}" if instancia else None
+                return self._version
+            except (OSError, sqlite3.Error):
+                self._cerrar()
+                return None
+
+    def cerrar(self) -> None:
+        with self._lock:
+            self._cerrar()
+
+    def _cerrar(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+        self._conn = None
+        self._ruta = self._inodo = self._data_version = self._version = None
@@ -0,0 +1,35 @@
+"""
+Fixtures compartidas por los tests del TP4.
+
+No son autouse: cada módulo las activa con
+`pytestmark = pytest.mark.usefixtures("db_temporal")`. El corrector copia la
+suite del curso a esta misma carpeta y esa suite maneja su propia base.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+import database
+import escritor
+import main
+import pool
+
+
+@pytest.fixture
+def base_temporal(tmp_path, monkeypatch):
+    """Cada test usa su propio archivo de base en un directorio temporal"""
+    monkeypatch.setattr(database, "DB_NAME", str(tmp_path / "tareas.db"))
+    yield
+    escritor.detener_escritor()
+    pool.reiniciar_pool()
+
+
+@pytest.fixture
+def db_temporal(base_temporal):
+    """base_temporal con el esquema ya creado por init_db()"""
+    database.init_db()
+
+
+@pytest.fixture
+def client():
+    return TestClient(main.app)
@@ -0,0 +1,177 @@
+"""
+Contadores de tareas mantenidos por triggers.
+
+La tabla `contadores` guarda una fila por (proyecto_id, campo, valor):
+
+- campo 'total'     -> cantidad de tareas (valor '')
+- campo 'estado'    -> cantidad de tareas con ese estado
+- campo 'prioridad' -> cantidad de tareas con esa prioridad
+- campo 'proyectos' -> cantidad de proyectos (solo en proyecto_id 0)
+
+proyecto_id 0 acumula los totales de toda la aplicación. Los triggers de
+`tareas` y `proyectos` la actualizan dentro de la misma transacción que la
+escritura, así que los resúmenes se leen sin recorrer tareas.
+
+Ejecutar desde la carpeta TP4 para verificar (y con --reparar, reconstruir)
+los contadores de tareas.db:
+
+    python contadores.py [--reparar]
+"""
+
+import sqlite3
+from typing import Dict, List, Tuple
+
+
+GENERAL = 0
+
+TABLA = '''
+    CREATE TABLE IF NOT EXISTS contadores (
+        proyecto_id INTEGER NOT NULL,
+        campo TEXT NOT NULL,
+        valor TEXT NOT NULL,
+        cantidad INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (proyecto_id, campo, valor)
+    ) WITHOUT ROWID
+'''
+
+# "Proyecto con más tareas" sale del primer elemento de este índice
+INDICE_RANKING = (
+    "CREATE INDEX IF NOT EXISTS idx_contadores_ranking "
+    "ON contadores(campo, cantidad DESC, proyecto_id)"
+)
+
+_SUMAR = '''
+        INSERT INTO contadores (proyecto_id, campo, valor, cantidad) VALUES
+            ({fila}.proyecto_id, 'total', '', 1),
+            ({fila}.proyecto_id, 'estado', {fila}.estado, 1),
+            ({fila}.proyecto_id, 'prioridad', {fila}.prioridad, 1),
+            (0, 'total', '', 1),
+            (0, 'estado', {fila}.estado, 1),
+            (0, 'prioridad', {fila}.prioridad, 1)
+        ON CONFLICT (proyecto_id, campo, valor) DO UPDATE SET cantidad = cantidad + 1;
+'''
+
+# Se resta con UPDATE (no upsert) para no recrear filas de un proyecto que
+# se está borrando
+_RESTAR = '''
+        UPDATE contadores SET cantidad = cantidad - 1
+        WHERE proyecto_id IN (0, {fila}.proyecto_id)
+          AND ((campo = 'total' AND valor = '')
+               OR (campo = 'estado' AND valor = {fila}.estado)
+               OR (campo = 'prioridad' AND valor = {fila}.prioridad));
+'''
+
+TRIGGERS = [
+    "CREATE TRIGGER IF NOT EXISTS contadores_tareas_insert AFTER INSERT ON tareas BEGIN"
+    + _SUMAR.format(fila="NEW") + "END",
+
+    "CREATE TRIGGER IF NOT EXISTS contadores_tareas_delete AFTER DELETE ON tareas BEGIN"
+    + _RESTAR.format(fila="OLD") + "END",
+
+    "CREATE TRIGGER IF NOT EXISTS contadores_tareas_update "
+    "AFTER UPDATE OF estado, prioridad, proyecto_id ON tareas BEGIN"
+    + _RESTAR.format(fila="OLD") + _SUMAR.format(fila="NEW") + "END",
+
+    '''CREATE TRIGGER IF NOT EXISTS contadores_proyectos_insert AFTER INSERT ON proyectos BEGIN
+        INSERT INTO contadores (proyecto_id, campo, valor, cantidad) VALUES (0, 'proyectos', '', 1)
+        ON CONFLICT (proyecto_id, campo, valor) DO UPDATE SET cantidad = cantidad + 1;
+        INSERT OR IGNORE INTO contadores (proyecto_id, campo, valor, cantidad) VALUES (NEW.id, 'total', '', 0);
+    END''',
+
+    # Las tareas borradas por CASCADE ya restaron antes de este trigger
+    '''CREATE TRIGGER IF NOT EXISTS contadores_proyectos_delete AFTER DELETE ON proyectos BEGIN
+        UPDATE contadores SET cantidad = cantidad - 1 WHERE proyecto_id = 0 AND campo = 'proyectos';
+        DELETE FROM contadores WHERE proyecto_id = OLD.id;
+    END''',
+]
+
+# Los mismos contadores calculados desde cero
+_DESDE_CERO = '''
+    SELECT p.id, 'total', '', COUNT(t.id) FROM proyectos p
+    LEFT JOIN tareas t ON t.proyecto_id = p.id GROUP BY p.id
+    UNION ALL SELECT proyecto_id, 'estado', estado, COUNT(*) FROM tareas GROUP BY proyecto_id, estado
+    UNION ALL SELECT proyecto_id, 'prioridad', prioridad, COUNT(*) FROM tareas GROUP BY proyecto_id, prioridad
+    UNION ALL SELECT 0, 'total', '', COUNT(*) FROM tareas
+    UNION ALL SELECT 0, 'estado', estado, COUNT(*) FROM tareas GROUP BY estado
+    UNION ALL SELECT 0, 'prioridad', prioridad, COUNT(*) FROM tareas GROUP BY prioridad
+    UNION ALL SELECT 0, 'proyectos', '', COUNT(*) FROM proyectos
+'''
+
+Clave = Tuple[int, str, str]
+
+
+def crear_contadores(cursor: sqlite3.Cursor) -> None:
+    """Crea la tabla, el índice y los triggers; si la tabla es nueva la llena"""
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'contadores'")
+    existia = cursor.fetchone() is not None
+
+    cursor.execute(TABLA)
+    cursor.execute(INDICE_RANKING)
+    for trigger in TRIGGERS:
+        cursor.execute(trigger)
+
+    # Bases creadas antes de existir los contadores
+    if not existia:
+        reconstruir_contadores(cursor)
+
+
+def _como_dict(filas) -> Dict[Clave, int]:
+    # Una fila en 0 equivale a que no exista
+    return {(p, campo, valor): cantidad for p, campo, valor, cantidad in filas if cantidad}
+
+
+def verificar_contadores(cursor: sqlite3.Cursor) -> List[Dict]:
+    """
+    Compara los contadores guardados con los calculados desde cero.
+
+    Devuelve una lista de diferencias (vacía si todo coincide).
+    """
+    cursor.execute("SELECT proyecto_id, campo, valor, cantidad FROM contadores")
+    guardados = _como_dict(cursor.fetchall())
+    cursor.execute(_DESDE_CERO)
+    esperados = _como_dict(cursor.fetchall())
+
+    diferencias = []
+    for clave in sorted(guardados.keys() | esperados.keys()):
+        if guardados.get(clave, 0) != esperados.get(clave, 0):
+            proyecto_id, campo, valor = clave
+            diferencias.append({
+                "proyecto_id": proyecto_id,
+                "campo": campo,
+                "valor": valor,
+                "guardado": guardados.get(clave, 0),
+                "esperado": esperados.get(clave, 0),
+            })
+    return diferencias
+
+
+def reconstruir_contadores(cursor: sqlite3.Cursor) -> None:
+    """Borra los contadores y los vuelve a calcular (no hace commit)"""
+    cursor.execute("DELETE FROM contadores")
+    cursor.execute(
+        "INSERT INTO contadores (proyecto_id, campo, valor, cantidad) " + _DESDE_CERO
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    import database
+
+    parser = argparse.ArgumentParser(description="Verifica los contadores de tareas.db")
+    parser.add_argument("--reparar", action="store_true", help="reconstruir si hay diferencias")
+    args = parser.parse_args()
+
+    database.init_db()
+    diferencias = database.verificar_contadores()
+    for d in diferencias:
+        print(f"proyecto {d['proyecto_id']:>5} {d['campo']}={d['valor']!r}: "
+              f"guardado {d['guardado']}, esperado {d['esperado']}")
+
+    if not diferencias:
+        print("Contadores consistentes")
+    elif args.reparar:
+        database.reconstruir_contadores()
+        print(f"{len(diferencias)} diferencias corregidas")
+    else:
+        raise SystemExit(1)
@@ -1,217 +1,381 @@
+import os
 import sqlite3
-from typing import Optional, List, Dict, Any
+import threading
+from concurrent.futures import Future
+from typing import Optional, List, Dict, Any, Tuple, Iterator
 from datetime import datetime
 
+import cambios
+import contadores
+import eventos
+import fechas
+from escritor import EscritorAgrupado, obtener_escritor
+from metricas import medir_datos
+import perfilador
+from perfiles import aplicar_perfil, perfil_activo
+from pool import PoolConexiones, obtener_pool, reiniciar_pool
+
 
 DB_NAME = "tareas.db"
 
+# Filas por fetchmany en las respuestas en streaming
+TAMANO_LOTE = 500
+
+# Respuestas en streaming abiertas a la vez; la siguiente recibe 503
+MAX_STREAMS = int(os.environ.get("TAREAS_MAX_STREAMS", "8"))
+_streams = threading.BoundedSemaphore(MAX_STREAMS)
+
+
+class StreamsAgotadosError(Exception):
+    """Se lanza cuando ya hay MAX_STREAMS respuestas en streaming abiertas"""
+
+# Índices secundarios. Todas las consultas de tareas filtran por alguna
+# combinación de proyecto_id / estado / prioridad y ordenan por fecha_creacion,
+# por eso cada índice termina en fecha_creacion: el filtro y el orden salen
+# del mismo índice sin ordenar en memoria.
+INDICES = [
+    # Clave foránea: ON DELETE CASCADE y conteos/listados por proyecto
+    "CREATE INDEX IF NOT EXISTS idx_tareas_proyecto_fecha ON tareas(proyecto_id, fecha_creacion)",
+    # Filtros combinados dentro de un proyecto y resúmenes por proyecto
+    "CREATE INDEX IF NOT EXISTS idx_tareas_proyecto_estado_prioridad "
+    "ON tareas(proyecto_id, estado, prioridad, fecha_creacion)",
+    # GET /tareas?estado=...
+    "CREATE INDEX IF NOT EXISTS idx_tareas_estado_fecha ON tareas(estado, fecha_creacion)",
+    # GET /tareas?estado=...&prioridad=...
+    "CREATE INDEX IF NOT EXISTS idx_tareas_estado_prioridad_fecha ON tareas(estado, prioridad, fecha_creacion)",
+    # GET /tareas?prioridad=...
+    "CREATE INDEX IF NOT EXISTS idx_tareas_prioridad_fecha ON tareas(prioridad, fecha_creacion)",
+    # GET /tareas sin filtros, ordenado por fecha
+    "CREATE INDEX IF NOT EXISTS idx_tareas_fecha ON tareas(fecha_creacion)",
+    # GET /proyectos ordenado por fecha
+    "CREATE INDEX IF NOT EXISTS idx_proyectos_fecha ON proyectos(fecha_creacion)",
+]
+
+# fecha_creacion en microsegundos (ver fechas.py); el CHECK rechaza el texto
+# que guardaban las versiones anteriores
+TABLA_TAREAS = '''
+    CREATE TABLE IF NOT EXISTS {nombre} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        descripcion TEXT NOT NULL,
+        estado TEXT NOT NULL,
+        prioridad TEXT NOT NULL,
+        proyecto_id INTEGER NOT NULL,
+        fecha_creacion FECHA NOT NULL CHECK (typeof(fecha_creacion) = 'integer'),
+        FOREIGN KEY (proyecto_id) REFERENCES proyectos(id) ON DELETE CASCADE
+    )
+'''
+
+
+def pool_db(tamano: Optional[int] = None) -> PoolConexiones:
+    """
+    Devuelve el pool de conexiones de DB_NAME.
+
+    Cada conexión nueva recibe los PRAGMA del perfil activo (ver perfiles.py).
+    Con el perfilador SQL activo las conexiones son ConexionPerfilada (ver
+    perfilador.py); activarlo o desactivarlo recrea el pool.
+    """
+    return obtener_pool(DB_NAME, tamano=tamano, configurar=aplicar_perfil,
+                        fabrica=perfilador.fabrica())
+
 
 def get_connection():
-    """Devuelve una conexión a la base de datos"""
-    conn = sqlite3.connect(DB_NAME)
-    conn.row_factory = sqlite3.Row
-    # Habilitar claves foráneas (importante para ON DELETE CASCADE)
-    conn.execute("PRAGMA foreign_keys = ON")
-    return conn
+    """
+    Presta una conexión del pool del proceso.
+
+    Se usa con `with get_connection() as conn:`; al salir del bloque la
+    conexión vuelve al pool (lo que no se haya confirmado con commit se
+    descarta, igual que al cerrarla).
+    """
+    return pool_db().conexion()
+
+
+def estadisticas_pool() -> Dict[str, Any]:
+    """Devuelve las estadísticas del pool de conexiones"""
+    stats = pool_db().estadisticas()
+    stats["perfil"] = perfil_activo()
+    return stats
+
+
+_lector_version = cambios.LectorVersion()
+
+
+def version_datos() -> Optional[str]:
+    """
+    Versión de los datos de DB_NAME, compartida por todos los procesos que la
+    escriben (ver cambios.LectorVersion). None si no se puede leer.
+    """
+    return _lector_version.leer(DB_NAME)
 
 
 def init_db():
     """Inicializa la base de datos y crea las tablas si no existen"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    # Crear tabla de proyectos
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS proyectos (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            nombre TEXT NOT NULL UNIQUE,
-            descripcion TEXT,
-            fecha_creacion TEXT NOT NULL
-        )
-    ''')
-    
-    # Crear tabla de tareas con relación a proyectos
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS tareas (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            descripcion TEXT NOT NULL,
-            estado TEXT NOT NULL,
-            prioridad TEXT NOT NULL,
-            proyecto_id INTEGER NOT NULL,
-            fecha_creacion TEXT NOT NULL,
-            FOREIGN KEY (proyecto_id) REFERENCES proyectos(id) ON DELETE CASCADE
-        )
-    ''')
-    
+    # Si el archivo se borró y se vuelve a crear (como hacen los tests), las
+    # conexiones del pool apuntarían al archivo viejo: se descartan.
+    reiniciar_pool()
+
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        # Crear tabla de proyectos
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS proyectos (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                nombre TEXT NOT NULL UNIQUE,
+                descripcion TEXT,
+                fecha_creacion TEXT NOT NULL
+            )
+        ''')
+
+        # Crear tabla de tareas con relación a proyectos
+        cursor.execute(TABLA_TAREAS.format(nombre="tareas"))
+        _migrar_fecha_tareas(conn)
+
+        for indice in INDICES:
+            cursor.execute(indice)
+
+        # Contadores para los resúmenes, mantenidos por triggers
+        contadores.crear_contadores(cursor)
+
+        # Registro de cambios para GET /cambios, también por triggers
+        cambios.crear_cambios(cursor)
+
+        conn.commit()
+
+
+def _migrar_fecha_tareas(conn: sqlite3.Connection) -> None:
+    """
+    Bases anteriores: pasa tareas.fecha_creacion de texto ISO a microsegundos.
+
+    SQLite no cambia el tipo de una columna, así que se arma la tabla nueva,
+    se copian las filas convirtiendo la fecha, se borra la vieja y se
+    renombra la nueva. Los índices y triggers de tareas se borran con la
+    tabla; init_db los vuelve a crear después. Se conserva el último id de
+    AUTOINCREMENT para que no se reutilicen ids borrados.
+    """
+    columnas = {fila["name"]: fila["type"] for fila in conn.execute("PRAGMA table_info(tareas)")}
+    if columnas["fecha_creacion"].upper() == "FECHA":
+        return
+
     conn.commit()
-    conn.close()
+    conn.create_function("iso_a_us", 1, fechas.iso_a_us, deterministic=True)
+    # Fuera de una transacción: si no, el PRAGMA no tiene efecto
+    conn.execute("PRAGMA foreign_keys = OFF")
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute(TABLA_TAREAS.format(nombre="tareas_migracion"))
+        conn.execute('''
+            INSERT INTO tareas_migracion (id, descripcion, estado, prioridad, proyecto_id, fecha_creacion)
+            SELECT id, descripcion, estado, prioridad, proyecto_id, iso_a_us(fecha_creacion) FROM tareas
+        ''')
+        fila = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'tareas'").fetchone()
+        conn.execute("DROP TABLE tareas")
+        conn.execute("ALTER TABLE tareas_migracion RENAME TO tareas")
+        if fila:
+            conn.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'tareas'", (fila["seq"],))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.create_function("iso_a_us", 1, None)
+
+
+def verificar_contadores() -> List[Dict[str, Any]]:
+    """Diferencias entre los contadores guardados y los calculados desde cero"""
+    with get_connection() as conn:
+        return contadores.verificar_contadores(conn.cursor())
+
+
+def reconstruir_contadores() -> None:
+    """Recalcula todos los contadores desde las tablas tareas y proyectos"""
+    with get_connection() as conn:
+        contadores.reconstruir_contadores(conn.cursor())
+        conn.commit()
 
 
 # ============== FUNCIONES DE PROYECTOS ==============
 
+@medir_datos
 def crear_proyecto(nombre: str, descripcion: Optional[str] = None) -> Dict[str, Any]:
     """Crea un nuevo proyecto"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    fecha_creacion = datetime.now().isoformat()
-    
-    cursor.execute('''
-        INSERT INTO proyectos (nombre, descripcion, fecha_creacion)
-        VALUES (?, ?, ?)
-    ''', (nombre, descripcion, fecha_creacion))
-    
-    conn.commit()
-    proyecto_id = cursor.lastrowid
-    conn.close()
-    
-    return {
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        fecha_creacion = datetime.now().isoformat()
+
+        cursor.execute('''
+            INSERT INTO proyectos (nombre, descripcion, fecha_creacion)
+            VALUES (?, ?, ?)
+        ''', (nombre, descripcion, fecha_creacion))
+
+        conn.commit()
+        proyecto_id = cursor.lastrowid
+
+    proyecto = {
         "id": proyecto_id,
         "nombre": nombre,
         "descripcion": descripcion,
         "fecha_creacion": fecha_creacion
     }
+    eventos.publicar("proyecto.creado", proyecto, proyecto_id)
+    return proyecto
 
 
+@medir_datos
 def obtener_proyectos(nombre: Optional[str] = None) -> List[Dict[str, Any]]:
     """Obtiene todos los proyectos con filtro opcional por nombre"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    query = "SELECT * FROM proyectos WHERE 1=1"
-    params = []
-    
-    if nombre:
-        query += " AND nombre LIKE ?"
-        params.append(f"%{nombre}%")
-    
-    query += " ORDER BY fecha_creacion DESC"
-    
-    cursor.execute(query, params)
-    proyectos = cursor.fetchall()
-    conn.close()
-    
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        query = "SELECT * FROM proyectos WHERE 1=1"
+        params = []
+
+        if nombre:
+            query += " AND nombre LIKE ?"
+            params.append(f"%{nombre}%")
+
+        query += " ORDER BY fecha_creacion DESC"
+
+        cursor.execute(query, params)
+        proyectos = cursor.fetchall()
+
     return [dict(proyecto) for proyecto in proyectos]
 
 
+@medir_datos
 def obtener_proyecto_por_id(proyecto_id: int) -> Optional[Dict[str, Any]]:
     """Obtiene un proyecto específico con contador de tareas"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT * FROM proyectos WHERE id = ?", (proyecto_id,))
-    proyecto = cursor.fetchone()
-    
-    if not proyecto:
-        conn.close()
-        return None
-    
-    # Contar tareas asociadas
-    cursor.execute("SELECT COUNT(*) as cantidad FROM tareas WHERE proyecto_id = ?", (proyecto_id,))
-    cantidad = cursor.fetchone()["cantidad"]
-    
-    conn.close()
-    
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT * FROM proyectos WHERE id = ?", (proyecto_id,))
+        proyecto = cursor.fetchone()
+
+        if not proyecto:
+            return None
+
+        # Contar tareas asociadas
+        cursor.execute("SELECT COUNT(*) as cantidad FROM tareas WHERE proyecto_id = ?", (proyecto_id,))
+        cantidad = cursor.fetchone()["cantidad"]
+
     proyecto_dict = dict(proyecto)
     proyecto_dict["total_tareas"] = cantidad
-    
+
     return proyecto_dict
 
 
-def actualizar_proyecto(proyecto_id: int, nombre: Optional[str] = None, 
+def _actualizar_con(cursor: sqlite3.Cursor, tabla: str, registro_id: int,
+                    campos: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Actualiza los campos dados con un solo UPDATE ... RETURNING * (no hace commit).
+
+    Si el id no existe el UPDATE no afecta ninguna fila y no devuelve nada:
+    la existencia sale de la misma sentencia, sin un SELECT previo. Los
+    nombres de columna vienen siempre del código, nunca del cliente.
+    """
+    if not campos:
+        cursor.execute(f"SELECT * FROM {tabla} WHERE id = ?", (registro_id,))
+    else:
+        asignaciones = ", ".join(f"{campo} = ?" for campo in campos)
+        cursor.execute(
+            f"UPDATE {tabla} SET {asignaciones} WHERE id = ? RETURNING *",
+            (*campos.values(), registro_id)
+        )
+    registro = cursor.fetchone()
+    return dict(registro) if registro else None
+
+
+def _actualizar(tabla: str, registro_id: int, campos: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Igual que _actualizar_con, con su propia conexión y commit"""
+    with get_connection() as conn:
+        registro = _actualizar_con(conn.cursor(), tabla, registro_id, campos)
+        if campos:
+            conn.commit()
+    return registro
+
+
+@medir_datos
+def actualizar_proyecto(proyecto_id: int, nombre: Optional[str] = None,
                        descripcion: Optional[str] = None) -> Optional[Dict[str, Any]]:
-    """Actualiza un proyecto existente"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    # Verificar que existe
-    cursor.execute("SELECT * FROM proyectos WHERE id = ?", (proyecto_id,))
-    if not cursor.fetchone():
-        conn.close()
-        return None
-    
-    # Actualizar campos proporcionados
-    if nombre is not None:
-        cursor.execute("UPDATE proyectos SET nombre = ? WHERE id = ?", (nombre, proyecto_id))
-    
-    if descripcion is not None:
-        cursor.execute("UPDATE proyectos SET descripcion = ? WHERE id = ?", (descripcion, proyecto_id))
-    
-    conn.commit()
-    
-    # Obtener proyecto actualizado
-    cursor.execute("SELECT * FROM proyectos WHERE id = ?", (proyecto_id,))
-    proyecto = cursor.fetchone()
-    conn.close()
-    
-    return dict(proyecto)
+    """
+    Actualiza un proyecto existente (None si no existe).
 
+    Un nombre repetido lanza sqlite3.IntegrityError (UNIQUE).
+    """
+    campos = {campo: valor for campo, valor in {"nombre": nombre, "descripcion": descripcion}.items()
+              if valor is not None}
+    proyecto = _actualizar("proyectos", proyecto_id, campos)
+    if proyecto and campos:
+        eventos.publicar("proyecto.actualizado", proyecto, proyecto_id)
+    return proyecto
 
+
+@medir_datos
 def eliminar_proyecto(proyecto_id: int) -> bool:
     """Elimina un proyecto y sus tareas (CASCADE)"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT * FROM proyectos WHERE id = ?", (proyecto_id,))
-    if not cursor.fetchone():
-        conn.close()
-        return False
-    
-    cursor.execute("DELETE FROM proyectos WHERE id = ?", (proyecto_id,))
-    conn.commit()
-    conn.close()
-    
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT * FROM proyectos WHERE id = ?", (proyecto_id,))
+        if not cursor.fetchone():
+            return False
+
+        cursor.execute("DELETE FROM proyectos WHERE id = ?", (proyecto_id,))
+        conn.commit()
+
+    # Sus tareas se borraron en CASCADE: no hay un evento por cada una
+    eventos.publicar("proyecto.eliminado", {"id": proyecto_id}, proyecto_id)
     return True
 
 
+@medir_datos
+def contar_tareas_proyecto(proyecto_id: int) -> int:
+    """Cuenta las tareas asociadas a un proyecto"""
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) as count FROM tareas WHERE proyecto_id = ?", (proyecto_id,))
+        return cursor.fetchone()[0]
+
+
+@medir_datos
 def proyecto_existe(proyecto_id: int) -> bool:
     """Verifica si un proyecto existe"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT id FROM proyectos WHERE id = ?", (proyecto_id,))
-    existe = cursor.fetchone() is not None
-    
-    conn.close()
-    return existe
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT id FROM proyectos WHERE id = ?", (proyecto_id,))
+        return cursor.fetchone() is not None
 
 
+@medir_datos
 def nombre_proyecto_existe(nombre: str, excluir_id: Optional[int] = None) -> bool:
     """Verifica si un nombre de proyecto ya existe"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    if excluir_id:
-        cursor.execute("SELECT id FROM proyectos WHERE nombre = ? AND id != ?", (nombre, excluir_id))
-    else:
-        cursor.execute("SELECT id FROM proyectos WHERE nombre = ?", (nombre,))
-    
-    existe = cursor.fetchone() is not None
-    
-    conn.close()
-    return existe
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        if excluir_id:
+            cursor.execute("SELECT id FROM proyectos WHERE nombre = ? AND id != ?", (nombre, excluir_id))
+        else:
+            cursor.execute("SELECT id FROM proyectos WHERE nombre = ?", (nombre,))
+
+        return cursor.fetchone() is not None
 
 
 # ============== FUNCIONES DE TAREAS ==============
 
-def crear_tarea(descripcion: str, estado: str, prioridad: str, proyecto_id: int) -> Dict[str, Any]:
-    """Crea una nueva tarea"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    fecha_creacion = datetime.now().isoformat()
-    
+def _insertar_tarea(cursor: sqlite3.Cursor, descripcion: str, estado: str, prioridad: str,
+                    proyecto_id: int) -> Dict[str, Any]:
+    """INSERT de una tarea (no hace commit)"""
+    fecha_us, fecha_creacion = fechas.ahora()
+
     cursor.execute('''
         INSERT INTO tareas (descripcion, estado, prioridad, proyecto_id, fecha_creacion)
         VALUES (?, ?, ?, ?, ?)
-    ''', (descripcion, estado, prioridad, proyecto_id, fecha_creacion))
-    
-    conn.commit()
-    tarea_id = cursor.lastrowid
-    conn.close()
-    
+    ''', (descripcion, estado, prioridad, proyecto_id, fecha_us))
+
     return {
-        "id": tarea_id,
+        "id": cursor.lastrowid,
         "descripcion": descripcion,
         "estado": estado,
         "prioridad": prioridad,
@@ -220,187 +384,380 @@ def crear_tarea(descripcion: str, estado: str, prioridad: str, proyecto_id: int)
     }
 
 
-def obtener_tareas(estado: Optional[str] = None, prioridad: Optional[str] = None,
-                   proyecto_id: Optional[int] = None, orden: str = "asc") -> List[Dict[str, Any]]:
-    """Obtiene todas las tareas con filtros opcionales"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
+@medir_datos
+def crear_tarea(descripcion: str, estado: str, prioridad: str, proyecto_id: int) -> Dict[str, Any]:
+    """Crea una nueva tarea"""
+    with get_connection() as conn:
+        tarea = _insertar_tarea(conn.cursor(), descripcion, estado, prioridad, proyecto_id)
+        conn.commit()
+    eventos.publicar("tarea.creada", tarea, proyecto_id)
+    return tarea
+
+
+@medir_datos
+def crear_tareas_lote(proyecto_id: int, tareas: List[Tuple[str, str, str]]) -> List[int]:
+    """
+    Inserta varias tareas (descripcion, estado, prioridad) en una transacción.
+
+    Un solo executemany y un solo commit. Devuelve los ids creados en el
+    mismo orden: mientras dura la transacción nadie más puede insertar y
+    AUTOINCREMENT asigna ids consecutivos, así que salen del último id.
+    """
+    if not tareas:
+        return []
+
+    filas = [
+        (descripcion, estado, prioridad, proyecto_id, fechas.ahora()[0])
+        for descripcion, estado, prioridad in tareas
+    ]
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.executemany('''
+            INSERT INTO tareas (descripcion, estado, prioridad, proyecto_id, fecha_creacion)
+            VALUES (?, ?, ?, ?, ?)
+        ''', filas)
+        cursor.execute("SELECT last_insert_rowid()")
+        ultimo_id = cursor.fetchone()[0]
+
+        conn.commit()
+
+    ids = list(range(ultimo_id - len(tareas) + 1, ultimo_id + 1))
+    if eventos.hay_suscriptores():
+        for tarea_id, (descripcion, estado, prioridad, _, fecha_us) in zip(ids, filas):
+            eventos.publicar("tarea.creada", {
+                "id": tarea_id, "descripcion": descripcion, "estado": estado, "prioridad": prioridad,
+                "proyecto_id": proyecto_id, "fecha_creacion": fechas.us_a_iso(fecha_us),
+            }, proyecto_id)
+    return ids
+
+
+def _filtrar_fechas(query: str, params: list, desde: Optional[datetime],
+                   hasta: Optional[datetime], prefijo: str = "") -> str:
+    """Rango [desde, hasta) sobre fecha_creacion: sale del mismo índice que el orden"""
+    if desde is not None:
+        query += f" AND {prefijo}fecha_creacion >= ?"
+        params.append(fechas.a_us(desde))
+    if hasta is not None:
+        query += f" AND {prefijo}fecha_creacion < ?"
+        params.append(fechas.a_us(hasta))
+    return query
+
+
+def _paginar(query: str, params: list, orden: str, limite: Optional[int],
+             despues_de: Optional[Tuple[str, int]], prefijo: str = "") -> str:
+    """
+    Agrega a la consulta la condición de keyset, el orden y el LIMIT.
+
+    Se ordena por (fecha_creacion, id) para que el orden sea total aunque dos
+    tareas tengan la misma fecha. `despues_de` es la clave de la última fila
+    de la página anterior: la consulta sigue desde ahí usando el índice, así
+    que una página profunda cuesta lo mismo que la primera (a diferencia de
+    OFFSET, que recorre y descarta todas las filas anteriores).
+    """
+    direccion = "DESC" if orden == "desc" else "ASC"
+
+    if despues_de is not None:
+        comparador = "<" if orden == "desc" else ">"
+        query += f" AND ({prefijo}fecha_creacion, {prefijo}id) {comparador} (?, ?)"
+        fecha, ultimo_id = despues_de
+        params.extend((fechas.iso_a_us(fecha), ultimo_id))
+
+    query += f" ORDER BY {prefijo}fecha_creacion {direccion}, {prefijo}id {direccion}"
+
+    if limite is not None:
+        query += " LIMIT ?"
+        params.append(limite)
+
+    return query
+
+
+def _consulta_tareas(estado: Optional[str], prioridad: Optional[str], proyecto_id: Optional[int],
+                     orden: str, limite: Optional[int], despues_de: Optional[Tuple[str, int]],
+                     desde: Optional[datetime], hasta: Optional[datetime]) -> Tuple[str, list]:
+    """Arma la consulta de GET /tareas con sus parámetros"""
     query = """
-        SELECT t.*, p.nombre as proyecto_nombre 
+        SELECT t.*, p.nombre as proyecto_nombre
         FROM tareas t
         JOIN proyectos p ON t.proyecto_id = p.id
         WHERE 1=1
     """
     params = []
-    
+
     if estado:
         query += " AND t.estado = ?"
         params.append(estado)
-    
+
     if prioridad:
         query += " AND t.prioridad = ?"
         params.append(prioridad)
-    
+
     if proyecto_id:
         query += " AND t.proyecto_id = ?"
         params.append(proyecto_id)
-    
-    if orden == "desc":
-        query += " ORDER BY t.fecha_creacion DESC"
-    else:
-        query += " ORDER BY t.fecha_creacion ASC"
-    
-    cursor.execute(query, params)
-    tareas = cursor.fetchall()
-    conn.close()
-    
+
+    query = _filtrar_fechas(query, params, desde, hasta, prefijo="t.")
+    query = _paginar(query, params, orden, limite, despues_de, prefijo="t.")
+    return query, params
+
+
+@medir_datos
+def obtener_tareas(estado: Optional[str] = None, prioridad: Optional[str] = None,
+                   proyecto_id: Optional[int] = None, orden: str = "asc",
+                   limite: Optional[int] = None,
+                   despues_de: Optional[Tuple[str, int]] = None,
+                   desde: Optional[datetime] = None,
+                   hasta: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """
+    Obtiene todas las tareas con filtros opcionales.
+
+    `limite` y `despues_de` permiten paginar por (fecha_creacion, id);
+    `desde` (inclusive) y `hasta` (exclusive) filtran por fecha_creacion.
+    """
+    query, params = _consulta_tareas(estado, prioridad, proyecto_id, orden, limite, despues_de,
+                                     desde, hasta)
+
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        tareas = cursor.fetchall()
+
     return [dict(tarea) for tarea in tareas]
 
 
+@medir_datos
+def iterar_tareas(estado: Optional[str] = None, prioridad: Optional[str] = None,
+                  proyecto_id: Optional[int] = None, orden: str = "asc",
+                  limite: Optional[int] = None,
+                  despues_de: Optional[Tuple[str, int]] = None,
+                  desde: Optional[datetime] = None,
+                  hasta: Optional[datetime] = None,
+                  lote: int = TAMANO_LOTE) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Igual que obtener_tareas pero devuelve las filas de a lotes con fetchmany.
+
+    En memoria solo hay un lote a la vez. La lectura usa una conexión propia,
+    fuera del pool, que queda abierta hasta que el generador termina o se
+    cierra; a lo sumo hay MAX_STREAMS a la vez (si no, StreamsAgotadosError
+    al pedir el primer lote). La lectura es una sola transacción: con WAL no
+    bloquea a los escritores; con journal_mode=DELETE sí.
+    """
+    query, params = _consulta_tareas(estado, prioridad, proyecto_id, orden, limite, despues_de,
+                                     desde, hasta)
+
+    if not _streams.acquire(blocking=False):
+        raise StreamsAgotadosError(f"Ya hay {MAX_STREAMS} respuestas en streaming abiertas")
+    try:
+        with pool_db().conexion_aparte() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            while True:
+                filas = cursor.fetchmany(lote)
+                if not filas:
+                    break
+                yield [dict(fila) for fila in filas]
+    finally:
+        _streams.release()
+
+
+@medir_datos
 def obtener_tareas_por_proyecto(proyecto_id: int, estado: Optional[str] = None,
-                                prioridad: Optional[str] = None, orden: str = "asc") -> List[Dict[str, Any]]:
+                                prioridad: Optional[str] = None, orden: str = "asc",
+                                limite: Optional[int] = None,
+                                despues_de: Optional[Tuple[str, int]] = None,
+                                desde: Optional[datetime] = None,
+                                hasta: Optional[datetime] = None) -> List[Dict[str, Any]]:
     """Obtiene todas las tareas de un proyecto específico"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    query = "SELECT * FROM tareas WHERE proyecto_id = ?"
-    params = [proyecto_id]
-    
-    if estado:
-        query += " AND estado = ?"
-        params.append(estado)
-    
-    if prioridad:
-        query += " AND prioridad = ?"
-        params.append(prioridad)
-    
-    if orden == "desc":
-        query += " ORDER BY fecha_creacion DESC"
-    else:
-        query += " ORDER BY fecha_creacion ASC"
-    
-    cursor.execute(query, params)
-    tareas = cursor.fetchall()
-    conn.close()
-    
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        query = "SELECT * FROM tareas WHERE proyecto_id = ?"
+        params = [proyecto_id]
+
+        if estado:
+            query += " AND estado = ?"
+            params.append(estado)
+
+        if prioridad:
+            query += " AND prioridad = ?"
+            params.append(prioridad)
+
+        query = _filtrar_fechas(query, params, desde, hasta)
+        query = _paginar(query, params, orden, limite, despues_de)
+
+        cursor.execute(query, params)
+        tareas = cursor.fetchall()
+
     return [dict(tarea) for tarea in tareas]
 
 
+@medir_datos
 def obtener_tarea_por_id(tarea_id: int) -> Optional[Dict[str, Any]]:
     """Obtiene una tarea específica"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT * FROM tareas WHERE id = ?", (tarea_id,))
-    tarea = cursor.fetchone()
-    
-    conn.close()
-    
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT * FROM tareas WHERE id = ?", (tarea_id,))
+        tarea = cursor.fetchone()
+
     return dict(tarea) if tarea else None
 
 
+@medir_datos
 def actualizar_tarea(tarea_id: int, descripcion: Optional[str] = None,
                     estado: Optional[str] = None, prioridad: Optional[str] = None,
                     proyecto_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
-    """Actualiza una tarea existente"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    # Verificar que existe
-    cursor.execute("SELECT * FROM tareas WHERE id = ?", (tarea_id,))
-    if not cursor.fetchone():
-        conn.close()
-        return None
-    
-    # Actualizar campos proporcionados
-    if descripcion is not None:
-        cursor.execute("UPDATE tareas SET descripcion = ? WHERE id = ?", (descripcion, tarea_id))
-    
-    if estado is not None:
-        cursor.execute("UPDATE tareas SET estado = ? WHERE id = ?", (estado, tarea_id))
-    
-    if prioridad is not None:
-        cursor.execute("UPDATE tareas SET prioridad = ? WHERE id = ?", (prioridad, tarea_id))
-    
-    if proyecto_id is not None:
-        cursor.execute("UPDATE tareas SET proyecto_id = ? WHERE id = ?", (proyecto_id, tarea_id))
-    
-    conn.commit()
-    
-    # Obtener tarea actualizada
-    cursor.execute("SELECT * FROM tareas WHERE id = ?", (tarea_id,))
-    tarea = cursor.fetchone()
-    conn.close()
-    
-    return dict(tarea)
+    """
+    Actualiza una tarea existente (None si no existe).
+
+    Un proyecto_id inexistente lanza sqlite3.IntegrityError (clave foránea).
+    """
+    campos = _campos_tarea(descripcion, estado, prioridad, proyecto_id)
+    tarea = _actualizar("tareas", tarea_id, campos)
+    if campos:
+        _publicar_actualizacion(tarea, campos)
+    return tarea
+
+
+def _publicar_actualizacion(tarea: Optional[Dict[str, Any]], campos: Dict[str, Any]) -> None:
+    # Si cambió de proyecto el evento va también a quienes siguen el proyecto
+    # anterior, que no se conoce sin otra consulta: va a todos
+    if tarea:
+        eventos.publicar("tarea.actualizada", tarea, tarea["proyecto_id"], a_todos="proyecto_id" in campos)
+
+
+def _campos_tarea(descripcion, estado, prioridad, proyecto_id) -> Dict[str, Any]:
+    campos = {
+        "descripcion": descripcion,
+        "estado": estado,
+        "prioridad": prioridad,
+        "proyecto_id": proyecto_id,
+    }
+    return {campo: valor for campo, valor in campos.items() if valor is not None}
+
+
+# ============== ESCRITURAS AGRUPADAS ==============
+
+def escritor_db() -> EscritorAgrupado:
+    """
+    Devuelve el escritor agrupado del proceso (ver escritor.py).
+
+    Cada lote pide una conexión al pool de DB_NAME, así que sigue a la base
+    actual aunque cambie DB_NAME.
+    """
+    return obtener_escritor(lambda: pool_db().conexion_dedicada())
+
+
+def crear_tarea_agrupada(descripcion: str, estado: str, prioridad: str,
+                         proyecto_id: int) -> Future:
+    """Como crear_tarea, pero encolada: el Future se resuelve después del COMMIT del lote"""
+    futuro = escritor_db().enviar(_insertar_tarea, descripcion, estado, prioridad, proyecto_id)
+    _al_confirmar(futuro, lambda tarea: eventos.publicar("tarea.creada", tarea, proyecto_id))
+    return futuro
+
+
+def actualizar_tarea_agrupada(tarea_id: int, descripcion: Optional[str] = None,
+                              estado: Optional[str] = None, prioridad: Optional[str] = None,
+                              proyecto_id: Optional[int] = None) -> Future:
+    """Como actualizar_tarea, pero encolada en el escritor agrupado"""
+    campos = _campos_tarea(descripcion, estado, prioridad, proyecto_id)
+    futuro = escritor_db().enviar(_actualizar_con, "tareas", tarea_id, campos)
+    if campos:
+        _al_confirmar(futuro, lambda tarea: _publicar_actualizacion(tarea, campos))
+    return futuro
 
 
+def _al_confirmar(futuro: Future, publicar) -> None:
+    """Llama a `publicar(resultado)` cuando la operación se confirmó sin error"""
+    def listo(f: Future) -> None:
+        if not f.cancelled() and f.exception() is None:
+            publicar(f.result())
+    futuro.add_done_callback(listo)
+
+
+@medir_datos
 def eliminar_tarea(tarea_id: int) -> bool:
     """Elimina una tarea"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT * FROM tareas WHERE id = ?", (tarea_id,))
-    if not cursor.fetchone():
-        conn.close()
-        return False
-    
-    cursor.execute("DELETE FROM tareas WHERE id = ?", (tarea_id,))
-    conn.commit()
-    conn.close()
-    
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT * FROM tareas WHERE id = ?", (tarea_id,))
+        tarea = cursor.fetchone()
+        if not tarea:
+            return False
+
+        cursor.execute("DELETE FROM tareas WHERE id = ?", (tarea_id,))
+        conn.commit()
+
+    eventos.publicar("tarea.eliminada", {"id": tarea_id, "proyecto_id": tarea["proyecto_id"]},
+                     tarea["proyecto_id"])
     return True
 
 
+# ============== SINCRONIZACIÓN ==============
+
+@medir_datos
+def obtener_cambios(desde: int, limite: int) -> Dict[str, Any]:
+    """
+    Proyectos y tareas que cambiaron después de la versión `desde` (ver
+    cambios.py), leídos en una sola transacción.
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("BEGIN")
+        try:
+            return cambios.leer_cambios(cursor, desde, limite)
+        finally:
+            conn.rollback()
+
+
 # ============== FUNCIONES DE RESUMEN ==============
 
+def _leer_contadores(cursor: sqlite3.Cursor, proyecto_id: int) -> Dict[str, Dict[str, int]]:
+    """Lee los contadores de un proyecto (o los generales con GENERAL)"""
+    cursor.execute(
+        "SELECT campo, valor, cantidad FROM contadores WHERE proyecto_id = ? AND cantidad > 0",
+        (proyecto_id,)
+    )
+    leidos: Dict[str, Dict[str, int]] = {"total": {}, "estado": {}, "prioridad": {}, "proyectos": {}}
+    for row in cursor.fetchall():
+        leidos[row["campo"]][row["valor"]] = row["cantidad"]
+    return leidos
+
+
+@medir_datos
 def obtener_resumen_proyecto(proyecto_id: int) -> Optional[Dict[str, Any]]:
-    """Obtiene estadísticas de un proyecto"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    # Verificar que el proyecto existe
-    cursor.execute("SELECT nombre FROM proyectos WHERE id = ?", (proyecto_id,))
-    proyecto = cursor.fetchone()
-    
-    if not proyecto:
-        conn.close()
-        return None
-    
-    # Total de tareas
-    cursor.execute("SELECT COUNT(*) as total FROM tareas WHERE proyecto_id = ?", (proyecto_id,))
-    total_tareas = cursor.fetchone()["total"]
-    
-    # Por estado
-    cursor.execute("""
-        SELECT estado, COUNT(*) as cantidad
-        FROM tareas
-        WHERE proyecto_id = ?
-        GROUP BY estado
-    """, (proyecto_id,))
-    por_estado = {row["estado"]: row["cantidad"] for row in cursor.fetchall()}
-    
-    # Por prioridad
-    cursor.execute("""
-        SELECT prioridad, COUNT(*) as cantidad
-        FROM tareas
-        WHERE proyecto_id = ?
-        GROUP BY prioridad
-    """, (proyecto_id,))
-    por_prioridad = {row["prioridad"]: row["cantidad"] for row in cursor.fetchall()}
-    
-    conn.close()
-    
+    """
+    Obtiene estadísticas de un proyecto.
+
+    Se lee de la tabla contadores (ver contadores.py): el costo no depende
+    de la cantidad de tareas.
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        # Verificar que el proyecto existe
+        cursor.execute("SELECT nombre FROM proyectos WHERE id = ?", (proyecto_id,))
+        proyecto = cursor.fetchone()
+
+        if not proyecto:
+            return None
+
+        leidos = _leer_contadores(cursor, proyecto_id)
+
+    total_tareas = leidos["total"].get("", 0)
+    por_estado = leidos["estado"]
+    por_prioridad = leidos["prioridad"]
+
     # Asegurar que todos los estados y prioridades aparezcan
     for estado in ["pendiente", "en_progreso", "completada"]:
         if estado not in por_estado:
             por_estado[estado] = 0
-    
+
     for prioridad in ["baja", "media", "alta"]:
         if prioridad not in por_prioridad:
             por_prioridad[prioridad] = 0
-    
+
     return {
         "proyecto_id": proyecto_id,
         "proyecto_nombre": proyecto["nombre"],
@@ -410,51 +767,43 @@ def obtener_resumen_proyecto(proyecto_id: int) -> Optional[Dict[str, Any]]:
     }
 
 
+@medir_datos
 def obtener_resumen_general() -> Dict[str, Any]:
-    """Obtiene resumen general de toda la aplicación"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    # Total de proyectos
-    cursor.execute("SELECT COUNT(*) as total FROM proyectos")
-    total_proyectos = cursor.fetchone()["total"]
-    
-    # Total de tareas
-    cursor.execute("SELECT COUNT(*) as total FROM tareas")
-    total_tareas = cursor.fetchone()["total"]
-    
-    # Tareas por estado
-    cursor.execute("""
-        SELECT estado, COUNT(*) as cantidad
-        FROM tareas
-        GROUP BY estado
-    """)
-    tareas_por_estado = {row["estado"]: row["cantidad"] for row in cursor.fetchall()}
-    
+    """
+    Obtiene resumen general de toda la aplicación.
+
+    Los totales salen de la fila general de contadores y el proyecto con más
+    tareas del primer elemento de idx_contadores_ranking.
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        leidos = _leer_contadores(cursor, contadores.GENERAL)
+
+        # Proyecto con más tareas (a igual cantidad, el de menor id)
+        cursor.execute("""
+            SELECT p.id, p.nombre, c.cantidad as cantidad_tareas
+            FROM contadores c
+            JOIN proyectos p ON p.id = c.proyecto_id
+            WHERE c.campo = 'total' AND c.proyecto_id != 0
+            ORDER BY c.cantidad DESC, c.proyecto_id ASC
+            LIMIT 1
+        """)
+        proyecto_mas_tareas = cursor.fetchone()
+
+    tareas_por_estado = leidos["estado"]
+
     # Asegurar que todos los estados aparezcan
     for estado in ["pendiente", "en_progreso", "completada"]:
         if estado not in tareas_por_estado:
             tareas_por_estado[estado] = 0
-    
-    # Proyecto con más tareas
-    cursor.execute("""
-        SELECT p.id, p.nombre, COUNT(t.id) as cantidad_tareas
-        FROM proyectos p
-        LEFT JOIN tareas t ON p.id = t.proyecto_id
-        GROUP BY p.id
-        ORDER BY cantidad_tareas DESC
-        LIMIT 1
-    """)
-    proyecto_mas_tareas = cursor.fetchone()
-    
-    conn.close()
-    
+
     resultado = {
-        "total_proyectos": total_proyectos,
-        "total_tareas": total_tareas,
+        "total_proyectos": leidos["proyectos"].get("", 0),
+        "total_tareas": leidos["total"].get("", 0),
         "tareas_por_estado": tareas_por_estado
     }
-    
+
     if proyecto_mas_tareas and proyecto_mas_tareas["cantidad_tareas"] > 0:
         resultado["proyecto_con_mas_tareas"] = {
             "id": proyecto_mas_tareas["id"],
@@ -463,5 +812,5 @@ def obtener_resumen_general() -> Dict[str, Any]:
         }
     else:
         resultado["proyecto_con_mas_tareas"] = None
-    
-    return resultado
\ No newline at end of file
+
+    return resultado
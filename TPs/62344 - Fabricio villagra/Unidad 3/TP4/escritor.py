@@ -0,0 +1,169 @@
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, ContextManager, Dict, List, Optional, Tuple
+
+
+# Con TAREAS_ESCRITOR=1 los POST de tareas y los PUT/PATCH de tareas pasan
+# por el escritor agrupado en lugar de hacer cada uno su commit
+ACTIVO = os.environ.get("TAREAS_ESCRITOR", "0") == "1"
+
+# Un lote se cierra al juntar MAX_OPERACIONES o al pasar MAX_ESPERA_MS desde
+# la primera operación, lo que ocurra antes
+MAX_OPERACIONES = int(os.environ.get("TAREAS_ESCRITOR_LOTE", "64"))
+MAX_ESPERA_MS = float(os.environ.get("TAREAS_ESCRITOR_ESPERA_MS", "2"))
+
+Operacion = Tuple[Callable[..., Any], tuple, Future]
+
+_FIN = object()
+
+
+class EscritorCerradoError(RuntimeError):
+    """Se encoló una operación en un escritor que ya se detuvo"""
+
+
+class EscritorAgrupado:
+    """
+    Hilo único que ejecuta las escrituras encoladas en lotes, con un solo
+    COMMIT por lote.
+
+    - `enviar(operacion, *args)` devuelve un Future; la operación se llama
+      como `operacion(cursor, *args)` y no debe hacer commit.
+    - Cada operación corre dentro de su propio SAVEPOINT: si lanza una
+      excepción se deshace solo esa operación y su Future recibe el error;
+      las demás del lote se confirman igual.
+    - Los Futures se resuelven recién después del COMMIT: un resultado
+      entregado ya es tan durable como un commit individual con el mismo
+      PRAGMA synchronous. Si falla el BEGIN o el COMMIT no se confirma nada
+      del lote y todas sus operaciones reciben el error.
+    - Una operación cancelada antes de empezar (el cliente se desconectó)
+      no se ejecuta.
+    """
+
+    def __init__(self, prestar: Callable[[], ContextManager[sqlite3.Connection]],
+                 max_operaciones: int = MAX_OPERACIONES, max_espera_ms: float = MAX_ESPERA_MS):
+        self._prestar = prestar
+        self.max_operaciones = max_operaciones
+        self.max_espera = max_espera_ms / 1000
+        self._cola: "queue.Queue" = queue.Queue()
+        self._hilo: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._cerrado = False
+        self._stats = {"lotes": 0, "operaciones": 0, "errores": 0, "lotes_fallidos": 0}
+
+    def enviar(self, operacion: Callable[..., Any], *args) -> Future:
+        """Encola `operacion(cursor, *args)` y devuelve el Future de su resultado"""
+        futuro: Future = Future()
+        with self._lock:
+            if self._cerrado:
+                raise EscritorCerradoError("El escritor agrupado está detenido")
+            if self._hilo is None:
+                self._hilo = threading.Thread(target=self._correr, name="escritor-agrupado", daemon=True)
+                self._hilo.start()
+            self._cola.put((operacion, args, futuro))
+        return futuro
+
+    def detener(self) -> None:
+        """Procesa lo que ya estaba encolado y termina el hilo"""
+        with self._lock:
+            if self._cerrado:
+                return
+            self._cerrado = True
+            hilo = self._hilo
+            self._cola.put(_FIN)
+        if hilo is not None:
+            hilo.join()
+
+    def estadisticas(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    # ---------- hilo del escritor ----------
+
+    def _correr(self) -> None:
+        seguir = True
+        while seguir:
+            lote, seguir = self._juntar_lote()
+            if lote:
+                self._procesar(lote)
+
+    def _juntar_lote(self) -> Tuple[List[Operacion], bool]:
+        primero = self._cola.get()
+        if primero is _FIN:
+            return [], False
+
+        lote = [primero]
+        limite = time.monotonic() + self.max_espera
+        while len(lote) < self.max_operaciones:
+            restante = limite - time.monotonic()
+            try:
+                item = self._cola.get(timeout=restante) if restante > 0 else self._cola.get_nowait()
+            except queue.Empty:
+                break
+            if item is _FIN:
+                return lote, False
+            lote.append(item)
+        return lote, True
+
+    def _procesar(self, lote: List[Operacion]) -> None:
+        resultados = []
+        try:
+            with self._prestar() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                cursor = conn.cursor()
+                for operacion, args, futuro in lote:
+                    if not futuro.set_running_or_notify_cancel():
+                        continue
+                    cursor.execute("SAVEPOINT operacion")
+                    try:
+                        resultados.append((futuro, True, operacion(cursor, *args)))
+                    except Exception as e:
+                        cursor.execute("ROLLBACK TO operacion")
+                        resultados.append((futuro, False, e))
+                    cursor.execute("RELEASE operacion")
+                conn.commit()
+        except Exception as e:
+            # No se confirmó nada: todas las operaciones del lote fallan
+            for _, _, futuro in lote:
+                if not futuro.done():
+                    futuro.set_exception(e)
+            with self._lock:
+                self._stats["lotes_fallidos"] += 1
+            return
+
+        errores = 0
+        for futuro, ok, valor in resultados:
+            if ok:
+                futuro.set_result(valor)
+            else:
+                futuro.set_exception(valor)
+                errores += 1
+        with self._lock:
+            self._stats["lotes"] += 1
+            self._stats["operaciones"] += len(resultados)
+            self._stats["errores"] += errores
+
+
+_escritor: Optional[EscritorAgrupado] = None
+_escritor_lock = threading.Lock()
+
+
+def obtener_escritor(prestar: Callable[[], ContextManager[sqlite3.Connection]]) -> EscritorAgrupado:
+    """Devuelve el escritor del proceso, creándolo (con `prestar`) si hace falta"""
+    global _escritor
+    with _escritor_lock:
+        if _escritor is None:
+            _escritor = EscritorAgrupado(prestar)
+        return _escritor
+
+
+def detener_escritor() -> None:
+    """Detiene el escritor del proceso (el próximo obtener_escritor crea otro)"""
+    global _escritor
+    with _escritor_lock:
+        escritor, _escritor = _escritor, None
+    if escritor is not None:
+        escritor.detener()
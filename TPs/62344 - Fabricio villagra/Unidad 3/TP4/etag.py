@@ -0,0 +1,87 @@
+import hashlib
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.responses import Response
+
+from database import version_datos
+
+
+# GETs que se pueden revalidar con If-None-Match (la ruta y todo lo que cuelga)
+RUTAS_CACHEABLES = ("/tareas", "/proyectos", "/resumen", "/cambios")
+
+
+def es_cacheable(metodo: str, ruta: str) -> bool:
+    return metodo == "GET" and any(
+        ruta == base or ruta.startswith(base + "/") for base in RUTAS_CACHEABLES
+    )
+
+
+def calcular_etag(version: str, ruta: str, query: bytes, accept: str) -> str:
+    """
+    ETag de una respuesta: la versión de los datos más un hash de lo que
+    define el contenido (ruta, query string y Accept, que elige JSON o NDJSON).
+    """
+    clave = hashlib.blake2b(digest_size=8)
+    clave.update(ruta.encode())
+    clave.update(b"?" + query)
+    clave.update(b"|" + accept.encode())
+    return f'"{version}-{clave.hexdigest()}"'
+
+
+def coincide(if_none_match: Optional[str], etag: str) -> bool:
+    """True si el ETag está en el If-None-Match (comparación débil, como pide HTTP)"""
+    if not if_none_match:
+        return False
+    return any(
+        candidato.strip().removeprefix("W/") == etag
+        for candidato in if_none_match.split(",")
+    )
+
+
+class ETagMiddleware:
+    """
+    Agrega ETag a los GET cacheables y responde 304 sin llegar a la base si
+    el cliente ya tiene esa versión.
+
+    La versión sale de la base (ver database.version_datos), así que vale
+    con varios workers y con escrituras hechas por fuera de la API. Se lee
+    antes de ejecutar la consulta: si una escritura termina en el medio, la
+    respuesta queda con la versión vieja y el próximo pedido la vuelve a
+    traer (nunca al revés). Si no se puede leer, el GET sigue sin ETag.
+    La lectura es sqlite3 bloqueante: corre en el threadpool, no en el loop.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not es_cacheable(scope["method"], scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        version = await run_in_threadpool(version_datos)
+        if version is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        etag = calcular_etag(version, scope["path"], scope["query_string"],
+                             headers.get("accept", ""))
+
+        if coincide(headers.get("if-none-match"), etag):
+            respuesta = Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+            await respuesta(scope, receive, send)
+            return
+
+        async def enviar(mensaje):
+            if mensaje["type"] == "http.response.start" and mensaje["status"] == 200:
+                mensaje["headers"] = list(mensaje.get("headers", [])) + [
+                    (b"etag", etag.encode()),
+                    (b"cache-control", b"no-cache"),
+                    (b"vary", b"Accept"),
+                ]
+            await send(mensaje)
+
+        await self.app(scope, receive, enviar)
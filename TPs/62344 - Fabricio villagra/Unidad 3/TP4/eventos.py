@@ -0,0 +1,172 @@
+"""
+Difusor de eventos en memoria para GET /eventos (Server-Sent Events).
+
+Las funciones de escritura de database.py publican un evento después de
+cada COMMIT ("tarea.creada", "proyecto.eliminado", ...). El difusor lo
+codifica una sola vez como mensaje SSE y lo copia a la cola de cada
+suscripción que corresponde; no hay consultas a la base por suscriptor.
+
+- Las suscripciones viven en el event loop del servidor. `publicar` se puede
+  llamar desde cualquier hilo (el escritor agrupado publica desde el suyo):
+  fuera del loop el reparto se agenda con call_soon_threadsafe.
+- Cada cola tiene un tope (TAREAS_EVENTOS_COLA). Un cliente que no lee a
+  tiempo y lo llena queda cortado: se descartan sus eventos pendientes y
+  su stream termina con un evento "cortado". Los demás no esperan por él.
+- Sin suscriptores `publicar` no hace nada.
+"""
+
+import asyncio
+import os
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set
+
+from respuestas import a_json
+
+
+# Eventos pendientes por suscripción antes de cortarla
+MAX_COLA = int(os.environ.get("TAREAS_EVENTOS_COLA", "256"))
+
+# Segundos sin eventos tras los que se manda un comentario ": latido"
+LATIDO_SEGUNDOS = float(os.environ.get("TAREAS_EVENTOS_LATIDO", "15"))
+
+
+class Suscripcion:
+    """Cola acotada de mensajes SSE ya codificados, filtrada por proyecto"""
+
+    def __init__(self, proyecto_id: Optional[int], max_cola: int):
+        self.proyecto_id = proyecto_id
+        self.max_cola = max_cola
+        self.cortada = False
+        self._pendientes: Deque[bytes] = deque()
+        self._hay = asyncio.Event()
+
+    def _entregar(self, mensaje: bytes) -> bool:
+        """Encola el mensaje; si la cola está llena corta la suscripción"""
+        if len(self._pendientes) >= self.max_cola:
+            self.cortada = True
+            self._pendientes.clear()
+            self._hay.set()
+            return False
+        self._pendientes.append(mensaje)
+        self._hay.set()
+        return True
+
+    async def siguientes(self, timeout: float = LATIDO_SEGUNDOS) -> List[bytes]:
+        """Espera hasta `timeout` segundos y devuelve todo lo pendiente ([] si no llegó nada)"""
+        if not self._pendientes and not self.cortada:
+            try:
+                await asyncio.wait_for(self._hay.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+        self._hay.clear()
+        mensajes = list(self._pendientes)
+        self._pendientes.clear()
+        return mensajes
+
+
+class Difusor:
+    """Reparte los eventos publicados entre las suscripciones de un event loop"""
+
+    def __init__(self):
+        self._todas: Set[Suscripcion] = set()
+        self._por_proyecto: Dict[int, Set[Suscripcion]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ultimo_id = 0
+        self._lock = threading.Lock()
+        self._stats = {"publicados": 0, "entregados": 0, "cortadas": 0}
+
+    def suscriptores(self) -> int:
+        return len(self._todas) + sum(len(s) for s in self._por_proyecto.values())
+
+    def activo(self) -> bool:
+        """True si hay al menos una suscripción"""
+        return bool(self._todas or self._por_proyecto)
+
+    def suscribir(self, proyecto_id: Optional[int] = None, max_cola: int = MAX_COLA) -> Suscripcion:
+        """Crea una suscripción (a todo o a un proyecto); llamar desde el event loop"""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            if self.suscriptores():
+                raise RuntimeError("El difusor ya tiene suscripciones en otro event loop")
+            self._loop = loop
+        suscripcion = Suscripcion(proyecto_id, max_cola)
+        if proyecto_id is None:
+            self._todas.add(suscripcion)
+        else:
+            self._por_proyecto.setdefault(proyecto_id, set()).add(suscripcion)
+        return suscripcion
+
+    def desuscribir(self, suscripcion: Suscripcion) -> None:
+        if suscripcion.proyecto_id is None:
+            self._todas.discard(suscripcion)
+            return
+        grupo = self._por_proyecto.get(suscripcion.proyecto_id)
+        if grupo is not None:
+            grupo.discard(suscripcion)
+            if not grupo:
+                del self._por_proyecto[suscripcion.proyecto_id]
+
+    def publicar(self, nombre: str, datos: Dict[str, Any], proyecto_id: Optional[int],
+                 a_todos: bool = False) -> None:
+        """
+        Publica el evento `nombre` ("tarea.creada", ...) con `datos` para las
+        suscripciones sin filtro y las de `proyecto_id`. Con `a_todos` le
+        llega también a las de los demás proyectos (una tarea que cambió de
+        proyecto deja de pertenecer a otro).
+        """
+        loop = self._loop
+        if loop is None or not self.activo():
+            return
+        try:
+            actual = asyncio.get_running_loop()
+        except RuntimeError:
+            actual = None
+        if actual is loop:
+            self._repartir(nombre, datos, proyecto_id, a_todos)
+            return
+        try:
+            loop.call_soon_threadsafe(self._repartir, nombre, datos, proyecto_id, a_todos)
+        except RuntimeError:
+            pass  # el loop ya se cerró: no queda nadie escuchando
+
+    def _repartir(self, nombre: str, datos: Dict[str, Any], proyecto_id: Optional[int],
+                  a_todos: bool) -> None:
+        # Corre en el loop: los ids salen en el mismo orden en que se entregan
+        self._ultimo_id += 1
+        mensaje = b"id: %d\nevent: %s\ndata: %s\n\n" % (self._ultimo_id, nombre.encode(), a_json(datos))
+
+        destinos = list(self._todas)
+        if a_todos:
+            for grupo in self._por_proyecto.values():
+                destinos.extend(grupo)
+        elif proyecto_id is not None:
+            destinos.extend(self._por_proyecto.get(proyecto_id, ()))
+
+        cortadas = 0
+        for suscripcion in destinos:
+            if not suscripcion._entregar(mensaje):
+                self.desuscribir(suscripcion)
+                cortadas += 1
+        with self._lock:
+            self._stats["publicados"] += 1
+            self._stats["entregados"] += len(destinos) - cortadas
+            self._stats["cortadas"] += cortadas
+
+    def estadisticas(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, "suscriptores": self.suscriptores()}
+
+
+# Difusor del proceso: uno por worker de uvicorn
+difusor = Difusor()
+
+
+def publicar(nombre: str, datos: Dict[str, Any], proyecto_id: Optional[int], a_todos: bool = False) -> None:
+    """Publica en el difusor del proceso"""
+    difusor.publicar(nombre, datos, proyecto_id, a_todos)
+
+
+def hay_suscriptores() -> bool:
+    """Para no armar los datos de un evento que nadie va a recibir"""
+    return difusor.activo()
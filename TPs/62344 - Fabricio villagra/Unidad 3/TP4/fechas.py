@@ -0,0 +1,46 @@
+"""
+fecha_creacion de las tareas como entero: microsegundos desde 1970-01-01.
+
+En la base se guarda el número (tipo declarado FECHA), así que ordenar y
+filtrar por rango es comparar enteros sobre los índices que terminan en
+fecha_creacion. Hacia afuera sigue siendo el mismo texto de antes
+(datetime.isoformat()): el conversor FECHA lo arma al leer cada fila en las
+conexiones abiertas con detect_types=PARSE_DECLTYPES (las del pool).
+
+Las fechas son locales y sin zona horaria, como datetime.now(); una fecha
+con zona se pasa primero a la hora local.
+"""
+
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Tuple
+
+
+EPOCA = datetime(1970, 1, 1)
+_MICRO = timedelta(microseconds=1)
+
+
+def a_us(fecha: datetime) -> int:
+    """Microsegundos desde EPOCA (exacto, sin pasar por float)"""
+    if fecha.tzinfo is not None:
+        fecha = fecha.astimezone().replace(tzinfo=None)
+    return (fecha - EPOCA) // _MICRO
+
+
+def iso_a_us(texto: str) -> int:
+    """'2024-01-15T10:30:00.123456' (o solo la fecha) -> microsegundos; ValueError si no es ISO"""
+    return a_us(datetime.fromisoformat(texto))
+
+
+def us_a_iso(us: int) -> str:
+    """Microsegundos -> el mismo texto que daba datetime.isoformat()"""
+    return (EPOCA + us * _MICRO).isoformat()
+
+
+def ahora() -> Tuple[int, str]:
+    """(microsegundos, texto ISO) del instante actual"""
+    fecha = datetime.now()
+    return a_us(fecha), fecha.isoformat()
+
+
+sqlite3.register_converter("FECHA", lambda valor: us_a_iso(int(valor)))
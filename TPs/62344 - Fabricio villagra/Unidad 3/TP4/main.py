@@ -1,19 +1,41 @@
-from fastapi import FastAPI, HTTPException, Query
-from typing import Optional
+from fastapi import FastAPI, HTTPException, Query, Request, Response, Body
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from datetime import datetime
+from typing import Any, List, Literal, Optional, Union
+import itertools
+import os
 import sqlite3
 
 from models import (
     ProyectoCreate, ProyectoUpdate, Proyecto, ProyectoConTareas,
     TareaCreate, TareaUpdate, Tarea, TareaConProyecto,
-    ResumenProyecto, ResumenGeneral
+    PaginaTareas, PaginaTareasConProyecto, ResultadoLote,
+    ResumenProyecto, ResumenGeneral, Cambios
 )
 from database import (
     init_db, crear_proyecto, obtener_proyectos, obtener_proyecto_por_id,
-    actualizar_proyecto, eliminar_proyecto, proyecto_existe, nombre_proyecto_existe,
-    crear_tarea, obtener_tareas, obtener_tareas_por_proyecto, obtener_tarea_por_id,
+    actualizar_proyecto, eliminar_proyecto, contar_tareas_proyecto, proyecto_existe, nombre_proyecto_existe,
+    crear_tarea, crear_tareas_lote, obtener_tareas, iterar_tareas, obtener_tareas_por_proyecto,
     actualizar_tarea, eliminar_tarea, obtener_resumen_proyecto, obtener_resumen_general,
-    DB_NAME
+    obtener_cambios, StreamsAgotadosError,
+    crear_tarea_agrupada, actualizar_tarea_agrupada,
+    reiniciar_pool, DB_NAME
 )
+from cambios import VersionDesconocidaError
+from eventos import difusor
+from paginacion import MAX_PAGINA, CursorInvalidoError, decodificar_cursor, cortar_pagina
+from etag import ETagMiddleware
+from respuestas import a_json, responder
+from metricas import CONTENT_TYPE, MetricasMiddleware, RutaMedida, exportar
+from perfilador import ConsultasMiddleware
+import perfilador
+import escritor
+
+
+# Máximo de tareas por POST /proyectos/{id}/tareas/lote
+MAX_LOTE = int(os.environ.get("TAREAS_MAX_LOTE", "1000"))
 
 
 app = FastAPI(
@@ -22,6 +44,16 @@ app = FastAPI(
     description="API con relaciones entre tablas y filtros avanzados"
 )
 
+# Las rutas anotan cuándo termina el endpoint (tiempo de codificación en /metrics)
+app.router.route_class = RutaMedida
+
+# ETag en los GET de datos; If-None-Match con la versión actual -> 304
+app.add_middleware(ETagMiddleware)
+# Con TAREAS_PERFILADOR=1: X-Consultas-SQL con las sentencias de cada request
+app.add_middleware(ConsultasMiddleware)
+# Último en agregarse = más externo: también mide los 304 del ETag
+app.add_middleware(MetricasMiddleware, router=app.router)
+
 
 # ============== EVENTOS DE LA APLICACIÓN ==============
 
@@ -31,6 +63,13 @@ async def startup():
     init_db()
 
 
+@app.on_event("shutdown")
+async def shutdown():
+    """Se ejecuta al detener la aplicación: vacía el escritor y cierra el pool"""
+    escritor.detener_escritor()
+    reiniciar_pool()
+
+
 # ============== ENDPOINT RAÍZ ==============
 
 @app.get("/")
@@ -47,23 +86,52 @@ async def root():
             "DELETE /proyectos/{id}": "Elimina un proyecto y sus tareas",
             "GET /proyectos/{id}/tareas": "Lista tareas de un proyecto",
             "POST /proyectos/{id}/tareas": "Crea tarea en un proyecto",
+            "POST /proyectos/{id}/tareas/lote": "Crea varias tareas en un proyecto",
             "GET /proyectos/{id}/resumen": "Estadísticas del proyecto"
         },
         "endpoints_tareas": {
             "GET /tareas": "Lista todas las tareas",
             "PUT /tareas/{id}": "Modifica una tarea",
+            "PATCH /tareas/{id}": "Modifica solo los campos enviados",
             "DELETE /tareas/{id}": "Elimina una tarea"
         },
         "endpoints_resumen": {
             "GET /resumen": "Resumen general de la aplicación"
+        },
+        "endpoints_sincronizacion": {
+            "GET /cambios?desde={version}": "Proyectos y tareas que cambiaron desde una versión",
+            "GET /eventos": "Cambios de proyectos y tareas en vivo (Server-Sent Events)"
         }
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metricas():
+    """Métricas de requests, data layer y codificación en formato Prometheus"""
+    return Response(exportar(), media_type=CONTENT_TYPE)
+
+
+@app.get("/debug/sql", include_in_schema=False)
+async def debug_sql(
+    limite: int = Query(20, ge=1, le=1000),
+    orden: Literal["total", "cantidad", "p95", "maximo"] = "total"
+):
+    """Sentencias SQL más costosas, log de lentas y consultas por ruta (TAREAS_PERFILADOR=1)"""
+    # Sin el perfilador la ruta no existe: no expone SQL ni tiempos
+    if not perfilador.ACTIVO:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return perfilador.resumen(limite, orden)
+
+
 # ============== ENDPOINTS DE PROYECTOS ==============
 
+# Los endpoints que usan la base son `def`: FastAPI los corre en su threadpool
+# y el event loop sigue atendiendo otros requests mientras SQLite trabaja.
+# Cada hilo toma su propia conexión del pool.
+
 @app.get("/proyectos", response_model=list[Proyecto])
-async def listar_proyectos(
+def listar_proyectos(
+    response: Response,
     nombre: Optional[str] = Query(None, description="Filtrar por nombre (búsqueda parcial)")
 ):
     """
@@ -72,11 +140,11 @@ async def listar_proyectos(
     - **nombre**: Filtra proyectos cuyo nombre contenga este texto
     """
     proyectos = obtener_proyectos(nombre=nombre)
-    return proyectos
+    return responder(proyectos, response)
 
 
 @app.get("/proyectos/{proyecto_id}", response_model=ProyectoConTareas)
-async def obtener_proyecto(proyecto_id: int):
+def obtener_proyecto(proyecto_id: int):
     """
     Obtiene un proyecto específico con el contador de tareas asociadas.
     """
@@ -89,7 +157,7 @@ async def obtener_proyecto(proyecto_id: int):
 
 
 @app.post("/proyectos", response_model=Proyecto, status_code=201)
-async def crear_nuevo_proyecto(proyecto: ProyectoCreate):
+def crear_nuevo_proyecto(proyecto: ProyectoCreate):
     """
     Crea un nuevo proyecto.
     
@@ -117,49 +185,39 @@ async def crear_nuevo_proyecto(proyecto: ProyectoCreate):
 
 
 @app.put("/proyectos/{proyecto_id}", response_model=Proyecto)
-async def modificar_proyecto(proyecto_id: int, proyecto_update: ProyectoUpdate):
+def modificar_proyecto(proyecto_id: int, proyecto_update: ProyectoUpdate):
     """
     Modifica un proyecto existente.
     
     Puedes actualizar el nombre y/o la descripción.
     """
-    # Verificar que el proyecto existe
-    if not proyecto_existe(proyecto_id):
-        raise HTTPException(status_code=404, detail="Proyecto no encontrado")
-    
-    # Si se está actualizando el nombre, verificar que no esté duplicado
-    if proyecto_update.nombre and nombre_proyecto_existe(proyecto_update.nombre, excluir_id=proyecto_id):
-        raise HTTPException(
-            status_code=409,
-            detail="Ya existe otro proyecto con ese nombre"
-        )
-    
+    # Un solo UPDATE: si no existe devuelve None y un nombre repetido
+    # dispara la restricción UNIQUE
     try:
         proyecto_actualizado = actualizar_proyecto(
             proyecto_id=proyecto_id,
             nombre=proyecto_update.nombre,
             descripcion=proyecto_update.descripcion
         )
-        return proyecto_actualizado
     except sqlite3.IntegrityError:
         raise HTTPException(
             status_code=409,
             detail="Ya existe otro proyecto con ese nombre"
         )
+    
+    if not proyecto_actualizado:
+        raise HTTPException(status_code=404, detail="Proyecto no encontrado")
+    
+    return proyecto_actualizado
 
 
 @app.delete("/proyectos/{proyecto_id}")
-async def eliminar_proyecto_endpoint(proyecto_id: int):
+def eliminar_proyecto_endpoint(proyecto_id: int):
     """
     Elimina un proyecto y todas sus tareas asociadas (CASCADE).
     """
     # Contar tareas antes de eliminar
-    import sqlite3
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute("SELECT COUNT(*) as count FROM tareas WHERE proyecto_id = ?", (proyecto_id,))
-    tareas_count = cursor.fetchone()[0]
-    conn.close()
+    tareas_count = contar_tareas_proyecto(proyecto_id)
     
     if not eliminar_proyecto(proyecto_id):
         raise HTTPException(status_code=404, detail="Proyecto no encontrado")
@@ -172,12 +230,81 @@ async def eliminar_proyecto_endpoint(proyecto_id: int):
 
 # ============== ENDPOINTS DE TAREAS ==============
 
-@app.get("/tareas", response_model=list[TareaConProyecto])
-async def listar_todas_las_tareas(
+def leer_cursor(cursor: Optional[str], orden: str):
+    """Decodifica el cursor recibido; si es inválido responde 400"""
+    if not cursor:
+        return None
+    try:
+        return decodificar_cursor(cursor, orden)
+    except CursorInvalidoError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def listar_paginado(obtener, response: Response, limit: Optional[int],
+                    cursor: Optional[str], orden: Literal["asc", "desc"], **filtros):
+    """
+    Arma la respuesta de los listados de tareas.
+
+    Sin `limit` ni `cursor` se devuelve la lista completa, como siempre: es la
+    única respuesta que no respeta MAX_PAGINA, para no cortar en silencio a
+    los clientes que no paginan. Con `limit` o `cursor` se devuelve
+    {"tareas": [...], "siguiente": cursor o null} con a lo sumo MAX_PAGINA
+    tareas.
+    
+    Con TAREAS_JSON_RAPIDO=1 la respuesta sale ya codificada (ver respuestas.py).
+    """
+    if limit is None and cursor is None:
+        return responder(obtener(orden=orden, **filtros), response)
+
+    despues_de = leer_cursor(cursor, orden)
+    limite = limit or MAX_PAGINA
+    # Se pide una fila de más para saber si existe otra página
+    tareas = obtener(orden=orden, limite=limite + 1, despues_de=despues_de, **filtros)
+    pagina, siguiente = cortar_pagina(tareas, limite, orden)
+    return responder({"tareas": pagina, "siguiente": siguiente}, response)
+
+
+NDJSON = "application/x-ndjson"
+
+
+def quiere_stream(request: Request, formato: Optional[str]) -> bool:
+    """True si se pidió la respuesta en streaming (formato=stream o Accept NDJSON)"""
+    return formato == "stream" or NDJSON in request.headers.get("accept", "")
+
+
+def codificar_ndjson(lotes):
+    """Codifica cada lote como líneas JSON a medida que sale de la base"""
+    for lote in lotes:
+        yield b"".join(a_json(tarea) + b"\n" for tarea in lote)
+
+
+def empezar_stream(lotes):
+    """
+    Lee el primer lote antes de responder: si ya hay demasiados streams
+    abiertos se responde 503 en lugar de cortar la respuesta empezada.
+    """
+    try:
+        primero = next(lotes, None)
+    except StreamsAgotadosError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    if primero is None:
+        return iter(())
+    return itertools.chain([primero], lotes)
+
+
+@app.get("/tareas", response_model=Union[list[TareaConProyecto], PaginaTareasConProyecto])
+def listar_todas_las_tareas(
+    request: Request,
+    response: Response,
     estado: Optional[str] = Query(None, description="Filtrar por estado"),
     prioridad: Optional[str] = Query(None, description="Filtrar por prioridad"),
     proyecto_id: Optional[int] = Query(None, description="Filtrar por proyecto"),
-    orden: str = Query("asc", description="Orden por fecha: asc o desc")
+    desde: Optional[datetime] = Query(None, description="Creadas desde esta fecha (inclusive)"),
+    hasta: Optional[datetime] = Query(None, description="Creadas antes de esta fecha (exclusive)"),
+    orden: Literal["asc", "desc"] = Query("asc", description="Orden por fecha: asc o desc"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGINA, description="Tamaño de página"),
+    cursor: Optional[str] = Query(None, description="Cursor 'siguiente' de la página anterior"),
+    formato: Optional[str] = Query(None, description="stream: una tarea por línea (NDJSON)")
 ):
     """
     Lista todas las tareas de todos los proyectos con filtros opcionales.
@@ -185,48 +312,82 @@ async def listar_todas_las_tareas(
     - **estado**: pendiente, en_progreso o completada
     - **prioridad**: baja, media o alta
     - **proyecto_id**: ID del proyecto
+    - **desde** / **hasta**: rango de fecha_creacion, desde inclusive y hasta
+      exclusive (ISO 8601: `2024-01-15` o `2024-01-15T10:30:00`)
     - **orden**: asc (ascendente) o desc (descendente)
+    - **limit** / **cursor**: paginación por (fecha_creacion, id); sin ninguno
+      de los dos se devuelve la lista completa, sin el tope de MAX_PAGINA
+    - **formato**: stream para recibir NDJSON (también con Accept: application/x-ndjson)
     
-    Los filtros se pueden combinar.
+    Los filtros se pueden combinar. Para pedir la página siguiente se repiten
+    los mismos filtros y el mismo orden junto con el cursor recibido.
+    
+    En streaming las tareas se leen de a lotes y se envían a medida que se
+    codifican, sin tope de cantidad (limit y cursor se respetan si vienen).
+    Con TAREAS_MAX_STREAMS streams ya abiertos responde 503.
     """
-    tareas = obtener_tareas(
+    if quiere_stream(request, formato):
+        despues_de = leer_cursor(cursor, orden)
+        lotes = iterar_tareas(
+            estado=estado,
+            prioridad=prioridad,
+            proyecto_id=proyecto_id,
+            orden=orden,
+            limite=limit,
+            despues_de=despues_de,
+            desde=desde,
+            hasta=hasta
+        )
+        return StreamingResponse(codificar_ndjson(empezar_stream(lotes)), media_type=NDJSON)
+
+    return listar_paginado(
+        obtener_tareas, response, limit, cursor, orden,
         estado=estado,
         prioridad=prioridad,
         proyecto_id=proyecto_id,
-        orden=orden
+        desde=desde,
+        hasta=hasta
     )
-    return tareas
 
 
-@app.get("/proyectos/{proyecto_id}/tareas", response_model=list[Tarea])
-async def listar_tareas_proyecto(
+@app.get("/proyectos/{proyecto_id}/tareas", response_model=Union[list[Tarea], PaginaTareas])
+def listar_tareas_proyecto(
     proyecto_id: int,
+    response: Response,
     estado: Optional[str] = Query(None, description="Filtrar por estado"),
     prioridad: Optional[str] = Query(None, description="Filtrar por prioridad"),
-    orden: str = Query("asc", description="Orden por fecha: asc o desc")
+    desde: Optional[datetime] = Query(None, description="Creadas desde esta fecha (inclusive)"),
+    hasta: Optional[datetime] = Query(None, description="Creadas antes de esta fecha (exclusive)"),
+    orden: Literal["asc", "desc"] = Query("asc", description="Orden por fecha: asc o desc"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGINA, description="Tamaño de página"),
+    cursor: Optional[str] = Query(None, description="Cursor 'siguiente' de la página anterior")
 ):
     """
     Lista todas las tareas de un proyecto específico.
     
     - **estado**: pendiente, en_progreso o completada
     - **prioridad**: baja, media o alta
+    - **desde** / **hasta**: rango de fecha_creacion (desde inclusive, hasta exclusive)
     - **orden**: asc (ascendente) o desc (descendente)
+    - **limit** / **cursor**: paginación por (fecha_creacion, id); sin ninguno
+      de los dos se devuelve la lista completa, sin el tope de MAX_PAGINA
     """
     # Verificar que el proyecto existe
     if not proyecto_existe(proyecto_id):
         raise HTTPException(status_code=404, detail="Proyecto no encontrado")
     
-    tareas = obtener_tareas_por_proyecto(
+    return listar_paginado(
+        obtener_tareas_por_proyecto, response, limit, cursor, orden,
         proyecto_id=proyecto_id,
         estado=estado,
         prioridad=prioridad,
-        orden=orden
+        desde=desde,
+        hasta=hasta
     )
-    return tareas
 
 
 @app.post("/proyectos/{proyecto_id}/tareas", response_model=Tarea, status_code=201)
-async def crear_tarea_en_proyecto(proyecto_id: int, tarea: TareaCreate):
+def crear_tarea_en_proyecto(proyecto_id: int, tarea: TareaCreate):
     """
     Crea una nueva tarea dentro de un proyecto.
     
@@ -241,48 +402,140 @@ async def crear_tarea_en_proyecto(proyecto_id: int, tarea: TareaCreate):
             detail="El proyecto especificado no existe"
         )
     
-    nueva_tarea = crear_tarea(
+    datos = dict(
         descripcion=tarea.descripcion,
         estado=tarea.estado,
         prioridad=tarea.prioridad,
         proyecto_id=proyecto_id
     )
-    return nueva_tarea
+    if escritor.ACTIVO:
+        # Se confirma junto con las demás escrituras del lote (group commit)
+        return crear_tarea_agrupada(**datos).result()
+    return crear_tarea(**datos)
 
 
-@app.put("/tareas/{tarea_id}", response_model=Tarea)
-async def modificar_tarea(tarea_id: int, tarea_update: TareaUpdate):
+@app.post("/proyectos/{proyecto_id}/tareas/lote", response_model=ResultadoLote, status_code=201)
+def crear_tareas_en_lote(
+    proyecto_id: int,
+    tareas: List[Any] = Body(..., description="Lista de tareas con el formato de TareaCreate"),
+    modo: Literal["todo_o_nada", "parcial"] = Query(
+        "todo_o_nada", description="todo_o_nada: si alguna es inválida no se crea ninguna"
+    )
+):
     """
-    Modifica una tarea existente.
+    Crea varias tareas en un proyecto con un solo INSERT (executemany) y un
+    solo commit.
     
-    Puedes actualizar cualquier campo, incluyendo mover la tarea a otro proyecto.
+    Cada elemento se valida por separado; los errores se informan por
+    índice. En modo **todo_o_nada** (default) un error cancela el lote con
+    422; en modo **parcial** se crean las válidas y se devuelven los errores
+    del resto. Se aceptan hasta TAREAS_MAX_LOTE tareas por llamada.
     """
-    # Verificar que la tarea existe
-    tarea_actual = obtener_tarea_por_id(tarea_id)
+    if len(tareas) > MAX_LOTE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"El lote supera el máximo de {MAX_LOTE} tareas"
+        )
     
-    if not tarea_actual:
-        raise HTTPException(status_code=404, detail="Tarea no encontrada")
+    # Verificar que el proyecto existe
+    if not proyecto_existe(proyecto_id):
+        raise HTTPException(
+            status_code=400,
+            detail="El proyecto especificado no existe"
+        )
+    
+    validas, errores = [], []
+    for indice, item in enumerate(tareas):
+        try:
+            tarea = TareaCreate.model_validate(item)
+        except ValidationError as e:
+            errores += [
+                {
+                    "indice": indice,
+                    "campo": ".".join(str(parte) for parte in error["loc"]) or None,
+                    "mensaje": error["msg"],
+                }
+                for error in e.errors()
+            ]
+            continue
+        validas.append((tarea.descripcion, tarea.estado, tarea.prioridad))
     
-    # Si se está cambiando el proyecto, verificar que existe
-    if tarea_update.proyecto_id is not None and not proyecto_existe(tarea_update.proyecto_id):
+    if errores and modo == "todo_o_nada":
+        raise HTTPException(
+            status_code=422,
+            detail={"mensaje": "Ninguna tarea fue creada", "errores": errores}
+        )
+    
+    try:
+        ids = crear_tareas_lote(proyecto_id, validas)
+    except sqlite3.IntegrityError:
+        # El proyecto se borró entre la verificación y el INSERT
         raise HTTPException(
             status_code=400,
             detail="El proyecto especificado no existe"
         )
+    return {"ids": ids, "errores": errores}
+
+
+def guardar_cambios_tarea(tarea_id: int, **cambios):
+    """Aplica los cambios con un solo UPDATE y traduce los errores a HTTP"""
+    # Si la tarea no existe no se afecta ninguna fila (404); si el
+    # proyecto_id no existe falla la clave foránea (400)
+    try:
+        if escritor.ACTIVO:
+            tarea_actualizada = actualizar_tarea_agrupada(tarea_id=tarea_id, **cambios).result()
+        else:
+            tarea_actualizada = actualizar_tarea(tarea_id=tarea_id, **cambios)
+    except sqlite3.IntegrityError:
+        raise HTTPException(
+            status_code=400,
+            detail="El proyecto especificado no existe"
+        )
+    
+    if not tarea_actualizada:
+        raise HTTPException(status_code=404, detail="Tarea no encontrada")
+    
+    return tarea_actualizada
+
+
+@app.put("/tareas/{tarea_id}", response_model=Tarea)
+def modificar_tarea(tarea_id: int, tarea_update: TareaUpdate):
+    """
+    Modifica una tarea existente.
     
-    tarea_actualizada = actualizar_tarea(
-        tarea_id=tarea_id,
+    Puedes actualizar cualquier campo, incluyendo mover la tarea a otro proyecto.
+    """
+    return guardar_cambios_tarea(
+        tarea_id,
         descripcion=tarea_update.descripcion,
         estado=tarea_update.estado,
         prioridad=tarea_update.prioridad,
         proyecto_id=tarea_update.proyecto_id
     )
+
+
+@app.patch("/tareas/{tarea_id}", response_model=Tarea)
+def modificar_parcialmente_tarea(tarea_id: int, tarea_update: TareaUpdate):
+    """
+    Modifica solo los campos enviados en el body.
     
-    return tarea_actualizada
+    A diferencia de PUT, un campo enviado como null no se ignora: se
+    rechaza con 422 porque ninguna columna de la tarea admite nulos.
+    """
+    cambios = tarea_update.model_dump(exclude_unset=True)
+    
+    nulos = [campo for campo, valor in cambios.items() if valor is None]
+    if nulos:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Los campos no pueden ser null: {', '.join(nulos)}"
+        )
+    
+    return guardar_cambios_tarea(tarea_id, **cambios)
 
 
 @app.delete("/tareas/{tarea_id}")
-async def eliminar_tarea_endpoint(tarea_id: int):
+def eliminar_tarea_endpoint(tarea_id: int):
     """
     Elimina una tarea.
     """
@@ -292,10 +545,78 @@ async def eliminar_tarea_endpoint(tarea_id: int):
     return {"mensaje": "Tarea eliminada correctamente"}
 
 
+# ============== SINCRONIZACIÓN ==============
+
+@app.get("/cambios", response_model=Cambios)
+def listar_cambios(
+    response: Response,
+    desde: int = Query(0, ge=0, description="Versión recibida en la sincronización anterior (0 = todo)"),
+    limite: int = Query(MAX_PAGINA, ge=1, le=MAX_PAGINA, description="Máximo de cambios por respuesta")
+):
+    """
+    Devuelve solo lo que cambió después de la versión `desde`.
+    
+    - **proyectos** / **tareas**: filas creadas o modificadas, con su estado actual
+    - **borrados**: ids de proyectos y tareas eliminados (incluye las tareas
+      borradas en cascada)
+    - **version**: el `desde` de la próxima llamada
+    - **hay_mas**: si es true, quedan cambios: volver a pedir con la nueva versión
+    
+    Con `desde=0` se recibe el estado completo. Si la base se recreó y la
+    versión no existe responde 410: hay que volver a sincronizar desde 0.
+    """
+    try:
+        resultado = obtener_cambios(desde, limite)
+    except VersionDesconocidaError as e:
+        raise HTTPException(status_code=410, detail=f"{e}: sincronizar de nuevo desde 0")
+    return responder(resultado, response)
+
+
+async def emitir_eventos(suscripcion):
+    """Mensajes SSE de la suscripción; termina si el cliente se desconecta o queda cortado"""
+    try:
+        yield b": conectado\n\n"
+        while True:
+            mensajes = await suscripcion.siguientes()
+            if suscripcion.cortada:
+                yield b'event: cortado\ndata: {"motivo":"cola llena"}\n\n'
+                return
+            yield b"".join(mensajes) if mensajes else b": latido\n\n"
+    finally:
+        difusor.desuscribir(suscripcion)
+
+
+@app.get("/eventos")
+async def transmitir_eventos(
+    proyecto_id: Optional[int] = Query(None, description="Solo eventos de este proyecto")
+):
+    """
+    Stream de Server-Sent Events con los cambios a medida que se confirman.
+    
+    Eventos: proyecto.creado, proyecto.actualizado, proyecto.eliminado,
+    tarea.creada, tarea.actualizada y tarea.eliminada. `data` es la fila en
+    JSON (solo `id` y `proyecto_id` en los eliminados). Borrar un proyecto
+    borra sus tareas sin un evento por cada una.
+    
+    Un cliente que se atrasa demasiado recibe `cortado` y se cierra su
+    stream: al reconectar conviene ponerse al día con GET /cambios.
+    """
+    if proyecto_id is not None and not await run_in_threadpool(proyecto_existe, proyecto_id):
+        raise HTTPException(status_code=404, detail="Proyecto no encontrado")
+    # La suscripción se crea antes de responder: no se pierde lo que se
+    # confirme mientras salen los headers
+    suscripcion = difusor.suscribir(proyecto_id)
+    return StreamingResponse(
+        emitir_eventos(suscripcion),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 # ============== ENDPOINTS DE RESUMEN ==============
 
 @app.get("/proyectos/{proyecto_id}/resumen", response_model=ResumenProyecto)
-async def obtener_resumen_proyecto_endpoint(proyecto_id: int):
+def obtener_resumen_proyecto_endpoint(proyecto_id: int):
     """
     Devuelve estadísticas detalladas de un proyecto.
     
@@ -313,7 +634,7 @@ async def obtener_resumen_proyecto_endpoint(proyecto_id: int):
 
 
 @app.get("/resumen", response_model=ResumenGeneral)
-async def obtener_resumen_general_endpoint():
+def obtener_resumen_general_endpoint():
     """
     Devuelve un resumen general de toda la aplicación.
     
@@ -332,4 +653,6 @@ async def obtener_resumen_general_endpoint():
 if __name__ == "__main__":
     import uvicorn
     init_db()
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # Los streams de /eventos no terminan solos: sin este tope el apagado
+    # esperaría a que se desconecte cada cliente
+    uvicorn.run(app, host="0.0.0.0", port=8000, timeout_graceful_shutdown=5)
\ No newline at end of file
@@ -0,0 +1,273 @@
+"""
+Métricas en formato de texto de Prometheus para GET /metrics.
+
+Cada histograma guarda sus series en un dict por hilo: registrar una
+observación no toma ningún lock (solo la primera vez que un hilo usa el
+histograma). Al exportar se suman los dicts de todos los hilos; una lectura
+concurrente puede ver una observación a medio registrar, lo que en métricas
+acumulativas no importa.
+"""
+
+import contextvars
+import functools
+import inspect
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Tuple
+
+from fastapi.routing import APIRoute
+from starlette.routing import Match
+
+
+# TAREAS_METRICAS=0 las desactiva (el middleware y los decoradores pasan de largo)
+ACTIVAS = os.environ.get("TAREAS_METRICAS", "1") != "0"
+
+# Límites superiores (segundos) de los buckets, como los de los clientes de Prometheus
+LIMITES = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Starlette agrega "; charset=utf-8" a los text/*
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+
+class Histograma:
+    """Histograma con etiquetas y agregación por hilo"""
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Tuple[str, ...],
+                 limites: Tuple[float, ...] = LIMITES):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = etiquetas
+        self.limites = limites
+        self._local = threading.local()
+        self._por_hilo: List[Dict[tuple, list]] = []
+        self._lock = threading.Lock()
+
+    def _series(self) -> Dict[tuple, list]:
+        try:
+            return self._local.series
+        except AttributeError:
+            series = self._local.series = {}
+            with self._lock:
+                self._por_hilo.append(series)
+            return series
+
+    def observar(self, valores: tuple, segundos: float) -> None:
+        series = self._series()
+        fila = series.get(valores)
+        if fila is None:
+            # Un contador por bucket (el último es +Inf) y la suma al final
+            fila = series[valores] = [0] * (len(self.limites) + 2)
+        fila[bisect_left(self.limites, segundos)] += 1
+        fila[-1] += segundos
+
+    def sumar(self) -> Dict[tuple, list]:
+        """Suma las series de todos los hilos"""
+        with self._lock:
+            por_hilo = list(self._por_hilo)
+        total: Dict[tuple, list] = {}
+        for series in por_hilo:
+            for valores, fila in series.copy().items():
+                acumulada = total.setdefault(valores, [0] * len(fila))
+                for i, valor in enumerate(list(fila)):
+                    acumulada[i] += valor
+        return total
+
+    def reiniciar(self) -> None:
+        with self._lock:
+            for series in self._por_hilo:
+                series.clear()
+
+
+def _escapar(valor) -> str:
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _etiquetas(nombres: Tuple[str, ...], valores: tuple, le: Optional[str] = None) -> str:
+    partes = [f'{nombre}="{_escapar(valor)}"' for nombre, valor in zip(nombres, valores)]
+    if le is not None:
+        partes.append(f'le="{le}"')
+    return "{" + ",".join(partes) + "}" if partes else ""
+
+
+REQUESTS = Histograma(
+    "tareas_http_request_duration_seconds",
+    "Duración de los requests HTTP, desde que llegan hasta el último byte",
+    ("metodo", "ruta", "status"),
+)
+DATOS = Histograma(
+    "tareas_db_duration_seconds",
+    "Tiempo dentro de cada función del data layer (database.py)",
+    ("funcion",),
+)
+CODIFICACION = Histograma(
+    "tareas_codificacion_duration_seconds",
+    "Tiempo entre que el endpoint devuelve y empieza la respuesta (response_model y JSON)",
+    ("ruta",),
+)
+HISTOGRAMAS = (REQUESTS, DATOS, CODIFICACION)
+
+
+def exportar() -> str:
+    """Todas las métricas en formato de texto de Prometheus"""
+    lineas = []
+
+    # Contador de requests por ruta y status (sale de los _count del histograma)
+    requests = REQUESTS.sumar()
+    lineas.append("# HELP tareas_http_requests_total Requests HTTP atendidos")
+    lineas.append("# TYPE tareas_http_requests_total counter")
+    for valores, fila in sorted(requests.items()):
+        lineas.append(f"tareas_http_requests_total{_etiquetas(REQUESTS.etiquetas, valores)} {sum(fila[:-1])}")
+
+    for histograma in HISTOGRAMAS:
+        series = requests if histograma is REQUESTS else histograma.sumar()
+        lineas.append(f"# HELP {histograma.nombre} {histograma.ayuda}")
+        lineas.append(f"# TYPE {histograma.nombre} histogram")
+        for valores, fila in sorted(series.items()):
+            etiquetas = _etiquetas(histograma.etiquetas, valores)
+            acumulado = 0
+            for limite, cantidad in zip(histograma.limites + (None,), fila[:-1]):
+                acumulado += cantidad
+                le = "+Inf" if limite is None else repr(limite)
+                lineas.append(f"{histograma.nombre}_bucket"
+                              f"{_etiquetas(histograma.etiquetas, valores, le)} {acumulado}")
+            lineas.append(f"{histograma.nombre}_sum{etiquetas} {repr(float(fila[-1]))}")
+            lineas.append(f"{histograma.nombre}_count{etiquetas} {acumulado}")
+
+    return "\n".join(lineas) + "\n"
+
+
+def reiniciar() -> None:
+    """Pone todas las métricas en cero (para los tests)"""
+    for histograma in HISTOGRAMAS:
+        histograma.reiniciar()
+
+
+# ---------- data layer ----------
+
+def medir_datos(funcion: Callable) -> Callable:
+    """
+    Decorador para las funciones de database.py. En los generadores
+    (iterar_tareas) se suma el tiempo de cada lote, no el que pasa entre
+    un lote y el siguiente.
+    """
+    nombre = (funcion.__name__,)
+
+    if inspect.isgeneratorfunction(funcion):
+        @functools.wraps(funcion)
+        def generador(*args, **kwargs):
+            if not ACTIVAS:
+                yield from funcion(*args, **kwargs)
+                return
+            total = 0.0
+            iterador = funcion(*args, **kwargs)
+            try:
+                while True:
+                    inicio = time.perf_counter()
+                    try:
+                        lote = next(iterador)
+                    except StopIteration:
+                        break
+                    finally:
+                        total += time.perf_counter() - inicio
+                    yield lote
+            finally:
+                iterador.close()
+                DATOS.observar(nombre, total)
+        return generador
+
+    @functools.wraps(funcion)
+    def medida(*args, **kwargs):
+        if not ACTIVAS:
+            return funcion(*args, **kwargs)
+        inicio = time.perf_counter()
+        try:
+            return funcion(*args, **kwargs)
+        finally:
+            DATOS.observar(nombre, time.perf_counter() - inicio)
+    return medida
+
+
+# ---------- HTTP ----------
+
+# Momento en que terminó el endpoint del request actual (lo escribe RutaMedida)
+_fin_endpoint: contextvars.ContextVar[Optional[list]] = contextvars.ContextVar(
+    "fin_endpoint", default=None
+)
+
+
+class RutaMedida(APIRoute):
+    """APIRoute que anota cuándo devuelve el endpoint, para separar la codificación"""
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        if inspect.iscoroutinefunction(endpoint):
+            @functools.wraps(endpoint)
+            async def anotado(*args, **kw):
+                try:
+                    return await endpoint(*args, **kw)
+                finally:
+                    _anotar_fin()
+        else:
+            @functools.wraps(endpoint)
+            def anotado(*args, **kw):
+                try:
+                    return endpoint(*args, **kw)
+                finally:
+                    _anotar_fin()
+        super().__init__(path, anotado, **kwargs)
+
+
+def _anotar_fin() -> None:
+    marca = _fin_endpoint.get()
+    if marca is not None:
+        marca[0] = time.perf_counter()
+
+
+def _plantilla(router, scope) -> str:
+    """Ruta con parámetros sin reemplazar (/tareas/{tarea_id}) para no abrir una serie por id"""
+    ruta = scope.get("route")
+    if ruta is not None:
+        return ruta.path
+    # Respuestas que no llegaron al router (304 del ETag) o 404
+    for candidata in getattr(router, "routes", ()):
+        if isinstance(candidata, APIRoute) and candidata.matches(scope)[0] == Match.FULL:
+            return candidata.path
+    return "sin_ruta"
+
+
+class MetricasMiddleware:
+    """Registra duración por método, ruta y status, y el tiempo de codificación"""
+
+    def __init__(self, app, router=None):
+        self.app = app
+        # Para resolver la plantilla de los requests que no pasan por el router
+        self.router = router
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not ACTIVAS:
+            await self.app(scope, receive, send)
+            return
+
+        inicio = time.perf_counter()
+        marca = [None]
+        token = _fin_endpoint.set(marca)
+        status = 500
+
+        async def enviar(mensaje):
+            nonlocal status
+            if mensaje["type"] == "http.response.start":
+                status = mensaje["status"]
+                if marca[0] is not None:
+                    CODIFICACION.observar((_plantilla(self.router, scope),),
+                                          time.perf_counter() - marca[0])
+            await send(mensaje)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            _fin_endpoint.reset(token)
+            REQUESTS.observar(
+                (scope["method"], _plantilla(self.router, scope), str(status)),
+                time.perf_counter() - inicio,
+            )
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, validator
-from typing import Optional, Literal
+from typing import Optional, Literal, List
 from datetime import datetime
 
 
@@ -81,6 +81,49 @@ class TareaConProyecto(Tarea):
     proyecto_nombre: str
 
 
+class ErrorLote(BaseModel):
+    """Error de validación de un elemento de POST /proyectos/{id}/tareas/lote"""
+    indice: int
+    campo: Optional[str] = None
+    mensaje: str
+
+
+class ResultadoLote(BaseModel):
+    """Respuesta de la creación de tareas en lote"""
+    ids: List[int]
+    errores: List[ErrorLote] = []
+
+
+class PaginaTareasConProyecto(BaseModel):
+    """Página de GET /tareas cuando se pide limit o cursor"""
+    tareas: List[TareaConProyecto]
+    siguiente: Optional[str] = None
+
+
+class PaginaTareas(BaseModel):
+    """Página de GET /proyectos/{id}/tareas cuando se pide limit o cursor"""
+    tareas: List[Tarea]
+    siguiente: Optional[str] = None
+
+
+# ============== MODELOS DE SINCRONIZACIÓN ==============
+
+class CambiosBorrados(BaseModel):
+    """Ids eliminados desde la versión pedida"""
+    proyectos: List[int] = []
+    tareas: List[int] = []
+
+
+class Cambios(BaseModel):
+    """Respuesta de GET /cambios"""
+    desde: int
+    version: int
+    hay_mas: bool
+    proyectos: List[Proyecto]
+    tareas: List[Tarea]
+    borrados: CambiosBorrados
+
+
 # ============== MODELOS DE RESUMEN ==============
 
 class ResumenProyecto(BaseModel):
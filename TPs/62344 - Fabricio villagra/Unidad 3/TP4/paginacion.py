@@ -0,0 +1,59 @@
+import base64
+import json
+import os
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+
+
+# Tope duro de filas por respuesta, se pida o no `limit`
+MAX_PAGINA = int(os.environ.get("TAREAS_MAX_PAGINA", "1000"))
+
+
+class CursorInvalidoError(ValueError):
+    """El cursor recibido no se puede decodificar o no corresponde al orden pedido"""
+
+
+def codificar_cursor(tarea: Dict[str, Any], orden: str) -> str:
+    """
+    Arma el cursor opaco que apunta después de `tarea`.
+
+    Guarda (fecha_creacion, id) y el orden con que se generó, en JSON y
+    base64 url-safe para poder pasarlo tal cual como query param.
+    """
+    datos = {"f": tarea["fecha_creacion"], "i": tarea["id"], "o": orden}
+    crudo = json.dumps(datos, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(crudo).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: str, orden: str) -> Tuple[str, int]:
+    """Devuelve la clave (fecha_creacion, id) guardada en el cursor"""
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        datos = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+        fecha, tarea_id, orden_cursor = datos["f"], datos["i"], datos["o"]
+    except (ValueError, TypeError, KeyError):
+        raise CursorInvalidoError("Cursor inválido")
+
+    if not isinstance(fecha, str) or not isinstance(tarea_id, int):
+        raise CursorInvalidoError("Cursor inválido")
+    try:
+        datetime.fromisoformat(fecha)
+    except ValueError:
+        raise CursorInvalidoError("Cursor inválido")
+    if orden_cursor != orden:
+        raise CursorInvalidoError("El cursor no corresponde al orden pedido")
+    return fecha, tarea_id
+
+
+def cortar_pagina(tareas: List[Dict[str, Any]], limite: int,
+                  orden: str) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Recibe hasta limite + 1 filas y devuelve (página, cursor siguiente).
+
+    La fila de más solo indica que hay otra página; si no vino, el cursor
+    siguiente es None.
+    """
+    if len(tareas) <= limite:
+        return tareas, None
+    pagina = tareas[:limite]
+    return pagina, codificar_cursor(pagina[-1], orden)
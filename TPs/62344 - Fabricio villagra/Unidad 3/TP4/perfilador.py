@@ -0,0 +1,254 @@
+"""
+Perfilador de sentencias SQL (opcional, TAREAS_PERFILADOR=1).
+
+Con el perfilador activo, el pool abre sus conexiones con ConexionPerfilada:
+
+- execute / executemany / commit se cronometran y se agregan por "forma" de
+  la sentencia (SQL con los literales reemplazados por ?): cantidad, tiempo
+  total, máximo y p95 de las últimas MUESTRAS ejecuciones.
+- Las que tardan más de TAREAS_PERFILADOR_LENTO_MS van al log de lentas.
+- set_trace_callback cuenta cada sentencia que corre SQLite, incluidos el
+  BEGIN implícito, el COMMIT y los pasos de los triggers, y se la suma al
+  request en curso: ConsultasMiddleware la devuelve en X-Consultas-SQL.
+
+El tiempo es el de execute, que en SQLite incluye buscar la primera fila
+(y ordenar, si hace falta); no incluye el fetchall posterior.
+"""
+
+import contextvars
+import functools
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+
+ACTIVO = os.environ.get("TAREAS_PERFILADOR", "0") == "1"
+UMBRAL_LENTO_MS = float(os.environ.get("TAREAS_PERFILADOR_LENTO_MS", "100"))
+
+# Ejecuciones por forma que se guardan para el p95, y entradas del log de lentas
+MUESTRAS = 1000
+MAX_LENTAS = 200
+
+ORDENES = ("total", "cantidad", "p95", "maximo")
+
+logger = logging.getLogger("tareas.sql")
+
+
+# ---------- formas de las sentencias ----------
+
+_ESPACIOS = re.compile(r"\s+")
+_LITERALES = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_LISTAS = re.compile(r"\bIN \(\?(?:, ?\?)+\)", re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=2048)
+def forma(sql: str) -> str:
+    """SQL normalizado: un espacio entre tokens, literales y listas IN como ?"""
+    sql = _ESPACIOS.sub(" ", sql).strip()
+    sql = _LITERALES.sub("?", sql)
+    return _LISTAS.sub("IN (?, ...)", sql)
+
+
+# ---------- agregados ----------
+
+class _Estadistica:
+    __slots__ = ("cantidad", "total", "maximo", "muestras")
+
+    def __init__(self):
+        self.cantidad = 0
+        self.total = 0.0
+        self.maximo = 0.0
+        self.muestras: deque = deque(maxlen=MUESTRAS)
+
+    def p95(self) -> float:
+        ordenadas = sorted(self.muestras)
+        return ordenadas[max(0, math.ceil(len(ordenadas) * 0.95) - 1)] if ordenadas else 0.0
+
+
+_lock = threading.Lock()
+_sentencias: Dict[str, _Estadistica] = {}
+_lentas: deque = deque(maxlen=MAX_LENTAS)
+_por_ruta: Dict[str, List[int]] = {}
+
+
+class _Request:
+    __slots__ = ("scope", "consultas")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.consultas = 0
+
+
+# Request en curso (lo fija ConsultasMiddleware)
+_request: contextvars.ContextVar[Optional[_Request]] = contextvars.ContextVar(
+    "request_sql", default=None
+)
+
+
+def _ruta(scope) -> str:
+    ruta = scope.get("route")
+    return ruta.path if ruta is not None else "sin_ruta"
+
+
+def registrar(sql: str, segundos: float) -> None:
+    """Suma una ejecución de `sql` a su forma y al log de lentas si corresponde"""
+    clave = forma(sql)
+    with _lock:
+        estadistica = _sentencias.get(clave)
+        if estadistica is None:
+            estadistica = _sentencias[clave] = _Estadistica()
+        estadistica.cantidad += 1
+        estadistica.total += segundos
+        estadistica.maximo = max(estadistica.maximo, segundos)
+        estadistica.muestras.append(segundos)
+
+    ms = segundos * 1000
+    if ms >= UMBRAL_LENTO_MS:
+        actual = _request.get()
+        lenta = {
+            "sql": clave,
+            "ms": round(ms, 3),
+            "ruta": _ruta(actual.scope) if actual is not None else None,
+            "cuando": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        _lentas.append(lenta)
+        logger.warning("Sentencia lenta (%.1f ms) en %s: %s", ms, lenta["ruta"], clave)
+
+
+def _contar(sql: str) -> None:
+    actual = _request.get()
+    if actual is not None:
+        actual.consultas += 1
+
+
+def resumen(limite: int = 20, orden: str = "total") -> Dict[str, Any]:
+    """Las `limite` formas con más `orden`, el log de lentas y las consultas por ruta"""
+    with _lock:
+        filas = [
+            {
+                "sql": clave,
+                "cantidad": e.cantidad,
+                "total_ms": e.total * 1000,
+                "promedio_ms": e.total / e.cantidad * 1000,
+                "p95_ms": e.p95() * 1000,
+                "maximo_ms": e.maximo * 1000,
+            }
+            for clave, e in _sentencias.items()
+        ]
+        lentas = list(_lentas)
+        por_ruta = [
+            {"ruta": ruta, "requests": requests, "consultas": consultas,
+             "consultas_por_request": consultas / requests}
+            for ruta, (requests, consultas) in _por_ruta.items()
+        ]
+
+    campo = {"total": "total_ms", "cantidad": "cantidad", "p95": "p95_ms", "maximo": "maximo_ms"}[orden]
+    filas.sort(key=lambda f: f[campo], reverse=True)
+    for fila in filas:
+        for clave in ("total_ms", "promedio_ms", "p95_ms", "maximo_ms"):
+            fila[clave] = round(fila[clave], 3)
+    por_ruta.sort(key=lambda r: r["consultas_por_request"], reverse=True)
+    return {
+        "activo": ACTIVO,
+        "umbral_lento_ms": UMBRAL_LENTO_MS,
+        "sentencias": filas[:limite],
+        "lentas": lentas[::-1],
+        "por_ruta": por_ruta,
+    }
+
+
+def reiniciar() -> None:
+    """Borra los agregados, el log de lentas y los conteos por ruta"""
+    with _lock:
+        _sentencias.clear()
+        _lentas.clear()
+        _por_ruta.clear()
+
+
+# ---------- conexiones ----------
+
+class CursorPerfilado(sqlite3.Cursor):
+    def execute(self, sql, parametros=()):
+        inicio = time.perf_counter()
+        try:
+            return super().execute(sql, parametros)
+        finally:
+            registrar(sql, time.perf_counter() - inicio)
+
+    def executemany(self, sql, secuencia):
+        inicio = time.perf_counter()
+        try:
+            return super().executemany(sql, secuencia)
+        finally:
+            registrar(sql, time.perf_counter() - inicio)
+
+
+class ConexionPerfilada(sqlite3.Connection):
+    """Conexión que cronometra sus sentencias y las cuenta con set_trace_callback"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.set_trace_callback(_contar)
+
+    def cursor(self, factory=CursorPerfilado):
+        return super().cursor(factory)
+
+    # Connection.execute de sqlite3 no pasa por cursor(): se redefine igual
+    def execute(self, sql, parametros=()):
+        return self.cursor().execute(sql, parametros)
+
+    def executemany(self, sql, secuencia):
+        return self.cursor().executemany(sql, secuencia)
+
+    def commit(self):
+        inicio = time.perf_counter()
+        try:
+            super().commit()
+        finally:
+            registrar("COMMIT", time.perf_counter() - inicio)
+
+
+def fabrica() -> type:
+    """Clase de conexión que tiene que usar el pool según ACTIVO"""
+    return ConexionPerfilada if ACTIVO else sqlite3.Connection
+
+
+# ---------- HTTP ----------
+
+class ConsultasMiddleware:
+    """Cuenta las sentencias de cada request y las devuelve en X-Consultas-SQL"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not ACTIVO:
+            await self.app(scope, receive, send)
+            return
+
+        actual = _Request(scope)
+        token = _request.set(actual)
+
+        async def enviar(mensaje):
+            if mensaje["type"] == "http.response.start":
+                # Las respuestas en streaming siguen consultando después de este punto
+                mensaje = dict(mensaje)
+                mensaje["headers"] = list(mensaje.get("headers", [])) + [
+                    (b"x-consultas-sql", str(actual.consultas).encode())
+                ]
+            await send(mensaje)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            _request.reset(token)
+            with _lock:
+                acumulado = _por_ruta.setdefault(f'{scope["method"]} {_ruta(scope)}', [0, 0])
+                acumulado[0] += 1
+                acumulado[1] += actual.consultas
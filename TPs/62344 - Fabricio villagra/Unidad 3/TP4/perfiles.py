@@ -0,0 +1,70 @@
+import os
+import sqlite3
+import sys
+from typing import Dict, Any, Optional
+
+
+# Cada perfil define los PRAGMA que se aplican a TODAS las conexiones que
+# abre el pool (no solo a la de init_db).
+PERFILES: Dict[str, Dict[str, Any]] = {
+    # Lectores y escritor concurrentes: WAL permite leer mientras se escribe.
+    "produccion": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16000,       # KiB (negativo) -> ~16 MB por conexión
+        "mmap_size": 268435456,     # 256 MB
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,       # ms
+    },
+    # Igual que producción pero con fsync en cada commit (máxima durabilidad).
+    "estricto": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -16000,
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    # Tests: sin archivos -wal/-shm (los tests borran tareas.db) y sin fsync.
+    "test": {
+        "journal_mode": "DELETE",
+        "synchronous": "OFF",
+        "cache_size": -2000,
+        "mmap_size": 0,
+        "temp_store": "MEMORY",
+        "busy_timeout": 1000,
+    },
+}
+
+# Orden en que se aplican (journal_mode primero: algunos valores dependen de él)
+_ORDEN = ("journal_mode", "synchronous", "cache_size", "mmap_size", "temp_store", "busy_timeout")
+
+
+def _ejecutando_pytest() -> bool:
+    return "pytest" in sys.modules or any("pytest" in str(arg) for arg in sys.argv)
+
+
+def perfil_activo() -> str:
+    """
+    Nombre del perfil a usar.
+
+    Se elige con la variable de entorno TAREAS_DB_PERFIL; si no está definida
+    se usa "test" al correr bajo pytest y "produccion" en otro caso.
+    """
+    nombre = os.environ.get("TAREAS_DB_PERFIL")
+    if nombre:
+        if nombre not in PERFILES:
+            raise ValueError(
+                f"Perfil de base de datos desconocido: {nombre!r} "
+                f"(opciones: {', '.join(PERFILES)})"
+            )
+        return nombre
+    return "test" if _ejecutando_pytest() else "produccion"
+
+
+def aplicar_perfil(conn: sqlite3.Connection, nombre: Optional[str] = None) -> Dict[str, Any]:
+    """Aplica los PRAGMA del perfil a la conexión y devuelve el perfil usado"""
+    perfil = PERFILES[nombre or perfil_activo()]
+    for pragma in _ORDEN:
+        conn.execute(f"PRAGMA {pragma} = {perfil[pragma]}")
+    return perfil
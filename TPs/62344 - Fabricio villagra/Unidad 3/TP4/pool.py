@@ -0,0 +1,271 @@
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Any, Optional
+
+
+TAMANO_POR_DEFECTO = int(os.environ.get("TAREAS_POOL_SIZE", "5"))
+TIMEOUT_POR_DEFECTO = float(os.environ.get("TAREAS_POOL_TIMEOUT", "30"))
+
+
+class PoolAgotadoError(Exception):
+    """Se lanza cuando no se obtiene una conexión libre dentro del timeout"""
+
+
+class PoolConexiones:
+    """
+    Pool de conexiones SQLite compartido por todo el proceso.
+
+    - Cada hilo obtiene una conexión y la devuelve al terminar; si el mismo
+      hilo vuelve a pedir una conexión mientras ya tiene una (llamadas
+      anidadas como crear_proyecto -> obtener_proyecto) se reutiliza la misma.
+    - Las conexiones se crean con check_same_thread=False para poder pasar de
+      un hilo a otro del threadpool de FastAPI.
+    - Antes de entregar una conexión se verifica que siga sana (SELECT 1); si
+      falla se descarta y se abre una nueva.
+    - tamano=0 desactiva el pool: se abre y cierra una conexión por llamada.
+    - `fabrica` es la clase de las conexiones (sqlite3.connect(factory=...)).
+    """
+
+    def __init__(self, ruta: str, tamano: int = TAMANO_POR_DEFECTO,
+                 timeout: float = TIMEOUT_POR_DEFECTO,
+                 configurar: Optional[Callable[[sqlite3.Connection], None]] = None,
+                 fabrica: type = sqlite3.Connection):
+        self.ruta = ruta
+        self.tamano = tamano
+        self.timeout = timeout
+        self.fabrica = fabrica
+        self._configurar = configurar
+        self._libres: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._cupos = threading.BoundedSemaphore(tamano) if tamano > 0 else None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._todas: set = set()
+        self._stats = {
+            "checkouts": 0,
+            "esperas": 0,
+            "timeouts": 0,
+            "creadas": 0,
+            "descartadas": 0,
+            "en_uso": 0,
+            "aparte": 0,
+        }
+
+    # ---------- ciclo de vida de las conexiones ----------
+
+    def _abrir(self) -> sqlite3.Connection:
+        # PARSE_DECLTYPES: las columnas declaradas FECHA salen como texto ISO (ver fechas.py)
+        conn = sqlite3.connect(self.ruta, check_same_thread=False, factory=self.fabrica,
+                               detect_types=sqlite3.PARSE_DECLTYPES)
+        conn.row_factory = sqlite3.Row
+        # Habilitar claves foráneas (importante para ON DELETE CASCADE)
+        conn.execute("PRAGMA foreign_keys = ON")
+        if self._configurar:
+            self._configurar(conn)
+        return conn
+
+    def _crear(self) -> sqlite3.Connection:
+        conn = self._abrir()
+        with self._lock:
+            self._stats["creadas"] += 1
+            self._todas.add(conn)
+        return conn
+
+    def _descartar(self, conn: sqlite3.Connection) -> None:
+        with self._lock:
+            self._stats["descartadas"] += 1
+            self._todas.discard(conn)
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    @staticmethod
+    def _sana(conn: sqlite3.Connection) -> bool:
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _tomar(self) -> sqlite3.Connection:
+        if self._cupos is None:
+            return self._crear()
+
+        if not self._cupos.acquire(blocking=False):
+            with self._lock:
+                self._stats["esperas"] += 1
+            if not self._cupos.acquire(timeout=self.timeout):
+                with self._lock:
+                    self._stats["timeouts"] += 1
+                raise PoolAgotadoError(
+                    f"No hay conexiones libres ({self.tamano}) tras {self.timeout}s"
+                )
+
+        try:
+            while True:
+                try:
+                    conn = self._libres.get_nowait()
+                except queue.Empty:
+                    return self._crear()
+                if self._sana(conn):
+                    return conn
+                self._descartar(conn)
+        except BaseException:
+            self._cupos.release()
+            raise
+
+    def _devolver(self, conn: sqlite3.Connection, rota: bool) -> None:
+        if conn.in_transaction:
+            # Igual que conn.close(): lo que no se confirmó se descarta
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                rota = True
+
+        if self._cupos is None:
+            # Sin pool: la conexión se cierra siempre, no cuenta como descartada
+            with self._lock:
+                self._todas.discard(conn)
+            conn.close()
+            return
+
+        if rota:
+            self._descartar(conn)
+        else:
+            self._libres.put(conn)
+        self._cupos.release()
+
+    # ---------- API pública ----------
+
+    @contextmanager
+    def _prestamo(self):
+        conn = self._tomar()
+        with self._lock:
+            self._stats["checkouts"] += 1
+            self._stats["en_uso"] += 1
+
+        rota = False
+        try:
+            yield conn
+        except sqlite3.DatabaseError as e:
+            rota = not isinstance(e, sqlite3.IntegrityError) and not self._sana(conn)
+            raise
+        finally:
+            with self._lock:
+                self._stats["en_uso"] -= 1
+            self._devolver(conn, rota)
+
+    @contextmanager
+    def conexion(self):
+        """Presta una conexión al hilo actual y la devuelve al salir"""
+        actual = getattr(self._local, "conn", None)
+        if actual is not None:
+            self._local.profundidad += 1
+            try:
+                yield actual
+            finally:
+                self._local.profundidad -= 1
+            return
+
+        with self._prestamo() as conn:
+            self._local.conn = conn
+            self._local.profundidad = 1
+            try:
+                yield conn
+            finally:
+                self._local.conn = None
+                self._local.profundidad = 0
+
+    @contextmanager
+    def conexion_dedicada(self):
+        """
+        Presta una conexión que no queda asociada al hilo actual.
+
+        Es para generadores (respuestas en streaming) que Starlette avanza
+        desde distintos hilos del threadpool: la conexión se usa de a un hilo
+        por vez y vuelve al pool cuando el generador termina o se cierra.
+        """
+        with self._prestamo() as conn:
+            yield conn
+
+    @contextmanager
+    def conexion_aparte(self):
+        """
+        Abre una conexión propia, configurada como las del pool pero fuera de
+        él, y la cierra al salir.
+
+        Es para lecturas largas (respuestas en streaming) que dependen de lo
+        rápido que lea el cliente: no ocupan un cupo del pool, así que no
+        dejan esperando a los demás requests. Igual que conexion_dedicada(),
+        se usa de a un hilo por vez.
+        """
+        conn = self._abrir()
+        with self._lock:
+            self._stats["aparte"] += 1
+        try:
+            yield conn
+        finally:
+            with self._lock:
+                self._stats["aparte"] -= 1
+            conn.close()
+
+    def cerrar(self) -> None:
+        """Cierra todas las conexiones libres del pool"""
+        while True:
+            try:
+                conn = self._libres.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._todas.discard(conn)
+            conn.close()
+
+    def estadisticas(self) -> Dict[str, Any]:
+        """Devuelve contadores del pool (checkouts, esperas, en uso, ...)"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["tamano"] = self.tamano
+        stats["libres"] = self._libres.qsize()
+        stats["abiertas"] = len(self._todas)
+        return stats
+
+
+_pool: Optional[PoolConexiones] = None
+_pool_lock = threading.Lock()
+
+
+def obtener_pool(ruta: str, tamano: Optional[int] = None,
+                 configurar: Optional[Callable[[sqlite3.Connection], None]] = None,
+                 fabrica: type = sqlite3.Connection) -> PoolConexiones:
+    """
+    Devuelve el pool del proceso para `ruta`, creándolo si hace falta.
+
+    Si cambia la ruta de la base (por ejemplo en los tests), el tamaño pedido
+    o la clase de conexión, el pool anterior se cierra y se crea uno nuevo.
+    `configurar` se llama con cada conexión nueva que abre el pool.
+    """
+    global _pool
+    with _pool_lock:
+        if (_pool is None or _pool.ruta != ruta or _pool.fabrica is not fabrica
+                or (tamano is not None and _pool.tamano != tamano)):
+            if _pool is not None:
+                _pool.cerrar()
+            _pool = PoolConexiones(
+                ruta,
+                tamano if tamano is not None else TAMANO_POR_DEFECTO,
+                configurar=configurar,
+                fabrica=fabrica,
+            )
+        return _pool
+
+
+def reiniciar_pool() -> None:
+    """Cierra las conexiones libres y olvida el pool actual"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.cerrar()
+        _pool = None
@@ -0,0 +1,44 @@
+import json
+import os
+from typing import Any
+
+from fastapi import Response
+
+try:
+    import orjson
+except ImportError:  # opcional: sin orjson se usa json de la biblioteca estándar
+    orjson = None
+
+
+# Con TAREAS_JSON_RAPIDO=1 los listados se codifican directo a bytes, sin
+# volver a validar cada fila contra el response_model (el esquema de OpenAPI
+# no cambia: los decoradores siguen declarando los modelos)
+JSON_RAPIDO = os.environ.get("TAREAS_JSON_RAPIDO", "0") == "1"
+
+
+def a_json(datos: Any) -> bytes:
+    """Codifica a JSON compacto en UTF-8 (con orjson si está instalado)"""
+    if orjson is not None:
+        return orjson.dumps(datos)
+    return json.dumps(datos, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class JSONRapido(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return a_json(content)
+
+
+def responder(datos: Any, response: Response) -> Any:
+    """
+    Devuelve `datos` tal cual (FastAPI los valida con el response_model) o,
+    si está activo el modo rápido, ya codificados en una JSONRapido con los
+    headers que el endpoint haya puesto en `response`.
+
+    Solo para filas que salen de la base con las columnas del modelo: en el
+    modo rápido no se filtran ni se convierten campos.
+    """
+    if not JSON_RAPIDO:
+        return datos
+    return JSONRapido(datos, headers=dict(response.headers))
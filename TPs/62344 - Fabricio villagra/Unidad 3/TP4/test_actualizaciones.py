@@ -0,0 +1,98 @@
+import pytest
+
+import database
+
+
+pytestmark = pytest.mark.usefixtures("db_temporal")
+
+
+@pytest.fixture
+def client(client):
+    client.post("/proyectos", json={"nombre": "Alpha", "descripcion": "Primero"})
+    client.post("/proyectos", json={"nombre": "Beta"})
+    client.post("/proyectos/1/tareas", json={"descripcion": "Tarea 1", "prioridad": "alta"})
+    return client
+
+
+def sentencias(funcion, *args, **kwargs):
+    """Ejecuta la función y devuelve las sentencias SQL que envió"""
+    capturadas = []
+    with database.get_connection() as conn:
+        conn.set_trace_callback(capturadas.append)
+        try:
+            resultado = funcion(*args, **kwargs)
+        finally:
+            conn.set_trace_callback(None)
+    # Cada trigger que dispara la sentencia vuelve a reportar el mismo SQL:
+    # las repeticiones consecutivas son una sola sentencia
+    consultas = [sql for i, sql in enumerate(capturadas)
+                 if sql.split()[0].upper() in ("SELECT", "UPDATE")
+                 and (i == 0 or capturadas[i - 1] != sql)]
+    return resultado, consultas
+
+
+def test_actualizar_tarea_es_un_solo_update(client):
+    tarea, consultas = sentencias(database.actualizar_tarea, 1, "Nueva", "completada", "baja", 2)
+
+    assert len(consultas) == 1
+    assert consultas[0].startswith("UPDATE tareas SET descripcion = 'Nueva', estado = 'completada'")
+    assert tarea["descripcion"] == "Nueva"
+    assert tarea["proyecto_id"] == 2
+
+
+def test_actualizar_proyecto_es_un_solo_update(client):
+    proyecto, consultas = sentencias(database.actualizar_proyecto, 1, descripcion="Otra")
+
+    assert len(consultas) == 1
+    assert proyecto["nombre"] == "Alpha"
+    assert proyecto["descripcion"] == "Otra"
+
+
+def test_actualizar_inexistente_devuelve_none(client):
+    assert database.actualizar_tarea(999, estado="completada") is None
+    assert database.actualizar_proyecto(999, nombre="Gamma") is None
+
+
+def test_put_tarea_con_proyecto_inexistente(client):
+    respuesta = client.put("/tareas/1", json={"proyecto_id": 999})
+    assert respuesta.status_code == 400
+    assert client.get("/proyectos/1/tareas").json()[0]["proyecto_id"] == 1
+
+
+def test_put_tarea_inexistente_con_proyecto_inexistente(client):
+    assert client.put("/tareas/999", json={"proyecto_id": 999}).status_code == 404
+
+
+def test_put_proyecto(client):
+    assert client.put("/proyectos/2", json={"nombre": "Alpha"}).status_code == 409
+    assert client.put("/proyectos/999", json={"nombre": "Alpha"}).status_code == 404
+    # Volver a poner su propio nombre no es un duplicado
+    assert client.put("/proyectos/1", json={"nombre": "Alpha"}).status_code == 200
+
+
+def test_patch_cambia_solo_lo_enviado(client):
+    respuesta = client.patch("/tareas/1", json={"estado": "en_progreso"})
+
+    assert respuesta.status_code == 200
+    tarea = respuesta.json()
+    assert tarea["estado"] == "en_progreso"
+    assert tarea["descripcion"] == "Tarea 1"
+    assert tarea["prioridad"] == "alta"
+
+
+def test_patch_vacio_devuelve_la_tarea(client):
+    respuesta = client.patch("/tareas/1", json={})
+    assert respuesta.status_code == 200
+    assert respuesta.json()["descripcion"] == "Tarea 1"
+
+
+def test_patch_rechaza_null(client):
+    respuesta = client.patch("/tareas/1", json={"estado": None})
+    assert respuesta.status_code == 422
+    assert client.patch("/tareas/1", json={}).json()["estado"] == "pendiente"
+
+
+def test_patch_errores(client):
+    assert client.patch("/tareas/999", json={"estado": "completada"}).status_code == 404
+    assert client.patch("/tareas/1", json={"proyecto_id": 999}).status_code == 400
+    assert client.patch("/tareas/1", json={"estado": "otro"}).status_code == 422
@@ -0,0 +1,161 @@
+import random
+import sqlite3
+
+import pytest
+
+import cambios
+import database
+
+
+ESTADOS = ["pendiente", "en_progreso", "completada"]
+
+
+pytestmark = pytest.mark.usefixtures("db_temporal")
+
+
+def sincronizar(client, replica, desde, limite=None):
+    """Aplica los cambios desde `desde` a la réplica, página por página"""
+    while True:
+        params = {"desde": desde} if limite is None else {"desde": desde, "limite": limite}
+        respuesta = client.get("/cambios", params=params)
+        assert respuesta.status_code == 200
+        delta = respuesta.json()
+        for tabla in ("proyectos", "tareas"):
+            for fila in delta[tabla]:
+                replica[tabla][fila["id"]] = fila
+            for registro_id in delta["borrados"][tabla]:
+                replica[tabla].pop(registro_id, None)
+        desde = delta["version"]
+        if not delta["hay_mas"]:
+            return desde
+
+
+def estado_actual():
+    with database.get_connection() as conn:
+        return {tabla: {fila["id"]: dict(fila) for fila in conn.execute(f"SELECT * FROM {tabla}")}
+                for tabla in ("proyectos", "tareas")}
+
+
+def test_devuelve_solo_lo_que_cambio(client):
+    client.post("/proyectos", json={"nombre": "A"})
+    for i in range(3):
+        client.post("/proyectos/1/tareas", json={"descripcion": f"t{i}"})
+    inicial = client.get("/cambios").json()
+    assert inicial["desde"] == 0 and inicial["version"] == 4 and not inicial["hay_mas"]
+    assert [t["id"] for t in inicial["tareas"]] == [1, 2, 3]
+
+    client.put("/tareas/2", json={"estado": "completada"})
+    client.put("/tareas/2", json={"prioridad": "alta"})
+    client.delete("/tareas/3")
+    delta = client.get("/cambios", params={"desde": 4}).json()
+    assert delta["proyectos"] == []
+    assert [(t["id"], t["estado"], t["prioridad"]) for t in delta["tareas"]] == [(2, "completada", "alta")]
+    assert delta["borrados"] == {"proyectos": [], "tareas": [3]}
+
+    # Sin cambios nuevos: la misma versión y nada para aplicar
+    vacio = client.get("/cambios", params={"desde": delta["version"]}).json()
+    assert vacio["version"] == delta["version"]
+    assert vacio["tareas"] == [] and vacio["borrados"] == {"proyectos": [], "tareas": []}
+
+
+def test_borrar_proyecto_informa_las_tareas_en_cascada(client):
+    client.post("/proyectos", json={"nombre": "A"})
+    client.post("/proyectos", json={"nombre": "B"})
+    for proyecto_id in (1, 1, 2):
+        client.post(f"/proyectos/{proyecto_id}/tareas", json={"descripcion": "x"})
+    version = client.get("/cambios").json()["version"]
+
+    client.delete("/proyectos/1")
+    delta = client.get("/cambios", params={"desde": version}).json()
+    assert delta["borrados"] == {"proyectos": [1], "tareas": [1, 2]}
+    assert delta["proyectos"] == [] and delta["tareas"] == []
+
+
+def test_replica_sigue_una_carga_aleatoria_por_paginas(client):
+    azar = random.Random(7)
+    replica = {"proyectos": {}, "tareas": {}}
+    version = 0
+    proyectos, tareas = [], []
+
+    for paso in range(300):
+        accion = azar.random()
+        if accion < 0.1 or not proyectos:
+            proyectos.append(client.post("/proyectos", json={"nombre": f"P{paso}"}).json()["id"])
+        elif accion < 0.5:
+            tareas.append(client.post(f"/proyectos/{azar.choice(proyectos)}/tareas",
+                                      json={"descripcion": f"T{paso}"}).json()["id"])
+        elif accion < 0.75 and tareas:
+            client.put(f"/tareas/{azar.choice(tareas)}", json={"estado": azar.choice(ESTADOS)})
+        elif accion < 0.9 and tareas:
+            client.delete(f"/tareas/{tareas.pop(azar.randrange(len(tareas)))}")
+        elif len(proyectos) > 1:
+            client.delete(f"/proyectos/{proyectos.pop(azar.randrange(len(proyectos)))}")
+            tareas = list(estado_actual()["tareas"])
+        if paso % 25 == 0:
+            version = sincronizar(client, replica, version, limite=7)
+
+    sincronizar(client, replica, version, limite=7)
+    assert replica == estado_actual()
+
+
+def test_version_desconocida_es_410(client):
+    client.post("/proyectos", json={"nombre": "A"})
+    respuesta = client.get("/cambios", params={"desde": 50})
+    assert respuesta.status_code == 410
+    assert client.get("/cambios", params={"desde": -1}).status_code == 422
+
+
+def test_etag_sin_cambios_es_304(client):
+    client.post("/proyectos", json={"nombre": "A"})
+    primera = client.get("/cambios", params={"desde": 0})
+    etag = primera.headers["etag"]
+    assert client.get("/cambios", params={"desde": 0}, headers={"If-None-Match": etag}).status_code == 304
+
+    client.post("/proyectos/1/tareas", json={"descripcion": "x"})
+    assert client.get("/cambios", params={"desde": 0}, headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_consultas_usan_indices():
+    for i in range(20):
+        database.crear_proyecto(f"P{i}")
+        database.crear_tarea("x", "pendiente", "media", i + 1)
+    with database.get_connection() as conn:
+        consultas = [
+            "SELECT IFNULL(MAX(version), 0) FROM cambios",
+            "SELECT tabla, registro_id, version, borrado FROM cambios WHERE version > 10 ORDER BY version LIMIT 6",
+            "SELECT * FROM tareas WHERE id IN (1, 2, 3) ORDER BY id",
+        ]
+        for sql in consultas:
+            plan = [fila[3] for fila in conn.execute("EXPLAIN QUERY PLAN " + sql)]
+            assert not [paso for paso in plan if paso.startswith("SCAN")], f"{sql}\n  plan: {plan}"
+
+
+def test_init_db_registra_las_filas_de_una_base_existente(tmp_path, monkeypatch):
+    ruta = str(tmp_path / "vieja.db")
+    conn = sqlite3.connect(ruta)
+    conn.executescript("""
+        CREATE TABLE proyectos (id INTEGER PRIMARY KEY AUTOINCREMENT, nombre TEXT NOT NULL UNIQUE,
+                                descripcion TEXT, fecha_creacion TEXT NOT NULL);
+        CREATE TABLE tareas (id INTEGER PRIMARY KEY AUTOINCREMENT, descripcion TEXT NOT NULL,
+                             estado TEXT NOT NULL, prioridad TEXT NOT NULL, proyecto_id INTEGER NOT NULL,
+                             fecha_creacion TEXT NOT NULL,
+                             FOREIGN KEY (proyecto_id) REFERENCES proyectos(id) ON DELETE CASCADE);
+        INSERT INTO proyectos VALUES (1, 'Viejo', NULL, '2024-01-01');
+        INSERT INTO tareas VALUES (4, 'a', 'pendiente', 'alta', 1, '2024-01-01'),
+                                  (9, 'b', 'completada', 'alta', 1, '2024-01-02');
+    """)
+    conn.close()
+
+    monkeypatch.setattr(database, "DB_NAME", ruta)
+    database.init_db()
+    database.init_db()
+
+    completo = database.obtener_cambios(0, 100)
+    assert completo["version"] == 3
+    assert [p["id"] for p in completo["proyectos"]] == [1]
+    assert [t["id"] for t in completo["tareas"]] == [4, 9]
+
+    database.eliminar_tarea(4)
+    with database.get_connection() as conn:
+        assert cambios.version_actual(conn.cursor()) == 4
+    assert database.obtener_cambios(3, 100)["borrados"]["tareas"] == [4]
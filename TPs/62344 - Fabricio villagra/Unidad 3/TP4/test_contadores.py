@@ -0,0 +1,139 @@
+import random
+import sqlite3
+
+import pytest
+
+import contadores
+import database
+
+
+ESTADOS = ["pendiente", "en_progreso", "completada"]
+PRIORIDADES = ["baja", "media", "alta"]
+
+
+pytestmark = pytest.mark.usefixtures("db_temporal")
+
+
+def resumen_general_desde_cero():
+    """Lo que calculaba obtener_resumen_general antes de los contadores"""
+    with database.get_connection() as conn:
+        total_proyectos = conn.execute("SELECT COUNT(*) FROM proyectos").fetchone()[0]
+        total_tareas = conn.execute("SELECT COUNT(*) FROM tareas").fetchone()[0]
+        por_estado = dict(conn.execute("SELECT estado, COUNT(*) FROM tareas GROUP BY estado").fetchall())
+        mas_tareas = conn.execute("""
+            SELECT p.id, p.nombre, COUNT(t.id) FROM proyectos p
+            LEFT JOIN tareas t ON p.id = t.proyecto_id
+            GROUP BY p.id ORDER BY COUNT(t.id) DESC, p.id LIMIT 1
+        """).fetchone()
+    return {
+        "total_proyectos": total_proyectos,
+        "total_tareas": total_tareas,
+        "tareas_por_estado": {estado: por_estado.get(estado, 0) for estado in ESTADOS},
+        "proyecto_con_mas_tareas": (
+            {"id": mas_tareas[0], "nombre": mas_tareas[1], "cantidad_tareas": mas_tareas[2]}
+            if mas_tareas and mas_tareas[2] else None
+        ),
+    }
+
+
+def test_contadores_siguen_una_carga_aleatoria(client):
+    azar = random.Random(42)
+    proyectos, tareas = [], []
+
+    for paso in range(400):
+        accion = azar.random()
+        if accion < 0.1 or not proyectos:
+            proyectos.append(client.post("/proyectos", json={"nombre": f"Proyecto {paso}"}).json()["id"])
+        elif accion < 0.55:
+            tarea = client.post(f"/proyectos/{azar.choice(proyectos)}/tareas", json={
+                "descripcion": f"Tarea {paso}",
+                "estado": azar.choice(ESTADOS),
+                "prioridad": azar.choice(PRIORIDADES),
+            }).json()
+            tareas.append(tarea["id"])
+        elif accion < 0.8 and tareas:
+            client.put(f"/tareas/{azar.choice(tareas)}", json={
+                "estado": azar.choice(ESTADOS),
+                "proyecto_id": azar.choice(proyectos),
+            })
+        elif accion < 0.95 and tareas:
+            client.delete(f"/tareas/{tareas.pop(azar.randrange(len(tareas)))}")
+        elif len(proyectos) > 1:
+            client.delete(f"/proyectos/{proyectos.pop(azar.randrange(len(proyectos)))}")
+            with database.get_connection() as conn:
+                tareas = [fila[0] for fila in conn.execute("SELECT id FROM tareas")]
+
+    assert database.verificar_contadores() == []
+    assert client.get("/resumen").json() == resumen_general_desde_cero()
+
+    for proyecto_id in proyectos:
+        resumen = client.get(f"/proyectos/{proyecto_id}/resumen").json()
+        with database.get_connection() as conn:
+            total = conn.execute("SELECT COUNT(*) FROM tareas WHERE proyecto_id = ?", (proyecto_id,)).fetchone()[0]
+        assert resumen["total_tareas"] == total
+        assert sum(resumen["por_estado"].values()) == total
+        assert sum(resumen["por_prioridad"].values()) == total
+
+
+def test_resumen_general_vacio_y_empate(client):
+    assert client.get("/resumen").json() == resumen_general_desde_cero()
+
+    client.post("/proyectos", json={"nombre": "A"})
+    client.post("/proyectos", json={"nombre": "B"})
+    client.post("/proyectos/2/tareas", json={"descripcion": "x"})
+    client.post("/proyectos/1/tareas", json={"descripcion": "y"})
+    assert client.get("/resumen").json()["proyecto_con_mas_tareas"]["id"] == 1
+
+
+def test_verificar_y_reconstruir(client):
+    client.post("/proyectos", json={"nombre": "A"})
+    for _ in range(3):
+        client.post("/proyectos/1/tareas", json={"descripcion": "x", "estado": "completada"})
+
+    with database.get_connection() as conn:
+        conn.execute("UPDATE contadores SET cantidad = 99 WHERE proyecto_id = 1 AND campo = 'estado'")
+        conn.commit()
+
+    diferencias = database.verificar_contadores()
+    assert diferencias == [{"proyecto_id": 1, "campo": "estado", "valor": "completada",
+                            "guardado": 99, "esperado": 3}]
+
+    database.reconstruir_contadores()
+    assert database.verificar_contadores() == []
+    assert client.get("/proyectos/1/resumen").json()["por_estado"]["completada"] == 3
+
+
+def test_init_db_llena_contadores_de_una_base_existente(tmp_path, monkeypatch):
+    ruta = str(tmp_path / "vieja.db")
+    conn = sqlite3.connect(ruta)
+    conn.executescript("""
+        CREATE TABLE proyectos (id INTEGER PRIMARY KEY AUTOINCREMENT, nombre TEXT NOT NULL UNIQUE,
+                                descripcion TEXT, fecha_creacion TEXT NOT NULL);
+        CREATE TABLE tareas (id INTEGER PRIMARY KEY AUTOINCREMENT, descripcion TEXT NOT NULL,
+                             estado TEXT NOT NULL, prioridad TEXT NOT NULL, proyecto_id INTEGER NOT NULL,
+                             fecha_creacion TEXT NOT NULL,
+                             FOREIGN KEY (proyecto_id) REFERENCES proyectos(id) ON DELETE CASCADE);
+        INSERT INTO proyectos VALUES (1, 'Viejo', NULL, '2024-01-01');
+        INSERT INTO tareas VALUES (1, 'a', 'pendiente', 'alta', 1, '2024-01-01'),
+                                  (2, 'b', 'completada', 'alta', 1, '2024-01-02');
+    """)
+    conn.close()
+
+    monkeypatch.setattr(database, "DB_NAME", ruta)
+    database.init_db()
+
+    assert database.verificar_contadores() == []
+    resumen = database.obtener_resumen_proyecto(1)
+    assert resumen["total_tareas"] == 2
+    assert resumen["por_prioridad"] == {"baja": 0, "media": 0, "alta": 2}
+    assert database.obtener_resumen_general()["total_proyectos"] == 1
+
+
+def test_triggers_en_la_misma_transaccion(client):
+    client.post("/proyectos", json={"nombre": "A"})
+    with database.get_connection() as conn:
+        conn.execute("INSERT INTO tareas (descripcion, estado, prioridad, proyecto_id, fecha_creacion) "
+                     "VALUES ('x', 'pendiente', 'media', 1, '2024')")
+        conn.rollback()
+    assert database.obtener_resumen_general()["total_tareas"] == 0
+    assert contadores.GENERAL == 0
@@ -0,0 +1,154 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import pytest
+
+import database
+import escritor
+from escritor import EscritorAgrupado, EscritorCerradoError
+
+
+@pytest.fixture(autouse=True)
+def proyecto_alpha(db_temporal):
+    database.crear_proyecto("Alpha")
+
+
+def prestar():
+    return database.pool_db().conexion_dedicada()
+
+
+def insertar(cursor, descripcion, proyecto_id=1):
+    return database._insertar_tarea(cursor, descripcion, "pendiente", "media", proyecto_id)
+
+
+def contar_tareas():
+    with database.get_connection() as conn:
+        return conn.execute("SELECT COUNT(*) FROM tareas").fetchone()[0]
+
+
+def test_junta_las_operaciones_en_un_commit():
+    commits = []
+
+    @contextmanager
+    def prestar_trazado():
+        with prestar() as conn:
+            conn.set_trace_callback(lambda sql: commits.append(sql) if sql == "COMMIT" else None)
+            try:
+                yield conn
+            finally:
+                conn.set_trace_callback(None)
+
+    # Espera larga: el lote se cierra por cantidad
+    agrupado = EscritorAgrupado(prestar_trazado, max_operaciones=10, max_espera_ms=5000)
+    futuros = [agrupado.enviar(insertar, f"Tarea {i}") for i in range(10)]
+    tareas = [f.result(timeout=5) for f in futuros]
+    agrupado.detener()
+
+    assert [t["descripcion"] for t in tareas] == [f"Tarea {i}" for i in range(10)]
+    assert len({t["id"] for t in tareas}) == 10
+    assert commits == ["COMMIT"]
+    assert agrupado.estadisticas()["lotes"] == 1
+    assert contar_tareas() == 10
+
+
+def test_un_error_solo_afecta_a_su_operacion():
+    agrupado = EscritorAgrupado(prestar, max_operaciones=3, max_espera_ms=5000)
+    buena = agrupado.enviar(insertar, "Buena")
+    mala = agrupado.enviar(insertar, "Proyecto inexistente", 99)
+    otra = agrupado.enviar(insertar, "Otra buena")
+
+    assert buena.result(timeout=5)["descripcion"] == "Buena"
+    with pytest.raises(sqlite3.IntegrityError):
+        mala.result(timeout=5)
+    assert otra.result(timeout=5)["descripcion"] == "Otra buena"
+    agrupado.detener()
+
+    assert contar_tareas() == 2
+    assert database.verificar_contadores() == []
+    assert agrupado.estadisticas()["errores"] == 1
+
+
+def test_si_falla_el_commit_fallan_todas():
+    class ConexionSinCommit(sqlite3.Connection):
+        def commit(self):
+            raise sqlite3.OperationalError("disco lleno")
+
+    @contextmanager
+    def prestar_roto():
+        conn = sqlite3.connect(database.DB_NAME, factory=ConexionSinCommit)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    agrupado = EscritorAgrupado(prestar_roto, max_operaciones=2, max_espera_ms=5000)
+    futuros = [agrupado.enviar(insertar, "Una"), agrupado.enviar(insertar, "Dos")]
+    for futuro in futuros:
+        with pytest.raises(sqlite3.OperationalError, match="disco lleno"):
+            futuro.result(timeout=5)
+    agrupado.detener()
+
+    assert contar_tareas() == 0
+    assert agrupado.estadisticas()["lotes_fallidos"] == 1
+
+
+def test_resultado_visible_al_resolver_el_future():
+    agrupado = EscritorAgrupado(prestar, max_espera_ms=0)
+    tarea = agrupado.enviar(insertar, "Confirmada").result(timeout=5)
+    agrupado.detener()
+
+    # Otra conexión (fuera del pool) ya ve la fila
+    conn = sqlite3.connect(database.DB_NAME)
+    fila = conn.execute("SELECT descripcion FROM tareas WHERE id = ?", (tarea["id"],)).fetchone()
+    conn.close()
+    assert fila == ("Confirmada",)
+
+
+def test_operacion_cancelada_no_se_ejecuta():
+    liberar = threading.Event()
+
+    def bloquear(cursor):
+        liberar.wait(5)
+
+    agrupado = EscritorAgrupado(prestar, max_operaciones=1, max_espera_ms=0)
+    primera = agrupado.enviar(bloquear)
+    cancelada = agrupado.enviar(insertar, "Nunca")
+    assert cancelada.cancel()
+    liberar.set()
+    primera.result(timeout=5)
+    agrupado.detener()
+
+    assert contar_tareas() == 0
+
+
+def test_detener_vacia_la_cola_y_rechaza_nuevas():
+    agrupado = EscritorAgrupado(prestar, max_operaciones=4, max_espera_ms=1)
+    futuros = [agrupado.enviar(insertar, f"Tarea {i}") for i in range(20)]
+    agrupado.detener()
+
+    assert all(f.done() and f.exception() is None for f in futuros)
+    assert contar_tareas() == 20
+    with pytest.raises(EscritorCerradoError):
+        agrupado.enviar(insertar, "Tarde")
+
+
+@pytest.fixture
+def client_agrupado(client, monkeypatch):
+    monkeypatch.setattr(escritor, "ACTIVO", True)
+    return client
+
+
+def test_endpoints_con_el_escritor_activo(client_agrupado):
+    version = database.version_datos()
+    creada = client_agrupado.post("/proyectos/1/tareas", json={"descripcion": "Nueva", "prioridad": "alta"})
+    assert creada.status_code == 201
+    assert creada.json()["prioridad"] == "alta"
+    assert database.version_datos() != version
+
+    tarea_id = creada.json()["id"]
+    assert client_agrupado.put(f"/tareas/{tarea_id}", json={"estado": "completada"}).json()["estado"] == "completada"
+    assert client_agrupado.patch(f"/tareas/{tarea_id}", json={"descripcion": "Editada"}).json()["descripcion"] == "Editada"
+    assert client_agrupado.put("/tareas/999", json={"estado": "completada"}).status_code == 404
+    assert client_agrupado.put(f"/tareas/{tarea_id}", json={"proyecto_id": 99}).status_code == 400
+    assert database.escritor_db().estadisticas()["operaciones"] == 5
@@ -0,0 +1,161 @@
+import asyncio
+import os
+import sqlite3
+
+import pytest
+
+import cambios
+import database
+
+
+pytestmark = pytest.mark.usefixtures("db_temporal")
+
+
+@pytest.fixture
+def client(client):
+    client.post("/proyectos", json={"nombre": "Alpha"})
+    client.post("/proyectos/1/tareas", json={"descripcion": "Primera"})
+    return client
+
+
+@pytest.mark.parametrize("ruta", [
+    "/tareas", "/tareas?estado=pendiente", "/proyectos", "/proyectos/1",
+    "/proyectos/1/tareas", "/proyectos/1/resumen", "/resumen",
+])
+def test_304_sin_tocar_la_base(client, ruta):
+    primera = client.get(ruta)
+    etag = primera.headers["etag"]
+
+    antes = database.estadisticas_pool()["checkouts"]
+    respuesta = client.get(ruta, headers={"If-None-Match": etag})
+
+    assert respuesta.status_code == 304
+    assert respuesta.content == b""
+    assert respuesta.headers["etag"] == etag
+    assert database.estadisticas_pool()["checkouts"] == antes
+
+
+def test_una_escritura_cambia_el_etag(client):
+    etag = client.get("/tareas").headers["etag"]
+
+    client.post("/proyectos/1/tareas", json={"descripcion": "Segunda"})
+    respuesta = client.get("/tareas", headers={"If-None-Match": etag})
+
+    assert respuesta.status_code == 200
+    assert len(respuesta.json()) == 2
+    assert respuesta.headers["etag"] != etag
+
+
+def test_lecturas_no_cambian_el_etag(client):
+    etag = client.get("/resumen").headers["etag"]
+    client.get("/tareas")
+    client.get("/proyectos/1")
+    assert client.get("/resumen").headers["etag"] == etag
+
+
+def test_la_version_se_lee_fuera_del_event_loop(client, monkeypatch):
+    en_el_loop = []
+    original = database.version_datos
+
+    def version_datos():
+        try:
+            asyncio.get_running_loop()
+            en_el_loop.append(True)
+        except RuntimeError:
+            en_el_loop.append(False)
+        return original()
+
+    monkeypatch.setattr("etag.version_datos", version_datos)
+    assert "etag" in client.get("/tareas").headers
+    assert en_el_loop == [False]
+
+
+def test_escritura_directa_por_el_pool_cambia_la_version(client):
+    version = database.version_datos()
+    with database.get_connection() as conn:
+        conn.execute("UPDATE tareas SET estado = 'completada'")
+        conn.commit()
+    assert database.version_datos() != version
+
+
+def test_escritura_de_otro_proceso_cambia_el_etag(client):
+    etag = client.get("/tareas").headers["etag"]
+    # Una conexión por fuera del pool, como otro worker o el CLI de sqlite3
+    conn = sqlite3.connect(database.DB_NAME)
+    conn.execute("UPDATE tareas SET estado = 'completada'")
+    conn.commit()
+    conn.close()
+
+    respuesta = client.get("/tareas", headers={"If-None-Match": etag})
+    assert respuesta.status_code == 200
+    assert respuesta.json()[0]["estado"] == "completada"
+
+
+def test_base_recreada_no_repite_etag(client):
+    etag = client.get("/proyectos").headers["etag"]
+    for sufijo in ("", "-wal", "-shm"):
+        if os.path.exists(database.DB_NAME + sufijo):
+            os.remove(database.DB_NAME + sufijo)
+    database.init_db()
+    # Mismos datos y misma versión en un archivo nuevo
+    client.post("/proyectos", json={"nombre": "Alpha"})
+    client.post("/proyectos/1/tareas", json={"descripcion": "Primera"})
+
+    respuesta = client.get("/proyectos", headers={"If-None-Match": etag})
+    assert respuesta.status_code == 200
+    assert respuesta.headers["etag"].split("-")[1] == etag.split("-")[1]
+
+
+def test_lector_sin_registro_o_con_la_base_bloqueada(tmp_path):
+    ruta = str(tmp_path / "otra.db")
+    lector = cambios.LectorVersion()
+    assert lector.leer(ruta) is None
+    assert not os.path.exists(ruta)
+
+    conn = sqlite3.connect(ruta, isolation_level=None)
+    conn.execute("CREATE TABLE proyectos (id INTEGER PRIMARY KEY)")
+    conn.execute("CREATE TABLE tareas (id INTEGER PRIMARY KEY)")
+    assert lector.leer(ruta) is None
+
+    cambios.crear_cambios(conn.cursor())
+    version = lector.leer(ruta)
+    assert version.endswith("-0")
+    conn.execute("INSERT INTO tareas DEFAULT VALUES")
+    assert lector.leer(ruta).endswith("-1")
+
+    # Sin esperar el lock: mientras otro escribe no hay versión (ni ETag)
+    conn.execute("BEGIN EXCLUSIVE")
+    assert lector.leer(ruta) is None
+    conn.execute("ROLLBACK")
+    assert lector.leer(ruta).endswith("-1")
+    lector.cerrar()
+    conn.close()
+
+
+def test_escritura_fallida_no_deja_304_viejo(client):
+    etag = client.get("/proyectos").headers["etag"]
+    # Nombre repetido: falla sin modificar nada
+    assert client.post("/proyectos", json={"nombre": "Alpha"}).status_code == 409
+    assert client.get("/proyectos", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_etag_depende_de_la_query_y_del_accept(client):
+    etags = {
+        client.get("/tareas").headers["etag"],
+        client.get("/tareas?estado=pendiente").headers["etag"],
+        client.get("/tareas?formato=stream").headers["etag"],
+        client.get("/tareas", headers={"Accept": "application/x-ndjson"}).headers["etag"],
+    }
+    assert len(etags) == 4
+
+
+def test_if_none_match_con_lista_y_etag_debil(client):
+    etag = client.get("/tareas").headers["etag"]
+    respuesta = client.get("/tareas", headers={"If-None-Match": f'"otro", W/{etag}'})
+    assert respuesta.status_code == 304
+
+
+def test_errores_y_escrituras_no_llevan_etag(client):
+    assert "etag" not in client.get("/proyectos/99").headers
+    assert "etag" not in client.post("/proyectos", json={"nombre": "Beta"}).headers
+    assert "etag" not in client.get("/").headers
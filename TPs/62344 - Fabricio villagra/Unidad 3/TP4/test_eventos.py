@@ -0,0 +1,178 @@
+import asyncio
+import json
+import socket
+import threading
+import time
+
+import pytest
+import requests
+import uvicorn
+
+import database
+import eventos
+import main
+
+
+@pytest.fixture(autouse=True)
+def difusor_nuevo(db_temporal, monkeypatch):
+    monkeypatch.setattr(eventos, "difusor", eventos.Difusor())
+    monkeypatch.setattr(main, "difusor", eventos.difusor)
+
+
+def leer(mensajes):
+    """[(evento, datos)] de una lista de mensajes SSE"""
+    resultado = []
+    for mensaje in mensajes:
+        campos = dict(linea.split(": ", 1) for linea in mensaje.decode().strip().split("\n"))
+        resultado.append((campos["event"], json.loads(campos["data"])))
+    return resultado
+
+
+def test_filtra_por_proyecto_y_avisa_a_todos_si_cambia_de_proyecto():
+    async def escenario():
+        difusor = eventos.Difusor()
+        todo = difusor.suscribir()
+        uno = difusor.suscribir(proyecto_id=1)
+        dos = difusor.suscribir(proyecto_id=2)
+
+        difusor.publicar("tarea.creada", {"id": 1, "proyecto_id": 1}, 1)
+        difusor.publicar("tarea.actualizada", {"id": 1, "proyecto_id": 2}, 2, a_todos=True)
+        difusor.publicar("tarea.creada", {"id": 2, "proyecto_id": 3}, 3)
+
+        assert [e for e, _ in leer(await todo.siguientes(0))] == ["tarea.creada", "tarea.actualizada",
+                                                                  "tarea.creada"]
+        assert [e for e, _ in leer(await uno.siguientes(0))] == ["tarea.creada", "tarea.actualizada"]
+        assert [e for e, _ in leer(await dos.siguientes(0))] == ["tarea.actualizada"]
+        assert await dos.siguientes(0.01) == []
+
+        difusor.desuscribir(uno)
+        difusor.desuscribir(dos)
+        assert difusor.suscriptores() == 1
+
+    asyncio.run(escenario())
+
+
+def test_cola_llena_corta_solo_al_cliente_lento():
+    async def escenario():
+        difusor = eventos.Difusor()
+        lento = difusor.suscribir(max_cola=3)
+        rapido = difusor.suscribir(max_cola=3)
+        for i in range(5):
+            difusor.publicar("tarea.creada", {"id": i}, 1)
+            await rapido.siguientes(0)
+
+        assert lento.cortada and await lento.siguientes(0) == []
+        assert not rapido.cortada
+        assert difusor.estadisticas() == {"publicados": 5, "entregados": 8, "cortadas": 1, "suscriptores": 1}
+
+    asyncio.run(escenario())
+
+
+def test_publicar_desde_otro_hilo():
+    async def escenario():
+        difusor = eventos.Difusor()
+        suscripcion = difusor.suscribir()
+        hilo = threading.Thread(target=difusor.publicar, args=("proyecto.creado", {"id": 7}, 7))
+        hilo.start()
+        hilo.join()
+        return leer(await suscripcion.siguientes(5))
+
+    assert asyncio.run(escenario()) == [("proyecto.creado", {"id": 7})]
+
+
+def test_escrituras_del_data_layer_publican_eventos():
+    async def escenario():
+        todo = eventos.difusor.suscribir()
+        proyecto = database.crear_proyecto("A")
+        database.crear_proyecto("B")
+        tarea = database.crear_tarea("x", "pendiente", "media", proyecto["id"])
+        database.crear_tareas_lote(1, [("y", "completada", "alta")])
+        database.actualizar_tarea(tarea["id"], estado="completada")
+        database.actualizar_tarea(999, estado="completada")
+        database.actualizar_proyecto(2, descripcion="otra")
+        database.eliminar_tarea(tarea["id"])
+        database.eliminar_proyecto(1)
+        assert not database.eliminar_tarea(tarea["id"])
+        return leer(await todo.siguientes(0))
+
+    recibidos = asyncio.run(escenario())
+    assert [evento for evento, _ in recibidos] == [
+        "proyecto.creado", "proyecto.creado", "tarea.creada", "tarea.creada", "tarea.actualizada",
+        "proyecto.actualizado", "tarea.eliminada", "proyecto.eliminado",
+    ]
+    assert recibidos[2][1] == {"id": 1, "descripcion": "x", "estado": "pendiente", "prioridad": "media",
+                               "proyecto_id": 1, "fecha_creacion": recibidos[2][1]["fecha_creacion"]}
+    assert recibidos[3][1]["id"] == 2 and recibidos[3][1]["descripcion"] == "y"
+    assert recibidos[4][1]["estado"] == "completada"
+    assert recibidos[6][1] == {"id": 1, "proyecto_id": 1}
+    assert recibidos[7][1] == {"id": 1}
+
+
+def test_escritor_agrupado_publica_despues_del_commit():
+    async def escenario():
+        database.crear_proyecto("A")
+        suscripcion = eventos.difusor.suscribir(proyecto_id=1)
+        tarea = await asyncio.wrap_future(database.crear_tarea_agrupada("x", "pendiente", "media", 1))
+        with pytest.raises(Exception):
+            await asyncio.wrap_future(database.crear_tarea_agrupada("y", "pendiente", "media", 99))
+        await asyncio.wrap_future(database.actualizar_tarea_agrupada(tarea["id"], prioridad="alta"))
+        mensajes = []
+        while len(mensajes) < 2:
+            mensajes += await suscripcion.siguientes(5)
+        return leer(mensajes)
+
+    recibidos = asyncio.run(escenario())
+    assert [(evento, datos["prioridad"]) for evento, datos in recibidos] == [
+        ("tarea.creada", "media"), ("tarea.actualizada", "alta")
+    ]
+
+
+@pytest.fixture
+def servidor():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    servidor = uvicorn.Server(uvicorn.Config(main.app, log_level="warning", timeout_graceful_shutdown=1))
+    hilo = threading.Thread(target=servidor.run, kwargs={"sockets": [sock]}, daemon=True)
+    hilo.start()
+    limite = time.time() + 10
+    while not servidor.started and time.time() < limite:
+        time.sleep(0.01)
+    yield f"http://127.0.0.1:{sock.getsockname()[1]}"
+    servidor.should_exit = True
+    hilo.join(10)
+
+
+def eventos_del_stream(respuesta, cantidad):
+    """Lee líneas del stream hasta juntar `cantidad` eventos"""
+    recibidos, evento = [], None
+    for linea in respuesta.iter_lines(decode_unicode=True):
+        if linea.startswith("event: "):
+            evento = linea[len("event: "):]
+        elif linea.startswith("data: "):
+            recibidos.append((evento, json.loads(linea[len("data: "):])))
+            if len(recibidos) == cantidad:
+                return recibidos
+    return recibidos
+
+
+def test_get_eventos_en_vivo_filtrado_por_proyecto(servidor):
+    requests.post(f"{servidor}/proyectos", json={"nombre": "A"})
+    requests.post(f"{servidor}/proyectos", json={"nombre": "B"})
+    assert requests.get(f"{servidor}/eventos", params={"proyecto_id": 99}).status_code == 404
+
+    with requests.get(f"{servidor}/eventos", params={"proyecto_id": 2}, stream=True, timeout=10) as respuesta:
+        assert respuesta.headers["content-type"].startswith("text/event-stream")
+        requests.post(f"{servidor}/proyectos/1/tareas", json={"descripcion": "de A"})
+        requests.post(f"{servidor}/proyectos/2/tareas", json={"descripcion": "de B"})
+        requests.delete(f"{servidor}/tareas/2")
+
+        recibidos = eventos_del_stream(respuesta, 2)
+    assert recibidos[0][0] == "tarea.creada"
+    assert (recibidos[0][1]["id"], recibidos[0][1]["descripcion"]) == (2, "de B")
+    assert recibidos[1] == ("tarea.eliminada", {"id": 2, "proyecto_id": 2})
+
+    # Al desconectarse el cliente se cancela el stream y se borra la suscripción
+    limite = time.time() + 5
+    while eventos.difusor.suscriptores() and time.time() < limite:
+        time.sleep(0.01)
+    assert eventos.difusor.suscriptores() == 0
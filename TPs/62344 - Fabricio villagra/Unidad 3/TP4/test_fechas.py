@@ -0,0 +1,122 @@
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import database
+import fechas
+
+
+pytestmark = pytest.mark.usefixtures("db_temporal")
+
+
+@pytest.fixture
+def tareas(client):
+    """Dos proyectos y 20 tareas, una por día desde el 1/1/2024 a las 12:00"""
+    client.post("/proyectos", json={"nombre": "Alpha"})
+    client.post("/proyectos", json={"nombre": "Beta"})
+    with database.get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO tareas (descripcion, estado, prioridad, proyecto_id, fecha_creacion) "
+            "VALUES (?, ?, 'media', ?, ?)",
+            [(f"Tarea {i}", ["pendiente", "completada"][i % 2], 1 + i % 2,
+              fechas.a_us(datetime(2024, 1, 1, 12) + timedelta(days=i))) for i in range(20)],
+        )
+        conn.commit()
+
+
+@pytest.mark.parametrize("texto", ["2024-01-15T10:30:00.123456", "2024-01-15T10:30:00",
+                                   "1969-12-31T23:59:59.999999", "2024-02-29T00:00:00.000001"])
+def test_ida_y_vuelta_exacta(texto):
+    assert fechas.us_a_iso(fechas.iso_a_us(texto)) == texto
+
+
+def test_se_guarda_como_entero_y_sale_igual_que_antes(client):
+    client.post("/proyectos", json={"nombre": "A"})
+    creada = client.post("/proyectos/1/tareas", json={"descripcion": "x"}).json()
+    assert datetime.fromisoformat(creada["fecha_creacion"]).isoformat() == creada["fecha_creacion"]
+
+    assert client.get("/tareas").json()[0]["fecha_creacion"] == creada["fecha_creacion"]
+    assert client.put("/tareas/1", json={"estado": "completada"}).json()["fecha_creacion"] == creada["fecha_creacion"]
+    with database.get_connection() as conn:
+        assert conn.execute("SELECT typeof(fecha_creacion) FROM tareas").fetchone()[0] == "integer"
+        with pytest.raises(sqlite3.IntegrityError):
+            conn.execute("INSERT INTO tareas (descripcion, estado, prioridad, proyecto_id, fecha_creacion) "
+                         "VALUES ('y', 'pendiente', 'media', 1, '2024-01-01T00:00:00')")
+
+
+def dias(respuesta):
+    return [datetime.fromisoformat(t["fecha_creacion"]).day for t in respuesta.json()]
+
+
+def test_desde_inclusive_hasta_exclusive(client, tareas):
+    assert dias(client.get("/tareas", params={"desde": "2024-01-05T12:00:00", "hasta": "2024-01-08T12:00:00"})) \
+        == [5, 6, 7]
+    assert dias(client.get("/tareas", params={"desde": "2024-01-18", "orden": "desc"})) == [20, 19, 18]
+    assert dias(client.get("/tareas", params={"hasta": "2024-01-03"})) == [1, 2]
+    assert dias(client.get("/tareas", params={"desde": "2024-01-03", "estado": "completada", "hasta": "2024-01-10"})) \
+        == [4, 6, 8]
+    assert dias(client.get("/proyectos/1/tareas", params={"desde": "2024-01-10", "hasta": "2024-01-15"})) \
+        == [11, 13]
+    # Con zona horaria se compara en hora local, igual que datetime.now()
+    desde = datetime(2024, 1, 19, 12).astimezone().astimezone(timezone.utc).isoformat()
+    assert dias(client.get("/tareas", params={"desde": desde})) == [19, 20]
+
+
+def test_rango_con_paginas_y_streaming(client, tareas):
+    params = {"desde": "2024-01-04", "hasta": "2024-01-16"}
+    ids, cursor = [], None
+    while True:
+        pagina = client.get("/tareas", params={**params, "limit": 5, **({"cursor": cursor} if cursor else {})}).json()
+        ids += [t["id"] for t in pagina["tareas"]]
+        cursor = pagina["siguiente"]
+        if cursor is None:
+            break
+    assert ids == list(range(4, 16))
+
+    stream = client.get("/tareas", params={**params, "formato": "stream"})
+    assert stream.text.count("\n") == 12
+
+
+def test_fecha_invalida(client, tareas):
+    assert client.get("/tareas", params={"desde": "ayer"}).status_code == 422
+    assert client.get("/proyectos/1/tareas", params={"hasta": "2024-13-01"}).status_code == 422
+
+
+def test_migra_una_base_con_fechas_de_texto(tmp_path, monkeypatch):
+    ruta = str(tmp_path / "vieja.db")
+    conn = sqlite3.connect(ruta)
+    conn.executescript("""
+        CREATE TABLE proyectos (id INTEGER PRIMARY KEY AUTOINCREMENT, nombre TEXT NOT NULL UNIQUE,
+                                descripcion TEXT, fecha_creacion TEXT NOT NULL);
+        CREATE TABLE tareas (id INTEGER PRIMARY KEY AUTOINCREMENT, descripcion TEXT NOT NULL,
+                             estado TEXT NOT NULL, prioridad TEXT NOT NULL, proyecto_id INTEGER NOT NULL,
+                             fecha_creacion TEXT NOT NULL,
+                             FOREIGN KEY (proyecto_id) REFERENCES proyectos(id) ON DELETE CASCADE);
+        CREATE INDEX idx_tareas_fecha ON tareas(fecha_creacion);
+        INSERT INTO proyectos VALUES (1, 'Viejo', NULL, '2024-01-01T09:00:00');
+        INSERT INTO tareas VALUES (1, 'a', 'pendiente', 'alta', 1, '2024-03-01T10:30:00.250000'),
+                                  (2, 'b', 'completada', 'alta', 1, '2024-01-02T08:00:00'),
+                                  (3, 'c', 'completada', 'baja', 1, '2024-02-01'),
+                                  (9, 'd', 'pendiente', 'media', 1, '2024-02-15T00:00:00.000001');
+        DELETE FROM tareas WHERE id = 9;
+    """)
+    conn.close()
+
+    monkeypatch.setattr(database, "DB_NAME", ruta)
+    database.init_db()
+    database.init_db()
+
+    assert [(t["id"], t["fecha_creacion"]) for t in database.obtener_tareas()] == [
+        (2, "2024-01-02T08:00:00"), (3, "2024-02-01T00:00:00"), (1, "2024-03-01T10:30:00.250000"),
+    ]
+    assert [t["id"] for t in database.obtener_tareas(desde=datetime(2024, 1, 15))] == [3, 1]
+    # Índices y triggers recreados; el id borrado no se reutiliza
+    assert database.crear_tarea("nueva", "pendiente", "media", 1)["id"] == 10
+    assert database.verificar_contadores() == []
+    assert [t["id"] for t in database.obtener_cambios(0, 100)["tareas"]] == [1, 2, 3, 10]
+    with database.get_connection() as conn:
+        indices = {fila["name"] for fila in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+        assert conn.execute("SELECT COUNT(*) FROM tareas WHERE typeof(fecha_creacion) != 'integer'").fetchone()[0] == 0
+    assert {"idx_tareas_fecha", "idx_tareas_proyecto_fecha", "idx_tareas_estado_fecha"} <= indices
@@ -0,0 +1,142 @@
+"""
+Verifica con EXPLAIN QUERY PLAN que ninguna consulta del data layer recorre
+la tabla tareas completa.
+"""
+
+import itertools
+import re
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+import database
+
+
+@pytest.fixture(autouse=True)
+def datos(db_temporal):
+    database.crear_proyecto("Alpha")
+    database.crear_proyecto("Beta")
+    for i, (estado, prioridad) in enumerate(itertools.product(
+            ["pendiente", "en_progreso", "completada"], ["baja", "media", "alta"])):
+        database.crear_tarea(f"Tarea {i}", estado, prioridad, 1 + i % 2)
+
+
+ESTADOS = [None, "pendiente"]
+PRIORIDADES = [None, "alta"]
+ORDENES = ["asc", "desc"]
+
+DESDE, HASTA = datetime(2000, 1, 1), datetime(2100, 1, 1)
+
+# Llamadas que filtran tareas: nunca pueden recorrer la tabla
+LLAMADAS_FILTRADAS = (
+    [(database.obtener_proyecto_por_id, (1,)),
+     (database.contar_tareas_proyecto, (1,)),
+     (database.proyecto_existe, (1,)),
+     (database.nombre_proyecto_existe, ("Alpha",)),
+     (database.nombre_proyecto_existe, ("Alpha", 2)),
+     (database.obtener_tarea_por_id, (1,)),
+     (database.obtener_resumen_proyecto, (1,)),
+     (database.obtener_resumen_general, ()),
+     (database.actualizar_tarea, (1, "Nueva", "completada", "baja", 2)),
+     (database.actualizar_proyecto, (2, "Gamma", "desc")),
+     (database.eliminar_tarea, (3,)),
+     (database.eliminar_proyecto, (2,)),
+     (database.obtener_cambios, (0, 5)),
+     (database.obtener_cambios, (8, 5))]
+    + [(database.obtener_tareas, (e, p, 1, o))
+       for e, p, o in itertools.product(ESTADOS, PRIORIDADES, ORDENES)]
+    + [(database.obtener_tareas, (e, p, None, o))
+       for e, p, o in itertools.product(ESTADOS, PRIORIDADES, ORDENES) if e or p]
+    + [(database.obtener_tareas_por_proyecto, (1, e, p, o))
+       for e, p, o in itertools.product(ESTADOS, PRIORIDADES, ORDENES)]
+    # Páginas siguientes: la clave del cursor también sale del índice
+    + [(database.obtener_tareas, (e, p, pr, o, 5, ("2000-01-01", 3)))
+       for e, p, pr, o in itertools.product(ESTADOS, PRIORIDADES, [None, 1], ORDENES)]
+    + [(database.obtener_tareas_por_proyecto, (1, e, p, o, 5, ("2000-01-01", 3)))
+       for e, p, o in itertools.product(ESTADOS, PRIORIDADES, ORDENES)]
+    # Rangos desde/hasta: comparación de enteros sobre el mismo índice
+    + [(database.obtener_tareas, (e, p, pr, o, 5, None, DESDE, HASTA))
+       for e, p, pr, o in itertools.product(ESTADOS, PRIORIDADES, [None, 1], ORDENES)]
+    + [(database.obtener_tareas_por_proyecto, (1, e, None, o, 5, ("2000-01-01", 3), DESDE))
+       for e, o in itertools.product(ESTADOS, ORDENES)]
+)
+
+# Llamadas que por definición leen todas las tareas: se permite recorrerlas
+# pero solo a través de un índice, nunca la tabla.
+LLAMADAS_COMPLETAS = [
+    (database.obtener_tareas, (None, None, None, "asc")),
+    (database.obtener_tareas, (None, None, None, "desc")),
+    (database.obtener_proyectos, ()),
+    (database.obtener_proyectos, ("Al",)),
+]
+
+_CONSULTAS = re.compile(r"^\s*(SELECT|UPDATE|DELETE|WITH)\b", re.IGNORECASE)
+_RECORRE_TAREAS = re.compile(r"^SCAN (tareas|t)\b")
+
+
+def planes(funcion, args):
+    """Ejecuta la función capturando sus sentencias y devuelve sus planes"""
+    sentencias = []
+    with database.get_connection() as conn:
+        conn.set_trace_callback(sentencias.append)
+        try:
+            funcion(*args)
+        finally:
+            conn.set_trace_callback(None)
+
+        resultado = []
+        for sql in sentencias:
+            if _CONSULTAS.match(sql):
+                plan = [fila[3] for fila in conn.execute("EXPLAIN QUERY PLAN " + sql)]
+                resultado.append((" ".join(sql.split()), plan))
+    assert resultado, f"{funcion.__name__} no ejecutó consultas"
+    return resultado
+
+
+def _id(llamada):
+    funcion, args = llamada
+    return f"{funcion.__name__}{args}"
+
+
+@pytest.mark.parametrize("llamada", LLAMADAS_FILTRADAS, ids=_id)
+def test_consultas_filtradas_no_recorren_tareas(llamada):
+    for sql, plan in planes(*llamada):
+        recorridos = [paso for paso in plan if _RECORRE_TAREAS.match(paso)]
+        assert not recorridos, f"{sql}\n  plan: {plan}"
+
+
+@pytest.mark.parametrize("llamada", LLAMADAS_COMPLETAS, ids=_id)
+def test_consultas_completas_recorren_solo_indices(llamada):
+    for sql, plan in planes(*llamada):
+        recorridos = [paso for paso in plan
+                      if _RECORRE_TAREAS.match(paso) and "INDEX" not in paso]
+        assert not recorridos, f"{sql}\n  plan: {plan}"
+
+
+def test_clave_foranea_indexada_para_on_delete_cascade():
+    with database.get_connection() as conn:
+        indices = conn.execute("PRAGMA index_list(tareas)").fetchall()
+        primeras_columnas = {
+            conn.execute(f"PRAGMA index_info({indice['name']})").fetchone()["name"]
+            for indice in indices
+        }
+    assert "proyecto_id" in primeras_columnas
+
+
+def test_init_db_crea_indices_en_una_base_existente(tmp_path, monkeypatch):
+    ruta = str(tmp_path / "vieja.db")
+    conn = sqlite3.connect(ruta)
+    conn.execute("CREATE TABLE proyectos (id INTEGER PRIMARY KEY AUTOINCREMENT, nombre TEXT NOT NULL UNIQUE, "
+                 "descripcion TEXT, fecha_creacion TEXT NOT NULL)")
+    conn.execute("CREATE TABLE tareas (id INTEGER PRIMARY KEY AUTOINCREMENT, descripcion TEXT NOT NULL, "
+                 "estado TEXT NOT NULL, prioridad TEXT NOT NULL, proyecto_id INTEGER NOT NULL, "
+                 "fecha_creacion TEXT NOT NULL, "
+                 "FOREIGN KEY (proyecto_id) REFERENCES proyectos(id) ON DELETE CASCADE)")
+    conn.close()
+
+    monkeypatch.setattr(database, "DB_NAME", ruta)
+    database.init_db()
+    with database.get_connection() as conn:
+        nombres = {fila["name"] for fila in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {"idx_tareas_proyecto_fecha", "idx_tareas_fecha"} <= nombres
@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+import main
+import respuestas
+
+
+pytestmark = pytest.mark.usefixtures("db_temporal")
+
+
+@pytest.fixture
+def client(client):
+    client.post("/proyectos", json={"nombre": "Alpha", "descripcion": "Año 2025 — ñandú"})
+    client.post("/proyectos", json={"nombre": "Beta"})
+    for i in range(5):
+        client.post("/proyectos/1/tareas", json={"descripcion": f"Tarea {i} ✓", "prioridad": "alta"})
+    return client
+
+
+RUTAS = [
+    "/tareas",
+    "/tareas?estado=pendiente&orden=desc",
+    "/tareas?limit=2",
+    "/proyectos",
+    "/proyectos?nombre=Al",
+    "/proyectos/1/tareas",
+    "/proyectos/1/tareas?limit=2",
+]
+
+
+@pytest.mark.parametrize("ruta", RUTAS)
+@pytest.mark.parametrize("con_orjson", [True, False])
+def test_mismo_contenido_que_con_response_model(client, monkeypatch, ruta, con_orjson):
+    normal = client.get(ruta)
+
+    monkeypatch.setattr(respuestas, "JSON_RAPIDO", True)
+    if not con_orjson:
+        monkeypatch.setattr(respuestas, "orjson", None)
+    rapida = client.get(ruta)
+
+    assert rapida.status_code == normal.status_code == 200
+    assert rapida.headers["content-type"] == "application/json"
+    assert rapida.json() == normal.json()
+
+
+def test_pagina_con_siguiente_igual_que_sin_modo_rapido(client, monkeypatch):
+    normal = client.get("/tareas", params={"limit": 2})
+
+    monkeypatch.setattr(respuestas, "JSON_RAPIDO", True)
+    rapida = client.get("/tareas", params={"limit": 2})
+
+    assert rapida.json()["siguiente"] is not None
+    assert rapida.json() == normal.json()
+
+
+def test_no_cambia_el_esquema_openapi(monkeypatch):
+    main.app.openapi_schema = None
+    normal = main.app.openapi()
+
+    monkeypatch.setattr(respuestas, "JSON_RAPIDO", True)
+    main.app.openapi_schema = None
+    rapido = main.app.openapi()
+
+    assert json.dumps(rapido, sort_keys=True) == json.dumps(normal, sort_keys=True)
+    esquema = normal["paths"]["/proyectos"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert esquema["items"]["$ref"].endswith("/Proyecto")
+
+
+def test_a_json_sin_orjson_es_compacto_y_utf8(monkeypatch):
+    monkeypatch.setattr(respuestas, "orjson", None)
+    assert respuestas.a_json({"a": "ñ", "b": [1, None]}) == '{"a":"ñ","b":[1,null]}'.encode()
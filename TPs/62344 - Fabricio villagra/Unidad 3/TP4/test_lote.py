@@ -0,0 +1,90 @@
+import pytest
+
+import database
+import main
+
+
+pytestmark = pytest.mark.usefixtures("db_temporal")
+
+
+@pytest.fixture
+def client(client):
+    client.post("/proyectos", json={"nombre": "Alpha"})
+    client.post("/proyectos/1/tareas", json={"descripcion": "Previa"})
+    return client
+
+
+def test_crea_todas_con_un_solo_commit(client):
+    # Con una sola conexión en el pool el endpoint usa la que se traza
+    commits = []
+    database.pool_db(1)
+    with database.get_connection() as conn:
+        conn.set_trace_callback(lambda sql: commits.append(sql) if sql == "COMMIT" else None)
+
+    respuesta = client.post("/proyectos/1/tareas/lote", json=[
+        {"descripcion": f"Tarea {i}", "prioridad": "alta"} for i in range(50)
+    ])
+
+    with database.get_connection() as conn:
+        conn.set_trace_callback(None)
+
+    assert respuesta.status_code == 201
+    assert respuesta.json() == {"ids": list(range(2, 52)), "errores": []}
+    assert commits == ["COMMIT"]
+
+    tareas = client.get("/proyectos/1/tareas").json()
+    assert [t["id"] for t in tareas[1:]] == list(range(2, 52))
+    assert tareas[-1]["descripcion"] == "Tarea 49"
+    assert tareas[-1]["prioridad"] == "alta"
+    assert client.get("/proyectos/1/resumen").json()["total_tareas"] == 51
+
+
+LOTE_CON_ERRORES = [
+    {"descripcion": "Buena"},
+    {"descripcion": "   "},
+    {"descripcion": "Otra", "estado": "inexistente"},
+    "no es un objeto",
+    {"descripcion": "Última", "estado": "completada"},
+]
+
+
+def test_todo_o_nada_no_crea_ninguna(client):
+    respuesta = client.post("/proyectos/1/tareas/lote", json=LOTE_CON_ERRORES)
+
+    assert respuesta.status_code == 422
+    errores = respuesta.json()["detail"]["errores"]
+    assert [e["indice"] for e in errores] == [1, 2, 3]
+    assert errores[1]["campo"] == "estado"
+    assert len(client.get("/proyectos/1/tareas").json()) == 1
+
+
+def test_parcial_crea_las_validas(client):
+    respuesta = client.post("/proyectos/1/tareas/lote", params={"modo": "parcial"}, json=LOTE_CON_ERRORES)
+
+    assert respuesta.status_code == 201
+    data = respuesta.json()
+    assert data["ids"] == [2, 3]
+    assert [e["indice"] for e in data["errores"]] == [1, 2, 3]
+    assert [t["descripcion"] for t in client.get("/proyectos/1/tareas").json()] == ["Previa", "Buena", "Última"]
+
+
+def test_lote_vacio(client):
+    respuesta = client.post("/proyectos/1/tareas/lote", json=[])
+    assert respuesta.status_code == 201
+    assert respuesta.json() == {"ids": [], "errores": []}
+
+
+def test_lote_demasiado_grande(client, monkeypatch):
+    monkeypatch.setattr(main, "MAX_LOTE", 3)
+    respuesta = client.post("/proyectos/1/tareas/lote", json=[{"descripcion": "x"}] * 4)
+    assert respuesta.status_code == 413
+    assert len(client.get("/proyectos/1/tareas").json()) == 1
+
+
+def test_proyecto_inexistente(client):
+    respuesta = client.post("/proyectos/999/tareas/lote", json=[{"descripcion": "x"}])
+    assert respuesta.status_code == 400
+
+
+def test_body_que_no_es_lista(client):
+    assert client.post("/proyectos/1/tareas/lote", json={"descripcion": "x"}).status_code == 422
@@ -0,0 +1,116 @@
+import re
+import threading
+
+import pytest
+
+import metricas
+from metricas import Histograma
+
+
+@pytest.fixture(autouse=True)
+def metricas_activas(db_temporal, monkeypatch):
+    monkeypatch.setattr(metricas, "ACTIVAS", True)
+    metricas.reiniciar()
+
+
+def valor(texto, metrica, **etiquetas):
+    """Valor de la primera línea de `metrica` que tiene todas las `etiquetas`"""
+    for linea in texto.splitlines():
+        if linea.startswith(metrica + "{") and all(f'{k}="{v}"' in linea for k, v in etiquetas.items()):
+            return float(linea.rsplit(" ", 1)[1])
+    return None
+
+
+def test_buckets_acumulativos_y_suma():
+    histograma = Histograma("prueba_seconds", "Prueba", ("ruta",), limites=(0.1, 1.0))
+    for segundos in (0.05, 0.1, 0.5, 3.0):
+        histograma.observar(("/x",), segundos)
+
+    metricas.HISTOGRAMAS, guardados = (histograma,), metricas.HISTOGRAMAS
+    try:
+        # REQUESTS no tiene series: solo sale el histograma de prueba
+        texto = metricas.exportar()
+    finally:
+        metricas.HISTOGRAMAS = guardados
+
+    assert valor(texto, "prueba_seconds_bucket", le="0.1") == 2
+    assert valor(texto, "prueba_seconds_bucket", le="1.0") == 3
+    assert valor(texto, "prueba_seconds_bucket", le="+Inf") == 4
+    assert valor(texto, "prueba_seconds_count") == 4
+    assert valor(texto, "prueba_seconds_sum") == pytest.approx(3.65)
+
+
+def test_suma_las_series_de_todos_los_hilos():
+    histograma = Histograma("prueba_seconds", "Prueba", ("ruta",))
+
+    def observar():
+        for _ in range(1000):
+            histograma.observar(("/x",), 0.001)
+
+    hilos = [threading.Thread(target=observar) for _ in range(8)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    fila = histograma.sumar()[("/x",)]
+    assert sum(fila[:-1]) == 8000
+    assert fila[-1] == pytest.approx(8.0)
+
+
+def test_escapa_los_valores_de_las_etiquetas():
+    assert metricas._etiquetas(("ruta",), ('a"b\\c\n',)) == '{ruta="a\\"b\\\\c\\n"}'
+
+
+def test_requests_por_plantilla_de_ruta_y_status(client):
+    client.post("/proyectos", json={"nombre": "Alpha"})
+    client.get("/proyectos/1")
+    client.get("/proyectos/2")
+    client.get("/no-existe")
+
+    respuesta = client.get("/metrics")
+    assert respuesta.status_code == 200
+    assert respuesta.headers["content-type"].startswith("text/plain; version=0.0.4")
+    texto = respuesta.text
+
+    total = "tareas_http_requests_total"
+    assert valor(texto, total, metodo="POST", ruta="/proyectos", status="201") == 1
+    assert valor(texto, total, metodo="GET", ruta="/proyectos/{proyecto_id}", status="200") == 1
+    assert valor(texto, total, metodo="GET", ruta="/proyectos/{proyecto_id}", status="404") == 1
+    assert valor(texto, total, metodo="GET", ruta="sin_ruta", status="404") == 1
+    # Un id distinto no abre otra serie
+    assert "/proyectos/2" not in texto
+
+
+def test_los_304_del_etag_tambien_se_cuentan(client):
+    etag = client.get("/tareas").headers["etag"]
+    assert client.get("/tareas", headers={"If-None-Match": etag}).status_code == 304
+
+    texto = client.get("/metrics").text
+    assert valor(texto, "tareas_http_requests_total", ruta="/tareas", status="304") == 1
+    # El 304 no llegó al endpoint: no hay tiempo de codificación para él
+    assert valor(texto, "tareas_codificacion_duration_seconds_count", ruta="/tareas") == 1
+
+
+def test_data_layer_y_codificacion(client):
+    client.post("/proyectos", json={"nombre": "Alpha"})
+    client.post("/proyectos/1/tareas", json={"descripcion": "Una"})
+    client.get("/tareas")
+    client.get("/tareas", params={"formato": "stream"})
+
+    texto = client.get("/metrics").text
+    assert valor(texto, "tareas_db_duration_seconds_count", funcion="crear_tarea") == 1
+    assert valor(texto, "tareas_db_duration_seconds_count", funcion="obtener_tareas") == 1
+    # El generador se registra una vez al terminar, no una por lote
+    assert valor(texto, "tareas_db_duration_seconds_count", funcion="iterar_tareas") == 1
+    assert valor(texto, "tareas_codificacion_duration_seconds_count", ruta="/tareas") == 2
+    assert valor(texto, "tareas_codificacion_duration_seconds_sum", ruta="/tareas") > 0
+
+
+def test_desactivadas_no_registran_nada(client, monkeypatch):
+    monkeypatch.setattr(metricas, "ACTIVAS", False)
+    client.post("/proyectos", json={"nombre": "Alpha"})
+    client.get("/tareas")
+
+    texto = client.get("/metrics").text
+    assert re.search(r"^tareas_\w+\{", texto, re.MULTILINE) is None
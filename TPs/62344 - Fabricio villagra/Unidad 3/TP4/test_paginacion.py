@@ -0,0 +1,98 @@
+import pytest
+
+import database
+import fechas
+import main
+from paginacion import MAX_PAGINA, codificar_cursor
+
+
+pytestmark = pytest.mark.usefixtures("db_temporal")
+
+
+@pytest.fixture
+def tareas(client):
+    """Dos proyectos con 25 tareas, varias con la misma fecha_creacion"""
+    client.post("/proyectos", json={"nombre": "Alpha"})
+    client.post("/proyectos", json={"nombre": "Beta"})
+    estados = ["pendiente", "en_progreso", "completada"]
+    with database.get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO tareas (descripcion, estado, prioridad, proyecto_id, fecha_creacion) "
+            "VALUES (?, ?, 'media', ?, ?)",
+            [(f"Tarea {i}", estados[i % 3], 1 + i % 2, fechas.iso_a_us(f"2024-01-01T00:00:{i // 3:02d}"))
+             for i in range(25)],
+        )
+        conn.commit()
+
+
+def recorrer(client, url, **params):
+    """Pide página tras página y devuelve todos los ids en orden"""
+    ids, cursor = [], None
+    while True:
+        if cursor:
+            params["cursor"] = cursor
+        data = client.get(url, params=params).json()
+        ids += [t["id"] for t in data["tareas"]]
+        cursor = data["siguiente"]
+        if cursor is None:
+            return ids
+
+
+@pytest.mark.parametrize("orden", ["asc", "desc"])
+@pytest.mark.parametrize("filtros", [{}, {"estado": "pendiente"}, {"proyecto_id": 2},
+                                     {"estado": "completada", "prioridad": "media", "proyecto_id": 1}])
+def test_las_paginas_cubren_el_listado_completo(client, tareas, orden, filtros):
+    completo = [t["id"] for t in client.get("/tareas", params={**filtros, "orden": orden}).json()]
+    assert completo
+    assert recorrer(client, "/tareas", limit=4, orden=orden, **filtros) == completo
+
+
+@pytest.mark.parametrize("orden", ["asc", "desc"])
+def test_paginacion_por_proyecto(client, tareas, orden):
+    completo = [t["id"] for t in client.get("/proyectos/1/tareas", params={"orden": orden}).json()]
+    assert recorrer(client, "/proyectos/1/tareas", limit=5, orden=orden) == completo
+
+
+def test_ultima_pagina_sin_siguiente(client, tareas):
+    data = client.get("/tareas", params={"limit": 25}).json()
+    assert len(data["tareas"]) == 25
+    assert data["siguiente"] is None
+
+
+def test_sin_limit_devuelve_lista(client, tareas):
+    respuesta = client.get("/tareas")
+    assert isinstance(respuesta.json(), list)
+    assert len(respuesta.json()) == 25
+    assert "x-siguiente-cursor" not in respuesta.headers
+
+
+def test_limit_mayor_al_maximo_se_rechaza(client, tareas):
+    respuesta = client.get("/tareas", params={"limit": MAX_PAGINA + 1})
+    assert respuesta.status_code == 422
+
+
+def test_sin_limit_no_corta_en_el_maximo(client, tareas, monkeypatch):
+    # Los clientes que no paginan reciben todas las tareas, no solo MAX_PAGINA
+    monkeypatch.setattr(main, "MAX_PAGINA", 10)
+    for ruta in ("/tareas", "/proyectos/1/tareas"):
+        respuesta = client.get(ruta)
+        assert isinstance(respuesta.json(), list)
+        assert len(respuesta.json()) == len(client.get(ruta, params={"limit": 25}).json()["tareas"])
+        assert len(respuesta.json()) > 10
+
+    pagina = client.get("/tareas", params={"cursor": client.get("/tareas", params={"limit": 10}).json()["siguiente"]})
+    assert len(pagina.json()["tareas"]) == 10
+
+
+@pytest.mark.parametrize("ruta", ["/tareas", "/proyectos/1/tareas"])
+@pytest.mark.parametrize("params", [{}, {"limit": 5}, {"formato": "stream"}])
+def test_orden_invalido_se_rechaza(client, tareas, ruta, params):
+    for orden in ("ascendente", "DESC", ""):
+        respuesta = client.get(ruta, params={**params, "orden": orden})
+        assert respuesta.status_code == 422
+
+
+@pytest.mark.parametrize("cursor", ["no-es-base64!", "e30", codificar_cursor({"fecha_creacion": "x", "id": 1}, "desc")])
+def test_cursor_invalido(client, tareas, cursor):
+    respuesta = client.get("/tareas", params={"cursor": cursor, "orden": "asc"})
+    assert respuesta.status_code == 400
@@ -0,0 +1,85 @@
+import pytest
+
+import database
+import perfilador
+
+
+@pytest.fixture(autouse=True)
+def perfilador_activo(db_temporal, monkeypatch):
+    monkeypatch.setattr(perfilador, "ACTIVO", True)
+    database.crear_proyecto("Alpha")
+    perfilador.reiniciar()
+
+
+def test_forma_normaliza_literales_espacios_y_listas():
+    sql = "SELECT *\n  FROM tareas WHERE id IN (?,?, ?) AND estado = 'pen''diente' AND id > 12"
+    assert perfilador.forma(sql) == "SELECT * FROM tareas WHERE id IN (?, ...) AND estado = ? AND id > ?"
+
+
+def test_p95_de_las_muestras():
+    estadistica = perfilador._Estadistica()
+    for ms in range(1, 101):
+        estadistica.muestras.append(ms / 1000)
+    assert estadistica.p95() == pytest.approx(0.095)
+
+
+def test_el_pool_usa_conexiones_perfiladas():
+    with database.get_connection() as conn:
+        assert isinstance(conn, perfilador.ConexionPerfilada)
+        conn.execute("SELECT COUNT(*) FROM tareas WHERE proyecto_id = ?", (1,)).fetchone()
+
+    sentencias = {s["sql"]: s for s in perfilador.resumen()["sentencias"]}
+    assert sentencias["SELECT COUNT(*) FROM tareas WHERE proyecto_id = ?"]["cantidad"] == 1
+
+
+def test_desactivado_usa_conexiones_comunes(monkeypatch):
+    monkeypatch.setattr(perfilador, "ACTIVO", False)
+    with database.get_connection() as conn:
+        assert type(conn) is database.sqlite3.Connection
+
+
+def test_consultas_por_request_en_el_header(client):
+    tarea = client.post("/proyectos/1/tareas", json={"descripcion": "Una"}).json()
+    respuesta = client.put(f"/tareas/{tarea['id']}", json={"estado": "completada"})
+
+    # Al menos BEGIN, el UPDATE, los pasos del trigger de contadores y el COMMIT
+    assert int(respuesta.headers["x-consultas-sql"]) >= 4
+    por_ruta = {r["ruta"]: r for r in client.get("/debug/sql").json()["por_ruta"]}
+    assert por_ruta["PUT /tareas/{tarea_id}"]["requests"] == 1
+    assert por_ruta["PUT /tareas/{tarea_id}"]["consultas"] == int(respuesta.headers["x-consultas-sql"])
+
+
+def test_debug_sql_ordena_y_limita(client):
+    for i in range(3):
+        client.post("/proyectos/1/tareas", json={"descripcion": f"Tarea {i}"})
+
+    datos = client.get("/debug/sql", params={"orden": "cantidad", "limite": 2}).json()
+    assert datos["activo"] is True
+    assert len(datos["sentencias"]) == 2
+    cantidades = [s["cantidad"] for s in datos["sentencias"]]
+    assert cantidades == sorted(cantidades, reverse=True)
+    assert client.get("/debug/sql", params={"orden": "otro"}).status_code == 422
+
+
+def test_log_de_sentencias_lentas(client, monkeypatch, caplog):
+    monkeypatch.setattr(perfilador, "UMBRAL_LENTO_MS", 0)
+    with caplog.at_level("WARNING", logger="tareas.sql"):
+        client.get("/proyectos/1")
+
+    lentas = client.get("/debug/sql").json()["lentas"]
+    assert lentas
+    assert {l["ruta"] for l in lentas} == {"/proyectos/{proyecto_id}"}
+    assert "Sentencia lenta" in caplog.text
+
+
+def test_sin_perfilador_no_hay_header(client, monkeypatch):
+    monkeypatch.setattr(perfilador, "ACTIVO", False)
+    respuesta = client.get("/proyectos")
+    assert "x-consultas-sql" not in respuesta.headers
+
+
+def test_sin_perfilador_debug_sql_no_existe(client, monkeypatch):
+    monkeypatch.setattr(perfilador, "ACTIVO", False)
+    respuesta = client.get("/debug/sql")
+    assert respuesta.status_code == 404
+    assert "sentencias" not in respuesta.text
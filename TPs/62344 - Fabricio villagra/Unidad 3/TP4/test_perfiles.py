@@ -0,0 +1,69 @@
+import sqlite3
+import threading
+
+import pytest
+
+import database
+from perfiles import PERFILES, aplicar_perfil, perfil_activo
+
+
+@pytest.fixture(autouse=True)
+def sin_perfil_elegido(base_temporal, monkeypatch):
+    monkeypatch.delenv("TAREAS_DB_PERFIL", raising=False)
+
+
+def leer_pragmas(conn):
+    return {
+        pragma: conn.execute(f"PRAGMA {pragma}").fetchone()[0]
+        for pragma in ("journal_mode", "synchronous", "cache_size", "mmap_size", "temp_store", "busy_timeout")
+    }
+
+
+def test_bajo_pytest_se_usa_el_perfil_test():
+    assert perfil_activo() == "test"
+
+
+def test_perfil_se_elige_por_variable_de_entorno(monkeypatch):
+    monkeypatch.setenv("TAREAS_DB_PERFIL", "produccion")
+    assert perfil_activo() == "produccion"
+
+
+def test_perfil_desconocido_falla(monkeypatch):
+    monkeypatch.setenv("TAREAS_DB_PERFIL", "turbo")
+    with pytest.raises(ValueError):
+        perfil_activo()
+
+
+@pytest.mark.parametrize("nombre", ["produccion", "test"])
+def test_todas_las_conexiones_reciben_el_perfil(monkeypatch, nombre):
+    monkeypatch.setenv("TAREAS_DB_PERFIL", nombre)
+    database.init_db()
+
+    # Mientras este hilo tiene una conexión prestada, otro hilo obliga al
+    # pool a abrir una segunda: las dos deben tener el perfil aplicado.
+    resultado = {}
+
+    def leer_en_otro_hilo():
+        with database.get_connection() as conn:
+            resultado.update(leer_pragmas(conn))
+
+    with database.get_connection():
+        hilo = threading.Thread(target=leer_en_otro_hilo)
+        hilo.start()
+        hilo.join()
+    pragmas = resultado
+    assert database.estadisticas_pool()["creadas"] == 2
+
+    esperado = PERFILES[nombre]
+    assert pragmas["journal_mode"].upper() == esperado["journal_mode"]
+    assert pragmas["cache_size"] == esperado["cache_size"]
+    assert pragmas["busy_timeout"] == esperado["busy_timeout"]
+    assert pragmas["temp_store"] == 2  # MEMORY
+    assert pragmas["synchronous"] == {"OFF": 0, "NORMAL": 1, "FULL": 2}[esperado["synchronous"]]
+
+
+def test_aplicar_perfil_en_conexion_suelta(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "suelta.db"))
+    aplicar_perfil(conn, "produccion")
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    conn.close()
@@ -0,0 +1,137 @@
+import asyncio
+import sqlite3
+import threading
+
+import httpx
+import pytest
+
+import database
+import main
+import pool
+from pool import PoolConexiones, PoolAgotadoError
+
+
+pytestmark = pytest.mark.usefixtures("db_temporal")
+
+
+def test_reutiliza_la_misma_conexion():
+    antes = database.estadisticas_pool()["checkouts"]
+    database.crear_proyecto("Alpha")
+    database.obtener_proyectos()
+    database.proyecto_existe(1)
+
+    stats = database.estadisticas_pool()
+    assert stats["checkouts"] - antes == 3
+    assert stats["creadas"] == 1
+    assert stats["en_uso"] == 0
+    assert stats["libres"] == 1
+
+
+def test_llamadas_anidadas_usan_la_conexion_del_hilo():
+    antes = database.estadisticas_pool()["checkouts"]
+    with database.get_connection() as externa:
+        with database.get_connection() as interna:
+            assert interna is externa
+        assert database.estadisticas_pool()["en_uso"] == 1
+    assert database.estadisticas_pool()["checkouts"] - antes == 1
+
+
+def test_foreign_keys_activas_en_conexiones_del_pool():
+    with database.get_connection() as conn:
+        assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+
+
+def test_cambios_sin_commit_se_descartan_al_devolver():
+    database.crear_proyecto("Alpha")
+    with database.get_connection() as conn:
+        conn.execute("DELETE FROM proyectos")
+    assert len(database.obtener_proyectos()) == 1
+
+
+def test_conexion_rota_se_reemplaza():
+    with database.get_connection() as conn:
+        pass
+    conn.close()
+
+    with database.get_connection() as nueva:
+        assert nueva is not conn
+        assert nueva.execute("SELECT 1").fetchone()[0] == 1
+
+    stats = database.estadisticas_pool()
+    assert stats["descartadas"] == 1
+    assert stats["creadas"] == 2
+
+
+def test_init_db_reinicia_el_pool(tmp_path, monkeypatch):
+    anterior = pool.obtener_pool(database.DB_NAME)
+    monkeypatch.setattr(database, "DB_NAME", str(tmp_path / "otra.db"))
+    database.init_db()
+    assert pool.obtener_pool(database.DB_NAME) is not anterior
+
+
+def test_espera_y_timeout_cuando_el_pool_esta_lleno(tmp_path):
+    p = PoolConexiones(str(tmp_path / "pool.db"), tamano=1, timeout=0.05)
+    liberar = threading.Event()
+    tomada = threading.Event()
+
+    def ocupar():
+        with p.conexion():
+            tomada.set()
+            liberar.wait()
+
+    hilo = threading.Thread(target=ocupar)
+    hilo.start()
+    tomada.wait()
+
+    with pytest.raises(PoolAgotadoError):
+        with p.conexion():
+            pass
+
+    liberar.set()
+    hilo.join()
+
+    with p.conexion():
+        pass
+
+    stats = p.estadisticas()
+    assert stats["esperas"] == 1
+    assert stats["timeouts"] == 1
+    assert stats["checkouts"] == 2
+    p.cerrar()
+
+
+def test_tamano_cero_abre_una_conexion_por_llamada(tmp_path):
+    p = PoolConexiones(str(tmp_path / "pool.db"), tamano=0)
+    with p.conexion() as primera:
+        pass
+    with p.conexion() as segunda:
+        pass
+    assert primera is not segunda
+    with pytest.raises(sqlite3.ProgrammingError):
+        primera.execute("SELECT 1")
+    assert p.estadisticas()["creadas"] == 2
+
+
+def test_requests_concurrentes_usan_varias_conexiones(monkeypatch):
+    """Los endpoints corren en el threadpool: dos requests usan la base a la vez"""
+    database.crear_proyecto("Alpha")
+    barrera = threading.Barrier(2, timeout=5)
+    en_uso = []
+
+    def obtener_y_esperar(proyecto_id):
+        with database.get_connection():
+            barrera.wait()  # se rompe si el otro request no puede entrar
+            en_uso.append(database.estadisticas_pool()["en_uso"])
+            barrera.wait()  # ninguno devuelve su conexión antes de que el otro mida
+            return database.obtener_proyecto_por_id(proyecto_id)
+
+    monkeypatch.setattr(main, "obtener_proyecto_por_id", obtener_y_esperar)
+
+    async def dos_requests():
+        transporte = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transporte, base_url="http://test") as client:
+            return await asyncio.gather(client.get("/proyectos/1"), client.get("/proyectos/1"))
+
+    respuestas = asyncio.run(dos_requests())
+    assert [r.status_code for r in respuestas] == [200, 200]
+    assert en_uso == [2, 2]
@@ -0,0 +1,111 @@
+import json
+import threading
+
+import pytest
+
+import database
+import main
+
+
+pytestmark = pytest.mark.usefixtures("db_temporal")
+
+
+@pytest.fixture
+def client(client):
+    client.post("/proyectos", json={"nombre": "Alpha"})
+    client.post("/proyectos", json={"nombre": "Beta"})
+    for i in range(12):
+        client.post(f"/proyectos/{1 + i % 2}/tareas",
+                    json={"descripcion": f"Tarea ñ {i}", "estado": "completada" if i % 3 else "pendiente"})
+    return client
+
+
+def lineas(respuesta):
+    return [json.loads(linea) for linea in respuesta.text.splitlines()]
+
+
+@pytest.mark.parametrize("params", [{}, {"estado": "pendiente"}, {"proyecto_id": 2, "orden": "desc"}])
+def test_stream_devuelve_lo_mismo_que_la_lista(client, params):
+    lista = client.get("/tareas", params=params).json()
+    respuesta = client.get("/tareas", params={**params, "formato": "stream"})
+
+    assert respuesta.status_code == 200
+    assert respuesta.headers["content-type"].startswith("application/x-ndjson")
+    assert lineas(respuesta) == lista
+
+
+def test_stream_por_header_accept(client):
+    respuesta = client.get("/tareas", headers={"Accept": "application/x-ndjson"})
+    assert respuesta.headers["content-type"].startswith("application/x-ndjson")
+    assert len(lineas(respuesta)) == 12
+
+
+def test_stream_lee_de_a_lotes(client, monkeypatch):
+    lotes = []
+    original = database.iterar_tareas
+
+    def espiar(**kwargs):
+        for lote in original(lote=5, **kwargs):
+            lotes.append(len(lote))
+            yield lote
+
+    monkeypatch.setattr(main, "iterar_tareas", espiar)
+    respuesta = client.get("/tareas", params={"formato": "stream"})
+
+    assert len(lineas(respuesta)) == 12
+    assert lotes == [5, 5, 2]
+
+
+def test_stream_devuelve_la_conexion(client):
+    client.get("/tareas", params={"formato": "stream"})
+    stats = database.estadisticas_pool()
+    assert stats["en_uso"] == 0
+    assert stats["aparte"] == 0
+    assert stats["abiertas"] == stats["libres"]
+
+
+def abrir_streams(cantidad):
+    """Streams a medio leer, como los de clientes lentos"""
+    streams = [database.iterar_tareas(lote=1) for _ in range(cantidad)]
+    for stream in streams:
+        next(stream)
+    return streams
+
+
+def test_streams_abiertos_no_ocupan_el_pool(client, monkeypatch):
+    # Con WAL: con journal_mode=DELETE las lecturas abiertas bloquean el POST
+    monkeypatch.setenv("TAREAS_DB_PERFIL", "produccion")
+    database.pool_db(tamano=2).timeout = 0.5
+    streams = abrir_streams(4)
+
+    assert database.estadisticas_pool()["aparte"] == 4
+    for i in range(3):
+        assert client.get("/tareas").status_code == 200
+        assert client.post("/proyectos", json={"nombre": f"Gamma {i}"}).status_code == 201
+    assert database.estadisticas_pool()["timeouts"] == 0
+
+    for stream in streams:
+        stream.close()
+    assert database.estadisticas_pool()["aparte"] == 0
+
+
+def test_demasiados_streams_responde_503(client, monkeypatch):
+    monkeypatch.setattr(database, "_streams", threading.BoundedSemaphore(2))
+    streams = abrir_streams(2)
+
+    respuesta = client.get("/tareas", params={"formato": "stream"})
+    assert respuesta.status_code == 503
+    assert respuesta.headers["retry-after"] == "1"
+    assert client.get("/tareas").status_code == 200
+
+    streams[0].close()
+    respuesta = client.get("/tareas", params={"formato": "stream"})
+    assert respuesta.status_code == 200
+    assert len(lineas(respuesta)) == 12
+    streams[1].close()
+
+
+def test_stream_vacio(client):
+    respuesta = client.get("/tareas", params={"formato": "stream", "estado": "en_progreso"})
+    assert respuesta.status_code == 200
+    assert respuesta.text == ""
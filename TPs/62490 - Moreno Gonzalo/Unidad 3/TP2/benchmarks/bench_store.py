@@ -0,0 +1,108 @@
+"""
+Benchmark: TareaStore vs la lista + búsqueda lineal anterior, en memoria.
+
+Ejecutar desde la carpeta TP2:
+
+    python benchmarks/bench_store.py [--tareas 100000 1000000] [--operaciones 200]
+
+Mide el costo por operación de buscar/actualizar, eliminar y resumir, y el
+de listar por estado, llamando directo a las estructuras (sin HTTP).
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import EstadoTarea, TareaStore  # noqa: E402
+
+ESTADOS = list(EstadoTarea)
+
+
+class ListaAnterior:
+    """La implementación anterior: lista de dicts y búsqueda lineal"""
+
+    def __init__(self):
+        self.tareas = []
+        self.contador_id = 1
+
+    def agregar(self, descripcion, estado):
+        tarea = {"id": self.contador_id, "descripcion": descripcion,
+                 "estado": estado, "fecha_creacion": datetime.now()}
+        self.tareas.append(tarea)
+        self.contador_id += 1
+        return tarea
+
+    def buscar(self, tarea_id):
+        for tarea in self.tareas:
+            if tarea["id"] == tarea_id:
+                return tarea
+        return None
+
+    def actualizar(self, tarea_id, descripcion=None, estado=None):
+        tarea = self.buscar(tarea_id)
+        if tarea and estado is not None:
+            tarea["estado"] = estado
+        return tarea
+
+    def eliminar(self, tarea_id):
+        tarea = self.buscar(tarea_id)
+        if tarea:
+            self.tareas.remove(tarea)
+        return tarea is not None
+
+    def resumen(self):
+        resumen = {"pendiente": 0, "en_progreso": 0, "completada": 0}
+        for tarea in self.tareas:
+            resumen[tarea["estado"]] += 1
+        return resumen
+
+    def listar(self, estado):
+        return [t for t in self.tareas if t["estado"] == estado]
+
+
+def por_operacion_us(funcion, argumentos) -> float:
+    inicio = time.perf_counter()
+    for args in argumentos:
+        funcion(*args)
+    return (time.perf_counter() - inicio) / len(argumentos) * 1e6
+
+
+def medir(estructura, cantidad: int, operaciones: int) -> dict:
+    azar = random.Random(1)
+    inicio = time.perf_counter()
+    for i in range(cantidad):
+        estructura.agregar(f"Tarea {i}", ESTADOS[i % 3])
+    carga = time.perf_counter() - inicio
+
+    ids = azar.sample(range(1, cantidad + 1), operaciones * 2)
+    return {
+        "carga_s": carga,
+        "actualizar_us": por_operacion_us(
+            estructura.actualizar, [(i, None, azar.choice(ESTADOS)) for i in ids[:operaciones]]),
+        "eliminar_us": por_operacion_us(estructura.eliminar, [(i,) for i in ids[operaciones:]]),
+        "resumen_us": por_operacion_us(estructura.resumen, [()] * 20),
+        "listar_estado_ms": por_operacion_us(estructura.listar, [(EstadoTarea.en_progreso,)] * 5) / 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tareas", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--operaciones", type=int, default=200)
+    args = parser.parse_args()
+
+    for cantidad in args.tareas:
+        for nombre, estructura in (("lista", ListaAnterior()), ("TareaStore", TareaStore())):
+            r = medir(estructura, cantidad, args.operaciones)
+            print(f"{cantidad:>9} {nombre:<10} carga {r['carga_s']:5.2f}s  "
+                  f"actualizar {r['actualizar_us']:10.1f}us  eliminar {r['eliminar_us']:10.1f}us  "
+                  f"resumen {r['resumen_us']:10.1f}us  listar estado {r['listar_estado_ms']:7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
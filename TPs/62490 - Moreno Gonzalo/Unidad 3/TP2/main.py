@@ -1,7 +1,7 @@
 from fastapi import FastAPI, HTTPException, Query
 from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Dict, Iterator
 from enum import Enum
 
 # Enumeración para los estados válidos
@@ -50,15 +50,100 @@ app = FastAPI(
 )
 
 # Almacenamiento en memoria
-tareas_db: List[dict] = []
-contador_id: int = 1
+class TareaStore:
+    """
+    Tareas en memoria indexadas por id y por estado.
+
+    - _tareas: dict id -> tarea (en orden de creación), búsqueda y borrado O(1)
+    - _por_estado: un dict id -> tarea por cada estado; su tamaño es el
+      contador de ese estado, así que el resumen no recorre nada
+    - clear() vacía todo y vuelve a empezar los ids desde 1
+
+    Las tareas se devuelven como dicts; el estado solo se cambia con
+    actualizar() o completar_todas() para que los índices no queden
+    desfasados.
+    """
+
+    def __init__(self):
+        self._tareas: Dict[int, dict] = {}
+        self._por_estado: Dict[EstadoTarea, Dict[int, dict]] = {estado: {} for estado in EstadoTarea}
+        self._siguiente_id = 1
+
+    def __len__(self) -> int:
+        return len(self._tareas)
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self._tareas.values())
+
+    def clear(self) -> None:
+        self._tareas.clear()
+        for indice in self._por_estado.values():
+            indice.clear()
+        self._siguiente_id = 1
+
+    def agregar(self, descripcion: str, estado: EstadoTarea) -> dict:
+        tarea = {
+            "id": self._siguiente_id,
+            "descripcion": descripcion,
+            "estado": estado,
+            "fecha_creacion": datetime.now()
+        }
+        self._siguiente_id += 1
+        self._tareas[tarea["id"]] = tarea
+        self._por_estado[estado][tarea["id"]] = tarea
+        return tarea
+
+    def obtener(self, tarea_id: int) -> Optional[dict]:
+        return self._tareas.get(tarea_id)
+
+    def actualizar(self, tarea_id: int, descripcion: Optional[str] = None,
+                   estado: Optional[EstadoTarea] = None) -> Optional[dict]:
+        tarea = self._tareas.get(tarea_id)
+        if tarea is None:
+            return None
+        if descripcion is not None:
+            tarea["descripcion"] = descripcion
+        if estado is not None and estado != tarea["estado"]:
+            del self._por_estado[tarea["estado"]][tarea_id]
+            tarea["estado"] = estado
+            self._por_estado[estado][tarea_id] = tarea
+        return tarea
+
+    def eliminar(self, tarea_id: int) -> bool:
+        tarea = self._tareas.pop(tarea_id, None)
+        if tarea is None:
+            return False
+        del self._por_estado[tarea["estado"]][tarea_id]
+        return True
+
+    def listar(self, estado: Optional[EstadoTarea] = None) -> List[dict]:
+        """Tareas en orden de creación, opcionalmente solo las de un estado"""
+        if estado is None:
+            return list(self._tareas.values())
+        # Las que cambiaron de estado quedan al final del índice: se ordena
+        # por id (casi siempre ya está ordenado)
+        indice = self._por_estado[estado]
+        return [indice[tarea_id] for tarea_id in sorted(indice)]
+
+    def resumen(self) -> Dict[str, int]:
+        return {estado.value: len(indice) for estado, indice in self._por_estado.items()}
+
+    def completar_todas(self) -> int:
+        """Pasa a completada las tareas que no lo están y devuelve cuántas"""
+        completadas = self._por_estado[EstadoTarea.completada]
+        actualizadas = 0
+        for estado, indice in self._por_estado.items():
+            if estado == EstadoTarea.completada:
+                continue
+            for tarea_id, tarea in indice.items():
+                tarea["estado"] = EstadoTarea.completada
+                completadas[tarea_id] = tarea
+            actualizadas += len(indice)
+            indice.clear()
+        return actualizadas
+
 
-# Función auxiliar para encontrar tarea por ID
-def buscar_tarea(tarea_id: int) -> Optional[dict]:
-    for tarea in tareas_db:
-        if tarea["id"] == tarea_id:
-            return tarea
-    return None
+tareas_db = TareaStore()
 
 # RUTAS DE LA API
 
@@ -85,16 +170,7 @@ def obtener_resumen():
     """
     Devuelve un contador de tareas por cada estado.
     """
-    resumen = {
-        "pendiente": 0,
-        "en_progreso": 0,
-        "completada": 0
-    }
-    
-    for tarea in tareas_db:
-        resumen[tarea["estado"]] += 1
-    
-    return resumen
+    return tareas_db.resumen()
 
 @app.put("/tareas/completar_todas")
 def completar_todas_tareas():
@@ -104,12 +180,7 @@ def completar_todas_tareas():
     if not tareas_db:
         return {"mensaje": "No hay tareas"}
     
-    tareas_actualizadas = 0
-    
-    for tarea in tareas_db:
-        if tarea["estado"] != EstadoTarea.completada:
-            tarea["estado"] = EstadoTarea.completada
-            tareas_actualizadas += 1
+    tareas_actualizadas = tareas_db.completar_todas()
     
     return {
         "mensaje": "Todas las tareas han sido marcadas como completadas",
@@ -126,10 +197,7 @@ def listar_tareas(
     - estado: filtra por estado específico
     - texto: busca coincidencias en la descripción
     """
-    tareas_filtradas = tareas_db.copy()
-    
-    if estado:
-        tareas_filtradas = [t for t in tareas_filtradas if t["estado"] == estado]
+    tareas_filtradas = tareas_db.listar(estado)
     
     if texto:
         tareas_filtradas = [
@@ -146,19 +214,7 @@ def crear_tarea(tarea: TareaCreate):
     - Valida que la descripción no esté vacía
     - Asigna ID automático y fecha de creación
     """
-    global contador_id
-    
-    nueva_tarea = {
-        "id": contador_id,
-        "descripcion": tarea.descripcion,
-        "estado": tarea.estado,
-        "fecha_creacion": datetime.now()
-    }
-    
-    tareas_db.append(nueva_tarea)
-    contador_id += 1
-    
-    return nueva_tarea
+    return tareas_db.agregar(tarea.descripcion, tarea.estado)
 
 @app.put("/tareas/{id}", response_model=TareaResponse)
 def actualizar_tarea(id: int, tarea_update: TareaUpdate):
@@ -167,7 +223,8 @@ def actualizar_tarea(id: int, tarea_update: TareaUpdate):
     - Permite modificar descripción y/o estado
     - Devuelve 404 si la tarea no existe
     """
-    tarea = buscar_tarea(id)
+    # Actualizar solo los campos proporcionados
+    tarea = tareas_db.actualizar(id, tarea_update.descripcion, tarea_update.estado)
     
     if not tarea:
         raise HTTPException(
@@ -175,13 +232,6 @@ def actualizar_tarea(id: int, tarea_update: TareaUpdate):
             detail={"error": "La tarea no existe"}
         )
     
-    # Actualizar solo los campos proporcionados
-    if tarea_update.descripcion is not None:
-        tarea["descripcion"] = tarea_update.descripcion
-    
-    if tarea_update.estado is not None:
-        tarea["estado"] = tarea_update.estado
-    
     return tarea
 
 @app.delete("/tareas/{id}")
@@ -190,14 +240,10 @@ def eliminar_tarea(id: int):
     Elimina una tarea por su ID.
     - Devuelve 404 si la tarea no existe
     """
-    tarea = buscar_tarea(id)
-    
-    if not tarea:
+    if not tareas_db.eliminar(id):
         raise HTTPException(
             status_code=404,
             detail={"error": "La tarea no existe"}
         )
     
-    tareas_db.remove(tarea)
-    
     return {"mensaje": "Tarea eliminada exitosamente"}
\ No newline at end of file
@@ -0,0 +1,52 @@
+import random
+
+from main import EstadoTarea, TareaStore
+
+
+def test_store_coincide_con_una_lista():
+    """Operaciones al azar sobre el store y sobre una lista simple"""
+    azar = random.Random(7)
+    store, lista = TareaStore(), []
+    estados = list(EstadoTarea)
+
+    for paso in range(2000):
+        accion = azar.random()
+        if accion < 0.4 or not lista:
+            tarea = store.agregar(f"Tarea {paso}", azar.choice(estados))
+            lista.append(dict(tarea))
+        elif accion < 0.7:
+            elegida = azar.choice(lista)
+            estado = azar.choice(estados)
+            store.actualizar(elegida["id"], estado=estado)
+            elegida["estado"] = estado
+        elif accion < 0.95:
+            elegida = lista.pop(azar.randrange(len(lista)))
+            assert store.eliminar(elegida["id"])
+        else:
+            store.completar_todas()
+            for tarea in lista:
+                tarea["estado"] = EstadoTarea.completada
+
+    assert [t["id"] for t in store.listar()] == [t["id"] for t in lista]
+    for estado in estados:
+        esperadas = [t["id"] for t in lista if t["estado"] == estado]
+        assert [t["id"] for t in store.listar(estado)] == esperadas
+        assert store.resumen()[estado.value] == len(esperadas)
+
+
+def test_clear_reinicia_ids():
+    store = TareaStore()
+    store.agregar("a", EstadoTarea.pendiente)
+    store.agregar("b", EstadoTarea.completada)
+    store.clear()
+
+    assert len(store) == 0
+    assert store.resumen() == {"pendiente": 0, "en_progreso": 0, "completada": 0}
+    assert store.agregar("c", EstadoTarea.pendiente)["id"] == 1
+
+
+def test_inexistentes():
+    store = TareaStore()
+    assert store.obtener(1) is None
+    assert store.actualizar(1, descripcion="x") is None
+    assert store.eliminar(1) is False
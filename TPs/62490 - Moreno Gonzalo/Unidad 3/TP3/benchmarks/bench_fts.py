@@ -0,0 +1,125 @@
+"""
+Benchmark: búsqueda ?texto= con LIKE '%palabra%' (versión anterior) contra el
+índice FTS5, sobre una base con muchas tareas.
+
+Ejecutar desde la carpeta TP3:
+
+    python benchmarks/bench_fts.py [--tareas 1000000] [--repeticiones 5]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+
+VERBOS = ["comprar", "estudiar", "revisar", "llamar", "preparar", "enviar", "limpiar", "pagar",
+          "organizar", "terminar", "escribir", "leer", "arreglar", "diseñar", "probar"]
+OBJETOS = ["pan", "leche", "informe", "presupuesto", "factura", "auto", "jardín", "código",
+           "documentación", "reunión", "examen", "matemáticas", "servidor", "base", "cliente",
+           "proveedor", "entrega", "tp", "api", "pedido"]
+CALIFICADORES = ["urgente", "mañana", "semanal", "anual", "pendiente", "final", "rápido", "mensual",
+                 "importante", "opcional", "xilófono"]
+ESTADOS = ["pendiente", "en_progreso", "completada"]
+PRIORIDADES = ["baja", "media", "alta"]
+
+
+def generar(conn: sqlite3.Connection, cantidad: int) -> None:
+    rnd = random.Random(42)
+
+    def filas():
+        for i in range(cantidad):
+            palabras = [rnd.choice(VERBOS), rnd.choice(OBJETOS)]
+            # ~1% de las tareas con una palabra rara
+            if rnd.random() < 0.3:
+                palabras.append(rnd.choice(CALIFICADORES[:-1]) if rnd.random() > 0.03 else CALIFICADORES[-1])
+            yield (" ".join(palabras).capitalize(), rnd.choice(ESTADOS), rnd.choice(PRIORIDADES),
+                   f"2025-01-01T00:00:{i:012d}")
+
+    conn.executemany(
+        "INSERT INTO tareas (descripcion, estado, prioridad, fecha_creacion) VALUES (?, ?, ?, ?)",
+        filas(),
+    )
+    conn.commit()
+
+
+def consulta_like(texto, estado=None):
+    """La consulta que armaba listar_tareas antes del índice FTS5"""
+    query = "SELECT * FROM tareas WHERE 1=1"
+    params = []
+    if estado:
+        query += " AND estado = ?"
+        params.append(estado)
+    query += " AND descripcion LIKE ?"
+    params.append(f"%{texto}%")
+    return query + " ORDER BY id ASC", params
+
+
+def medir(conn, query, params, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        filas = conn.execute(query, params).fetchall()
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos) * 1000, len(filas)
+
+
+def main_bench():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tareas", type=int, default=1_000_000)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "bench.db")
+        conn = sqlite3.connect(ruta)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("""
+            CREATE TABLE tareas (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                descripcion TEXT NOT NULL,
+                estado TEXT NOT NULL,
+                prioridad TEXT NOT NULL DEFAULT 'media',
+                fecha_creacion TEXT NOT NULL
+            )
+        """)
+
+        inicio = time.perf_counter()
+        generar(conn, args.tareas)
+        print(f"{args.tareas} tareas generadas en {time.perf_counter() - inicio:.1f}s")
+
+        inicio = time.perf_counter()
+        main.init_fts(conn.cursor())
+        conn.commit()
+        print(f"índice FTS5 construido en {time.perf_counter() - inicio:.1f}s\n")
+
+        casos = [
+            ("palabra rara", dict(texto="xilófono")),
+            ("palabra rara + estado", dict(texto="xilófono", estado="pendiente")),
+            ("prefijo", dict(texto="presup")),
+            ("dos palabras", dict(texto="comprar pan")),
+            ("palabra común", dict(texto="informe")),
+        ]
+        print(f"{'caso':<24}{'LIKE ms':>10}{'FTS5 ms':>10}{'filas':>9}{'mejora':>9}")
+        for nombre, filtros in casos:
+            # "comprar pan" con LIKE busca la frase literal; FTS5 busca ambas palabras
+            ms_like, n_like = medir(conn, *consulta_like(**filtros), args.repeticiones)
+            query, params = main.construir_consulta_tareas(**filtros)
+            ms_fts, n_fts = medir(conn, query, params, args.repeticiones)
+            print(f"{nombre:<24}{ms_like:>10.1f}{ms_fts:>10.1f}{n_fts:>9}{ms_like / ms_fts:>8.1f}x")
+
+        query, params = main.construir_consulta_tareas(texto="xilófono", orden="relevancia")
+        ms, n = medir(conn, query, params, args.repeticiones)
+        print(f"{'relevancia (FTS5)':<24}{'-':>10}{ms:>10.1f}{n:>9}")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main_bench()
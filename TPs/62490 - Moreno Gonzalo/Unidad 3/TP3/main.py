@@ -3,6 +3,7 @@ from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
 from typing import Optional, List
 from enum import Enum
+import re
 import sqlite3
 from contextlib import contextmanager
 
@@ -77,8 +78,103 @@ def init_db():
                 fecha_creacion TEXT NOT NULL
             )
         """)
+        init_fts(cursor)
         conn.commit()
 
+def init_fts(cursor):
+    """
+    Crea el índice de texto completo (FTS5) sobre la descripción.
+
+    tareas_fts es una tabla "external content": no guarda otra copia del
+    texto, solo el índice, y los triggers la mantienen sincronizada con
+    tareas en cada INSERT, DELETE y UPDATE de la descripción.
+    """
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'tareas_fts'")
+    existia = cursor.fetchone() is not None
+
+    cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS tareas_fts USING fts5(
+            descripcion,
+            content='tareas',
+            content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS tareas_fts_insert AFTER INSERT ON tareas BEGIN
+            INSERT INTO tareas_fts(rowid, descripcion) VALUES (new.id, new.descripcion);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS tareas_fts_delete AFTER DELETE ON tareas BEGIN
+            INSERT INTO tareas_fts(tareas_fts, rowid, descripcion) VALUES ('delete', old.id, old.descripcion);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS tareas_fts_update AFTER UPDATE OF descripcion ON tareas BEGIN
+            INSERT INTO tareas_fts(tareas_fts, rowid, descripcion) VALUES ('delete', old.id, old.descripcion);
+            INSERT INTO tareas_fts(rowid, descripcion) VALUES (new.id, new.descripcion);
+        END
+    """)
+
+    # Bases creadas antes del índice: indexar las tareas que ya existen
+    if not existia:
+        cursor.execute("INSERT INTO tareas_fts(tareas_fts) VALUES ('rebuild')")
+
+def consulta_fts(texto: str) -> Optional[str]:
+    """
+    Convierte el texto buscado en una consulta FTS5.
+
+    Cada palabra se busca como prefijo ("compr" encuentra "Comprar") y todas
+    deben aparecer. Devuelve None si el texto no tiene ninguna palabra o
+    tiene símbolos ("c++", "v1.2"): el tokenizador los descarta y la
+    consulta quedaría mucho más amplia que lo buscado.
+    """
+    palabras = re.findall(r"\w+", texto)
+    if not palabras or not re.fullmatch(r"[\w\s]+", texto):
+        return None
+    return " ".join(f'"{palabra}"*' for palabra in palabras)
+
+def construir_consulta_tareas(estado: Optional[str] = None, texto: Optional[str] = None,
+                              prioridad: Optional[str] = None, orden: Optional[str] = None):
+    """Arma el SELECT de GET /tareas y sus parámetros según los filtros"""
+    query = "SELECT tareas.* FROM tareas"
+    condiciones = []
+    params = []
+
+    busqueda = consulta_fts(texto) if texto else None
+    if busqueda:
+        query += " JOIN tareas_fts ON tareas_fts.rowid = tareas.id"
+        condiciones.append("tareas_fts MATCH ?")
+        params.append(busqueda)
+    elif texto:
+        # Texto con símbolos: búsqueda literal, como antes del índice
+        condiciones.append("tareas.descripcion LIKE ?")
+        params.append(f"%{texto}%")
+
+    if estado:
+        condiciones.append("tareas.estado = ?")
+        params.append(estado)
+
+    if prioridad:
+        condiciones.append("tareas.prioridad = ?")
+        params.append(prioridad)
+
+    if condiciones:
+        query += " WHERE " + " AND ".join(condiciones)
+
+    # Ordenamiento
+    orden = orden.lower() if orden else None
+    if orden in ('asc', 'desc'):
+        query += f" ORDER BY tareas.fecha_creacion {orden.upper()}"
+    elif orden == 'relevancia' and busqueda:
+        # rank = bm25(): más negativo = más relevante
+        query += " ORDER BY tareas_fts.rank, tareas.id"
+    else:
+        query += " ORDER BY tareas.id ASC"
+
+    return query, params
+
 # Inicializar FastAPI
 app = FastAPI(
     title="API de Tareas con SQLite",
@@ -206,35 +302,23 @@ def listar_tareas(
     estado: Optional[EstadoTarea] = Query(None, description="Filtrar por estado"),
     texto: Optional[str] = Query(None, description="Buscar texto en descripción"),
     prioridad: Optional[PrioridadTarea] = Query(None, description="Filtrar por prioridad"),
-    orden: Optional[str] = Query(None, description="Ordenar por fecha: 'asc' o 'desc'")
+    orden: Optional[str] = Query(None, description="Ordenar por fecha: 'asc' o 'desc', o 'relevancia' junto con texto")
 ):
     """
     Lista todas las tareas con filtros opcionales y ordenamiento.
+    - texto: busca palabras (o comienzos de palabras) en la descripción
+    - orden=relevancia: las tareas que mejor coinciden con texto primero
     """
     with get_db_connection() as conn:
         cursor = conn.cursor()
         
         # Construir consulta dinámica
-        query = "SELECT * FROM tareas WHERE 1=1"
-        params = []
-        
-        if estado:
-            query += " AND estado = ?"
-            params.append(estado.value)
-        
-        if texto:
-            query += " AND descripcion LIKE ?"
-            params.append(f"%{texto}%")
-        
-        if prioridad:
-            query += " AND prioridad = ?"
-            params.append(prioridad.value)
-        
-        # Ordenamiento
-        if orden and orden.lower() in ['asc', 'desc']:
-            query += f" ORDER BY fecha_creacion {orden.upper()}"
-        else:
-            query += " ORDER BY id ASC"
+        query, params = construir_consulta_tareas(
+            estado=estado.value if estado else None,
+            texto=texto,
+            prioridad=prioridad.value if prioridad else None,
+            orden=orden
+        )
         
         cursor.execute(query, params)
         tareas = cursor.fetchall()
@@ -0,0 +1,112 @@
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+client = TestClient(main.app)
+
+
+@pytest.fixture(autouse=True)
+def db_temporal(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "DB_NAME", str(tmp_path / "tareas.db"))
+    main.init_db()
+    yield
+
+
+def crear(descripcion, estado="pendiente", prioridad="media"):
+    return client.post("/tareas", json={
+        "descripcion": descripcion, "estado": estado, "prioridad": prioridad
+    }).json()
+
+
+def descripciones(respuesta):
+    assert respuesta.status_code == 200
+    return [t["descripcion"] for t in respuesta.json()]
+
+
+def test_busqueda_por_prefijo_y_sin_mayusculas():
+    crear("Comprar pan")
+    crear("Estudiar Python")
+    assert descripciones(client.get("/tareas?texto=compr")) == ["Comprar pan"]
+    assert descripciones(client.get("/tareas?texto=PYTH")) == ["Estudiar Python"]
+
+
+def test_busqueda_ignora_acentos():
+    crear("Estudiar matemáticas")
+    assert descripciones(client.get("/tareas?texto=matematicas")) == ["Estudiar matemáticas"]
+
+
+def test_todas_las_palabras_deben_aparecer():
+    crear("Comprar pan integral")
+    crear("Comprar leche")
+    assert descripciones(client.get("/tareas?texto=comprar pan")) == ["Comprar pan integral"]
+
+
+def test_indice_sigue_a_actualizaciones_y_borrados():
+    tarea = crear("Comprar pan")
+    client.put(f"/tareas/{tarea['id']}", json={"descripcion": "Lavar auto"})
+    assert descripciones(client.get("/tareas?texto=comprar")) == []
+    assert descripciones(client.get("/tareas?texto=lavar")) == ["Lavar auto"]
+
+    client.delete(f"/tareas/{tarea['id']}")
+    assert descripciones(client.get("/tareas?texto=lavar")) == []
+
+
+def test_orden_por_relevancia():
+    crear("Revisar informe anual")
+    crear("Informe informe informe")
+    crear("Informe semanal de ventas con muchas palabras extra para diluir")
+    resultado = descripciones(client.get("/tareas?texto=informe&orden=relevancia"))
+    assert resultado[0] == "Informe informe informe"
+    assert len(resultado) == 3
+
+
+def test_texto_combinado_con_filtros_y_orden():
+    crear("Comprar pan", "pendiente", "alta")
+    crear("Comprar leche", "completada", "alta")
+    crear("Comprar fruta", "pendiente", "alta")
+    crear("Comprar queso", "pendiente", "baja")
+
+    resultado = descripciones(client.get("/tareas?texto=comprar&estado=pendiente&prioridad=alta&orden=desc"))
+    assert resultado == ["Comprar fruta", "Comprar pan"]
+
+
+def test_texto_sin_palabras_usa_busqueda_literal():
+    crear("Revisar A/B")
+    crear("Otra tarea")
+    assert descripciones(client.get("/tareas", params={"texto": "/"})) == ["Revisar A/B"]
+
+
+def test_texto_con_simbolos_usa_busqueda_literal():
+    crear("Aprender C++")
+    crear("Comprar pan")
+    crear("Publicar v1.2")
+    crear("Publicar v1 y 2")
+    assert descripciones(client.get("/tareas", params={"texto": "c++"})) == ["Aprender C++"]
+    assert descripciones(client.get("/tareas", params={"texto": "v1.2"})) == ["Publicar v1.2"]
+    assert main.consulta_fts("c++") is None
+    assert main.consulta_fts("comprar  pan") == '"comprar"* "pan"*'
+
+
+def test_init_db_indexa_tareas_existentes(tmp_path, monkeypatch):
+    ruta = str(tmp_path / "vieja.db")
+    conn = sqlite3.connect(ruta)
+    conn.execute("""
+        CREATE TABLE tareas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            descripcion TEXT NOT NULL,
+            estado TEXT NOT NULL,
+            prioridad TEXT NOT NULL DEFAULT 'media',
+            fecha_creacion TEXT NOT NULL
+        )
+    """)
+    conn.execute("INSERT INTO tareas (descripcion, estado, fecha_creacion) "
+                 "VALUES ('Comprar pan', 'pendiente', '2025-01-01')")
+    conn.commit()
+    conn.close()
+
+    monkeypatch.setattr(main, "DB_NAME", ruta)
+    main.init_db()
+    assert descripciones(client.get("/tareas?texto=pan")) == ["Comprar pan"]
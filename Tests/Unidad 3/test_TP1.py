@@ -2,22 +2,55 @@
 Test de autocorrección para TP3.1 - Introducción a FastAPI
 Ejecutar con: python -m pytest test_TP1.py -v
 O simplemente: python test_TP1.py
+
+Los tests levantan main:app con uvicorn en un hilo, en un puerto libre: no
+hace falta correr el servidor antes y se pueden correr varios TPs a la vez.
+Para probar un servidor ya levantado: TP1_BASE_URL=http://127.0.0.1:8000
 """
 
+import os
+import socket
+import threading
 import pytest
 import requests
 import json
 import time
 import subprocess
-import sys
 from typing import Dict, Any, List
 
+
+def levantar_servidor():
+    """
+    Levanta main:app con uvicorn en un hilo, sobre un socket en un puerto
+    libre. Devuelve (url, servidor, hilo).
+    """
+    import uvicorn
+    from main import app
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    puerto = sock.getsockname()[1]
+    servidor = uvicorn.Server(uvicorn.Config(app, log_level="warning"))
+    hilo = threading.Thread(target=servidor.run, kwargs={"sockets": [sock]}, daemon=True)
+    hilo.start()
+
+    limite = time.time() + 10
+    while not servidor.started:
+        if not hilo.is_alive() or time.time() > limite:
+            sock.close()
+            raise RuntimeError("uvicorn no pudo levantar la app")
+        time.sleep(0.01)
+    return f"http://127.0.0.1:{puerto}", servidor, hilo
+
 class TestAgendaAPI:
     """
     Clase de test para verificar la implementación de la Agenda API
     """
     
-    BASE_URL = "http://127.0.0.1:8000"
+    BASE_URL = os.environ.get("TP1_BASE_URL", "")
+    servidor = None
+    hilo = None
+    session = None
     
     @classmethod
     def setup_class(cls):
@@ -27,20 +60,43 @@ class TestAgendaAPI:
         print("TP3.1: Introducción a FastAPI - Servidor Básico")
         print("="*60)
         
+        # Levantar la app en un puerto libre (salvo que se indique TP1_BASE_URL)
+        if not cls.BASE_URL:
+            try:
+                cls.BASE_URL, cls.servidor, cls.hilo = levantar_servidor()
+            except Exception as e:
+                print("❌ ERROR: No se pudo levantar main:app")
+                pytest.fail(f"No se pudo levantar main:app: {type(e).__name__}: {e}", pytrace=False)
+        
+        # Una sola sesión: reutiliza la conexión (keep-alive) entre requests
+        cls.session = requests.Session()
+        
         # Verificar que el servidor esté corriendo
         try:
-            response = requests.get(f"{cls.BASE_URL}/", timeout=5)
-            print("✅ Servidor detectado y funcionando")
+            response = cls.session.get(f"{cls.BASE_URL}/", timeout=5)
+            print(f"✅ Servidor detectado y funcionando en {cls.BASE_URL}")
         except requests.exceptions.RequestException:
             print("❌ ERROR: El servidor no está corriendo")
             print("💡 Ejecuta primero: uvicorn main:app --reload")
-            sys.exit(1)
+            cls.teardown_class()
+            pytest.fail(f"El servidor no responde en {cls.BASE_URL}", pytrace=False)
+
+    @classmethod
+    def teardown_class(cls):
+        """Cierra la sesión y detiene el servidor levantado por los tests"""
+        if cls.session is not None:
+            cls.session.close()
+            cls.session = None
+        if cls.servidor is not None:
+            cls.servidor.should_exit = True
+            cls.hilo.join(timeout=10)
+            cls.servidor = cls.hilo = None
 
     def test_01_endpoint_raiz_existe(self):
         """Test 1: Verificar que existe el endpoint raíz"""
         print("\n📋 Test 1: Verificando endpoint raíz...")
         
-        response = requests.get(f"{self.BASE_URL}/")
+        response = self.session.get(f"{self.BASE_URL}/")
         
         assert response.status_code == 200, "El endpoint raíz debe retornar status 200"
         print("✅ Endpoint raíz responde correctamente")
@@ -49,7 +105,7 @@ class TestAgendaAPI:
         """Test 2: Verificar formato del mensaje de bienvenida"""
         print("\n📋 Test 2: Verificando formato del mensaje de bienvenida...")
         
-        response = requests.get(f"{self.BASE_URL}/")
+        response = self.session.get(f"{self.BASE_URL}/")
         data = response.json()
         
         assert "mensaje" in data, "La respuesta debe contener la clave 'mensaje'"
@@ -63,7 +119,7 @@ class TestAgendaAPI:
         """Test 3: Verificar que existe el endpoint /contactos"""
         print("\n📋 Test 3: Verificando endpoint /contactos...")
         
-        response = requests.get(f"{self.BASE_URL}/contactos")
+        response = self.session.get(f"{self.BASE_URL}/contactos")
         
         assert response.status_code == 200, "El endpoint /contactos debe retornar status 200"
         print("✅ Endpoint /contactos responde correctamente")
@@ -72,7 +128,7 @@ class TestAgendaAPI:
         """Test 4: Verificar que /contactos devuelve una lista JSON"""
         print("\n📋 Test 4: Verificando formato JSON de contactos...")
         
-        response = requests.get(f"{self.BASE_URL}/contactos")
+        response = self.session.get(f"{self.BASE_URL}/contactos")
         data = response.json()
         
         assert isinstance(data, list), "Los contactos deben ser una lista"
@@ -84,7 +140,7 @@ class TestAgendaAPI:
         """Test 5: Verificar estructura de los contactos"""
         print("\n📋 Test 5: Verificando estructura de contactos...")
         
-        response = requests.get(f"{self.BASE_URL}/contactos")
+        response = self.session.get(f"{self.BASE_URL}/contactos")
         contactos = response.json()
         
         campos_requeridos = ["nombre", "apellido", "edad", "teléfono", "email"]
@@ -107,7 +163,7 @@ class TestAgendaAPI:
         """Test 6: Verificar contactos específicos del ejemplo"""
         print("\n📋 Test 6: Verificando contactos específicos del ejemplo...")
         
-        response = requests.get(f"{self.BASE_URL}/contactos")
+        response = self.session.get(f"{self.BASE_URL}/contactos")
         contactos = response.json()
         
         # Buscar Juan Pérez
@@ -134,7 +190,7 @@ class TestAgendaAPI:
         print("\n📋 Test 7: Verificando manejo de errores 404...")
         
         # Intentar acceder a una ruta inexistente
-        response = requests.get(f"{self.BASE_URL}/ruta-inexistente")
+        response = self.session.get(f"{self.BASE_URL}/ruta-inexistente")
         
         assert response.status_code == 404, "Rutas inexistentes deben retornar 404"
         
@@ -144,7 +200,7 @@ class TestAgendaAPI:
         """Test 8: Verificar headers de respuesta"""
         print("\n📋 Test 8: Verificando headers de respuesta...")
         
-        response = requests.get(f"{self.BASE_URL}/")
+        response = self.session.get(f"{self.BASE_URL}/")
         
         assert "application/json" in response.headers.get("content-type", ""), \
             "Las respuestas deben ser application/json"
@@ -156,7 +212,7 @@ class TestAgendaAPI:
         print("\n📋 Test 9: Verificando rendimiento básico...")
         
         start_time = time.time()
-        response = requests.get(f"{self.BASE_URL}/contactos")
+        response = self.session.get(f"{self.BASE_URL}/contactos")
         end_time = time.time()
         
         response_time = end_time - start_time
@@ -169,7 +225,7 @@ class TestAgendaAPI:
         """Test 10: Verificar que la documentación automática esté disponible"""
         print("\n📋 Test 10: Verificando documentación automática...")
         
-        response = requests.get(f"{self.BASE_URL}/docs")
+        response = self.session.get(f"{self.BASE_URL}/docs")
         
         assert response.status_code == 200, "La documentación debe estar disponible en /docs"
         
@@ -231,5 +287,6 @@ if __name__ == "__main__":
                 failed += 1
         
         print(f"\n📊 Resultados: {passed} pasaron, {failed} fallaron")
+        test_instance.teardown_class()
     
     mostrar_resumen_final()
\ No newline at end of file
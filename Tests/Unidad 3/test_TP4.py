@@ -1,15 +1,96 @@
 import pytest
 from fastapi.testclient import TestClient
+import main
 from main import app, init_db, DB_NAME
 import sqlite3
+import shutil
+import sys
+import tempfile
 import os
 
 # Cliente de prueba
 client = TestClient(app)
 
+# ============== CONFIGURACIÓN DE LA BASE ==============
+# Por defecto cada test borra la base y llama a init_db().
+# TEST_DB_MODO=plantilla: el esquema se crea una sola vez y antes de cada test
+# se vuelca esa copia sobre la base con la API de backup, sin init_db().
+# TEST_DB_NAME: ruta de la base para los tests; reemplaza el DB_NAME de los
+# módulos de la app (los que están en la carpeta de main.py).
+
+if os.environ.get("TEST_DB_NAME"):
+    _CARPETA_APP = os.path.dirname(os.path.abspath(main.__file__))
+    _DB_NAME_APP = DB_NAME
+    DB_NAME = os.environ["TEST_DB_NAME"]
+    for _modulo in list(sys.modules.values()):
+        _archivo = getattr(_modulo, "__file__", None)
+        if (_archivo and os.path.dirname(os.path.abspath(_archivo)) == _CARPETA_APP
+                and getattr(_modulo, "DB_NAME", None) == _DB_NAME_APP):
+            _modulo.DB_NAME = DB_NAME
+
+DB_MODO = os.environ.get("TEST_DB_MODO", "init_db")
+
+def borrar_db():
+    """Borra la base y sus archivos -wal, -shm y -journal"""
+    for ruta in (DB_NAME, DB_NAME + "-wal", DB_NAME + "-shm", DB_NAME + "-journal"):
+        if os.path.exists(ruta):
+            os.remove(ruta)
+
+def copiar_base(origen, destino):
+    """Copia una base con la API de backup, escribiendo sobre el mismo archivo destino"""
+    conn_origen, conn_destino = sqlite3.connect(origen), sqlite3.connect(destino)
+    try:
+        conn_origen.backup(conn_destino)
+    finally:
+        conn_origen.close()
+        conn_destino.close()
+
+def base_libre():
+    """False si una conexión de la app dejó la base bloqueada"""
+    if not os.path.exists(DB_NAME):
+        return True
+    conn = sqlite3.connect(DB_NAME, timeout=0, isolation_level=None)
+    try:
+        conn.execute("BEGIN EXCLUSIVE")
+        conn.execute("ROLLBACK")
+        return True
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        conn.close()
+
+@pytest.fixture(scope="module")
+def plantilla():
+    """Con TEST_DB_MODO=plantilla, base con el esquema de init_db() armada una sola vez"""
+    if DB_MODO != "plantilla":
+        yield None
+        return
+    borrar_db()
+    init_db()
+
+    directorio = tempfile.mkdtemp()
+    ruta = os.path.join(directorio, "plantilla.db")
+    copiar_base(DB_NAME, ruta)
+    yield ruta
+    shutil.rmtree(directorio, ignore_errors=True)
+    borrar_db()
+
 @pytest.fixture(autouse=True)
-def setup_and_teardown():
+def setup_and_teardown(plantilla):
     """Configuración antes y después de cada test"""
+    if plantilla:
+        if base_libre():
+            # El archivo no se reemplaza: las conexiones que la app tiene
+            # abiertas siguen siendo válidas y ven la base limpia
+            copiar_base(plantilla, DB_NAME)
+        else:
+            # El backup esperaría a una transacción que la app no cerró
+            borrar_db()
+            shutil.copyfile(plantilla, DB_NAME)
+            init_db()
+        yield
+        return
+
     # Eliminar base de datos si existe
     if os.path.exists(DB_NAME):
         os.remove(DB_NAME)